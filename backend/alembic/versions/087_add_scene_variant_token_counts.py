@@ -0,0 +1,66 @@
+"""add token_counts to scene_variants
+
+Revision ID: 087_scene_variant_token_counts
+Revises: 086_add_narrative_presence
+Create Date: 2026-10-16
+
+Persisted per-variant token counts keyed by tokenizer name, e.g.
+{"cl100k_base": 812}. Lets the context manager fit its token budget by
+summing stored integers instead of re-encoding every scene.
+
+Existing rows are backfilled here when tiktoken is importable; otherwise
+(or after a tokenizer change) use POST /api/admin/scene-variants/backfill-token-counts.
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+
+revision = '087_scene_variant_token_counts'
+down_revision = '086_add_narrative_presence'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 500
+
+
+def upgrade():
+    op.add_column(
+        'scene_variants',
+        sa.Column('token_counts', sa.JSON(), nullable=True)
+    )
+
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # No tokenizer in the migration environment - leave NULL for the backfill job
+        return
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, content FROM scene_variants "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+
+        params = [
+            {"tc": json.dumps({"cl100k_base": len(encoding.encode(row.content or ""))}), "id": row.id}
+            for row in rows
+        ]
+        conn.execute(
+            sa.text("UPDATE scene_variants SET token_counts = :tc WHERE id = :id"),
+            params
+        )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    op.drop_column('scene_variants', 'token_counts')
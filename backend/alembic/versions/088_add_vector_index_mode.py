@@ -0,0 +1,49 @@
+"""configurable vector index type (HNSW / IVFFlat)
+
+Revision ID: 088_vector_index_mode
+Revises: 087_scene_variant_token_counts
+Create Date: 2026-10-16
+
+Makes sure every vector table (scene_embeddings, character_memories,
+plot_events, character_chronicles, location_lorebooks, scene_events) has its
+HNSW cosine index, e.g. after a re-embed that skipped scene_embeddings.
+
+The index type is configured by semantic_memory.vector_index.index_type in
+config.yaml and applied with POST /api/admin/embeddings/rebuild-vector-indexes.
+Build IVFFlat indexes only after the embeddings are populated, since IVFFlat
+clusters are trained on existing rows.
+"""
+from alembic import op
+
+
+revision = '088_vector_index_mode'
+down_revision = '087_scene_variant_token_counts'
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    'scene_embeddings',
+    'character_memories',
+    'plot_events',
+    'character_chronicles',
+    'location_lorebooks',
+    'scene_events',
+]
+
+
+def upgrade():
+    for table in TABLES:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_embedding_hnsw ON {table} "
+            f"USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade():
+    # Back to the HNSW indexes created by 064 / 065 / 076
+    for table in TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_embedding_ivfflat")
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_embedding_hnsw ON {table} "
+            f"USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+        )
@@ -0,0 +1,38 @@
+"""add reembed_checkpoints
+
+Revision ID: 089_reembed_checkpoints
+Revises: 088_vector_index_mode
+Create Date: 2026-10-16
+
+Per-table progress of the bulk re-embedding pipeline (ReembedService), so a
+cancelled or interrupted re-embed resumes after the last fully written chunk
+instead of starting over. Rows are cleared when a re-embed completes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '089_reembed_checkpoints'
+down_revision = '088_vector_index_mode'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'reembed_checkpoints',
+        sa.Column('table_name', sa.String(64), primary_key=True),
+        sa.Column('model_key', sa.Text(), nullable=False),
+        sa.Column('dimension', sa.Integer(), nullable=False),
+        sa.Column('mode', sa.String(16), nullable=False),
+        sa.Column('last_id', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('max_id', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('errors', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('status', sa.String(16), nullable=False, server_default='running'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table('reembed_checkpoints')
@@ -0,0 +1,57 @@
+"""add background_jobs
+
+Revision ID: 090_background_jobs
+Revises: 089_reembed_checkpoints
+Create Date: 2026-10-16
+
+Durable, prioritized queue for background work (post-scene extractions,
+backfills). Workers claim rows with FOR UPDATE SKIP LOCKED; the partial unique
+index on coalesce_key keeps at most one pending job per piece of work.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '090_background_jobs'
+down_revision = '089_reembed_checkpoints'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'background_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('job_type', sa.String(64), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='10'),
+        sa.Column('status', sa.String(16), nullable=False, server_default='pending'),
+        sa.Column('story_id', sa.Integer(), sa.ForeignKey('stories.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('coalesce_key', sa.String(255), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('progress', sa.JSON(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('run_after', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_by', sa.String(64), nullable=True),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_background_jobs_id', 'background_jobs', ['id'])
+    op.create_index('ix_background_jobs_story_id', 'background_jobs', ['story_id'])
+    op.create_index('ix_background_jobs_claim', 'background_jobs', ['status', 'priority', 'id'])
+    op.create_index(
+        'uq_background_jobs_pending_coalesce_key', 'background_jobs', ['coalesce_key'],
+        unique=True, postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade():
+    op.drop_index('uq_background_jobs_pending_coalesce_key', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_claim', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_story_id', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_id', table_name='background_jobs')
+    op.drop_table('background_jobs')
@@ -893,7 +893,10 @@ async def get_embedding_status(
 
         return {
             "compatibility": compatibility,
-            "collection_stats": stats
+            "collection_stats": stats,
+            "query_cache": semantic_memory.get_query_cache_stats(),
+            "embedding_batching": semantic_memory.get_batching_stats(),
+            "rerank": semantic_memory.get_rerank_stats(),
         }
     except Exception as e:
         logger.error(f"Error getting embedding status: {e}")
@@ -903,6 +906,141 @@ async def get_embedding_status(
         )
 
 
+@router.get("/llm/prefix-cache")
+async def get_prefix_cache_stats(
+    current_user: User = Depends(require_admin),
+):
+    """
+    Prompt prefix memoization and KV-cache reuse counters.
+    shared_byte_ratio / identical_rate show how much of each cache-friendly
+    prefix was byte-identical to the previous call for the same story branch.
+    """
+    from ..services.llm.prefix_cache import prefix_cache, prefix_tracker
+
+    return {
+        "memo": prefix_cache.get_stats(),
+        "identity": prefix_tracker.get_stats(),
+    }
+
+
+@router.get("/llm/fused-extraction")
+async def get_fused_extraction_stats(
+    current_user: User = Depends(require_admin),
+):
+    """
+    Fused per-scene extraction counters: LLM calls saved (tasks_per_call),
+    split fallbacks and the measured fused output quality per task.
+    """
+    from ..services.llm.fused_extraction import get_fused_planner
+
+    return get_fused_planner().get_stats()
+
+
+@router.get("/llm/scheduler")
+async def get_llm_scheduler_stats(
+    current_user: User = Depends(require_admin),
+):
+    """Per-endpoint LLM concurrency limits, queue depths and circuit state for this process."""
+    from ..utils.circuit_breaker import get_llm_scheduler
+
+    return get_llm_scheduler().get_stats()
+
+
+@router.get("/llm/clients")
+async def get_llm_client_registry_stats(
+    current_user: User = Depends(require_admin),
+):
+    """Cached LLM client / extraction service counts and reuse rate for this process."""
+    from ..services.llm.client_registry import get_client_registry
+
+    return get_client_registry().get_stats()
+
+
+@router.get("/llm/health")
+async def get_llm_health_stats(
+    current_user: User = Depends(require_admin),
+):
+    """Cached state of every LLM endpoint tracked by the background health prober."""
+    from ..services.llm.health_prober import get_health_prober
+
+    return get_health_prober().get_stats()
+
+
+@router.get("/tts/providers")
+async def get_tts_provider_pool_stats(
+    current_user: User = Depends(require_admin),
+):
+    """Pooled TTS provider instances (hit rate, evictions, idle time per provider)."""
+    from ..services.tts.provider_pool import get_tts_provider_pool
+
+    return get_tts_provider_pool().get_stats()
+
+
+@router.get("/tts/audio-cache")
+async def get_tts_audio_cache_stats(
+    current_user: User = Depends(require_admin),
+):
+    """Content-addressed TTS audio cache usage (size against quota, hit rate, evictions)."""
+    from ..services.tts.audio_cache import get_tts_audio_cache
+
+    cache = get_tts_audio_cache()
+    return cache.get_stats() if cache is not None else {"enabled": False}
+
+
+@router.get("/stt/batching")
+async def get_stt_batching_stats(
+    current_user: User = Depends(require_admin),
+):
+    """Cross-session Whisper/VAD batching (batch sizes and queue wait per model)."""
+    from ..services.stt_scheduler import get_stt_scheduler
+
+    return get_stt_scheduler().get_stats()
+
+
+@router.get("/images/comfyui-events")
+async def get_comfyui_event_stats(
+    current_user: User = Depends(require_admin),
+):
+    """ComfyUI websocket listeners (connection state, tracked jobs, events received per server)."""
+    from ..services.image_generation.comfyui_events import get_comfyui_event_stats
+
+    return {"listeners": get_comfyui_event_stats()}
+
+
+@router.get("/images/scheduler")
+async def get_image_scheduler_stats(
+    current_user: User = Depends(require_admin),
+):
+    """Image job scheduler (in-flight and waiting jobs per ComfyUI server, deduplicated generations)."""
+    from ..services.image_generation.scheduler import get_image_job_scheduler
+
+    return get_image_job_scheduler().get_stats()
+
+
+@router.get("/extraction/metrics")
+async def get_extraction_metrics(
+    current_user: User = Depends(require_admin),
+):
+    """
+    Post-scene extraction pipeline timings per step (wall time, time spent
+    waiting for an endpoint slot, failures). parallelism is the sum of step
+    times over pipeline wall time.
+    """
+    from ..services.extraction_executor import get_extraction_executor
+
+    return get_extraction_executor().metrics.get_stats()
+
+
+@router.get("/jobs/stats")
+async def get_job_queue_stats(
+    current_user: User = Depends(require_admin),
+):
+    """Background job queue counters for this process."""
+    from ..services.job_queue import get_job_queue
+
+    return get_job_queue().get_stats()
+
+
 @router.post("/embeddings/reembed-story/{story_id}")
 async def reembed_story(
     story_id: int,
@@ -1335,3 +1473,112 @@ async def backfill_event_embeddings(
         "total": total,
     }
 
+
+
+@router.post("/scene-variants/backfill-token-counts")
+async def backfill_scene_variant_token_counts(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Backfill SceneVariant.token_counts for the current tokenizer.
+    Needed once for rows written before migration 087 (if it could not
+    tokenize) and after a tokenizer change. New and edited variants are
+    counted at write time. Runs in background.
+    """
+    from ..models import SceneVariant
+    from ..utils.token_counter import get_tokenizer_name
+
+    tokenizer = get_tokenizer_name()
+    total = db.query(func.count(SceneVariant.id)).scalar()
+
+    def run_backfill():
+        from ..database import SessionLocal
+        from ..utils.token_counter import count_tokens
+
+        backfill_db = SessionLocal()
+        batch_size = 500
+        last_id = 0
+        updated = 0
+        errors = 0
+
+        try:
+            while True:
+                rows = (
+                    backfill_db.query(SceneVariant.id, SceneVariant.content, SceneVariant.token_counts)
+                    .filter(SceneVariant.id > last_id)
+                    .order_by(SceneVariant.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    break
+                last_id = rows[-1].id
+
+                mappings = []
+                for row in rows:
+                    if row.token_counts and tokenizer in row.token_counts:
+                        continue
+                    counts = dict(row.token_counts or {})
+                    counts[tokenizer] = count_tokens(row.content)
+                    mappings.append({"id": row.id, "token_counts": counts})
+
+                if not mappings:
+                    continue
+                try:
+                    backfill_db.bulk_update_mappings(SceneVariant, mappings)
+                    backfill_db.commit()
+                    updated += len(mappings)
+                except Exception as e:
+                    logger.error(f"[BACKFILL] Token count batch failed: {e}")
+                    backfill_db.rollback()
+                    errors += len(mappings)
+
+            logger.info(f"[BACKFILL] Scene variant token counts complete ({tokenizer}): {updated} updated, {errors} errors")
+        finally:
+            backfill_db.close()
+
+    background_tasks.add_task(run_backfill)
+
+    return {
+        "message": f"Backfilling {tokenizer} token counts for {total} scene variants in background",
+        "tokenizer": tokenizer,
+        "total": total,
+    }
+
+
+@router.post("/embeddings/rebuild-vector-indexes")
+async def rebuild_vector_indexes(
+    background_tasks: BackgroundTasks,
+    force: bool = Query(False, description="Rebuild indexes that already exist (to apply new parameters)"),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Rebuild pgvector indexes to match semantic_memory.vector_index in config.yaml
+    (HNSW or IVFFlat, with the configured build parameters).
+    Runs in background; large tables can take several minutes per index.
+    """
+    from ..services.vector_index import get_vector_index_config
+
+    config = get_vector_index_config()
+
+    def run_rebuild():
+        from ..database import engine
+        from ..services.vector_index import rebuild_vector_indexes as _rebuild
+
+        try:
+            with engine.connect() as conn:
+                built = _rebuild(conn, config=config, force=force)
+                conn.commit()
+            logger.info(f"[VECTOR INDEX] Rebuild complete: {built}")
+        except Exception as e:
+            logger.error(f"[VECTOR INDEX] Rebuild failed: {e}")
+
+    background_tasks.add_task(run_rebuild)
+
+    return {
+        "message": f"Rebuilding {config['index_type']} vector indexes in background",
+        "index_type": config["index_type"],
+        "force": force,
+    }
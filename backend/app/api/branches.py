@@ -15,6 +15,7 @@ from ..database import get_db
 from ..dependencies import get_current_user
 from ..models import Story, StoryBranch, Scene, Chapter, StoryCharacter
 from ..services.branch_service import get_branch_service
+from ..services.context_cache import invalidate_story_context
 from .story_helpers import get_or_create_user_settings
 from .story_tasks import initialize_branch_entity_states_in_background
 import logging
@@ -291,6 +292,7 @@ async def delete_branch(
     if not success:
         raise HTTPException(status_code=400, detail="Failed to delete branch")
     
+    invalidate_story_context(story_id, branch_id)
     return {"success": True, "message": f"Deleted branch '{branch.name}'"}
 
 
@@ -6,20 +6,27 @@ Provides REST endpoints for AI-powered image generation using ComfyUI.
 
 import os
 import uuid
+import json
+import asyncio
 import logging
+import mimetypes
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..dependencies import get_current_user
-from ..models import User, UserSettings, GeneratedImage, Character, Scene, Story, StoryCharacter
+from ..models import User, UserSettings, GeneratedImage, Character, Scene, Story, StoryCharacter, Chapter
 from ..config import settings
 from ..services.image_generation import ComfyUIProvider, GenerationRequest, GenerationStatus
+from ..services.image_generation.derivatives import content_hash, create_derivatives, pick_derivative, sign_url
+from ..services.image_generation.scheduler import PRIORITY_BATCH, get_image_job_scheduler
+from ..services.job_queue import PRIORITY_BACKFILL, register_job_handler, submit_job
+from ..utils.file_responses import file_response
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +99,27 @@ class GenerateCharacterImageRequest(BaseModel):
     custom_prompt: Optional[str] = None
 
 
+class IllustrateStoryRequest(BaseModel):
+    """Request to illustrate all scenes of a chapter or story"""
+    chapter_id: Optional[int] = None  # None = every scene of the current branch
+    skip_illustrated: bool = True  # Leave scenes that already have an image alone
+    style: str = "illustrated"
+    checkpoint: Optional[str] = None
+    width: int = 1024
+    height: int = 1024
+    steps: int = 4
+    cfg_scale: float = 1.5
+    seed: Optional[int] = None  # Fixed seed for a consistent look across scenes
+
+
+class IllustrationBatchResponse(BaseModel):
+    """Response for a queued illustration batch"""
+    job_id: Optional[int] = None  # Background job id (None when run without the job queue)
+    batch_id: Optional[str] = None
+    scene_count: int = 0
+    queued: bool = False
+
+
 class GenerationJobResponse(BaseModel):
     """Response for a generation job"""
     job_id: str
@@ -116,6 +144,9 @@ class ImageResponse(BaseModel):
     width: Optional[int]
     height: Optional[int]
     created_at: str
+    url: Optional[str] = None  # Full image; content-versioned, cacheable as immutable
+    thumbnail_url: Optional[str] = None  # Smallest WebP thumbnail (falls back to url)
+    thumbnails: Dict[str, str] = {}  # Longest edge in pixels -> WebP thumbnail URL
 
 
 # ============================================================================
@@ -153,13 +184,17 @@ def get_comfyui_provider(user_settings: UserSettings) -> ComfyUIProvider:
             detail="ComfyUI server URL not configured. Please configure it in settings."
         )
 
-    api_key = img_settings.get("comfyui_api_key") or settings.image_generation.get("comfyui", {}).get("api_key", "")
-    timeout = settings.image_generation.get("comfyui", {}).get("timeout", 300)
+    comfyui_config = settings.image_generation.get("comfyui", {})
+    api_key = img_settings.get("comfyui_api_key") or comfyui_config.get("api_key", "")
 
     return ComfyUIProvider(
         server_url=server_url,
         api_key=api_key if api_key else None,
-        timeout=timeout,
+        timeout=comfyui_config.get("timeout", 300),
+        polling_interval=float(comfyui_config.get("polling_interval", 2)),
+        use_websocket=comfyui_config.get("use_websocket", True),
+        fallback_to_polling=comfyui_config.get("websocket_fallback_to_polling", True),
+        owner_id=user_settings.user_id,
     )
 
 
@@ -180,6 +215,119 @@ def get_storage_path() -> str:
     return storage_path
 
 
+async def store_image_derivatives(image_data: bytes, file_path: str, relative_dir: str) -> Dict[str, Any]:
+    """Content hash and WebP thumbnails of a freshly written image, for generation_params"""
+    params: Dict[str, Any] = {"content_hash": content_hash(image_data)}
+    config = settings.image_generation.get("derivatives", {})
+    if not config.get("enabled", True):
+        return params
+
+    written = await asyncio.to_thread(
+        create_derivatives,
+        image_data,
+        file_path,
+        config.get("sizes", [256, 512, 1024]),
+        int(config.get("quality", 80)),
+    )
+    if written:
+        params["derivatives"] = {
+            str(size): f"{relative_dir}/{os.path.basename(path)}" for size, path in written.items()
+        }
+    return params
+
+
+def smallest_derivative(params: Dict[str, Any]) -> Optional[str]:
+    derivatives = params.get("derivatives") or {}
+    return derivatives[min(derivatives, key=int)] if derivatives else None
+
+
+_signing_secret_warned = False
+
+
+def get_url_signing_secret() -> Optional[str]:
+    """Secret for nginx-signed image URLs, or None when signed mode is off"""
+    global _signing_secret_warned
+    if not settings.image_generation.get("serving", {}).get("signed_urls", False):
+        return None
+    if not settings.image_url_signing_secret:
+        if not _signing_secret_warned:
+            logger.warning("[IMAGES] serving.signed_urls is enabled but IMAGE_URL_SIGNING_SECRET is not set; using API URLs")
+            _signing_secret_warned = True
+        return None
+    return settings.image_url_signing_secret
+
+
+def image_response(img: GeneratedImage) -> ImageResponse:
+    """ImageResponse with cacheable URLs for the image and its thumbnails"""
+    params = img.generation_params or {}
+    derivatives = params.get("derivatives") or {}
+    secret = get_url_signing_secret()
+
+    if secret:
+        serving = settings.image_generation.get("serving", {})
+        prefix = serving.get("url_prefix", "/media/images/")
+        ttl = int(serving.get("url_ttl_seconds", 86400))
+        url = sign_url(img.file_path, secret, prefix, ttl)
+        thumbnails = {size: sign_url(path, secret, prefix, ttl) for size, path in derivatives.items()}
+    else:
+        # Images saved before content hashing have no versioned URL
+        version = params.get("content_hash")
+        url = f"/api/image-generation/images/{img.id}/file" + (f"/{version}" if version else "")
+        thumbnails = {size: f"{url}?size={size}" for size in derivatives}
+
+    return ImageResponse(
+        id=img.id,
+        story_id=img.story_id,
+        branch_id=img.branch_id,
+        scene_id=img.scene_id,
+        character_id=img.character_id,
+        image_type=img.image_type,
+        file_path=img.file_path,
+        thumbnail_path=img.thumbnail_path,
+        prompt=img.prompt,
+        width=img.width,
+        height=img.height,
+        created_at=img.created_at.isoformat() if img.created_at else "",
+        url=url,
+        thumbnail_url=thumbnails[min(thumbnails, key=int)] if thumbnails else url,
+        thumbnails=thumbnails,
+    )
+
+
+def get_image_for_user(db: Session, image_id: int, user_id: int) -> GeneratedImage:
+    """Load an image the user may see - through story or character ownership - in one query"""
+    row = db.query(GeneratedImage, Story.owner_id, Character.creator_id).outerjoin(
+        Story, Story.id == GeneratedImage.story_id
+    ).outerjoin(
+        Character, Character.id == GeneratedImage.character_id
+    ).filter(GeneratedImage.id == image_id).first()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+
+    image, story_owner_id, character_creator_id = row
+    if user_id not in (story_owner_id, character_creator_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    return image
+
+
+def remove_image_files(image: GeneratedImage) -> None:
+    """Delete an image file together with its thumbnails"""
+    storage_path = get_storage_path()
+    paths = {image.file_path, image.thumbnail_path}
+    paths.update(((image.generation_params or {}).get("derivatives") or {}).values())
+    for relative_path in filter(None, paths):
+        file_path = os.path.join(storage_path, relative_path)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
 async def save_generated_image(
     image_data: bytes,
     story_id: Optional[int],
@@ -214,6 +362,7 @@ async def save_generated_image(
 
     # Create relative path for database
     relative_path = f"{subdir}/{filename}"
+    generation_params = {**generation_params, **await store_image_derivatives(image_data, file_path, subdir)}
 
     # Create database record
     generated_image = GeneratedImage(
@@ -223,6 +372,7 @@ async def save_generated_image(
         character_id=character_id,
         image_type=image_type,
         file_path=relative_path,
+        thumbnail_path=smallest_derivative(generation_params),
         prompt=prompt,
         negative_prompt=generation_params.get("negative_prompt", ""),
         generation_params=generation_params,
@@ -238,6 +388,80 @@ async def save_generated_image(
     return generated_image
 
 
+def get_latest_scene_variant(db: Session, scene_id: int):
+    """The most recent variant of a scene (scene content lives in SceneVariant)"""
+    from ..models.scene_variant import SceneVariant
+
+    return db.query(SceneVariant).filter(
+        SceneVariant.scene_id == scene_id
+    ).order_by(SceneVariant.created_at.desc()).first()
+
+
+def get_scene_characters(db: Session, story_id: int, variant) -> List[Dict[str, str]]:
+    """Characters present in a scene variant, with appearance + background for the image prompt"""
+    characters = []
+    if not variant or not variant.characters_present:
+        return characters
+    for char_name in variant.characters_present:
+        sc = db.query(StoryCharacter).join(Character).filter(
+            StoryCharacter.story_id == story_id,
+            Character.name == char_name
+        ).first()
+        if sc:
+            char = db.query(Character).filter(Character.id == sc.character_id).first()
+            if char:
+                # Combine appearance + background for gender/ethnicity inference
+                appearance_parts = []
+                if char.background:
+                    appearance_parts.append(char.background)
+                if char.appearance:
+                    appearance_parts.append(char.appearance)
+                elif char.description:
+                    appearance_parts.append(char.description)
+                characters.append({
+                    "name": char.name,
+                    "appearance": ". ".join(appearance_parts) if appearance_parts else "no description"
+                })
+    return characters
+
+
+def create_prompt_generator(db: Session, user: User, story: Story):
+    """LLM image prompt generator with the user's story settings"""
+    from ..services.image_generation.prompt_generator import ImagePromptGenerator
+    from ..services.llm.service import UnifiedLLMService
+    from ..services.llm.prompts import PromptManager
+    from .story_helpers import get_or_create_user_settings
+
+    llm_user_settings = get_or_create_user_settings(user.id, db, user, story)
+    return ImagePromptGenerator(user.id, llm_user_settings, UnifiedLLMService(), PromptManager())
+
+
+async def build_scene_prompt(
+    prompt_gen,
+    scene_content: str,
+    characters: List[Dict[str, str]],
+    style: str,
+) -> str:
+    """Scene image prompt with the style suffix; falls back to the scene's opening text without an LLM"""
+    style_preset = get_style_preset(style)
+    if prompt_gen is not None:
+        try:
+            generated = await prompt_gen.generate_scene_prompt(
+                scene_content=scene_content,
+                characters=characters,
+                style_preset=style,
+            )
+            prompt = f"{generated}, {style_preset['prompt_suffix']}"
+            logger.info(f"[IMAGE_GEN] LLM-generated scene prompt: {prompt[:200]}...")
+            return prompt
+        except Exception as e:
+            logger.warning(f"[IMAGE_GEN] LLM prompt generation failed, using fallback: {e}")
+    scene_summary = scene_content[:200].strip()
+    if scene_summary and not scene_summary.endswith('.'):
+        scene_summary = scene_summary.rsplit(' ', 1)[0] + '...'
+    return f"{scene_summary}, {style_preset['prompt_suffix']}"
+
+
 # ============================================================================
 # Endpoints
 # ============================================================================
@@ -324,38 +548,95 @@ async def get_style_presets(
     return StylePresetsResponse(presets=presets)
 
 
-# In-memory job tracking (simple implementation for now)
-# In production, this should use Redis or database
-_generation_jobs: Dict[str, Dict[str, Any]] = {}
+def get_user_comfyui_listener(db: Session, user_id: int):
+    """The event listener of the user's ComfyUI server (job table and subscriptions)"""
+    provider = get_comfyui_provider(get_user_settings(db, user_id))
+    if provider.event_listener is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ComfyUI job events are disabled (image_generation.comfyui.use_websocket)"
+        )
+    return provider.event_listener
 
 
 @router.get("/status/{job_id}", response_model=GenerationJobResponse)
 async def get_job_status(
     job_id: str,
     current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ):
     """
     Get the status of a generation job.
 
-    Note: The current implementation uses synchronous generation,
-    so jobs complete immediately. This endpoint is provided for
-    API compatibility and future async implementation.
+    Answered from the job table kept up to date by the ComfyUI websocket
+    listener; no request goes to the ComfyUI server.
     """
-    # Check in-memory job store
-    if job_id in _generation_jobs:
-        job = _generation_jobs[job_id]
-        return GenerationJobResponse(
-            job_id=job_id,
-            status=job.get("status", "unknown"),
-            progress=job.get("progress", 0.0),
-            image_id=job.get("image_id"),
-            error=job.get("error"),
+    listener = get_user_comfyui_listener(db, current_user.id)
+    job = listener.jobs.get(job_id)
+    if job is None or job.owner_id != current_user.id:
+        # Unknown, someone else's, or finished longer ago than finished_job_ttl
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found or already completed"
         )
 
-    # Job not found - may have already completed or never existed
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail="Job not found or already completed"
+    return GenerationJobResponse(
+        job_id=job_id,
+        status=job.status.value,
+        progress=job.progress,
+        error=job.error_message,
+    )
+
+
+@router.get("/events")
+async def stream_generation_events(
+    job_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Server-sent events with the progress of the user's generation jobs.
+
+    Open it before starting a generation to follow it live: every status or
+    step change of any of the user's jobs is pushed as it arrives from
+    ComfyUI. With job_id, only that job is streamed and the stream ends when
+    it finishes.
+    """
+    listener = get_user_comfyui_listener(db, current_user.id)
+
+    async def event_generator():
+        # Subscribed inside the generator, so a client that disconnects at any
+        # point (even while the listener connects) is unsubscribed
+        queue = listener.subscribe(owner_id=current_user.id, job_id=job_id)
+        try:
+            await listener.ensure_connected()
+            # Current state first, so a late subscriber isn't blind until the next event
+            for job in list(listener.jobs.values()):
+                if job.owner_id == current_user.id and job_id in (None, job.prompt_id):
+                    yield f"data: {json.dumps(job.snapshot())}\n\n"
+                    if job_id is not None and job.finished:
+                        return
+            while True:
+                try:
+                    snapshot = await asyncio.wait_for(queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(snapshot)}\n\n"
+                if job_id is not None and snapshot["status"] in ("completed", "failed", "cancelled"):
+                    return
+        finally:
+            listener.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
     )
 
 
@@ -414,8 +695,8 @@ async def generate_character_portrait(
             checkpoint=checkpoint,
         )
 
-        # Generate and wait for result
-        result = await provider.generate_and_wait(gen_request)
+        # Generate and wait for result (shares the per-server slots with illustration batches)
+        result = await get_image_job_scheduler().generate(provider, gen_request)
         await provider.close()
 
         if not result.success or result.status != GenerationStatus.COMPLETED:
@@ -520,6 +801,7 @@ async def upload_character_portrait(
         f.write(image_data)
 
     relative_path = f"portraits/{filename}"
+    generation_params = await store_image_derivatives(image_data, file_path, "portraits")
 
     # Create database record - no story_id for default portraits
     generated_image = GeneratedImage(
@@ -528,7 +810,9 @@ async def upload_character_portrait(
         character_id=character_id,
         image_type="character_portrait",
         file_path=relative_path,
+        thumbnail_path=smallest_derivative(generation_params),
         prompt="Uploaded image",
+        generation_params=generation_params,
         provider="upload",
     )
 
@@ -585,10 +869,7 @@ async def delete_character_portrait(
 
     # Optionally delete the image file and record
     if image:
-        storage_path = get_storage_path()
-        file_path = os.path.join(storage_path, image.file_path)
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        remove_image_files(image)
 
         db.delete(image)
         db.commit()
@@ -638,12 +919,7 @@ async def generate_scene_image(
         )
 
     # Get scene content from variants (content is stored in SceneVariant, not Scene)
-    from ..models.scene_variant import SceneVariant
-
-    # Get the most recent variant for this scene
-    variant = db.query(SceneVariant).filter(
-        SceneVariant.scene_id == scene_id
-    ).order_by(SceneVariant.created_at.desc()).first()
+    variant = get_latest_scene_variant(db, scene_id)
 
     scene_content = variant.content if variant else ""
     if not scene_content:
@@ -660,53 +936,12 @@ async def generate_scene_image(
     else:
         # Use LLM to generate an optimized image prompt from scene content
         try:
-            from ..services.image_generation.prompt_generator import ImagePromptGenerator
-            from ..services.llm.service import UnifiedLLMService
-            from ..services.llm.prompts import PromptManager
-            from .story_helpers import get_or_create_user_settings
-
-            llm_service = UnifiedLLMService()
-            prompt_manager = PromptManager()
-            llm_user_settings = get_or_create_user_settings(current_user.id, db, current_user, story)
-            prompt_gen = ImagePromptGenerator(current_user.id, llm_user_settings, llm_service, prompt_manager)
-
-            # Get characters with appearances + background for richer prompt
-            characters = []
-            if variant and variant.characters_present:
-                for char_name in variant.characters_present:
-                    sc = db.query(StoryCharacter).join(Character).filter(
-                        StoryCharacter.story_id == scene.story_id,
-                        Character.name == char_name
-                    ).first()
-                    if sc:
-                        char = db.query(Character).filter(Character.id == sc.character_id).first()
-                        if char:
-                            # Combine appearance + background for gender/ethnicity inference
-                            appearance_parts = []
-                            if char.background:
-                                appearance_parts.append(char.background)
-                            if char.appearance:
-                                appearance_parts.append(char.appearance)
-                            elif char.description:
-                                appearance_parts.append(char.description)
-                            characters.append({
-                                "name": char.name,
-                                "appearance": ". ".join(appearance_parts) if appearance_parts else "no description"
-                            })
-
-            generated = await prompt_gen.generate_scene_prompt(
-                scene_content=scene_content,
-                characters=characters,
-                style_preset=request.style,
-            )
-            prompt = f"{generated}, {style_preset['prompt_suffix']}"
-            logger.info(f"[IMAGE_GEN] LLM-generated scene prompt: {prompt[:200]}...")
+            prompt_gen = create_prompt_generator(db, current_user, story)
         except Exception as e:
-            logger.warning(f"[IMAGE_GEN] LLM prompt generation failed, using fallback: {e}")
-            scene_summary = scene_content[:200].strip()
-            if scene_summary and not scene_summary.endswith('.'):
-                scene_summary = scene_summary.rsplit(' ', 1)[0] + '...'
-            prompt = f"{scene_summary}, {style_preset['prompt_suffix']}"
+            logger.warning(f"[IMAGE_GEN] Could not set up LLM prompt generation: {e}")
+            prompt_gen = None
+        characters = get_scene_characters(db, scene.story_id, variant)
+        prompt = await build_scene_prompt(prompt_gen, scene_content, characters, request.style)
 
     negative_prompt = style_preset["negative_prompt"]
 
@@ -729,8 +964,8 @@ async def generate_scene_image(
             checkpoint=checkpoint,
         )
 
-        # Generate and wait for result
-        result = await provider.generate_and_wait(gen_request)
+        # Generate and wait for result (shares the per-server slots with illustration batches)
+        result = await get_image_job_scheduler().generate(provider, gen_request)
         await provider.close()
 
         if not result.success or result.status != GenerationStatus.COMPLETED:
@@ -950,7 +1185,7 @@ async def generate_character_image(
             checkpoint=checkpoint,
         )
 
-        result = await provider.generate_and_wait(gen_request)
+        result = await get_image_job_scheduler().generate(provider, gen_request)
         await provider.close()
 
         if not result.success or result.status != GenerationStatus.COMPLETED:
@@ -1002,6 +1237,243 @@ async def generate_character_image(
         )
 
 
+# ============================================================================
+# Batch Illustration
+# ============================================================================
+
+ILLUSTRATION_JOB_TYPE = "scene_illustrations"
+
+
+async def run_scene_illustrations(
+    batch_id: str,
+    story_id: int,
+    user_id: int,
+    scene_ids: List[int],
+    style: str = "illustrated",
+    checkpoint: Optional[str] = None,
+    width: int = 1024,
+    height: int = 1024,
+    steps: int = 4,
+    cfg_scale: float = 1.5,
+    seed: Optional[int] = None,
+    **kwargs,
+):
+    """
+    Illustrate a list of scenes (background job queued by /story/{story_id}/illustrate).
+
+    Prompts for all scenes are generated concurrently, then every image is
+    submitted through the image job scheduler, which keeps at most
+    max_concurrent_per_server jobs on the ComfyUI server and submits identical
+    prompt/seed combinations once. Scenes this batch has already illustrated
+    are skipped, so a re-run after a restart or a failed attempt only does the
+    rest.
+    """
+    from ..database import SessionLocal
+    from ..services.job_queue import report_job_progress
+
+    scheduler = get_image_job_scheduler()
+    # Short sessions only: generating a batch takes minutes, and the pool is
+    # shared with the request handlers.
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.id == user_id).first()
+        story = db.query(Story).filter(Story.id == story_id, Story.owner_id == user_id).first()
+        if user is None or story is None:
+            logger.info(f"[IMAGE_GEN] Story {story_id} no longer exists, dropping illustration batch {batch_id}")
+            return
+
+        already_done = {
+            image.scene_id
+            for image in db.query(GeneratedImage).filter(
+                GeneratedImage.scene_id.in_(scene_ids),
+                GeneratedImage.image_type == "scene",
+            ).all()
+            if (image.generation_params or {}).get("batch_id") == batch_id
+        }
+        order = {scene_id: index for index, scene_id in enumerate(scene_ids)}
+        pending = []
+        for scene in sorted(
+            db.query(Scene).filter(Scene.id.in_(scene_ids), Scene.story_id == story_id).all(),
+            key=lambda sc: order[sc.id],
+        ):
+            if scene.id in already_done:
+                continue
+            variant = get_latest_scene_variant(db, scene.id)
+            if variant and variant.content:
+                pending.append((scene.id, scene.branch_id, variant.content, get_scene_characters(db, story_id, variant)))
+
+        progress = {"stage": "prompts", "total": len(scene_ids), "done": len(already_done), "failed": 0, "image_ids": []}
+        if not pending:
+            await report_job_progress({**progress, "stage": "done"})
+            return
+
+        user_settings = get_user_settings(db, user_id)
+        provider = get_comfyui_provider(user_settings)
+        img_settings = user_settings._get_image_generation_settings()
+        checkpoint = checkpoint or img_settings.get("comfyui_checkpoint") or None
+        negative_prompt = get_style_preset(style)["negative_prompt"]
+        try:
+            prompt_gen = create_prompt_generator(db, user, story)
+        except Exception as e:
+            logger.warning(f"[IMAGE_GEN] Could not set up LLM prompt generation: {e}")
+            prompt_gen = None
+
+    try:
+        await report_job_progress(progress)
+        prompts = await scheduler.map_prompts([
+            (lambda content=content, characters=characters: build_scene_prompt(prompt_gen, content, characters, style))
+            for _, _, content, characters in pending
+        ])
+
+        async def illustrate(scene_id, branch_id, prompt):
+            gen_request = GenerationRequest(
+                prompt=prompt,
+                negative_prompt=negative_prompt,
+                width=width,
+                height=height,
+                steps=steps,
+                cfg_scale=cfg_scale,
+                seed=seed,
+                checkpoint=checkpoint,
+            )
+            try:
+                result = await scheduler.generate(provider, gen_request, priority=PRIORITY_BATCH)
+            except Exception as e:
+                logger.error(f"[IMAGE_GEN] Illustration of scene {scene_id} failed: {e}")
+                result = None
+            return scene_id, branch_id, prompt, result
+
+        progress["stage"] = "generating"
+        await report_job_progress(progress)
+        for finished in asyncio.as_completed([
+            illustrate(scene_id, branch_id, prompt)
+            for (scene_id, branch_id, _, _), prompt in zip(pending, prompts)
+        ]):
+            scene_id, branch_id, prompt, result = await finished
+            if result is None or result.status != GenerationStatus.COMPLETED or not result.image_data:
+                progress["failed"] += 1
+                if result is not None:
+                    logger.warning(f"[IMAGE_GEN] Illustration of scene {scene_id} failed: {result.error_message}")
+            else:
+                with SessionLocal() as db:
+                    generated_image = await save_generated_image(
+                        image_data=result.image_data,
+                        story_id=story_id,
+                        image_type="scene",
+                        prompt=prompt,
+                        generation_params={
+                            "width": width,
+                            "height": height,
+                            "steps": steps,
+                            "cfg_scale": cfg_scale,
+                            "checkpoint": checkpoint,
+                            "style": style,
+                            "negative_prompt": negative_prompt,
+                            "seed": seed,
+                            "batch_id": batch_id,
+                        },
+                        db=db,
+                        branch_id=branch_id,
+                        scene_id=scene_id,
+                    )
+                    image_id = generated_image.id
+                progress["done"] += 1
+                progress["image_ids"].append(image_id)
+            await report_job_progress(progress)
+    finally:
+        await provider.close()
+
+    logger.info(
+        f"[IMAGE_GEN] Illustration batch {batch_id}: {progress['done']}/{progress['total']} scenes, "
+        f"{progress['failed']} failed"
+    )
+    if progress["failed"]:
+        # Retried by the job queue; illustrated scenes are skipped on the next attempt
+        raise RuntimeError(f"{progress['failed']} of {len(pending)} scene illustrations failed")
+
+
+register_job_handler(ILLUSTRATION_JOB_TYPE, run_scene_illustrations)
+
+
+@router.post("/story/{story_id}/illustrate", response_model=IllustrationBatchResponse)
+async def illustrate_story(
+    story_id: int,
+    request: IllustrateStoryRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Illustrate every scene of a chapter, or of the story's current branch.
+
+    Runs as a background job: it shows up with the story's background jobs
+    (progress: done / failed / image_ids), survives restarts, and requesting
+    the same chapter again while it is still queued updates that job. Live
+    progress of the individual images is on /events.
+    """
+    story = db.query(Story).filter(
+        Story.id == story_id,
+        Story.owner_id == current_user.id
+    ).first()
+    if not story:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Story not found"
+        )
+
+    query = db.query(Scene).filter(Scene.story_id == story_id, Scene.is_deleted == False)  # noqa: E712
+    if story.current_branch_id:
+        query = query.filter(Scene.branch_id == story.current_branch_id)
+    if request.chapter_id is not None:
+        chapter = db.query(Chapter).filter(Chapter.id == request.chapter_id, Chapter.story_id == story_id).first()
+        if not chapter:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Chapter not found"
+            )
+        query = query.filter(Scene.chapter_id == request.chapter_id)
+    scene_ids = [scene.id for scene in query.order_by(Scene.sequence_number).all()]
+
+    if request.skip_illustrated and scene_ids:
+        illustrated = {
+            scene_id for (scene_id,) in db.query(GeneratedImage.scene_id).filter(
+                GeneratedImage.scene_id.in_(scene_ids),
+                GeneratedImage.image_type == "scene",
+            ).distinct()
+        }
+        scene_ids = [scene_id for scene_id in scene_ids if scene_id not in illustrated]
+
+    if not scene_ids:
+        return IllustrationBatchResponse()
+
+    batch_id = uuid.uuid4().hex
+    payload = {
+        "batch_id": batch_id,
+        "story_id": story_id,
+        "user_id": current_user.id,
+        "scene_ids": scene_ids,
+        "style": request.style,
+        "checkpoint": request.checkpoint,
+        "width": request.width,
+        "height": request.height,
+        "steps": request.steps,
+        "cfg_scale": request.cfg_scale,
+        "seed": request.seed,
+    }
+    job_id = await submit_job(
+        ILLUSTRATION_JOB_TYPE,
+        payload,
+        priority=PRIORITY_BACKFILL,
+        coalesce_key=f"illustrate:{story_id}:{request.chapter_id or 'story'}",
+    )
+    logger.info(f"[IMAGE_GEN] Queued illustration of {len(scene_ids)} scenes for story {story_id} (job {job_id})")
+
+    return IllustrationBatchResponse(
+        job_id=job_id,
+        batch_id=batch_id,
+        scene_count=len(scene_ids),
+        queued=job_id is not None,
+    )
+
+
 @router.get("/story/{story_id}/images", response_model=List[ImageResponse])
 async def get_story_images(
     story_id: int,
@@ -1038,23 +1510,7 @@ async def get_story_images(
 
     images = query.order_by(GeneratedImage.created_at.desc()).all()
 
-    return [
-        ImageResponse(
-            id=img.id,
-            story_id=img.story_id,
-            branch_id=img.branch_id,
-            scene_id=img.scene_id,
-            character_id=img.character_id,
-            image_type=img.image_type,
-            file_path=img.file_path,
-            thumbnail_path=img.thumbnail_path,
-            prompt=img.prompt,
-            width=img.width,
-            height=img.height,
-            created_at=img.created_at.isoformat() if img.created_at else "",
-        )
-        for img in images
-    ]
+    return [image_response(img) for img in images]
 
 
 @router.get("/story/{story_id}/portraits", response_model=List[ImageResponse])
@@ -1102,23 +1558,7 @@ async def get_story_character_portraits(
         )
     ).order_by(GeneratedImage.created_at.desc()).all()
 
-    return [
-        ImageResponse(
-            id=img.id,
-            story_id=img.story_id,
-            branch_id=img.branch_id,
-            scene_id=img.scene_id,
-            character_id=img.character_id,
-            image_type=img.image_type,
-            file_path=img.file_path,
-            thumbnail_path=img.thumbnail_path,
-            prompt=img.prompt,
-            width=img.width,
-            height=img.height,
-            created_at=img.created_at.isoformat() if img.created_at else "",
-        )
-        for img in images
-    ]
+    return [image_response(img) for img in images]
 
 
 @router.get("/images/{image_id}", response_model=ImageResponse)
@@ -1130,108 +1570,71 @@ async def get_image_details(
     """
     Get image metadata by ID.
     """
-    # Get the image record
-    image = db.query(GeneratedImage).filter(GeneratedImage.id == image_id).first()
+    image = get_image_for_user(db, image_id, current_user.id)
+    return image_response(image)
 
-    if not image:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Image not found"
-        )
-
-    # Verify access - either through story ownership or character ownership
-    has_access = False
 
-    if image.story_id:
-        # Story-based image - verify user owns the story
-        story = db.query(Story).filter(
-            Story.id == image.story_id,
-            Story.owner_id == current_user.id
-        ).first()
-        has_access = story is not None
+def serve_image_file(request: Request, image: GeneratedImage, size: Optional[int], cache_control: str):
+    """File response for an image, or its smallest thumbnail of at least `size` pixels"""
+    params = image.generation_params or {}
+    version = params.get("content_hash")
+    relative_path, media_type, etag = image.file_path, None, version
 
-    if not has_access and image.character_id:
-        # Character portrait - verify user owns the character
-        character = db.query(Character).filter(
-            Character.id == image.character_id,
-            Character.creator_id == current_user.id
-        ).first()
-        has_access = character is not None
+    derivative = pick_derivative(params.get("derivatives"), size)
+    if derivative:
+        chosen_size, relative_path = derivative
+        media_type = "image/webp"
+        etag = f"{version}-w{chosen_size}" if version else None
 
-    if not has_access:
+    file_path = os.path.join(get_storage_path(), relative_path)
+    if not os.path.exists(file_path):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image file not found"
         )
 
-    return ImageResponse(
-        id=image.id,
-        story_id=image.story_id,
-        branch_id=image.branch_id,
-        scene_id=image.scene_id,
-        character_id=image.character_id,
-        image_type=image.image_type,
-        file_path=image.file_path,
-        thumbnail_path=image.thumbnail_path,
-        prompt=image.prompt,
-        width=image.width,
-        height=image.height,
-        created_at=image.created_at.isoformat() if image.created_at else "",
-    )
+    media_type = media_type or mimetypes.guess_type(file_path)[0] or "image/png"
+    return file_response(request, file_path, media_type, etag=etag, cache_control=cache_control)
 
 
 @router.get("/images/{image_id}/file")
 async def get_image_file(
     image_id: int,
+    request: Request,
+    size: Optional[int] = Query(None, gt=0, description="Serve the smallest thumbnail with at least this longest edge"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     Get an image file by ID. Requires authentication.
-    """
-    # Get the image record
-    image = db.query(GeneratedImage).filter(GeneratedImage.id == image_id).first()
-
-    if not image:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Image not found"
-        )
-
-    # Verify access - either through story ownership or character ownership
-    has_access = False
-
-    if image.story_id:
-        story = db.query(Story).filter(
-            Story.id == image.story_id,
-            Story.owner_id == current_user.id
-        ).first()
-        has_access = story is not None
 
-    if not has_access and image.character_id:
-        character = db.query(Character).filter(
-            Character.id == image.character_id,
-            Character.creator_id == current_user.id
-        ).first()
-        has_access = character is not None
+    Revalidated on every use (ETag); prefer the versioned URL from ImageResponse.url.
+    """
+    image = get_image_for_user(db, image_id, current_user.id)
+    return serve_image_file(request, image, size, "private, no-cache")
 
-    if not has_access:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
 
-    # Get the file path
-    storage_path = get_storage_path()
-    file_path = os.path.join(storage_path, image.file_path)
+@router.get("/images/{image_id}/file/{version}")
+async def get_versioned_image_file(
+    image_id: int,
+    version: str,
+    request: Request,
+    size: Optional[int] = Query(None, gt=0, description="Serve the smallest thumbnail with at least this longest edge"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get an image file by ID and content hash. Requires authentication.
 
-    if not os.path.exists(file_path):
+    The bytes behind this URL never change, so browsers cache it as immutable.
+    """
+    image = get_image_for_user(db, image_id, current_user.id)
+    if (image.generation_params or {}).get("content_hash") != version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Image file not found"
+            detail="Image version not found"
         )
-
-    return FileResponse(file_path, media_type="image/png")
+    return serve_image_file(request, image, size, "private, max-age=31536000, immutable")
 
 
 @router.delete("/images/{image_id}")
@@ -1273,16 +1676,8 @@ async def delete_image(
         if character:
             character.portrait_image_id = None
 
-    # Delete the file
-    storage_path = get_storage_path()
-    file_path = os.path.join(storage_path, image.file_path)
-    if os.path.exists(file_path):
-        os.remove(file_path)
-
-    if image.thumbnail_path:
-        thumb_path = os.path.join(storage_path, image.thumbnail_path)
-        if os.path.exists(thumb_path):
-            os.remove(thumb_path)
+    # Delete the file and its thumbnails
+    remove_image_files(image)
 
     # Delete the database record
     db.delete(image)
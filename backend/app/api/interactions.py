@@ -6,6 +6,7 @@ deletion, extraction progress, and retroactive extraction.
 Extracted from stories.py for better organization.
 """
 
+import asyncio
 import logging
 import os
 from typing import Optional
@@ -16,6 +17,7 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import Story, User
 from ..api.auth import get_current_user
+from ..services.job_queue import get_job_queue
 from .story_tasks import (
     extraction_progress_store,
     scene_event_extraction_progress_store,
@@ -261,6 +263,38 @@ async def get_extraction_progress(
     }
 
 
+@router.get("/{story_id}/background-jobs")
+async def get_background_jobs(
+    story_id: int,
+    active_only: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get queued, running and recently finished background jobs for a story.
+
+    Pending jobs include their position in the queue; running jobs include
+    the progress their handler reported.
+    """
+    story = db.query(Story).filter(
+        Story.id == story_id,
+        Story.owner_id == current_user.id
+    ).first()
+
+    if not story:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Story not found"
+        )
+
+    queue = get_job_queue()
+    jobs = await asyncio.to_thread(queue.list_jobs, story_id, not active_only)
+    return {
+        "queue_enabled": queue.enabled and queue.running,
+        "jobs": jobs,
+    }
+
+
 @router.post("/{story_id}/extract-interactions")
 async def extract_interactions_retroactively(
     story_id: int,
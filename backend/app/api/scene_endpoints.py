@@ -21,6 +21,9 @@ from ..models import (
     Story, Scene, User, SceneChoice, SceneVariant, StoryFlow, Chapter, ChapterStatus
 )
 from ..services.llm.service import UnifiedLLMService
+from ..services.job_queue import submit_job
+from ..services.llm.fused_extraction import fused_extraction_enabled
+from ..services.llm.health_prober import get_health_prober
 from ..services.llm import LLMConnectionError
 from ..dependencies import get_current_user
 
@@ -41,10 +44,6 @@ from .story_tasks import (
     mark_scene_generation_start,
     mark_scene_generation_end,
     force_release_scene_generation_lock,
-    run_extractions_in_background,
-    run_plot_extraction_in_background,
-    run_scene_event_extraction_for_scene_in_background,
-    run_chronicle_extraction_in_background,
     update_working_memory_in_background,
     run_inline_entity_extraction_background,
     run_chapter_summary_background,
@@ -775,10 +774,10 @@ async def generate_scene_streaming_endpoint(
                 thinking_content = ""
                 is_thinking = False
 
-                # Quick health check before starting generation
+                # Cached endpoint health (background prober) before starting generation
                 try:
                     client = llm_service.get_user_client(current_user.id, user_settings)
-                    is_healthy, health_msg = await client.check_health(timeout=3.0)
+                    is_healthy, health_msg = await get_health_prober().check(client)
                     if not is_healthy:
                         logger.error(f"[SCENE STREAM] LLM health check failed: {health_msg}")
                         _emit({'type': 'error', 'message': f'LLM server unavailable: {health_msg}'})
@@ -1410,6 +1409,9 @@ async def generate_scene_streaming_endpoint(
                     logger.error(f"[AUTO-SUMMARY] Failed to start background summary generation: {e}")
                     # Don't fail scene generation if summary fails
 
+            use_fused_extraction = fused_extraction_enabled(user_settings or {})
+            fuse_inline_check = False
+
             # Run extractions synchronously - no background tasks
             if active_chapter:
                 try:
@@ -1447,8 +1449,13 @@ async def generate_scene_streaming_endpoint(
                         logger.debug(f"[EXTRACTION] Chapter {active_chapter.id} has {len(scenes_in_chapter)} scenes (sequences {min(scene_sequence_numbers)} to {max_sequence_in_chapter}), last extracted: {last_extraction_sequence}")
 
                         # === INLINE CONTRADICTION CHECK (if enabled) ===
-                        # Uses FastAPI background_tasks for sequential execution with other LLM tasks
-                        if enable_inline_check:
+                        # Uses FastAPI background_tasks for sequential execution with other LLM tasks.
+                        # In fused mode the entity states ride along with the per-scene event
+                        # extraction below instead of making their own LLM call.
+                        if enable_inline_check and use_fused_extraction:
+                            fuse_inline_check = True
+                            _emit({'type': 'contradiction_check', 'status': 'scheduled'})
+                        elif enable_inline_check:
                             logger.debug(f"[INLINE_CHECK] Scheduling background entity extraction for contradiction check")
                             _emit({'type': 'contradiction_check', 'status': 'scheduled'})
 
@@ -1475,20 +1482,21 @@ async def generate_scene_streaming_endpoint(
                         if scenes_since_extraction >= extraction_threshold:
                             logger.info(f"[EXTRACTION] Scheduled: threshold reached ({scenes_since_extraction}/{extraction_threshold})")
 
-                            # Deferred until TTS segment extraction releases the LLM queue.
-                            asyncio.create_task(_defer_until_tts_segment_done(
-                                variant.id,
-                                run_extractions_in_background(
-                                    story_id=story_id,
-                                    chapter_id=active_chapter.id,
-                                    from_sequence=last_extraction_sequence,
-                                    to_sequence=max_sequence_in_chapter,
-                                    user_id=current_user.id,
-                                    user_settings=user_settings or {},
-                                    scene_generation_context=context,
-                                    skip_entity_states=enable_inline_check,
-                                ),
-                            ))
+                            # Queued; the job waits for TTS segment extraction to release the LLM queue.
+                            await submit_job(
+                                "scene_extractions",
+                                {
+                                    "story_id": story_id,
+                                    "chapter_id": active_chapter.id,
+                                    "from_sequence": last_extraction_sequence,
+                                    "to_sequence": max_sequence_in_chapter,
+                                    "user_id": current_user.id,
+                                    "skip_entity_states": enable_inline_check,
+                                    "defer_variant_id": variant.id,
+                                },
+                                coalesce_key=f"scene_extractions:chapter:{active_chapter.id}",
+                                extras={"user_settings": user_settings or {}, "scene_generation_context": context},
+                            )
 
                             # Send status event with clear message
                             extraction_msg = f"Extracting ({scenes_since_extraction}/{extraction_threshold})"
@@ -1545,19 +1553,20 @@ async def generate_scene_streaming_endpoint(
                             if scenes_since_plot_extraction >= plot_extraction_threshold:
                                 logger.info(f"[PLOT_EXTRACTION] Scheduled: threshold reached ({scenes_since_plot_extraction}/{plot_extraction_threshold})")
 
-                                # Deferred until TTS segment extraction releases the LLM queue.
-                                asyncio.create_task(_defer_until_tts_segment_done(
-                                    variant.id,
-                                    run_plot_extraction_in_background(
-                                        story_id=story_id,
-                                        chapter_id=active_chapter.id,
-                                        from_sequence=last_plot_extraction_sequence,
-                                        to_sequence=max_sequence_in_chapter,
-                                        user_id=current_user.id,
-                                        user_settings=user_settings or {},
-                                        scene_generation_context=context,
-                                    ),
-                                ))
+                                # Queued; the job waits for TTS segment extraction to release the LLM queue.
+                                await submit_job(
+                                    "plot_extraction",
+                                    {
+                                        "story_id": story_id,
+                                        "chapter_id": active_chapter.id,
+                                        "from_sequence": last_plot_extraction_sequence,
+                                        "to_sequence": max_sequence_in_chapter,
+                                        "user_id": current_user.id,
+                                        "defer_variant_id": variant.id,
+                                    },
+                                    coalesce_key=f"plot_extraction:chapter:{active_chapter.id}",
+                                    extras={"user_settings": user_settings or {}, "scene_generation_context": context},
+                                )
 
                                 # Send status event
                                 plot_msg = f"Plot tracking ({scenes_since_plot_extraction}/{plot_extraction_threshold})"
@@ -1578,19 +1587,45 @@ async def generate_scene_streaming_endpoint(
             # and use_cache_friendly_prompts user settings.
             try:
                 logger.info(f"[SCENE_EVENT] Scheduling per-scene event extraction for scene {scene.sequence_number}")
-                asyncio.create_task(_defer_until_tts_segment_done(
-                    variant.id,
-                    run_scene_event_extraction_for_scene_in_background(
-                        story_id=story_id,
-                        scene_id=scene.id,
-                        scene_sequence=scene.sequence_number,
-                        chapter_id=active_chapter.id if active_chapter else None,
-                        branch_id=active_branch_id,
-                        user_id=current_user.id,
-                        user_settings=user_settings or {},
-                        scene_generation_context=context.copy() if context else {},
-                    ),
-                ))
+                # Only the inline check's entity states share this call; without it
+                # there is nothing to fuse and the plain job makes the same single call.
+                if fuse_inline_check:
+                    await submit_job(
+                        "fused_scene_extraction",
+                        {
+                            "story_id": story_id,
+                            "scene_id": scene.id,
+                            "scene_sequence": scene.sequence_number,
+                            "chapter_id": active_chapter.id if active_chapter else None,
+                            "branch_id": active_branch_id,
+                            "user_id": current_user.id,
+                            "include_entity_states": fuse_inline_check,
+                            "defer_variant_id": variant.id,
+                        },
+                        coalesce_key=f"fused_scene_extraction:scene:{scene.id}",
+                        extras={
+                            "user_settings": user_settings or {},
+                            "scene_generation_context": context.copy() if context else {},
+                        },
+                    )
+                else:
+                    await submit_job(
+                        "scene_event_extraction",
+                        {
+                            "story_id": story_id,
+                            "scene_id": scene.id,
+                            "scene_sequence": scene.sequence_number,
+                            "chapter_id": active_chapter.id if active_chapter else None,
+                            "branch_id": active_branch_id,
+                            "user_id": current_user.id,
+                            "defer_variant_id": variant.id,
+                        },
+                        coalesce_key=f"scene_event_extraction:scene:{scene.id}",
+                        extras={
+                            "user_settings": user_settings or {},
+                            "scene_generation_context": context.copy() if context else {},
+                        },
+                    )
             except Exception as e:
                 logger.error(f"[SCENE_EVENT] Failed to schedule per-scene extraction: {e}")
                 import traceback
@@ -1618,19 +1653,20 @@ async def generate_scene_streaming_endpoint(
                     if scenes_since_chronicle >= chronicle_threshold:
                         max_seq_chapter = max(chronicle_scene_seqs) if chronicle_scene_seqs else 0
                         logger.info(f"[CHRONICLE] Scheduled: threshold reached ({scenes_since_chronicle}/{chronicle_threshold})")
-                        # Deferred until TTS segment extraction releases the LLM queue.
-                        asyncio.create_task(_defer_until_tts_segment_done(
-                            variant.id,
-                            run_chronicle_extraction_in_background(
-                                story_id=story_id,
-                                chapter_id=active_chapter.id,
-                                from_sequence=last_chronicle_seq,
-                                to_sequence=max_seq_chapter,
-                                user_id=current_user.id,
-                                user_settings=user_settings or {},
-                                scene_generation_context=context,
-                            ),
-                        ))
+                        # Queued; the job waits for TTS segment extraction to release the LLM queue.
+                        await submit_job(
+                            "chronicle_extraction",
+                            {
+                                "story_id": story_id,
+                                "chapter_id": active_chapter.id,
+                                "from_sequence": last_chronicle_seq,
+                                "to_sequence": max_seq_chapter,
+                                "user_id": current_user.id,
+                                "defer_variant_id": variant.id,
+                            },
+                            coalesce_key=f"chronicle_extraction:chapter:{active_chapter.id}",
+                            extras={"user_settings": user_settings or {}, "scene_generation_context": context},
+                        )
                         _emit({'type': 'chronicle_status', 'status': 'scheduled'})
                     else:
                         logger.info(f"[CHRONICLE] Skipped ({scenes_since_chronicle}/{chronicle_threshold})")
@@ -53,6 +53,8 @@ PROVIDER_REGISTRY = {
 EMBEDDING_PROVIDER_REGISTRY = {
     # Local sentence-transformers (no API needed)
     "local": {"label": "Local (sentence-transformers)", "category": "local", "base_url": None, "models_path": None},
+    # Shared embedding worker process (app/services/embedding_worker.py) — user provides URL
+    "worker": {"label": "Shared Embedding Worker", "category": "local", "base_url": None, "models_path": None},
     # Cloud providers with embedding support (verified via LiteLLM docs)
     "openai": {"label": "OpenAI", "category": "cloud", "base_url": "https://api.openai.com/v1", "models_path": "/models"},
     "mistral": {"label": "Mistral AI", "category": "cloud", "base_url": "https://api.mistral.ai/v1", "models_path": "/models"},
@@ -1072,6 +1074,19 @@ async def test_embedding_model(
                 "dimensions": dimensions,
                 "message": f"Local model loaded. Dimension: {dimensions}"
             }
+        elif request.provider == "worker":
+            from ..services.embedding_worker import EmbeddingWorkerClient
+            client = EmbeddingWorkerClient(request.api_url or settings.semantic_worker.get('url'))
+            try:
+                embeddings = await client.embed(["test embedding dimension detection"])
+            finally:
+                await client.close()
+            dimensions = int(embeddings.shape[1])
+            return {
+                "success": True,
+                "dimensions": dimensions,
+                "message": f"Embedding worker reachable. Dimension: {dimensions}"
+            }
         else:
             import litellm
             litellm_model, api_base = _resolve_embedding_litellm_args(
@@ -1435,6 +1450,45 @@ async def get_available_models(
             "message": f"Failed to fetch models: {str(e)}"
         }
 
+@router.get("/llm-health-status")
+async def get_llm_health_status(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Health of the user's main and extraction LLM endpoints.
+
+    Served from the background health prober's cached state (healthy,
+    degraded, down), including the last probe latency; an endpoint is probed
+    inline only the first time it is seen.
+    """
+    from .story_helpers import get_or_create_user_settings
+    from ..services.llm.extraction_service import ExtractionLLMService
+    from ..services.llm.health_prober import get_health_prober
+
+    user_settings = get_or_create_user_settings(current_user.id, db, current_user)
+    prober = get_health_prober()
+    endpoints: Dict[str, Any] = {"main": None, "extraction": None}
+
+    try:
+        client = llm_service.get_user_client(current_user.id, user_settings)
+        await prober.check(client)
+        endpoints["main"] = prober.get_status(client)
+    except ValueError as e:
+        endpoints["main"] = {"state": "unconfigured", "message": str(e)}
+
+    if user_settings.get('extraction_model_settings', {}).get('enabled', False):
+        ext_service = ExtractionLLMService.from_settings(user_settings)
+        if ext_service:
+            await prober.check(ext_service)
+            endpoints["extraction"] = prober.get_status(ext_service)
+
+    checked = [status for status in endpoints.values() if status]
+    return {
+        **endpoints,
+        "healthy": all(status["state"] in ("healthy", "degraded") for status in checked),
+    }
+
 @router.get("/stt-model-status")
 async def get_stt_model_status(
     current_user: User = Depends(get_current_user),
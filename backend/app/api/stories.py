@@ -8,6 +8,7 @@ from ..models import Story, Scene, Character, StoryCharacter, User, UserSettings
 from ..services.llm.service import UnifiedLLMService
 from sqlalchemy.sql import func
 from ..services.context_manager import ContextManager
+from ..services.context_cache import invalidate_scene_context, invalidate_story_context
 from ..dependencies import get_current_user
 from ..config import settings
 import logging
@@ -1064,6 +1065,10 @@ async def delete_scenes_from_sequence(
                 detail="Failed to delete scenes"
             )
 
+        # Drop cached scene content for the deleted scenes
+        for deleted_scene_id in scene_ids_to_cleanup:
+            invalidate_scene_context(story_id, deleted_scene_id)
+
         # Phase 5: Schedule ALL cleanup/restoration tasks concurrently using asyncio.create_task
         # Using create_task instead of BackgroundTasks.add_task to run tasks concurrently
         # This prevents connection pool exhaustion from sequential task execution
@@ -1172,6 +1177,7 @@ async def delete_story(
             detail=f"Failed to delete story: {str(e)}"
         )
 
+    invalidate_story_context(story_id)
     logger.info(f"[DELETE] Successfully deleted story {story_id}")
 
     return {
@@ -19,6 +19,7 @@ from ..models import (
     Chapter, CharacterState, LocationState, ObjectState
 )
 from ..services.llm.service import UnifiedLLMService
+from ..services.context_cache import invalidate_scene_context
 from ..config import settings
 
 logger = logging.getLogger(__name__)
@@ -480,6 +481,9 @@ async def invalidate_extractions_for_scene(
        last_chronicle_scene_count) so the next threshold sweep re-extracts.
     2. Invalidates entity state batches containing the scene.
     """
+    # Drop cached formatted content/token count for the scene (see context_cache)
+    invalidate_scene_context(story_id, scene_id)
+
     try:
         from ..services.semantic_integration import cleanup_scene_embeddings
         from ..services.entity_state_service import EntityStateService
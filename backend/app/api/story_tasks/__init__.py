@@ -44,6 +44,7 @@ from .background_tasks import (
     run_scene_event_extraction_background,
     run_scene_event_extraction_for_scene_in_background,
     run_chronicle_extraction_in_background,
+    run_fused_scene_extraction_in_background,
 )
 
 __all__ = [
@@ -86,4 +87,5 @@ __all__ = [
     'run_scene_event_extraction_background',
     'run_scene_event_extraction_for_scene_in_background',
     'run_chronicle_extraction_in_background',
+    'run_fused_scene_extraction_in_background',
 ]
@@ -19,6 +19,9 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from ...database import SessionLocal, get_background_db
+from ...services.job_queue import get_job_queue, in_queued_job, register_job_handler, report_job_progress
+from ...services.llm import LLMConnectionError
+from ...services.llm.health_prober import get_health_prober
 from ...models import (
     Chapter, Scene, StoryFlow, SceneVariant, Character, StoryCharacter,
     CharacterInteraction, NPCTracking, NPCTrackingSnapshot,
@@ -116,11 +119,14 @@ async def get_scene_generation_lock(story_id: int) -> asyncio.Lock:
 def mark_scene_generation_start(story_id: int):
     """Record when a scene generation lock was acquired."""
     _scene_generation_lock_times[story_id] = time.time()
+    # Queued extraction jobs hold back while the user is waiting on a scene
+    get_job_queue().mark_interactive_start(("scene_generation", story_id))
 
 
 def mark_scene_generation_end(story_id: int):
     """Clear the scene generation lock timestamp."""
     _scene_generation_lock_times.pop(story_id, None)
+    get_job_queue().mark_interactive_end(("scene_generation", story_id))
 
 
 async def force_release_scene_generation_lock(story_id: int) -> bool:
@@ -212,7 +218,7 @@ async def run_inline_entity_extraction_background(
             from ...services.llm.service import UnifiedLLMService
             main_llm = UnifiedLLMService()
             client = main_llm.get_user_client(user_id, user_settings)
-            is_healthy, health_msg = await client.check_health(timeout=3.0)
+            is_healthy, health_msg = await get_health_prober().check(client)
             if not is_healthy:
                 logger.warning(f"[INLINE_CHECK] LLM unavailable: {health_msg}, skipping inline extraction")
                 return
@@ -680,6 +686,12 @@ async def run_interaction_extraction_background(
         extraction_db.close()
 
 
+def _raise_if_queued(message: str) -> None:
+    """Fail a queued job so the job queue retries it later; direct tasks just skip."""
+    if in_queued_job():
+        raise LLMConnectionError(message)
+
+
 async def run_extractions_in_background(
     story_id: int,
     chapter_id: int,
@@ -711,7 +723,7 @@ async def run_extractions_in_background(
         # Increased from 0.1s to 0.3s for better reliability under load
         await asyncio.sleep(0.3)
 
-        # Quick health check before extraction to avoid hanging on unavailable LLM
+        # Cached endpoint health (background prober) to avoid hanging on unavailable LLM
         try:
             from ...services.llm.service import UnifiedLLMService
             from ...services.llm.extraction_service import ExtractionLLMService
@@ -722,15 +734,16 @@ async def run_extractions_in_background(
             if extraction_settings.get('enabled', False):
                 ext_service = ExtractionLLMService.from_settings(user_settings)
                 if ext_service:
-                    is_healthy, health_msg = await ext_service.check_health(timeout=3.0)
+                    is_healthy, health_msg = await get_health_prober().check(ext_service)
                     if not is_healthy:
                         logger.warning(f"[EXTRACTION] Extraction model unavailable: {health_msg}")
                         # Check main LLM as fallback
                         main_llm = UnifiedLLMService()
                         client = main_llm.get_user_client(user_id, user_settings)
-                        is_healthy, health_msg = await client.check_health(timeout=3.0)
+                        is_healthy, health_msg = await get_health_prober().check(client)
                         if not is_healthy:
                             logger.warning(f"[EXTRACTION] Main LLM also unavailable: {health_msg}, skipping extraction")
+                            _raise_if_queued(f"LLM unavailable: {health_msg}")
                             return
                         else:
                             logger.info(f"[EXTRACTION] Will use main LLM fallback for extraction")
@@ -738,10 +751,13 @@ async def run_extractions_in_background(
                 # No extraction model, check main LLM
                 main_llm = UnifiedLLMService()
                 client = main_llm.get_user_client(user_id, user_settings)
-                is_healthy, health_msg = await client.check_health(timeout=3.0)
+                is_healthy, health_msg = await get_health_prober().check(client)
                 if not is_healthy:
                     logger.warning(f"[EXTRACTION] LLM unavailable: {health_msg}, skipping extraction")
+                    _raise_if_queued(f"LLM unavailable: {health_msg}")
                     return
+        except LLMConnectionError:
+            raise
         except Exception as health_err:
             logger.warning(f"[EXTRACTION] Health check failed (proceeding anyway): {health_err}")
             # Don't block on health check failures
@@ -838,6 +854,8 @@ async def run_extractions_in_background(
         logger.error(f"[EXTRACTION] Background extraction failed: {e}")
         import traceback
         logger.error(f"[EXTRACTION] Traceback: {traceback.format_exc()}")
+        if in_queued_job():
+            raise
 
 
 async def recalculate_entities_in_background(
@@ -937,10 +955,13 @@ async def run_plot_extraction_in_background(
                 from ...services.llm.service import UnifiedLLMService
                 main_llm = UnifiedLLMService()
                 client = main_llm.get_user_client(user_id, user_settings)
-                is_healthy, health_msg = await client.check_health(timeout=3.0)
+                is_healthy, health_msg = await get_health_prober().check(client)
                 if not is_healthy:
                     logger.warning(f"[PLOT_EXTRACTION] LLM unavailable: {health_msg}, skipping extraction")
+                    _raise_if_queued(f"LLM unavailable: {health_msg}")
                     return
+            except LLMConnectionError:
+                raise
             except Exception as health_err:
                 logger.warning(f"[PLOT_EXTRACTION] Health check failed (proceeding anyway): {health_err}")
 
@@ -1116,6 +1137,8 @@ async def run_plot_extraction_in_background(
         logger.error(f"[PLOT_EXTRACTION] Background plot extraction failed: {e}")
         import traceback
         logger.error(f"[PLOT_EXTRACTION] Traceback: {traceback.format_exc()}")
+        if in_queued_job():
+            raise
 
 
 async def restore_npc_tracking_in_background(
@@ -2245,6 +2268,8 @@ async def run_scene_event_extraction_for_scene_in_background(
                 )
             except Exception as e:
                 logger.error(f"[SCENE_EVENT] LLM call failed for scene {scene_sequence}: {e}")
+                if in_queued_job():
+                    raise
                 return
 
             if not response:
@@ -2278,6 +2303,123 @@ async def run_scene_event_extraction_for_scene_in_background(
         logger.error(f"[SCENE_EVENT] Background task failed: {e}")
         import traceback
         logger.error(f"[SCENE_EVENT] Traceback: {traceback.format_exc()}")
+        if in_queued_job():
+            raise
+
+
+async def run_fused_scene_extraction_in_background(
+    story_id: int,
+    scene_id: int,
+    scene_sequence: int,
+    chapter_id: Optional[int],
+    branch_id: Optional[int],
+    user_id: int,
+    user_settings: dict,
+    scene_generation_context: Optional[Dict[str, Any]] = None,
+    include_entity_states: bool = False,
+):
+    """Per-scene extractions fused into as few LLM calls as possible.
+
+    Replaces the separate per-scene event extraction and (when the inline
+    contradiction check is enabled) inline entity extraction calls. Task
+    grouping, split fallback and quality tracking live in
+    services/llm/fused_extraction.py.
+    """
+    try:
+        from ...services.llm.service import UnifiedLLMService
+        from ...services.semantic_integration import _store_scene_events, run_inline_entity_extraction
+        from ...models import Story
+
+        # Short delay so the generating session has committed.
+        await asyncio.sleep(0.3)
+
+        extraction_db = SessionLocal()
+        try:
+            flow = extraction_db.query(StoryFlow).filter(
+                StoryFlow.scene_id == scene_id,
+                StoryFlow.is_active == True,
+            ).first()
+            if not flow or not flow.scene_variant:
+                logger.warning(f"[FUSED_EXTRACTION] No active variant for scene {scene_id}, skipping")
+                return
+            scene_content = flow.scene_variant.content
+
+            story_chars = extraction_db.query(StoryCharacter).filter(
+                StoryCharacter.story_id == story_id
+            ).all()
+            character_names: List[str] = []
+            for sc in story_chars:
+                char = extraction_db.query(Character).filter(Character.id == sc.character_id).first()
+                if char:
+                    character_names.append(char.name)
+
+            story_obj = extraction_db.query(Story).filter(Story.id == story_id).first()
+            world_id = story_obj.world_id if story_obj else None
+
+            ext_settings = user_settings.get('extraction_model_settings', {}) if user_settings else {}
+            force_main_llm = ext_settings.get('use_main_llm_for_scene_events', False)
+
+            llm_service = UnifiedLLMService()
+            tasks = [llm_service.fused_scene_events_task(character_names, user_settings, force_main_llm=force_main_llm)]
+            include_entity_states = include_entity_states and bool(chapter_id)
+            if include_entity_states:
+                chapter = extraction_db.query(Chapter).filter(Chapter.id == chapter_id).first()
+                chapter_location = (chapter.location_name if chapter else None) or (story_obj.setting if story_obj else None)
+                tasks.append(llm_service.fused_entity_states_task(character_names, chapter_location, user_settings))
+
+            outputs = await llm_service.extract_fused_cache_friendly(
+                scene_content=scene_content,
+                tasks=tasks,
+                context=scene_generation_context or {},
+                user_id=user_id,
+                user_settings=user_settings,
+                db=extraction_db,
+            )
+
+            events = (outputs.get("scene_events") or {}).get("events", [])
+            if events:
+                stored = await _store_scene_events(
+                    db=extraction_db,
+                    events=events,
+                    story_id=story_id,
+                    scene_id=scene_id,
+                    scene_sequence=scene_sequence,
+                    chapter_id=chapter_id,
+                    branch_id=branch_id,
+                    world_id=world_id,
+                )
+                extraction_db.commit()
+                logger.info(f"[FUSED_EXTRACTION] Stored {stored} events for scene {scene_sequence}")
+
+            if include_entity_states:
+                # The scene extractions job skips entity states whenever the inline
+                # check is on, so when the fused output lacks them (even standalone)
+                # run_inline_entity_extraction makes its own call instead.
+                if "entity_states" not in outputs:
+                    logger.warning(f"[FUSED_EXTRACTION] No entity states for scene {scene_sequence}, extracting separately")
+                inline_result = await run_inline_entity_extraction(
+                    story_id=story_id,
+                    chapter_id=chapter_id,
+                    scene_id=scene_id,
+                    scene_sequence=scene_sequence,
+                    scene_content=scene_content,
+                    user_id=user_id,
+                    user_settings=user_settings,
+                    db=extraction_db,
+                    branch_id=branch_id,
+                    scene_generation_context=scene_generation_context,
+                    entity_states=outputs.get("entity_states"),
+                )
+                extraction_db.commit()
+                logger.info(f"[FUSED_EXTRACTION] Entity states processed: {inline_result}")
+        finally:
+            extraction_db.close()
+    except Exception as e:
+        logger.error(f"[FUSED_EXTRACTION] Background task failed: {e}")
+        import traceback
+        logger.error(f"[FUSED_EXTRACTION] Traceback: {traceback.format_exc()}")
+        if in_queued_job():
+            raise
 
 
 async def run_chronicle_extraction_in_background(
@@ -2300,10 +2442,13 @@ async def run_chronicle_extraction_in_background(
             from ...services.llm.service import UnifiedLLMService
             main_llm = UnifiedLLMService()
             client = main_llm.get_user_client(user_id, user_settings)
-            is_healthy, health_msg = await client.check_health(timeout=3.0)
+            is_healthy, health_msg = await get_health_prober().check(client)
             if not is_healthy:
                 logger.warning(f"[CHRONICLE] LLM unavailable: {health_msg}, skipping")
+                _raise_if_queued(f"LLM unavailable: {health_msg}")
                 return
+        except LLMConnectionError:
+            raise
         except Exception as health_err:
             logger.warning(f"[CHRONICLE] Health check failed (proceeding anyway): {health_err}")
 
@@ -2388,8 +2533,69 @@ async def run_chronicle_extraction_in_background(
             import traceback
             logger.error(f"[CHRONICLE] Traceback: {traceback.format_exc()}")
             extraction_db.rollback()
+            if in_queued_job():
+                raise
         finally:
             extraction_db.close()
 
     except Exception as e:
         logger.error(f"[CHRONICLE] Failed to start background extraction: {e}")
+        if in_queued_job():
+            raise
+
+
+# =====================================================================
+# QUEUED JOBS
+# =====================================================================
+
+async def _run_queued_job(
+    task,
+    *,
+    story_id: int,
+    user_id: int,
+    defer_variant_id: Optional[int] = None,
+    user_settings: Optional[Dict[str, Any]] = None,
+    **kwargs,
+):
+    """
+    Run a post-scene background task from the job queue.
+
+    Waits for in-flight TTS segment extraction of the scene's variant first
+    (same gate as scene_endpoints._defer_until_tts_segment_done). user_settings
+    and scene_generation_context are in-memory extras; when the job runs after a
+    restart or on another process, settings are reloaded and the task builds its
+    own context.
+    """
+    if defer_variant_id is not None:
+        await report_job_progress({"stage": "waiting_for_tts"})
+        try:
+            from ...services.scene_segment_extraction_service import wait_for_in_flight
+            await wait_for_in_flight(defer_variant_id, timeout=90.0)
+        except Exception as e:
+            logger.warning(f"[DEFER_AFTER_TTS] wait_for_in_flight failed for variant {defer_variant_id}: {e}; running job anyway")
+
+    if user_settings is None:
+        from ...models import Story
+        from ..story_helpers import get_or_create_user_settings
+        with SessionLocal() as db:
+            story = db.query(Story).filter(Story.id == story_id).first()
+            if story is None:
+                logger.info(f"[JOB QUEUE] Story {story_id} no longer exists, dropping {task.__name__}")
+                return
+            user_settings = get_or_create_user_settings(user_id, db, story=story)
+
+    await report_job_progress({"stage": "running"})
+    await task(story_id=story_id, user_id=user_id, user_settings=user_settings, **kwargs)
+
+
+def _register_queued_job(job_type: str, task) -> None:
+    async def handler(**kwargs):
+        await _run_queued_job(task, **kwargs)
+    register_job_handler(job_type, handler)
+
+
+_register_queued_job("scene_extractions", run_extractions_in_background)
+_register_queued_job("plot_extraction", run_plot_extraction_in_background)
+_register_queued_job("scene_event_extraction", run_scene_event_extraction_for_scene_in_background)
+_register_queued_job("chronicle_extraction", run_chronicle_extraction_in_background)
+_register_queued_job("fused_scene_extraction", run_fused_scene_extraction_in_background)
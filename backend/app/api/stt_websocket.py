@@ -120,7 +120,8 @@ async def websocket_stt_stream(
             })
         
         # Start professional STT transcription with user's model preference
-        await stt_service.start_transcription(
+        # (each session gets its own stream; model calls are batched across sessions)
+        session.stt_stream = await stt_service.start_transcription(
             on_partial=on_partial,
             on_final=on_final,
             on_error=on_error,
@@ -151,7 +152,9 @@ async def websocket_stt_stream(
     finally:
         # Clean up session when WebSocket closes
         logger.info(f"[STT WebSocket] Cleaning up session: {session_id}")
-        await stt_service.stop_transcription()
+        session = stt_session_manager.get_session(session_id)
+        if session and session.stt_stream:
+            await session.stt_stream.stop_transcription()
         await stt_session_manager.remove_session(session_id)
 
 
@@ -165,8 +168,12 @@ async def process_audio_data(session_id: str, audio_data: bytes):
     """
     try:
         # Frontend is now sending raw PCM audio directly
-        # No conversion needed - feed directly to STT service
-        await stt_service.feed_audio_data(audio_data, sample_rate=16000)
+        # No conversion needed - feed directly to the session's STT stream
+        session = stt_session_manager.get_session(session_id)
+        if not session or not session.stt_stream:
+            logger.warning(f"No active STT stream for session {session_id}")
+            return
+        await session.stt_stream.feed_audio_data(audio_data, sample_rate=16000)
         
     except Exception as e:
         logger.error(f"Error processing audio data for session {session_id}: {e}")
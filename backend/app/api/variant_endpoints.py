@@ -60,6 +60,7 @@ class ThinkingStreamHandler:
             events.append(json.dumps({'type': 'content', 'chunk': chunk}))
             return events, chunk  # Return chunk for content accumulation
 from ..services.llm.service import UnifiedLLMService
+from ..services.context_cache import invalidate_scene_context
 from ..dependencies import get_current_user
 from ..config import settings
 
@@ -1647,6 +1648,7 @@ async def update_scene_variant(
 
             db.commit()
             db.refresh(variant)
+            invalidate_scene_context(story_id, scene_id)
             # Re-extract TTS segments in background (gated inside the helper).
             try:
                 from ..services.scene_segment_extraction_service import extract_and_cache_for_variant
@@ -214,6 +214,7 @@ class Settings(BaseSettings):
     
     # Security
     jwt_secret_key: str  # Required, must be set via env var
+    image_url_signing_secret: str = ""  # nginx secure_link secret for signed image URLs (env only)
     jwt_algorithm: str
     access_token_expire_minutes: int
     refresh_token_expire_days: int
@@ -372,11 +373,232 @@ class Settings(BaseSettings):
         """Get base delay in seconds for exponential backoff retries"""
         return self.service_defaults.get('llm_client', {}).get('retry_base_delay', 2.0)
     
+    @property
+    def prompt_prefix_cache(self) -> dict:
+        """Get memoized cache-friendly prompt prefix configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'max_entries': 64,
+            'ttl_seconds': 300,
+        }
+        config = self.service_defaults.get('prompt_prefix_cache', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def job_queue(self) -> dict:
+        """Get durable background job queue configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'workers': 2,
+            'poll_interval_seconds': 2,
+            'max_attempts': 3,
+            'retry_base_delay': 5,
+            'stale_after_seconds': 600,
+            'interactive_grace_seconds': 30,
+            'retention_hours': 24,
+        }
+        config = self.service_defaults.get('job_queue', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def fused_extraction(self) -> dict:
+        """Get fused per-scene extraction configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'max_output_tokens': 8192,
+            'min_quality': 0.8,
+            'min_samples': 5,
+            'reprobe_every': 20,
+        }
+        config = self.service_defaults.get('fused_extraction', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def extraction_executor(self) -> dict:
+        """Get concurrent post-scene extraction configuration from config.yaml"""
+        defaults = {
+            'max_concurrency_per_endpoint': 2,
+        }
+        config = self.service_defaults.get('extraction_executor', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def llm_scheduler(self) -> dict:
+        """Get per-endpoint LLM concurrency scheduler configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'initial_limit': 4,
+            'min_limit': 1,
+            'max_limit': 32,
+            'latency_tolerance': 2.0,
+            'decrease_factor': 0.7,
+            'circuit_failure_threshold': 5,
+            'circuit_recovery_timeout': 30,
+        }
+        config = self.service_defaults.get('llm_scheduler', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def llm_client_registry(self) -> dict:
+        """Get LLM client reuse and shared HTTP connection pool configuration from config.yaml"""
+        defaults = {
+            'max_entries': 64,
+            'shared_http_pool': True,
+            'max_connections': 100,
+            'max_keepalive_connections': 20,
+            'keepalive_expiry_seconds': 120,
+            'connect_timeout_seconds': 10,
+        }
+        config = self.service_defaults.get('llm_client_registry', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def llm_health_prober(self) -> dict:
+        """Get background LLM endpoint health prober configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'interval_seconds': 15,
+            'down_interval_seconds': 5,
+            'probe_timeout_seconds': 3,
+            'degraded_latency_seconds': 2,
+            'idle_ttl_seconds': 600,
+        }
+        config = self.service_defaults.get('llm_health_prober', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def tts_pipeline(self) -> dict:
+        """Get pipelined TTS chunk synthesis configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'max_in_flight': 4,
+        }
+        config = self.service_defaults.get('tts_pipeline', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def tts_provider_pool(self) -> dict:
+        """Get long-lived TTS provider pool configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'max_entries': 32,
+            'idle_ttl_seconds': 900,
+            'max_connections': 20,
+            'max_keepalive_connections': 10,
+            'keepalive_expiry_seconds': 60,
+        }
+        config = self.service_defaults.get('tts_provider_pool', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def tts_audio_cache(self) -> dict:
+        """Get content-addressed TTS audio cache configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'max_size_mb': 2048,
+        }
+        config = self.service_defaults.get('tts_audio_cache', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def stt_batching(self) -> dict:
+        """Get cross-session STT inference batching configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'max_batch_size': 8,
+            'batch_window_ms': 50,
+            'vad_batch_window_ms': 5,
+        }
+        config = self.service_defaults.get('stt_batching', {}) or {}
+        return {**defaults, **config}
+
     @property
     def chapter_context_threshold_percentage(self) -> int:
         """Get chapter context threshold percentage from config.yaml"""
         return self._yaml_config.get('context', {}).get('chapter_context_threshold_percentage', 80)
 
+    @property
+    def vector_index(self) -> dict:
+        """Get pgvector index / ANN search configuration from config.yaml"""
+        defaults = {
+            'search_mode': 'auto',
+            'index_type': 'hnsw',
+            'hnsw_m': 16,
+            'hnsw_ef_construction': 64,
+            'ef_search': 40,
+            'iterative_scan': '',
+            'ivfflat_lists': 100,
+            'ivfflat_probes': 10,
+        }
+        config = self._yaml_config.get('semantic_memory', {}).get('vector_index', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def semantic_query_cache(self) -> dict:
+        """Get query embedding cache configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'max_mb': 64,
+            'persist_path': '',
+        }
+        config = self._yaml_config.get('semantic_memory', {}).get('query_cache', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def semantic_embedding_batching(self) -> dict:
+        """Get embedding micro-batching configuration from config.yaml"""
+        defaults = {
+            'enabled': True,
+            'max_batch_size': 32,
+            'max_wait_ms': 5,
+        }
+        config = self._yaml_config.get('semantic_memory', {}).get('embedding_batching', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def semantic_rerank(self) -> dict:
+        """Get cross-encoder rerank cache / early-exit configuration from config.yaml"""
+        defaults = {
+            'cache_enabled': True,
+            'cache_max_entries': 50000,
+            'early_exit_margin': 0.0,
+        }
+        config = self._yaml_config.get('semantic_memory', {}).get('rerank', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def semantic_inference(self) -> dict:
+        """Get local embedding / reranker inference backend configuration from config.yaml"""
+        defaults = {
+            'embedding_backend': 'torch',
+            'reranker_backend': 'torch',
+            'onnx_cache_dir': './data/models/onnx',
+        }
+        config = self._yaml_config.get('semantic_memory', {}).get('inference', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def semantic_reembed(self) -> dict:
+        """Get bulk re-embedding pipeline configuration from config.yaml"""
+        defaults = {
+            'chunk_size': 256,
+            'workers': 2,
+            'shadow_column': True,
+        }
+        config = self._yaml_config.get('semantic_memory', {}).get('reembed', {}) or {}
+        return {**defaults, **config}
+
+    @property
+    def semantic_worker(self) -> dict:
+        """Get shared embedding / rerank worker configuration from config.yaml"""
+        defaults = {
+            'enabled': False,
+            'url': 'http://127.0.0.1:9877',
+            'timeout': 60,
+        }
+        config = self._yaml_config.get('semantic_memory', {}).get('worker', {}) or {}
+        return {**defaults, **config}
+
     @property
     def sso_config(self) -> dict:
         """Get SSO configuration from config.yaml"""
@@ -402,8 +624,24 @@ class Settings(BaseSettings):
                 'server_url': 'http://localhost:8188',
                 'api_key': '',
                 'timeout': 300,
+                'use_websocket': True,
                 'websocket_fallback_to_polling': True,
                 'polling_interval': 2,
+                'finished_job_ttl': 600,
+            },
+            'scheduler': {
+                'max_concurrent_per_server': 2,
+                'prompt_concurrency': 4,
+            },
+            'derivatives': {
+                'enabled': True,
+                'sizes': [256, 512, 1024],
+                'quality': 80,
+            },
+            'serving': {
+                'signed_urls': False,
+                'url_prefix': '/media/images/',
+                'url_ttl_seconds': 86400,
             },
             'defaults': {
                 'width': 1024,
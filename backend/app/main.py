@@ -140,6 +140,15 @@ async def startup_event():
             )
             logger.info(f"Semantic memory service initialized (reranking={'enabled' if settings.semantic_enable_reranking else 'disabled'}, models will load on first use)")
 
+            # Shared embedding worker: local models live in one process for all API workers
+            if settings.semantic_worker.get('enabled'):
+                from .services.semantic_memory import get_semantic_memory_service as _get_sms
+                _get_sms().configure_provider(
+                    provider="worker",
+                    model_name=settings.semantic_embedding_model,
+                    api_url=settings.semantic_worker.get('url'),
+                )
+
             # Load saved embedding provider from DB (if user configured a non-local provider)
             try:
                 from .database import SessionLocal
@@ -203,8 +212,76 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to validate branch clone registry: {e}")
 
+    # Start background job workers (post-scene extractions)
+    try:
+        from .services.job_queue import get_job_queue
+        from .api import story_tasks  # noqa: F401 - registers job handlers
+        job_queue = get_job_queue()
+        if job_queue.enabled:
+            await job_queue.start()
+        else:
+            logger.info("Background job queue disabled in configuration")
+    except Exception as e:
+        logger.error(f"Failed to start background job queue: {e}")
+        logger.warning("Background extractions will run as in-process tasks")
+
+    # Background LLM endpoint health probing (tasks read the cached state)
+    try:
+        from .services.llm.health_prober import get_health_prober
+        if settings.llm_health_prober.get('enabled', True):
+            await get_health_prober().start()
+    except Exception as e:
+        logger.error(f"Failed to start LLM health prober: {e}")
+
     logger.info("Application startup complete")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush caches and release shared resources on application shutdown"""
+    # Persist query embeddings (no-op unless semantic_memory.query_cache.persist_path is set)
+    try:
+        from .services.embedding_cache import get_query_embedding_cache
+        get_query_embedding_cache().save()
+    except Exception as e:
+        logger.warning(f"Failed to persist query embedding cache: {e}")
+
+    try:
+        from .services.job_queue import get_job_queue
+        await get_job_queue().stop()
+    except Exception as e:
+        logger.warning(f"Failed to stop background job queue: {e}")
+
+    try:
+        from .services.llm.health_prober import get_health_prober
+        await get_health_prober().stop()
+    except Exception as e:
+        logger.warning(f"Failed to stop LLM health prober: {e}")
+
+    try:
+        from .services.llm.client_registry import close_shared_http_clients
+        await close_shared_http_clients()
+    except Exception as e:
+        logger.warning(f"Failed to close shared LLM HTTP pool: {e}")
+
+    try:
+        from .services.stt_scheduler import stop_stt_scheduler
+        await stop_stt_scheduler()
+    except Exception as e:
+        logger.warning(f"Failed to stop STT inference scheduler: {e}")
+
+    try:
+        from .services.tts.provider_pool import get_tts_provider_pool
+        await get_tts_provider_pool().close_all()
+    except Exception as e:
+        logger.warning(f"Failed to close TTS provider pool: {e}")
+
+    try:
+        from .services.image_generation.comfyui_events import close_comfyui_listeners
+        await close_comfyui_listeners()
+    except Exception as e:
+        logger.warning(f"Failed to close ComfyUI event listeners: {e}")
+
 # Configure network settings
 from .utils.network_config import NetworkConfig
 network_config = NetworkConfig.get_deployment_config()
@@ -36,6 +36,7 @@ from .contradiction import Contradiction
 from .relationship import CharacterRelationship, RelationshipSummary
 from .world import World
 from .chronicle import CharacterChronicle, LocationLorebook, ChronicleEntryType, CharacterSnapshot
+from .background_job import BackgroundJob
 
 __all__ = [
     "Base",
@@ -68,4 +69,5 @@ __all__ = [
     "LocationLorebook",
     "ChronicleEntryType",
     "CharacterSnapshot",
+    "BackgroundJob",
 ]
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Background Job Model
+
+Durable queue of background work (post-scene extractions, backfills) drained
+by the job workers in services/job_queue.py.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Index, text
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class BackgroundJob(Base):
+    """
+    One unit of queued background work.
+
+    Lower priority values run first (interactive < extraction < backfill).
+    coalesce_key identifies duplicate work: while a job with the same key is
+    still pending, enqueueing again updates that job instead of adding one.
+    payload holds only JSON-serializable arguments; in-memory extras like the
+    scene generation context are kept by the enqueueing process.
+    """
+    __tablename__ = "background_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(64), nullable=False)
+    priority = Column(Integer, nullable=False, default=10)
+    status = Column(String(16), nullable=False, default="pending")  # pending | running | done | failed
+
+    story_id = Column(Integer, ForeignKey("stories.id", ondelete="CASCADE"), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    coalesce_key = Column(String(255), nullable=True)
+
+    payload = Column(JSON, nullable=False, default=dict)
+    progress = Column(JSON, nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(String(64), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_background_jobs_claim", "status", "priority", "id"),
+        Index(
+            "uq_background_jobs_pending_coalesce_key", "coalesce_key",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "priority": self.priority,
+            "status": self.status,
+            "story_id": self.story_id,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "progress": self.progress,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
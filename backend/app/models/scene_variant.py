@@ -1,7 +1,8 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from ..database import Base
+from ..utils.token_counter import count_tokens, get_tokenizer_name
 from .branch_aware import branch_clone_config
 
 
@@ -64,6 +65,12 @@ class SceneVariant(Base):
     # Shape: {"model": "...", "extracted_at": "...", "segments": [...]}.
     tts_segments = Column(JSON, nullable=True)
 
+    # Token count of `content`, keyed by tokenizer name ({"cl100k_base": 812}).
+    # Computed whenever content is assigned (see _update_token_counts) so the
+    # context manager can fit its token budget without re-encoding scene text.
+    # Rows written before migration 087 are filled by the backfill job.
+    token_counts = Column(JSON, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -73,5 +80,11 @@ class SceneVariant(Base):
     choices = relationship("SceneChoice", back_populates="variant", cascade="all, delete-orphan")
     story_flows = relationship("StoryFlow", back_populates="scene_variant")
     
+    @validates('content')
+    def _update_token_counts(self, key, value):
+        """Recount tokens whenever the content changes (insert, edit, continue)."""
+        self.token_counts = {get_tokenizer_name(): count_tokens(value)}
+        return value
+
     def __repr__(self):
         return f"<SceneVariant(id={self.id}, scene_id={self.scene_id}, variant={self.variant_number})>"
\ No newline at end of file
@@ -607,6 +607,34 @@ async def list_voices(
         )
 
 
+async def _synthesize_cached(provider, tts_request, provider_type: str, api_url: str, extra_params: Optional[dict]):
+    """
+    Synthesize a short preview through the content-addressed audio cache.
+    
+    Returns:
+        Tuple of (audio_data, format, duration)
+    """
+    from app.services.tts.audio_cache import audio_cache_key, get_tts_audio_cache
+    
+    cache = get_tts_audio_cache()
+    cache_key = audio_cache_key(
+        tts_request.text, provider_type, api_url, tts_request.voice_id,
+        tts_request.speed, tts_request.format, extra_params,
+    )
+    if cache is not None:
+        cached = cache.lookup(cache_key)
+        if cached is not None:
+            try:
+                return cached.path.read_bytes(), cached.format, cached.duration
+            except OSError:
+                pass
+    
+    response = await provider.synthesize(tts_request)
+    if cache is not None:
+        cache.store_bytes(cache_key, response.audio_data, response.format, response.duration)
+    return response.audio_data, response.format, response.duration
+
+
 @router.post("/test")
 async def test_tts(
     request: TTSTestRequest,
@@ -648,9 +676,12 @@ async def test_tts(
             format=AudioFormat.MP3
         )
         
-        response = await provider.synthesize(tts_request)
+        audio_data, audio_format, duration = await _synthesize_cached(
+            provider, tts_request, tts_settings.tts_provider_type,
+            tts_settings.tts_api_url, tts_settings.tts_extra_params,
+        )
         
-        logger.info(f"Generated test audio for user {current_user.id}: {len(response.audio_data)} bytes")
+        logger.info(f"Generated test audio for user {current_user.id}: {len(audio_data)} bytes")
         
         # Determine content type based on format
         content_type_map = {
@@ -661,15 +692,15 @@ async def test_tts(
             AudioFormat.AAC: "audio/aac"
         }
         
-        content_type = content_type_map.get(response.format, "audio/wav")
+        content_type = content_type_map.get(audio_format, "audio/wav")
         
         return Response(
-            content=response.audio_data,
+            content=audio_data,
             media_type=content_type,
             headers={
-                "Content-Disposition": f"attachment; filename=test.{response.format.value}",
-                "X-Audio-Duration": str(response.duration),
-                "X-Audio-Format": response.format.value
+                "Content-Disposition": f"attachment; filename=test.{audio_format.value}",
+                "X-Audio-Duration": str(duration),
+                "X-Audio-Format": audio_format.value
             }
         )
         
@@ -723,9 +754,12 @@ async def test_voice_preview(
             format=AudioFormat.MP3
         )
         
-        response = await provider.synthesize(tts_request)
+        audio_data, audio_format, duration = await _synthesize_cached(
+            provider, tts_request, settings_request.provider_type,
+            settings_request.api_url, settings_request.extra_params,
+        )
         
-        logger.info(f"Generated voice preview for user {current_user.id}: voice={final_voice_id}, {len(response.audio_data)} bytes")
+        logger.info(f"Generated voice preview for user {current_user.id}: voice={final_voice_id}, {len(audio_data)} bytes")
         
         # Determine content type based on format
         content_type_map = {
@@ -736,15 +770,15 @@ async def test_voice_preview(
             AudioFormat.AAC: "audio/aac"
         }
         
-        content_type = content_type_map.get(response.format, "audio/wav")
+        content_type = content_type_map.get(audio_format, "audio/wav")
         
         return Response(
-            content=response.audio_data,
+            content=audio_data,
             media_type=content_type,
             headers={
-                "Content-Disposition": f"attachment; filename=preview_{final_voice_id}.{response.format.value}",
-                "X-Audio-Duration": str(response.duration),
-                "X-Audio-Format": response.format.value,
+                "Content-Disposition": f"attachment; filename=preview_{final_voice_id}.{audio_format.value}",
+                "X-Audio-Duration": str(duration),
+                "X-Audio-Format": audio_format.value,
                 "X-Voice-ID": final_voice_id
             }
         )
@@ -2487,30 +2521,29 @@ async def get_scene_audio(
         elif scene_audio.audio_format == "ogg":
             content_type = "audio/ogg"
         
-        # Read file into memory
         file_path = scene_audio.audio_url
-        with open(file_path, "rb") as f:
-            audio_data = f.read()
-        
-        # Delete the file immediately after reading
-        try:
-            os.remove(file_path)
-            logger.info(f"Deleted audio file after serving: {file_path}")
-        except Exception as e:
-            logger.warning(f"Failed to delete audio file {file_path}: {e}")
+        audio_format = scene_audio.audio_format
         
         # Delete database entry
         db.delete(scene_audio)
         db.commit()
         logger.info(f"Deleted audio cache entry for scene {scene_id}")
         
-        # Return audio data from memory
-        from fastapi.responses import Response
-        return Response(
-            content=audio_data,
+        def delete_audio_file():
+            try:
+                os.remove(file_path)
+                logger.info(f"Deleted audio file after serving: {file_path}")
+            except Exception as e:
+                logger.warning(f"Failed to delete audio file {file_path}: {e}")
+        
+        # Stream the file from disk, delete it once it has been sent
+        from starlette.background import BackgroundTask
+        return FileResponse(
+            file_path,
             media_type=content_type,
+            background=BackgroundTask(delete_audio_file),
             headers={
-                "Content-Disposition": f"inline; filename=scene_{scene_id}.{scene_audio.audio_format}",
+                "Content-Disposition": f"inline; filename=scene_{scene_id}.{audio_format}",
                 "Cache-Control": "no-cache, no-store, must-revalidate",
                 "Pragma": "no-cache",
                 "Expires": "0"
@@ -2727,9 +2760,7 @@ async def get_scene_audio_chunk(
                 detail=f"Chunk file not found: {chunk_filename}"
             )
         
-        # Read chunk file
-        with open(chunk_path, "rb") as f:
-            audio_data = f.read()
+        file_size = chunk_path.stat().st_size
         
         # Get duration from file metadata if possible
         import wave
@@ -2742,17 +2773,16 @@ async def get_scene_audio_chunk(
                     duration = frames / float(rate)
         except Exception:
             # If we can't get duration, estimate it
-            duration = len(audio_data) / 32000.0  # Rough estimate
+            duration = file_size / 32000.0  # Rough estimate
         
         # Determine content type
         content_type = "audio/mpeg" if scene_audio.audio_format == "mp3" else f"audio/{scene_audio.audio_format}"
         
-        logger.info(f"Serving chunk {chunk_number} for scene {scene_id}: {len(audio_data)} bytes, {duration:.2f}s")
+        logger.info(f"Serving chunk {chunk_number} for scene {scene_id}: {file_size} bytes, {duration:.2f}s")
         
-        # Return audio immediately
-        from fastapi.responses import Response
-        return Response(
-            content=audio_data,
+        # Stream the chunk file from disk
+        return FileResponse(
+            chunk_path,
             media_type=content_type,
             headers={
                 "Content-Disposition": f"inline; filename=scene_{scene_id}_chunk_{chunk_number}.{scene_audio.audio_format}",
@@ -0,0 +1,150 @@
+"""
+Story Context Cache
+
+Process-wide cache for the per-scene pieces of a context build.
+
+ContextManager instances are created per request, so without a shared cache
+every "continue" click re-queries the active variant of every scene, re-formats
+it as "Scene N: ..." and re-runs tiktoken over it - even though only one scene
+was appended since the previous build. On 300+ scene stories that is the
+dominant pre-LLM latency.
+
+Entries are keyed by (story_id, branch_id) and hold, per scene, the active
+variant the text was built from together with its ``updated_at`` stamp. A build
+validates the whole story with a single StoryFlow query and only re-formats /
+re-counts the delta (new scenes, switched variants, edited variants). Scene
+selection (chapter bounds, excluded scene) stays in ContextManager, so one
+entry serves every chapter of the branch.
+
+Explicit invalidation hooks (invalidate_scene / invalidate_story) are called
+from the scene edit, delete and variant-switch paths so stale text is dropped
+immediately instead of lingering until the next validation.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedSceneContent:
+    """Formatted content and token count of one scene's active variant."""
+    variant_id: Optional[int]
+    variant_updated_at: Optional[datetime]
+    sequence_number: int
+    content: str
+    tokens: int
+    tokenizer: str
+
+
+class StoryContextCache:
+    """
+    LRU cache of formatted scene content per (story, branch).
+
+    Args:
+        max_stories: Number of (story, branch) entries kept before the least
+            recently used one is evicted.
+    """
+
+    def __init__(self, max_stories: int = 256):
+        self.max_stories = max_stories
+        self._stories: "OrderedDict[Tuple[int, Optional[int]], Dict[int, CachedSceneContent]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(
+        self,
+        story_id: int,
+        branch_id: Optional[int],
+        scene_id: int,
+        variant_id: Optional[int],
+        variant_updated_at: Optional[datetime],
+        sequence_number: int,
+        tokenizer: str,
+    ) -> Optional[CachedSceneContent]:
+        """Return the cached entry if it was built from the same variant state, else None."""
+        with self._lock:
+            scenes = self._stories.get((story_id, branch_id))
+            entry = scenes.get(scene_id) if scenes is not None else None
+            if (
+                entry is not None
+                and entry.variant_id == variant_id
+                and entry.variant_updated_at == variant_updated_at
+                and entry.sequence_number == sequence_number
+                and entry.tokenizer == tokenizer
+            ):
+                self._stories.move_to_end((story_id, branch_id))
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def put(self, story_id: int, branch_id: Optional[int], scene_id: int, entry: CachedSceneContent) -> None:
+        """Store (or replace) the entry for a scene."""
+        with self._lock:
+            key = (story_id, branch_id)
+            scenes = self._stories.get(key)
+            if scenes is None:
+                scenes = {}
+                self._stories[key] = scenes
+            scenes[scene_id] = entry
+            self._stories.move_to_end(key)
+            while len(self._stories) > self.max_stories:
+                evicted_key, _ = self._stories.popitem(last=False)
+                logger.debug(f"[CONTEXT CACHE] Evicted story {evicted_key[0]} branch {evicted_key[1]}")
+
+    def invalidate_scene(self, story_id: int, scene_id: int) -> None:
+        """Drop a scene from every branch entry of the story (edit, delete, variant switch)."""
+        with self._lock:
+            for (cached_story_id, _), scenes in self._stories.items():
+                if cached_story_id == story_id and scenes.pop(scene_id, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate_story(self, story_id: int, branch_id: Optional[int] = None) -> None:
+        """Drop all entries for a story, or only one branch of it when branch_id is given."""
+        with self._lock:
+            keys = [
+                key for key in self._stories
+                if key[0] == story_id and (branch_id is None or key[1] == branch_id)
+            ]
+            for key in keys:
+                del self._stories[key]
+            self.invalidations += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stories.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache counters for monitoring"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "stories": len(self._stories),
+                "scenes": sum(len(s) for s in self._stories.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+# Global instance shared by all ContextManager instances in this process
+story_context_cache = StoryContextCache()
+
+
+def invalidate_scene_context(story_id: int, scene_id: int) -> None:
+    """Invalidate cached context for a scene whose content or active variant changed."""
+    story_context_cache.invalidate_scene(story_id, scene_id)
+
+
+def invalidate_story_context(story_id: int, branch_id: Optional[int] = None) -> None:
+    """Invalidate cached context for a whole story (or one of its branches)."""
+    story_context_cache.invalidate_story(story_id, branch_id)
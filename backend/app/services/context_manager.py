@@ -16,6 +16,8 @@ from ..models import Story, Scene, Character, StoryCharacter, StoryBranch, Chapt
 from ..models import StoryFlow, SceneVariant, ChapterStatus
 from ..services.llm.service import UnifiedLLMService
 from ..services.llm.prompts import prompt_manager
+from ..services.context_cache import story_context_cache, CachedSceneContent
+from ..utils.token_counter import TIKTOKEN_ENCODING, ESTIMATE_TOKENIZER
 from ..database import get_db
 from ..config import settings
 try:
@@ -147,15 +149,18 @@ class ContextManager:
         # Initialize tokenizer if available
         if TIKTOKEN_AVAILABLE:
             try:
-                self.encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 encoding
+                self.encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)  # GPT-4 encoding
                 self.use_tiktoken = True
+                self.tokenizer_name = TIKTOKEN_ENCODING
                 logger.info("Tiktoken initialized successfully for accurate token counting")
             except Exception as e:
                 logger.warning(f"Failed to initialize tiktoken: {e}, using estimation")
                 self.use_tiktoken = False
+                self.tokenizer_name = ESTIMATE_TOKENIZER
         else:
             logger.warning("Tiktoken not available, using estimation for token counting")
             self.use_tiktoken = False
+            self.tokenizer_name = ESTIMATE_TOKENIZER
 
         # Initialize semantic memory service (graceful fallback if not available)
         self.semantic_memory = None
@@ -1203,10 +1208,8 @@ Appearance: {char.get('appearance', '')}
         # This helps weaker LLMs focus on recent context without dilution
         if not self.fill_remaining_context:
             recent_scenes = scenes[-self.keep_recent_scenes:]
-            scene_contents = []
-            for scene in recent_scenes:
-                scene_content = await self._get_scene_content_proper(scene, db)
-                scene_contents.append(scene_content)
+            cached_contents = await self._get_scene_contents_cached(recent_scenes, db)
+            scene_contents = [cached_contents[scene.id][0] for scene in recent_scenes]
             combined_content = "\n\n".join(scene_contents)
             logger.info(f"[LINEAR CONTEXT] Fill remaining context disabled: using only {len(recent_scenes)} recent scenes")
             return {
@@ -1219,10 +1222,11 @@ Appearance: {char.get('appearance', '')}
             }
 
         # Build a map of scene sequence numbers to scenes and their token counts
+        # (only new/changed scenes are re-formatted and re-tokenized, see context_cache)
+        cached_contents = await self._get_scene_contents_cached(scenes, db)
         scene_map: Dict[int, Tuple[Scene, str, int]] = {}
         for scene in scenes:
-            scene_content = await self._get_scene_content_proper(scene, db)
-            scene_tokens = self.count_tokens(scene_content)
+            scene_content, scene_tokens = cached_contents[scene.id]
             scene_map[scene.sequence_number] = (scene, scene_content, scene_tokens)
         
         # Get the highest scene number (most recent)
@@ -1291,9 +1295,8 @@ Appearance: {char.get('appearance', '')}
         if not included_scenes:
             # Emergency fallback - just the last scene
             last_scene = scenes[-1]
-            last_content = await self._get_scene_content_proper(last_scene, db)
+            last_content, used_tokens = cached_contents[last_scene.id]
             included_scenes = [last_scene]
-            used_tokens = self.count_tokens(last_content)
         
         # Build content using proper scene content
         included_content_parts = []
@@ -1355,6 +1358,151 @@ Appearance: {char.get('appearance', '')}
             logger.warning(f"Failed to get proper scene content for scene {scene.id}: {e}")
             return f"Scene {scene.sequence_number}: {scene.content}"
     
+    async def _get_scene_contents_cached(self, scenes: List[Scene], db: Session = None) -> Dict[int, Tuple[str, int]]:
+        """
+        Get formatted content and token count for many scenes at once.
+
+        Same output as _get_scene_content_proper + count_tokens per scene, but the
+        active variants are resolved with a single StoryFlow query and results are
+        reused from the process-wide story_context_cache. Only scenes that are new
+        or whose active variant changed since the last build are re-formatted and
+        re-tokenized.
+
+        Returns:
+            Dict mapping scene.id -> (formatted content, token count)
+        """
+        results: Dict[int, Tuple[str, int]] = {}
+        if not scenes:
+            return results
+
+        if not db:
+            for scene in scenes:
+                content = await self._get_scene_content_proper(scene, db)
+                results[scene.id] = (content, self.count_tokens(content))
+            return results
+
+        try:
+            # One query for the active variant (id + edit stamp) of every scene
+            scene_ids = [scene.id for scene in scenes]
+            flow_rows = db.query(
+                StoryFlow.scene_id, SceneVariant.id, SceneVariant.updated_at
+            ).join(
+                SceneVariant, StoryFlow.scene_variant_id == SceneVariant.id
+            ).filter(
+                StoryFlow.scene_id.in_(scene_ids),
+                StoryFlow.is_active == True
+            ).all()
+            active_variants: Dict[int, Tuple[int, Any]] = {}
+            for scene_id, variant_id, updated_at in flow_rows:
+                active_variants.setdefault(scene_id, (variant_id, updated_at))
+
+            # Reuse cached entries that were built from the same variant state
+            misses: List[Scene] = []
+            for scene in scenes:
+                variant_id, updated_at = active_variants.get(scene.id, (None, None))
+                if variant_id is None:
+                    misses.append(scene)
+                    continue
+                entry = story_context_cache.get(
+                    scene.story_id, scene.branch_id, scene.id,
+                    variant_id, updated_at, scene.sequence_number, self.tokenizer_name
+                )
+                if entry is not None:
+                    results[scene.id] = (entry.content, entry.tokens)
+                else:
+                    misses.append(scene)
+
+            # Load content (and persisted token counts) for the delta only
+            miss_variant_ids = [active_variants[s.id][0] for s in misses if s.id in active_variants]
+            variant_rows: Dict[int, Tuple[str, Optional[Dict[str, int]]]] = {}
+            if miss_variant_ids:
+                variant_rows = {
+                    variant_id: (content, token_counts)
+                    for variant_id, content, token_counts in db.query(
+                        SceneVariant.id, SceneVariant.content, SceneVariant.token_counts
+                    ).filter(SceneVariant.id.in_(miss_variant_ids)).all()
+                }
+
+            for scene in misses:
+                variant_id, updated_at = active_variants.get(scene.id, (None, None))
+                if variant_id is None or variant_id not in variant_rows:
+                    # No flow entry - fall back to legacy scene content (not cached)
+                    content = f"Scene {scene.sequence_number}: {scene.content}"
+                    results[scene.id] = (content, self.count_tokens(content))
+                    continue
+                variant_content, token_counts = variant_rows[variant_id]
+                prefix = f"Scene {scene.sequence_number}: "
+                content = f"{prefix}{variant_content}"
+                stored_tokens = (token_counts or {}).get(self.tokenizer_name)
+                if stored_tokens is not None:
+                    # Persisted at write time - only the short prefix needs encoding
+                    tokens = self.count_tokens(prefix) + stored_tokens
+                else:
+                    tokens = self.count_tokens(content)
+                story_context_cache.put(scene.story_id, scene.branch_id, scene.id, CachedSceneContent(
+                    variant_id=variant_id,
+                    variant_updated_at=updated_at,
+                    sequence_number=scene.sequence_number,
+                    content=content,
+                    tokens=tokens,
+                    tokenizer=self.tokenizer_name,
+                ))
+                results[scene.id] = (content, tokens)
+
+            logger.debug(f"[CONTEXT CACHE] {len(scenes) - len(misses)}/{len(scenes)} scenes reused, {len(misses)} rebuilt")
+            return results
+        except Exception as e:
+            logger.warning(f"[CONTEXT CACHE] Bulk scene content lookup failed, falling back to per-scene: {e}")
+            for scene in scenes:
+                if scene.id not in results:
+                    content = await self._get_scene_content_proper(scene, db)
+                    results[scene.id] = (content, self.count_tokens(content))
+            return results
+
+    async def _get_scene_token_counts(self, scenes: List[Scene], db: Session) -> Dict[int, int]:
+        """
+        Get the context token count of each scene without loading scene text.
+
+        Reads SceneVariant.token_counts (persisted at write time) for the active
+        variants; only scenes without a stored count for the current tokenizer
+        fall back to _get_scene_contents_cached.
+
+        Returns:
+            Dict mapping scene.id -> token count (including the "Scene N: " prefix)
+        """
+        results: Dict[int, int] = {}
+        if not scenes:
+            return results
+
+        try:
+            rows = db.query(StoryFlow.scene_id, SceneVariant.token_counts).join(
+                SceneVariant, StoryFlow.scene_variant_id == SceneVariant.id
+            ).filter(
+                StoryFlow.scene_id.in_([scene.id for scene in scenes]),
+                StoryFlow.is_active == True
+            ).all()
+            stored: Dict[int, int] = {}
+            for scene_id, token_counts in rows:
+                if scene_id not in stored and token_counts and self.tokenizer_name in token_counts:
+                    stored[scene_id] = token_counts[self.tokenizer_name]
+        except Exception as e:
+            logger.warning(f"[CONTEXT SIZE] Failed to read stored token counts: {e}")
+            stored = {}
+
+        uncounted = []
+        for scene in scenes:
+            if scene.id in stored:
+                results[scene.id] = self.count_tokens(f"Scene {scene.sequence_number}: ") + stored[scene.id]
+            else:
+                uncounted.append(scene)
+
+        if uncounted:
+            cached_contents = await self._get_scene_contents_cached(uncounted, db)
+            for scene in uncounted:
+                results[scene.id] = cached_contents[scene.id][1]
+
+        return results
+
     def _get_scene_token_count(self, scene: Scene, scene_content: str) -> int:
         """
         Get accurate token count for a scene.
@@ -1791,10 +1939,8 @@ Appearance: {char.get('appearance', '')}
             
             # Count tokens for ALL scenes in the chapter (not limited by available_tokens)
             # This gives accurate total chapter size for progress tracking
-            total_scene_tokens = 0
-            for scene in current_chapter_scenes:
-                scene_content = await self._get_scene_content_proper(scene, db)
-                total_scene_tokens += self.count_tokens(scene_content)
+            scene_token_counts = await self._get_scene_token_counts(current_chapter_scenes, db)
+            total_scene_tokens = sum(scene_token_counts.values())
             
             # Total = base context + all scene tokens
             total_tokens = base_tokens + total_scene_tokens
@@ -3734,7 +3880,7 @@ Appearance: {char.get('appearance', '')}
                         loaded_from_db = len(has_vector)
                         logger.info(f"[EVENT INDEX] Cached {len(all_events)} events for story {story_id} ({loaded_from_db} from DB, {len(no_vector)} encoded)")
 
-                    query_embeddings = await self.semantic_memory.encode_texts(sub_queries)
+                    query_embeddings = await self.semantic_memory.encode_queries(sub_queries)
 
                     # Cosine similarity: (num_queries, num_events)
                     e_norms = np.linalg.norm(event_embeddings, axis=1, keepdims=True)
@@ -5290,9 +5436,9 @@ Appearance: {char.get('appearance', '')}
         if not scenes_to_consider:
             return "", []
 
+        cached_contents = await self._get_scene_contents_cached(scenes_to_consider, db)
         for scene in scenes_to_consider:
-            scene_content = await self._get_scene_content_proper(scene, db)
-            scene_tokens = self.count_tokens(scene_content)
+            scene_content, scene_tokens = cached_contents[scene.id]
             scene_map[scene.sequence_number] = (scene, scene_content, scene_tokens)
 
         if not scene_map:
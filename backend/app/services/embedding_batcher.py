@@ -0,0 +1,153 @@
+"""
+Embedding Batcher
+
+Coalesces concurrent embedding requests into a single encoder call.
+
+Every scene save and search embeds a handful of texts through
+asyncio.to_thread, so with several users generating at once the model runs
+many tiny batches back to back. The batcher queues requests from all
+coroutines on the event loop and hands them to the encoder together, bounded
+by a maximum batch size and a maximum wait. Each caller gets back exactly the
+rows for its own texts.
+
+Requests made from a different event loop than the one the batcher is bound
+to (e.g. admin background jobs running asyncio.run in a worker thread) bypass
+the queue and are encoded directly.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EncodeFn = Callable[[List[str]], Awaitable["np.ndarray"]]
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching dispatcher in front of an async batch encoder.
+
+    Args:
+        encode_fn: Async function encoding a list of texts to an (n, dim) array
+        max_batch_size: Max texts per encoder call (a larger single request is
+            encoded on its own)
+        max_wait_ms: How long the first queued request waits for others
+        enabled: When False, submit() calls encode_fn directly
+    """
+
+    def __init__(self, encode_fn: EncodeFn, max_batch_size: int = 32, max_wait_ms: float = 5.0, enabled: bool = True):
+        self._encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.enabled = enabled
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.batches = 0
+        self.texts = 0
+        self.requests = 0
+        self.max_observed_batch = 0
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Bind to the running loop. Returns False if bound to another live loop."""
+        if self._loop is loop:
+            return True
+        if self._loop is not None and not self._loop.is_closed() and self._worker is not None and not self._worker.done():
+            return False
+        self._loop = loop
+        self._pending = []
+        self._pending_texts = 0
+        self._full = asyncio.Event()
+        self._worker = None
+        return True
+
+    async def submit(self, texts: List[str]) -> "np.ndarray":
+        """Encode texts, sharing the encoder call with other pending requests."""
+        if not texts:
+            return await self._encode_fn(texts)
+        loop = asyncio.get_running_loop()
+        if not self.enabled or not self._bind(loop):
+            return await self._encode_fn(texts)
+
+        future = loop.create_future()
+        self._pending.append((list(texts), future))
+        self._pending_texts += len(texts)
+        self.requests += 1
+        if self._pending_texts >= self.max_batch_size:
+            self._full.set()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        return await future
+
+    def _take_batch(self) -> List[Tuple[List[str], asyncio.Future]]:
+        batch = []
+        count = 0
+        while self._pending:
+            texts, future = self._pending[0]
+            if batch and count + len(texts) > self.max_batch_size:
+                break
+            self._pending.pop(0)
+            if future.cancelled():
+                self._pending_texts -= len(texts)
+                continue
+            batch.append((texts, future))
+            count += len(texts)
+        self._pending_texts -= count
+        return batch
+
+    async def _run(self):
+        while self._pending:
+            if self._pending_texts < self.max_batch_size and self.max_wait > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+
+            batch = self._take_batch()
+            if not batch:
+                continue
+            all_texts = [t for texts, _ in batch for t in texts]
+            try:
+                embeddings = await self._encode_fn(all_texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.texts += len(all_texts)
+            self.max_observed_batch = max(self.max_observed_batch, len(all_texts))
+            if len(batch) > 1:
+                logger.debug(f"[EMBED BATCH] Coalesced {len(batch)} requests into one batch of {len(all_texts)} texts")
+
+            offset = 0
+            for texts, future in batch:
+                if not future.done():
+                    future.set_result(embeddings[offset:offset + len(texts)])
+                offset += len(texts)
+
+            if self._pending_texts >= self.max_batch_size:
+                self._full.set()
+
+    def get_stats(self) -> dict:
+        """Get batching counters for monitoring"""
+        return {
+            "enabled": self.enabled,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "requests": self.requests,
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": (self.texts / self.batches) if self.batches else 0.0,
+            "max_observed_batch": self.max_observed_batch,
+            "pending": self._pending_texts,
+        }
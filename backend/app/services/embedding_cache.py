@@ -0,0 +1,161 @@
+"""
+Query Embedding Cache
+
+Process-wide LRU cache of query embeddings for SemanticMemoryService.
+
+The hybrid context path and the recall agent embed the same sub-queries and
+the same "recent scene" text again on every regeneration / variant, which
+costs a sentence-transformer pass (or an embedding API call) each time.
+Entries are keyed by (provider, model, sha256(text)), so switching the
+embedding provider or model never returns vectors from another space.
+
+The cache is bounded by memory (bytes of the stored float32 vectors), not by
+entry count, and can optionally be persisted to a .npz file so a restart does
+not start cold. Only query embeddings go through here - document embeddings
+(scene events, chronicles, backfills) are stored in pgvector already.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+
+def make_key(provider: str, model: Optional[str], text: str) -> CacheKey:
+    """Cache key for a text embedded by the given provider/model."""
+    return (provider or "", model or "", hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+
+class EmbeddingCache:
+    """
+    Size-aware LRU cache of embedding vectors.
+
+    Args:
+        max_bytes: Upper bound for the summed size of the stored vectors
+        persist_path: Optional .npz file used by load() / save()
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, persist_path: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.persist_path = persist_path or None
+        self._entries: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def get_many(self, keys: Sequence[CacheKey]) -> List[Optional[np.ndarray]]:
+        return [self.get(key) for key in keys]
+
+    def put(self, key: CacheKey, vector) -> None:
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = vector
+            self._bytes += vector.nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        """Get cache counters for monitoring"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "evictions": self.evictions,
+                "persist_path": self.persist_path,
+            }
+
+    def save(self) -> int:
+        """Write entries (oldest first) to persist_path. Returns number of entries saved."""
+        if not self.persist_path:
+            return 0
+        with self._lock:
+            items = list(self._entries.items())
+        if not items:
+            return 0
+
+        keys = np.array(["\x1f".join(key) for key, _ in items])
+        dims = np.array([vec.shape[0] for _, vec in items], dtype=np.int32)
+        data = np.concatenate([vec for _, vec in items])
+
+        directory = os.path.dirname(self.persist_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.persist_path}.tmp.npz"
+        np.savez(tmp_path, keys=keys, dims=dims, data=data)
+        os.replace(tmp_path, self.persist_path)
+        logger.info(f"[EMBED CACHE] Saved {len(items)} query embeddings to {self.persist_path}")
+        return len(items)
+
+    def load(self) -> int:
+        """Load entries from persist_path (missing or unreadable files are ignored)."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return 0
+        try:
+            with np.load(self.persist_path, allow_pickle=False) as archive:
+                keys, dims, data = archive["keys"], archive["dims"], archive["data"]
+            offset = 0
+            for key, dim in zip(keys, dims):
+                parts = tuple(str(key).split("\x1f"))
+                vector = data[offset:offset + int(dim)]
+                offset += int(dim)
+                if len(parts) == 3:
+                    self.put(parts, vector)
+            logger.info(f"[EMBED CACHE] Loaded {len(keys)} query embeddings from {self.persist_path}")
+            return len(keys)
+        except Exception as e:
+            logger.warning(f"[EMBED CACHE] Failed to load {self.persist_path}: {e}")
+            return 0
+
+
+_query_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_query_embedding_cache() -> EmbeddingCache:
+    """Get the shared query embedding cache (created from config.yaml on first use)."""
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        from ..config import settings
+        config = settings.semantic_query_cache
+        _query_embedding_cache = EmbeddingCache(
+            max_bytes=int(config.get("max_mb", 64)) * 1024 * 1024,
+            persist_path=config.get("persist_path") or None,
+        )
+        _query_embedding_cache.load()
+    return _query_embedding_cache
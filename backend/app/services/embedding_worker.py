@@ -0,0 +1,211 @@
+"""
+Shared Embedding / Rerank Worker
+
+A small localhost HTTP service that owns the local bi-encoder and
+cross-encoder, so several uvicorn API workers can share one copy of the
+models instead of loading their own (RAM and cold start scale with model
+count, not worker count).
+
+Run it next to the API:
+
+    cd backend
+    python -m app.services.embedding_worker --port 9877
+
+and point the API at it with semantic_memory.worker in config.yaml (or pick
+the "worker" embedding provider in settings). The API side talks to it through
+EmbeddingWorkerClient below.
+
+Requests from all API workers are coalesced into model batches by an
+EmbeddingBatcher inside the worker. Vectors travel as base64-encoded float32
+to keep payloads small.
+"""
+
+import argparse
+import asyncio
+import base64
+import logging
+import weakref
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKER_URL = "http://127.0.0.1:9877"
+
+
+def encode_array(array: np.ndarray) -> dict:
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    return {"data": base64.b64encode(array.tobytes()).decode("ascii"), "shape": list(array.shape)}
+
+
+def decode_array(payload: dict) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(payload["data"]), dtype=np.float32).reshape(payload["shape"])
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+def create_worker_app(embedding_model: str, reranker_model: Optional[str], inference: dict,
+                      max_batch_size: int = 64, max_wait_ms: float = 5.0):
+    """Build the worker ASGI app. Models are loaded lazily on first request."""
+    from fastapi import FastAPI, HTTPException
+    from pydantic import BaseModel
+
+    from .embedding_batcher import EmbeddingBatcher
+    from .inference_backends import load_embedding_model, load_reranker_model
+
+    app = FastAPI(title="Kahani embedding worker")
+    state = {"embedder": None, "reranker": None}
+    load_lock = asyncio.Lock()
+
+    async def _embedder():
+        if state["embedder"] is None:
+            async with load_lock:
+                if state["embedder"] is None:
+                    logger.info(f"[EMBED WORKER] Loading embedding model {embedding_model}")
+                    state["embedder"] = await asyncio.to_thread(
+                        load_embedding_model, embedding_model,
+                        inference.get("embedding_backend", "torch"),
+                        inference.get("onnx_cache_dir", "./data/models/onnx"),
+                    )
+        return state["embedder"]
+
+    async def _reranker():
+        if not reranker_model:
+            raise HTTPException(status_code=404, detail="Reranker not configured on this worker")
+        if state["reranker"] is None:
+            async with load_lock:
+                if state["reranker"] is None:
+                    logger.info(f"[EMBED WORKER] Loading reranker {reranker_model}")
+                    state["reranker"] = await asyncio.to_thread(
+                        load_reranker_model, reranker_model,
+                        inference.get("reranker_backend", "torch"),
+                        inference.get("onnx_cache_dir", "./data/models/onnx"),
+                    )
+        return state["reranker"]
+
+    async def _encode(texts: List[str]) -> np.ndarray:
+        model = await _embedder()
+        return await asyncio.to_thread(
+            lambda: model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+        )
+
+    batcher = EmbeddingBatcher(_encode, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    class EmbedRequest(BaseModel):
+        texts: List[str]
+
+    class RerankRequest(BaseModel):
+        pairs: List[List[str]]
+
+    @app.get("/health")
+    async def health():
+        embedder = state["embedder"]
+        return {
+            "status": "healthy",
+            "embedding_model": embedding_model,
+            "reranker_model": reranker_model,
+            "embedding_loaded": embedder is not None,
+            "reranker_loaded": state["reranker"] is not None,
+            "dimension": embedder.get_sentence_embedding_dimension() if embedder is not None else None,
+            "batching": batcher.get_stats(),
+        }
+
+    @app.post("/embed")
+    async def embed(request: EmbedRequest):
+        embeddings = await batcher.submit(request.texts)
+        model = await _embedder()
+        return {
+            "embeddings": encode_array(np.asarray(embeddings)),
+            "dimension": model.get_sentence_embedding_dimension(),
+        }
+
+    @app.post("/rerank")
+    async def rerank(request: RerankRequest):
+        reranker = await _reranker()
+        scores = await asyncio.to_thread(reranker.predict, request.pairs)
+        return {"scores": [float(s) for s in scores]}
+
+    return app
+
+
+def main():
+    from ..config import settings
+
+    parser = argparse.ArgumentParser(description="Shared embedding / rerank worker for Kahani API workers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9877)
+    parser.add_argument("--embedding-model", default=settings.semantic_embedding_model)
+    parser.add_argument("--reranker-model", default=settings.semantic_reranker_model or "BAAI/bge-reranker-v2-m3")
+    parser.add_argument("--no-reranker", action="store_true")
+    args = parser.parse_args()
+
+    import uvicorn
+    batching = settings.semantic_embedding_batching
+    app = create_worker_app(
+        args.embedding_model,
+        None if args.no_reranker else args.reranker_model,
+        settings.semantic_inference,
+        max_batch_size=int(batching.get("max_batch_size", 32)) * 2,
+        max_wait_ms=float(batching.get("max_wait_ms", 5)),
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+
+
+# ---------------------------------------------------------------------------
+# API-side client
+# ---------------------------------------------------------------------------
+
+class EmbeddingWorkerClient:
+    """Client used by SemanticMemoryService for the "worker" provider."""
+
+    def __init__(self, url: str = DEFAULT_WORKER_URL, timeout: float = 60.0):
+        self.url = (url or DEFAULT_WORKER_URL).rstrip("/")
+        self.timeout = timeout
+        # One pooled client per event loop (httpx connections are bound to the loop that opened them;
+        # admin re-embeds run in their own loop)
+        self._clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def _get_client(self):
+        import httpx
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._clients[loop] = httpx.AsyncClient(base_url=self.url, timeout=self.timeout)
+        return client
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        response = await self._get_client().post("/embed", json={"texts": texts})
+        response.raise_for_status()
+        return decode_array(response.json()["embeddings"])
+
+    async def health(self) -> dict:
+        response = await self._get_client().get("/health", timeout=5.0)
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+class WorkerReranker:
+    """CrossEncoder stand-in whose predict() is served by the worker (sync, run via to_thread)."""
+
+    def __init__(self, url: str = DEFAULT_WORKER_URL, timeout: float = 60.0):
+        import httpx
+        self.url = (url or DEFAULT_WORKER_URL).rstrip("/")
+        self._client = httpx.Client(timeout=timeout)
+
+    def predict(self, pairs, **kwargs) -> np.ndarray:
+        response = self._client.post(f"{self.url}/rerank", json={"pairs": [list(p) for p in pairs]})
+        response.raise_for_status()
+        return np.array(response.json()["scores"], dtype=np.float32)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    main()
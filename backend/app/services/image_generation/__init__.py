@@ -6,6 +6,7 @@ Provides AI-powered image generation using ComfyUI or other providers.
 
 from .base import ImageGenerationProvider, GenerationResult, GenerationStatus, GenerationRequest
 from .comfyui import ComfyUIProvider
+from .comfyui_events import ComfyUIEventListener, get_comfyui_listener
 from .prompt_generator import ImagePromptGenerator
 
 __all__ = [
@@ -14,5 +15,7 @@ __all__ = [
     "GenerationResult",
     "GenerationStatus",
     "ComfyUIProvider",
+    "ComfyUIEventListener",
+    "get_comfyui_listener",
     "ImagePromptGenerator",
 ]
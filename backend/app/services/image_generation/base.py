@@ -191,8 +191,8 @@ class ImageGenerationProvider(ABC):
         """
         Generate an image and wait for completion.
 
-        This is a convenience method that starts generation and polls
-        until complete or timeout.
+        This is a convenience method that starts generation and waits
+        for it with wait_for_result().
 
         Args:
             request: The generation request parameters
@@ -202,8 +202,6 @@ class ImageGenerationProvider(ABC):
         Returns:
             GenerationResult with final status and image if successful
         """
-        import asyncio
-
         # Start the generation
         result = await self.generate(request)
         if not result.success or result.status == GenerationStatus.FAILED:
@@ -217,6 +215,30 @@ class ImageGenerationProvider(ABC):
                 error_message="No job ID returned from generation request"
             )
 
+        return await self.wait_for_result(job_id, poll_interval, max_wait)
+
+    async def wait_for_result(
+        self,
+        job_id: str,
+        poll_interval: float = 2.0,
+        max_wait: float = 300.0
+    ) -> GenerationResult:
+        """
+        Wait for a submitted job to finish and fetch its result.
+
+        Polls get_job_status(); providers that receive job events can
+        override this to wait for them instead.
+
+        Args:
+            job_id: The job identifier
+            poll_interval: Seconds between status checks
+            max_wait: Maximum seconds to wait
+
+        Returns:
+            GenerationResult with final status and image if successful
+        """
+        import asyncio
+
         # Poll for completion
         elapsed = 0.0
         while elapsed < max_wait:
@@ -2,7 +2,8 @@
 ComfyUI Image Generation Provider
 
 Implements the ImageGenerationProvider interface for ComfyUI servers.
-Supports both HTTP polling and WebSocket connections for job status.
+Job status comes from the server's websocket events (see comfyui_events),
+with HTTP polling of /queue and /history as the fallback.
 """
 
 import asyncio
@@ -20,9 +21,13 @@ from .base import (
     GenerationResult,
     GenerationStatus,
 )
+from .comfyui_events import ComfyUIEventListener, ComfyUIJob, get_comfyui_listener
 
 logger = logging.getLogger(__name__)
 
+# How long generate() waits for the event websocket before falling back to polling
+WEBSOCKET_CONNECT_TIMEOUT = 5.0
+
 
 class ComfyUIProvider(ImageGenerationProvider):
     """ComfyUI image generation provider"""
@@ -33,16 +38,29 @@ class ComfyUIProvider(ImageGenerationProvider):
         api_key: Optional[str] = None,
         timeout: int = 300,
         polling_interval: float = 2.0,
+        use_websocket: bool = True,
+        fallback_to_polling: bool = True,
+        owner_id: Optional[int] = None,
     ):
         super().__init__(server_url, api_key, timeout)
         self.polling_interval = polling_interval
-        self._client_id = str(uuid.uuid4())
+        self.fallback_to_polling = fallback_to_polling
+        self.owner_id = owner_id
+        # The listener is shared by all providers for this server; prompts carry its client_id
+        # so ComfyUI sends their events to its websocket
+        self._listener = get_comfyui_listener(self.server_url, api_key) if use_websocket else None
+        self._client_id = self._listener.client_id if self._listener else str(uuid.uuid4())
         self._http_client: Optional[httpx.AsyncClient] = None
 
     @property
     def provider_name(self) -> str:
         return "comfyui"
 
+    @property
+    def event_listener(self) -> Optional[ComfyUIEventListener]:
+        """Websocket listener for this server (None when polling only)"""
+        return self._listener
+
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client"""
         if self._http_client is None or self._http_client.is_closed:
@@ -550,6 +568,19 @@ class ComfyUIProvider(ImageGenerationProvider):
                 # Default to txt2img for SDXL/SD models
                 workflow = self._build_txt2img_workflow(request)
 
+            listening = False
+            if self._listener is not None:
+                # The socket must be open before queueing, or the first events are lost
+                listening = await self._listener.ensure_connected(WEBSOCKET_CONNECT_TIMEOUT)
+                if not listening:
+                    if not self.fallback_to_polling:
+                        return GenerationResult(
+                            success=False,
+                            status=GenerationStatus.FAILED,
+                            error_message="ComfyUI websocket is not reachable"
+                        )
+                    logger.warning(f"[COMFYUI EVENTS] No websocket to {self.server_url}, polling job status")
+
             # Submit the prompt
             payload = {
                 "prompt": workflow,
@@ -578,6 +609,8 @@ class ComfyUIProvider(ImageGenerationProvider):
                 )
 
             logger.info(f"ComfyUI job submitted with prompt_id: {prompt_id}")
+            if listening:
+                self._listener.track(prompt_id, self.owner_id)
 
             return GenerationResult(
                 success=True,
@@ -592,6 +625,7 @@ class ComfyUIProvider(ImageGenerationProvider):
                     "cfg_scale": request.cfg_scale,
                     "sampler": request.sampler,
                     "checkpoint": request.checkpoint,
+                    "tracking": "websocket" if listening else "polling",
                 }
             )
 
@@ -603,8 +637,52 @@ class ComfyUIProvider(ImageGenerationProvider):
                 error_message=str(e)
             )
 
+    def _tracked_job(self, job_id: str) -> Optional[ComfyUIJob]:
+        """The job's live entry if its events are being received."""
+        if self._listener is None:
+            return None
+        job = self._listener.jobs.get(job_id)
+        return job if job is not None and job.tracked else None
+
+    async def wait_for_result(
+        self,
+        job_id: str,
+        poll_interval: float = 2.0,
+        max_wait: float = 300.0
+    ) -> GenerationResult:
+        """Wait for the job's completion event (polling if it isn't tracked)"""
+        job = self._tracked_job(job_id)
+        if job is None:
+            return await super().wait_for_result(job_id, poll_interval, max_wait)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while not job.done.is_set():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return GenerationResult(
+                    success=False,
+                    status=GenerationStatus.FAILED,
+                    job_id=job_id,
+                    error_message=f"Generation timed out after {max_wait} seconds"
+                )
+            try:
+                await asyncio.wait_for(job.done.wait(), min(remaining, self.polling_interval))
+            except asyncio.TimeoutError:
+                if not self._listener.connected:
+                    # Events are lost while the socket is down
+                    await self._listener.refresh(job)
+
+        if job.status == GenerationStatus.FAILED:
+            logger.warning(f"Job {job_id} failed: {job.error_message}")
+        return job.to_result(take_image=True)
+
     async def get_job_status(self, job_id: str) -> GenerationResult:
         """Get the status of a generation job"""
+        job = self._tracked_job(job_id)
+        if job is not None:
+            return job.to_result()
+
         try:
             client = await self._get_client()
 
@@ -682,6 +760,11 @@ class ComfyUIProvider(ImageGenerationProvider):
 
     async def get_result(self, job_id: str) -> GenerationResult:
         """Get the result of a completed generation job"""
+        job = self._tracked_job(job_id)
+        if job is not None and job.image_data is not None:
+            # Already downloaded when the job finished
+            return job.to_result(take_image=True)
+
         try:
             client = await self._get_client()
 
@@ -0,0 +1,448 @@
+"""
+ComfyUI event tracking
+
+One persistent websocket per ComfyUI server (ws://<server>/ws?clientId=<id>).
+Every ComfyUIProvider for that server submits its prompts with the listener's
+client_id, so ComfyUI pushes the events of all our jobs over this one
+connection and the job table is updated as they arrive, instead of polling
+/queue and /history for each job:
+
+- execution_start / executing          -> processing (current node)
+- progress (value / max)               -> step counter and progress
+- executed (output.images)             -> image references
+- execution_success, or executing with node None (older ComfyUI)
+                                       -> the first output image is downloaded
+                                          once, right away, then completed
+- execution_error / execution_interrupted -> failed / cancelled
+
+Subscribers (the /api/image-generation/events SSE stream, generate_and_wait) are
+notified on every change. Events sent while the socket is down are lost, so
+after a reconnect the unfinished jobs are re-checked once via /history.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from .base import GenerationResult, GenerationStatus
+
+logger = logging.getLogger(__name__)
+
+_FINISHED = (GenerationStatus.COMPLETED, GenerationStatus.FAILED, GenerationStatus.CANCELLED)
+
+# Unfinished jobs without any event for this long are dropped (server restarted, queue cleared)
+_STALE_SECONDS = 3600.0
+
+
+@dataclass
+class ComfyUIJob:
+    """Live state of one submitted prompt."""
+    prompt_id: str
+    owner_id: Optional[int] = None
+    status: GenerationStatus = GenerationStatus.QUEUED
+    current_step: int = 0
+    total_steps: int = 0
+    current_node: Optional[str] = None
+    images: List[Dict[str, Any]] = field(default_factory=list)
+    image_data: Optional[bytes] = None
+    filename: Optional[str] = None
+    error_message: Optional[str] = None
+    updated_at: float = field(default_factory=time.monotonic)
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    tracked: bool = False  # Submitted by us (events can arrive before the /prompt response)
+    completion_pending: bool = False
+    completing: bool = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    @property
+    def progress(self) -> float:
+        if self.status == GenerationStatus.COMPLETED:
+            return 1.0
+        return self.current_step / self.total_steps if self.total_steps else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-safe view for subscribers."""
+        return {
+            "job_id": self.prompt_id,
+            "status": self.status.value,
+            "progress": round(self.progress, 3),
+            "current_step": self.current_step,
+            "total_steps": self.total_steps,
+            "error": self.error_message,
+        }
+
+    def to_result(self, take_image: bool = False) -> GenerationResult:
+        """
+        GenerationResult for this job.
+
+        Args:
+            take_image: Hand over the downloaded image and drop it from the
+                table (later lookups fall back to /history + /view)
+        """
+        image_data = self.image_data
+        if take_image:
+            self.image_data = None
+        return GenerationResult(
+            success=self.status not in (GenerationStatus.FAILED, GenerationStatus.CANCELLED),
+            status=self.status,
+            job_id=self.prompt_id,
+            image_data=image_data,
+            filename=self.filename,
+            error_message=self.error_message,
+            progress=self.progress,
+            current_step=self.current_step,
+            total_steps=self.total_steps,
+        )
+
+
+class ComfyUIEventListener:
+    """
+    Websocket listener and job table for one ComfyUI server.
+
+    Args:
+        server_url: ComfyUI base URL (http/https)
+        api_key: Bearer token, if the server requires one
+        finished_ttl: Seconds finished jobs stay queryable
+    """
+
+    def __init__(self, server_url: str, api_key: Optional[str] = None, finished_ttl: float = 600.0):
+        self.server_url = server_url.rstrip('/')
+        self.api_key = api_key
+        self.finished_ttl = finished_ttl
+        self.client_id = str(uuid.uuid4())
+        self.jobs: Dict[str, ComfyUIJob] = {}
+        self.connected = False
+        self._subscribers: List[Tuple[Optional[int], Optional[str], asyncio.Queue]] = []
+        self._connected_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._background: Set[asyncio.Task] = set()
+        self.events = 0
+        self.reconnects = 0
+        self.downloads = 0
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def _ws_url(self) -> str:
+        base = self.server_url
+        if base.startswith("https://"):
+            base = "wss://" + base[len("https://"):]
+        elif base.startswith("http://"):
+            base = "ws://" + base[len("http://"):]
+        return f"{base}/ws?clientId={self.client_id}"
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                base_url=self.server_url,
+                headers=self._headers(),
+                timeout=httpx.Timeout(120.0, connect=30.0),
+            )
+        return self._http_client
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+
+    async def ensure_connected(self, timeout: float = 5.0) -> bool:
+        """Start the listener if needed; True once the websocket is open."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._connected_event = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        if self.connected:
+            return True
+        try:
+            await asyncio.wait_for(self._connected_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _run(self) -> None:
+        import websockets
+
+        delay = 1.0
+        while True:
+            try:
+                async with websockets.connect(
+                    self._ws_url(), extra_headers=self._headers(), max_size=None, ping_interval=20,
+                ) as ws:
+                    self.connected = True
+                    self._connected_event.set()
+                    delay = 1.0
+                    logger.info(f"[COMFYUI EVENTS] Connected to {self.server_url}")
+                    if self.reconnects:
+                        self._spawn(self._resync())
+                    async for message in ws:
+                        if isinstance(message, bytes):
+                            continue  # Latent previews
+                        try:
+                            self.handle_message(json.loads(message))
+                        except ValueError:
+                            continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[COMFYUI EVENTS] Websocket to {self.server_url} failed: {e}")
+            finally:
+                self.connected = False
+                if self._connected_event is not None:
+                    self._connected_event.clear()
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def _resync(self) -> None:
+        """Catch up on jobs that may have finished while disconnected."""
+        for job in [j for j in self.jobs.values() if not j.finished and not j.completing]:
+            await self.refresh(job)
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        for task in list(self._background):
+            task.cancel()
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+
+    # ------------------------------------------------------------------
+    # Job table
+    # ------------------------------------------------------------------
+
+    def track(self, prompt_id: str, owner_id: Optional[int] = None) -> ComfyUIJob:
+        """Register a submitted prompt (its events may already have arrived)."""
+        job = self._job(prompt_id)
+        job.tracked = True
+        if owner_id is not None:
+            job.owner_id = owner_id
+        self._publish(job)
+        if job.completion_pending:
+            self._complete(job)
+        return job
+
+    def _job(self, prompt_id: str) -> ComfyUIJob:
+        job = self.jobs.get(prompt_id)
+        if job is None:
+            job = self.jobs[prompt_id] = ComfyUIJob(prompt_id=prompt_id)
+        return job
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        """Apply one websocket event to the job table."""
+        kind = message.get("type")
+        data = message.get("data") or {}
+        prompt_id = data.get("prompt_id")
+        if not prompt_id:
+            return  # Queue status broadcasts
+        self.events += 1
+        job = self._job(prompt_id)
+        if job.finished:
+            return
+
+        if kind == "execution_start" or kind == "execution_cached":
+            job.status = GenerationStatus.PROCESSING
+        elif kind == "executing":
+            if data.get("node") is None:
+                self._complete(job)
+                return
+            job.status = GenerationStatus.PROCESSING
+            job.current_node = str(data["node"])
+        elif kind == "progress":
+            job.status = GenerationStatus.PROCESSING
+            job.current_step = int(data.get("value", 0))
+            job.total_steps = int(data.get("max", 0))
+        elif kind == "executed":
+            job.images.extend((data.get("output") or {}).get("images") or [])
+        elif kind == "execution_success":
+            self._complete(job)
+            return
+        elif kind == "execution_error":
+            job.error_message = str(data.get("exception_message") or "Generation failed")
+            logger.error(f"[COMFYUI EVENTS] Job {prompt_id} failed in {data.get('node_type')}: {job.error_message}")
+            self._settle(job, GenerationStatus.FAILED)
+            return
+        elif kind == "execution_interrupted":
+            self._settle(job, GenerationStatus.CANCELLED)
+            return
+        else:
+            return
+        job.updated_at = time.monotonic()
+        self._publish(job)
+
+    def _complete(self, job: ComfyUIJob) -> None:
+        if not job.tracked:
+            # Download once the submitter has registered the job
+            job.completion_pending = True
+            return
+        if job.completing:
+            return
+        job.completing = True
+        self._spawn(self._download(job))
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _download(self, job: ComfyUIJob) -> None:
+        """Fetch the job's output image once and mark it completed."""
+        try:
+            if not job.images:
+                # Fully cached prompts send no 'executed' events
+                history = await self._history(job.prompt_id)
+                job.images = _history_images(history or {})
+            image = next((i for i in job.images if i.get("type", "output") == "output"), None)
+            if image is None or not image.get("filename"):
+                job.error_message = "No images found in job output"
+                self._settle(job, GenerationStatus.FAILED)
+                return
+            job.image_data = await self._fetch_image(image)
+            job.filename = image["filename"]
+            self.downloads += 1
+            self._settle(job, GenerationStatus.COMPLETED)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[COMFYUI EVENTS] Failed to download result of job {job.prompt_id}: {e}")
+            job.error_message = f"Failed to download image: {e}"
+            self._settle(job, GenerationStatus.FAILED)
+
+    async def _history(self, prompt_id: str) -> Optional[Dict[str, Any]]:
+        response = await self._get_client().get(f"/history/{prompt_id}")
+        if response.status_code != 200:
+            return None
+        return response.json().get(prompt_id)
+
+    async def _fetch_image(self, image: Dict[str, Any]) -> bytes:
+        params = {
+            "filename": image["filename"],
+            "subfolder": image.get("subfolder", ""),
+            "type": image.get("type", "output"),
+        }
+        response = await self._get_client().get("/view", params=params)
+        response.raise_for_status()
+        return response.content
+
+    async def refresh(self, job: ComfyUIJob) -> None:
+        """Check one job via /history (missed events); completes or fails it if it has finished."""
+        if job.finished or job.completing:
+            return
+        try:
+            history = await self._history(job.prompt_id)
+        except Exception as e:
+            logger.warning(f"[COMFYUI EVENTS] History check for job {job.prompt_id} failed: {e}")
+            return
+        if not history:
+            return
+        status_data = history.get("status", {})
+        if status_data.get("status_str") == "error":
+            messages = status_data.get("messages") or []
+            job.error_message = str(messages[0]) if messages and messages[0] else "Generation failed"
+            self._settle(job, GenerationStatus.FAILED)
+        elif history.get("outputs"):
+            job.images = _history_images(history)
+            self._complete(job)
+
+    def _settle(self, job: ComfyUIJob, status: GenerationStatus) -> None:
+        job.status = status
+        job.updated_at = time.monotonic()
+        job.done.set()
+        self._publish(job)
+        self._prune()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for prompt_id, job in list(self.jobs.items()):
+            age = now - job.updated_at
+            if (job.finished and age > self.finished_ttl) or (not job.completing and age > _STALE_SECONDS):
+                del self.jobs[prompt_id]
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(self, owner_id: Optional[int] = None, job_id: Optional[str] = None) -> asyncio.Queue:
+        """Queue of job snapshots, optionally limited to one owner and/or job."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        self._subscribers.append((owner_id, job_id, queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers = [s for s in self._subscribers if s[2] is not queue]
+
+    def _publish(self, job: ComfyUIJob) -> None:
+        snapshot = None
+        for owner_id, job_id, queue in self._subscribers:
+            if owner_id is not None and job.owner_id != owner_id:
+                continue
+            if job_id is not None and job.prompt_id != job_id:
+                continue
+            snapshot = snapshot or job.snapshot()
+            if queue.full():
+                # Slow consumer: the newest state matters more than the history
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+    def get_stats(self) -> dict:
+        """Get listener statistics for monitoring"""
+        active = [j for j in self.jobs.values() if not j.finished]
+        return {
+            "server_url": self.server_url,
+            "connected": self.connected,
+            "active_jobs": len(active),
+            "tracked_jobs": len(self.jobs),
+            "subscribers": len(self._subscribers),
+            "events": self.events,
+            "downloads": self.downloads,
+            "reconnects": self.reconnects,
+        }
+
+
+def _history_images(history: Dict[str, Any]) -> List[Dict[str, Any]]:
+    images = []
+    for node_output in (history.get("outputs") or {}).values():
+        images.extend(node_output.get("images") or [])
+    return images
+
+
+# One listener per server and credential
+_listeners: Dict[Tuple[str, str], ComfyUIEventListener] = {}
+
+
+def get_comfyui_listener(server_url: str, api_key: Optional[str] = None) -> ComfyUIEventListener:
+    key = (server_url.rstrip('/'), hashlib.sha256((api_key or "").encode()).hexdigest())
+    listener = _listeners.get(key)
+    if listener is None:
+        from app.config import settings
+        ttl = settings.image_generation.get("comfyui", {}).get("finished_job_ttl", 600)
+        listener = _listeners[key] = ComfyUIEventListener(server_url, api_key, finished_ttl=float(ttl))
+    return listener
+
+
+def get_comfyui_event_stats() -> List[dict]:
+    return [listener.get_stats() for listener in _listeners.values()]
+
+
+async def close_comfyui_listeners() -> None:
+    """Close every websocket listener (application shutdown)."""
+    for listener in list(_listeners.values()):
+        await listener.close()
+    _listeners.clear()
@@ -0,0 +1,111 @@
+"""
+Generated image derivatives and delivery URLs
+
+Every saved image is stored once at full resolution plus WebP thumbnails
+(image_generation.derivatives.sizes, longest edge in pixels) next to it:
+
+  story_12/scene_20260101_120000_ab12cd34.png
+  story_12/scene_20260101_120000_ab12cd34.w256.webp
+  story_12/scene_20260101_120000_ab12cd34.w512.webp
+
+The content hash of the original and the derivative paths are recorded in
+generation_params ("content_hash", "derivatives"); thumbnail_path points at
+the smallest size. Image URLs embed the content hash, so the bytes behind a
+URL never change and browsers may cache them as immutable.
+
+Signed mode (image_generation.serving.signed_urls) hands out nginx
+secure_link URLs instead: nginx checks signature and expiry and serves the
+file from storage_path itself, without a request to the backend. Expiry is
+rounded up to whole url_ttl_seconds windows, so the URL of an image stays the
+same - and cached - within a window.
+"""
+
+import base64
+import hashlib
+import io
+import logging
+import os
+import time
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(data: bytes) -> str:
+    """Short content hash used as ETag and URL version."""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def derivative_filename(filename: str, size: int) -> str:
+    return f"{os.path.splitext(filename)[0]}.w{size}.webp"
+
+
+def create_derivatives(
+    image_data: bytes,
+    image_path: str,
+    sizes: Iterable[int],
+    quality: int = 80,
+) -> Dict[int, str]:
+    """
+    Write WebP thumbnails of an image next to it.
+
+    Sizes at or above the original's longest edge are skipped (the original
+    serves them). Returns {size: file path}; empty when Pillow is not
+    installed or the image can't be decoded.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.warning("[IMAGE DERIVATIVES] Pillow not installed, thumbnails disabled")
+        return {}
+
+    try:
+        source = Image.open(io.BytesIO(image_data))
+        source.load()
+    except Exception as e:
+        logger.warning(f"[IMAGE DERIVATIVES] Could not decode {os.path.basename(image_path)}: {e}")
+        return {}
+    if source.mode not in ("RGB", "RGBA"):
+        source = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+
+    written: Dict[int, str] = {}
+    for size in sorted(set(int(s) for s in sizes)):
+        if size >= max(source.size):
+            continue
+        thumbnail = source.copy()
+        thumbnail.thumbnail((size, size), Image.LANCZOS)
+        path = os.path.join(os.path.dirname(image_path), derivative_filename(os.path.basename(image_path), size))
+        part = path + ".part"
+        try:
+            thumbnail.save(part, format="WEBP", quality=quality, method=4)
+            os.replace(part, path)
+        except OSError as e:
+            logger.warning(f"[IMAGE DERIVATIVES] Failed to write {os.path.basename(path)}: {e}")
+            continue
+        written[size] = path
+    return written
+
+
+def pick_derivative(derivatives: Optional[Dict[str, str]], size: Optional[int]) -> Optional[Tuple[int, str]]:
+    """Smallest derivative of at least `size` pixels as (size, path); None means the original."""
+    if not derivatives or not size:
+        return None
+    candidates = sorted((int(s), path) for s, path in derivatives.items() if int(s) >= size)
+    return candidates[0] if candidates else None
+
+
+def sign_url(relative_path: str, secret: str, prefix: str, ttl: int, now: Optional[float] = None) -> str:
+    """
+    nginx secure_link URL for a file under storage_path.
+
+    Matches: secure_link_md5 "$secure_link_expires$uri <secret>";
+    """
+    now = time.time() if now is None else now
+    ttl = max(1, int(ttl))
+    # Valid for at least one full window, constant within the current one
+    expires = (int(now) // ttl + 2) * ttl
+    uri = prefix.rstrip('/') + '/' + quote(relative_path.lstrip('/'))
+    digest = hashlib.md5(f"{expires}{uri} {secret}".encode("utf-8")).digest()
+    signature = base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+    return f"{uri}?md5={signature}&expires={expires}"
@@ -0,0 +1,194 @@
+"""
+Image Job Scheduler
+
+Coordinates every ComfyUI generation of this process - interactive requests
+from the image endpoints and the chapter/story illustration batches run by the
+background job queue:
+
+- at most max_concurrent_per_server jobs are in flight per ComfyUI server;
+  further requests wait for a slot, interactive ones ahead of batch ones
+- identical generations (same prompt, seed and parameters) that overlap in
+  time are submitted once and every caller gets the result; requests without
+  a seed are random and never shared
+- map_prompts() runs LLM prompt generation with bounded concurrency
+
+The cap is per process; batches are persisted by the job queue, not here.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import time
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .base import GenerationRequest, GenerationResult, ImageGenerationProvider
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+T = TypeVar("T")
+
+
+def generation_key(server_url: str, request: GenerationRequest) -> str:
+    """Identity of a generation: the same key produces the same image (or is random with seed None)."""
+    encoded = json.dumps(
+        {"server": server_url.rstrip('/'), **asdict(request)},
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class _ServerSlots:
+    """In-flight cap for one server; the waiter with the lowest priority value goes first."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters: List[tuple] = []
+        self._order = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int) -> None:
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # Slot passes to the waiter, active count unchanged
+                return
+        self.active -= 1
+
+
+class ImageJobScheduler:
+    """
+    Per-server concurrency control and deduplication for image generation.
+
+    Args:
+        max_concurrent_per_server: Jobs submitted to one ComfyUI server at a time
+        prompt_concurrency: LLM prompt generations run at once by map_prompts()
+    """
+
+    def __init__(self, max_concurrent_per_server: int = 2, prompt_concurrency: int = 4):
+        self.max_concurrent_per_server = max(1, max_concurrent_per_server)
+        self.prompt_concurrency = max(1, prompt_concurrency)
+        self._slots: Dict[str, _ServerSlots] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.submitted = 0
+        self.deduplicated = 0
+        self.failed = 0
+        self.slot_wait_seconds = 0.0
+
+    def _server_slots(self, server_url: str) -> _ServerSlots:
+        key = server_url.rstrip('/')
+        slots = self._slots.get(key)
+        if slots is None:
+            slots = self._slots[key] = _ServerSlots(self.max_concurrent_per_server)
+        return slots
+
+    async def generate(
+        self,
+        provider: ImageGenerationProvider,
+        request: GenerationRequest,
+        priority: int = PRIORITY_INTERACTIVE,
+        max_wait: float = 300.0,
+    ) -> GenerationResult:
+        """Generate through provider.generate_and_wait once a server slot is free."""
+        # Without a seed every call is meant to produce a different image
+        key = generation_key(provider.server_url, request) if request.seed is not None else None
+        shared = self._inflight.get(key) if key else None
+        if shared is not None:
+            self.deduplicated += 1
+            logger.info(f"[IMAGE SCHEDULER] Joining identical in-flight generation {key[:12]}")
+            return await asyncio.shield(shared)
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may join; don't warn about an unretrieved exception
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        if key:
+            self._inflight[key] = future
+        try:
+            slots = self._server_slots(provider.server_url)
+            queued_at = time.monotonic()
+            await slots.acquire(priority)
+            self.slot_wait_seconds += time.monotonic() - queued_at
+            try:
+                self.submitted += 1
+                result = await provider.generate_and_wait(request, max_wait=max_wait)
+            finally:
+                slots.release()
+            if not result.success:
+                self.failed += 1
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            self.failed += 1
+            if not future.done():
+                future.set_exception(e if isinstance(e, Exception) else RuntimeError("Generation was cancelled"))
+            raise
+        finally:
+            if key:
+                self._inflight.pop(key, None)
+
+    async def map_prompts(self, factories: List[Callable[[], Awaitable[T]]]) -> List[T]:
+        """Run prompt-generation coroutines prompt_concurrency at a time, results in input order."""
+        semaphore = asyncio.Semaphore(self.prompt_concurrency)
+
+        async def bounded(factory):
+            async with semaphore:
+                return await factory()
+
+        return await asyncio.gather(*(bounded(f) for f in factories))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics for monitoring"""
+        return {
+            "max_concurrent_per_server": self.max_concurrent_per_server,
+            "prompt_concurrency": self.prompt_concurrency,
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "failed": self.failed,
+            "avg_slot_wait_s": round(self.slot_wait_seconds / self.submitted, 2) if self.submitted else 0.0,
+            "servers": {
+                url: {"in_flight": slots.active, "waiting": slots.waiting}
+                for url, slots in self._slots.items()
+            },
+        }
+
+
+# Global singleton
+_scheduler: Optional[ImageJobScheduler] = None
+
+
+def get_image_job_scheduler() -> ImageJobScheduler:
+    global _scheduler
+    if _scheduler is None:
+        from app.config import settings
+        config = settings.image_generation.get("scheduler", {})
+        _scheduler = ImageJobScheduler(
+            max_concurrent_per_server=int(config.get("max_concurrent_per_server", 2)),
+            prompt_concurrency=int(config.get("prompt_concurrency", 4)),
+        )
+    return _scheduler
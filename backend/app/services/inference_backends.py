@@ -0,0 +1,284 @@
+"""
+Inference Backends for Local Embedding / Reranker Models
+
+Selectable CPU inference backends for the sentence-transformers bi-encoder and
+the cross-encoder reranker used by SemanticMemoryService:
+
+- torch: full-precision PyTorch (default, previous behaviour)
+- int8:  PyTorch with dynamic int8 quantization of all Linear layers
+         (~2-3x faster on CPU, ~1/4 of the Linear weight memory)
+- onnx:  ONNX Runtime. The transformer is exported once to
+         semantic_memory.inference.onnx_cache_dir and reused on later starts;
+         pooling / normalization / activation are reproduced in numpy.
+         Requires the optional onnxruntime package (and onnx for the export).
+
+The returned objects expose the subset of the SentenceTransformer /
+CrossEncoder API the service uses (encode, get_sentence_embedding_dimension,
+predict), so callers don't need to know which backend is active.
+
+Use benchmarks/embedding_backends to compare throughput and
+tests/test_inference_backends.py for cosine parity against fp32.
+"""
+
+import logging
+import os
+import re
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "int8", "onnx")
+
+# Transformer inputs passed to the exported graph when the tokenizer produces them
+_MODEL_INPUTS = ("input_ids", "attention_mask", "token_type_ids")
+
+
+def _onnx_path(cache_dir: str, model_name: str, kind: str) -> str:
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+    return os.path.join(cache_dir, f"{safe_name}.{kind}.onnx")
+
+
+def _export_onnx(hf_model, tokenizer, path: str, pair_classifier: bool = False) -> List[str]:
+    """
+    Export a HuggingFace transformer to ONNX with dynamic batch / sequence axes.
+
+    pair_classifier=True exports a sequence-classification head (logits) fed
+    with (query, document) pairs; otherwise the last hidden state is exported.
+    """
+    import torch
+
+    if pair_classifier:
+        sample = tokenizer(["export sample"], ["sample document"], return_tensors="pt")
+        output_name = "logits"
+        output_axes = {0: "batch"}
+    else:
+        sample = tokenizer(["export sample"], return_tensors="pt")
+        output_name = "last_hidden_state"
+        output_axes = {0: "batch", 1: "sequence"}
+    input_names = [name for name in _MODEL_INPUTS if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes[output_name] = output_axes
+
+    class _Wrapper(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *args):
+            outputs = self.model(**dict(zip(input_names, args)))
+            return outputs[0]
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    hf_model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            _Wrapper(hf_model),
+            tuple(sample[name] for name in input_names),
+            tmp_path,
+            input_names=input_names,
+            output_names=[output_name],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False,
+        )
+    os.replace(tmp_path, path)
+    logger.info(f"[INFERENCE] Exported ONNX model to {path}")
+    return input_names
+
+
+def _create_session(path: str):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+class OnnxSentenceEncoder:
+    """ONNX Runtime replacement for SentenceTransformer.encode()."""
+
+    def __init__(self, session, tokenizer, pooling: str, normalize: bool, max_seq_length: int, dimension: int):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.pooling = pooling
+        self.normalize = normalize
+        self.max_seq_length = max_seq_length
+        self._dimension = dimension
+        self._input_names = [i.name for i in session.get_inputs()]
+
+    @classmethod
+    def from_sentence_transformer(cls, model, cache_dir: str, model_name: str) -> "OnnxSentenceEncoder":
+        from sentence_transformers import models as st_models
+
+        modules = list(model._modules.values())
+        transformer = modules[0]
+        if not isinstance(transformer, st_models.Transformer):
+            raise ValueError("ONNX backend needs a Transformer as the first module")
+
+        pooling, normalize = None, False
+        for module in modules[1:]:
+            if isinstance(module, st_models.Pooling):
+                config = module.get_config_dict()
+                if config.get("pooling_mode_mean_tokens"):
+                    pooling = "mean"
+                elif config.get("pooling_mode_cls_token"):
+                    pooling = "cls"
+                elif config.get("pooling_mode_max_tokens"):
+                    pooling = "max"
+            elif isinstance(module, st_models.Normalize):
+                normalize = True
+            else:
+                raise ValueError(f"ONNX backend does not support module {type(module).__name__}")
+        if pooling is None:
+            raise ValueError("ONNX backend needs a mean, cls or max Pooling module")
+
+        path = _onnx_path(cache_dir, model_name, "embedding")
+        if not os.path.exists(path):
+            _export_onnx(transformer.auto_model, transformer.tokenizer, path)
+
+        return cls(
+            session=_create_session(path),
+            tokenizer=transformer.tokenizer,
+            pooling=pooling,
+            normalize=normalize,
+            max_seq_length=transformer.max_seq_length,
+            dimension=model.get_sentence_embedding_dimension(),
+        )
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+    def encode(self, sentences: Union[str, Sequence[str]], batch_size: int = 32, convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self._dimension), dtype=np.float32)
+
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            encoded = self.tokenizer(
+                batch, padding=True, truncation="longest_first",
+                max_length=self.max_seq_length, return_tensors="np",
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self._input_names}
+            hidden = self.session.run(None, feeds)[0]
+            mask = encoded["attention_mask"].astype(np.float32)[..., None]
+
+            if self.pooling == "mean":
+                pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            elif self.pooling == "cls":
+                pooled = hidden[:, 0]
+            else:
+                pooled = np.where(mask > 0, hidden, -1e9).max(axis=1)
+
+            if self.normalize:
+                pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            outputs.append(pooled.astype(np.float32))
+
+        embeddings = np.concatenate(outputs)
+        return embeddings[0] if single else embeddings
+
+
+class OnnxCrossEncoder:
+    """ONNX Runtime replacement for CrossEncoder.predict()."""
+
+    def __init__(self, session, tokenizer, max_length: Optional[int], apply_sigmoid: bool):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.apply_sigmoid = apply_sigmoid
+        self._input_names = [i.name for i in session.get_inputs()]
+
+    @classmethod
+    def from_cross_encoder(cls, model, cache_dir: str, model_name: str) -> "OnnxCrossEncoder":
+        import torch
+
+        path = _onnx_path(cache_dir, model_name, "reranker")
+        if not os.path.exists(path):
+            _export_onnx(model.model, model.tokenizer, path, pair_classifier=True)
+
+        return cls(
+            session=_create_session(path),
+            tokenizer=model.tokenizer,
+            max_length=model.max_length,
+            apply_sigmoid=isinstance(model.default_activation_function, torch.nn.Sigmoid),
+        )
+
+    def predict(self, sentences: Sequence[Sequence[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        pairs = list(sentences)
+        scores = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            encoded = self.tokenizer(
+                [p[0] for p in batch], [p[1] for p in batch],
+                padding=True, truncation="longest_first",
+                max_length=self.max_length, return_tensors="np",
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self._input_names}
+            logits = self.session.run(None, feeds)[0]
+            if self.apply_sigmoid:
+                logits = 1.0 / (1.0 + np.exp(-logits))
+            scores.append(logits[:, 0] if logits.shape[1] == 1 else logits)
+        return np.concatenate(scores) if scores else np.zeros(0, dtype=np.float32)
+
+
+def _quantize_int8(module):
+    import torch
+    return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_embedding_model(model_name: str, backend: str = "torch", onnx_cache_dir: str = "./data/models/onnx"):
+    """
+    Load the bi-encoder with the requested backend.
+
+    Falls back to full-precision torch (with a warning) when the backend
+    cannot be used, e.g. onnxruntime is not installed.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name)
+    # Backend actually in use; vectors differ slightly between backends
+    model.inference_backend = "torch"
+    if backend == "torch":
+        return model
+    try:
+        if backend == "int8":
+            model = _quantize_int8(model)
+            model.inference_backend = "int8"
+            logger.info(f"[INFERENCE] Embedding model {model_name} quantized to int8")
+            return model
+        if backend == "onnx":
+            encoder = OnnxSentenceEncoder.from_sentence_transformer(model, onnx_cache_dir, model_name)
+            encoder.inference_backend = "onnx"
+            logger.info(f"[INFERENCE] Embedding model {model_name} running on ONNX Runtime")
+            return encoder
+        logger.warning(f"[INFERENCE] Unknown embedding backend '{backend}', using torch")
+    except Exception as e:
+        logger.warning(f"[INFERENCE] {backend} backend unavailable for {model_name} ({e}), using torch")
+    return model
+
+
+def load_reranker_model(model_name: str, backend: str = "torch", onnx_cache_dir: str = "./data/models/onnx"):
+    """Load the cross-encoder with the requested backend (same fallback rules)."""
+    from sentence_transformers import CrossEncoder
+
+    model = CrossEncoder(model_name)
+    if backend == "torch":
+        return model
+    try:
+        if backend == "int8":
+            model.model = _quantize_int8(model.model)
+            logger.info(f"[INFERENCE] Reranker {model_name} quantized to int8")
+            return model
+        if backend == "onnx":
+            reranker = OnnxCrossEncoder.from_cross_encoder(model, onnx_cache_dir, model_name)
+            logger.info(f"[INFERENCE] Reranker {model_name} running on ONNX Runtime")
+            return reranker
+        logger.warning(f"[INFERENCE] Unknown reranker backend '{backend}', using torch")
+    except Exception as e:
+        logger.warning(f"[INFERENCE] {backend} backend unavailable for {model_name} ({e}), using torch")
+    return model
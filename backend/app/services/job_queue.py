@@ -0,0 +1,588 @@
+"""
+Background Job Queue
+
+Durable, prioritized queue for background work (post-scene extractions,
+backfills), backed by the background_jobs table.
+
+Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+workers across uvicorn processes can drain the queue without double-running a
+job. Compared to fire-and-forget asyncio tasks:
+
+- jobs survive restarts: every process heartbeats the jobs it is running, and
+  running jobs without a heartbeat for job_queue.stale_after_seconds (their
+  worker died) are re-queued by the periodic sweep of any live process
+- lower priority values run first (interactive < extraction < backfill), and
+  while a scene is being generated in this process, workers only take
+  interactive jobs (for up to interactive_grace_seconds), so extraction doesn't
+  compete with the user for the LLM
+- duplicate work is coalesced: enqueueing with the coalesce_key of a job that is
+  still pending updates that job (sequence ranges are widened) instead of adding
+  another one
+- failures are retried with exponential backoff up to max_attempts
+
+Payloads must be JSON-serializable. Extras that can't be stored (the scene
+generation context used for cache-friendly prompts) are kept in memory by the
+enqueueing process and passed to the handler when the same process runs the
+job; after a restart or on another process the handler gets none and rebuilds.
+
+When the queue is disabled (job_queue.enabled: false) or not started,
+submit_job() runs the handler as a plain asyncio task, as before.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from ..utils.circuit_breaker import LANE_BACKGROUND, reset_llm_lane, set_llm_lane
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_EXTRACTION = 10
+PRIORITY_BACKFILL = 20
+
+JobHandler = Callable[..., Awaitable[Any]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+# Handlers started directly by submit_job() while the queue isn't running
+_direct_tasks: Set[asyncio.Task] = set()
+_current_job_id: ContextVar[Optional[int]] = ContextVar("current_job_id", default=None)
+
+
+def register_job_handler(job_type: str, handler: JobHandler) -> None:
+    """Register the coroutine function that runs jobs of a type (called with payload + extras as kwargs)."""
+    _handlers[job_type] = handler
+
+
+def merge_payload(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge a coalesced job's payload: newest values win, sequence ranges are widened."""
+    merged = {**(old or {}), **(new or {})}
+    if old and new:
+        if old.get("from_sequence") is not None and new.get("from_sequence") is not None:
+            merged["from_sequence"] = min(old["from_sequence"], new["from_sequence"])
+        if old.get("to_sequence") is not None and new.get("to_sequence") is not None:
+            merged["to_sequence"] = max(old["to_sequence"], new["to_sequence"])
+    return merged
+
+
+def retry_delay(attempts: int, base_delay: float) -> float:
+    """Backoff before retry number `attempts` (1-based): base, 2*base, 4*base, ..."""
+    return base_delay * (2 ** max(0, attempts - 1))
+
+
+class JobQueue:
+    """
+    Postgres-backed job queue with an in-process worker pool.
+
+    Args:
+        workers: Concurrent jobs run by this process
+        poll_interval: Seconds between polls when idle (jobs enqueued by this
+            process wake workers immediately)
+        max_attempts: Default attempts per job before it is marked failed
+        retry_base_delay: Backoff base in seconds
+        stale_after: Seconds without a heartbeat or progress report after
+            which a running job is presumed orphaned
+        interactive_grace: Max seconds workers hold back non-interactive jobs
+            while a scene is being generated
+        retention_hours: Finished jobs older than this are deleted by the sweep
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        poll_interval: float = 2.0,
+        max_attempts: int = 3,
+        retry_base_delay: float = 5.0,
+        stale_after: float = 600.0,
+        interactive_grace: float = 30.0,
+        retention_hours: float = 24.0,
+        enabled: bool = True,
+    ):
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.stale_after = stale_after
+        self.interactive_grace = interactive_grace
+        self.retention_hours = retention_hours
+        self.enabled = enabled
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        self._interactive: Dict[Any, float] = {}
+        self._active_jobs: Set[int] = set()
+
+        self.enqueued = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and not self._stopping
+
+    # ------------------------------------------------------------------
+    # Interactive activity
+    # ------------------------------------------------------------------
+
+    def mark_interactive_start(self, key: Any) -> None:
+        self._interactive[key] = time.monotonic()
+
+    def mark_interactive_end(self, key: Any) -> None:
+        self._interactive.pop(key, None)
+        self._wake()
+
+    def _interactive_active(self) -> bool:
+        now = time.monotonic()
+        return any(now - started < self.interactive_grace for started in self._interactive.values())
+
+    # ------------------------------------------------------------------
+    # Enqueue
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        story_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        priority: int = PRIORITY_EXTRACTION,
+        coalesce_key: Optional[str] = None,
+        extras: Optional[Dict[str, Any]] = None,
+        max_attempts: Optional[int] = None,
+    ) -> int:
+        """Persist a job (or coalesce it into a pending duplicate). Returns the job id."""
+        from sqlalchemy.exc import IntegrityError
+        from ..database import SessionLocal
+        from ..models import BackgroundJob
+
+        for _ in range(2):
+            with SessionLocal() as db:
+                if coalesce_key:
+                    existing = db.query(BackgroundJob).filter(
+                        BackgroundJob.coalesce_key == coalesce_key,
+                        BackgroundJob.status == "pending",
+                    ).with_for_update().first()
+                    if existing:
+                        existing.payload = merge_payload(existing.payload, payload)
+                        existing.priority = min(existing.priority, priority)
+                        db.commit()
+                        self.coalesced += 1
+                        if extras:
+                            self._extras[existing.id] = extras
+                        logger.info(f"[JOB QUEUE] Coalesced {job_type} into pending job {existing.id} ({coalesce_key})")
+                        return existing.id
+
+                job = BackgroundJob(
+                    job_type=job_type,
+                    priority=priority,
+                    status="pending",
+                    story_id=story_id,
+                    user_id=user_id,
+                    coalesce_key=coalesce_key,
+                    payload=payload,
+                    max_attempts=max_attempts or self.max_attempts,
+                )
+                db.add(job)
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # Another process enqueued the same key concurrently - coalesce into it
+                    db.rollback()
+                    continue
+                job_id = job.id
+
+            self.enqueued += 1
+            if extras:
+                self._extras[job_id] = extras
+            self._wake()
+            logger.debug(f"[JOB QUEUE] Enqueued {job_type} job {job_id} (priority={priority})")
+            return job_id
+        raise RuntimeError(f"Could not enqueue {job_type} job ({coalesce_key})")
+
+    def _wake(self) -> None:
+        if self._loop is None or self._wakeup is None or self._loop.is_closed():
+            return
+        try:
+            if asyncio.get_running_loop() is self._loop:
+                self._wakeup.set()
+                return
+        except RuntimeError:
+            pass
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Recover orphaned jobs and start the worker pool on the running loop."""
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        await asyncio.to_thread(self._recover_and_prune)
+        self._tasks = [self._loop.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(self._loop.create_task(self._sweeper()))
+        logger.info(f"[JOB QUEUE] Started {self.workers} workers ({self.worker_id})")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await asyncio.to_thread(self._release_running)
+        except Exception as e:
+            logger.warning(f"[JOB QUEUE] Failed to release running jobs on stop: {e}")
+
+    async def _worker(self, index: int) -> None:
+        while not self._stopping:
+            try:
+                self._wakeup.clear()
+                max_priority = PRIORITY_INTERACTIVE if self._interactive_active() else None
+                job = await asyncio.to_thread(self._claim, max_priority)
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[JOB QUEUE] Worker {index} error: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _sweeper(self) -> None:
+        """Heartbeat this process's running jobs and re-queue orphans of dead workers."""
+        interval = max(self.poll_interval, self.stale_after / 4)
+        while not self._stopping:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self._heartbeat_and_recover)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[JOB QUEUE] Stale job sweep failed: {e}")
+
+    def _heartbeat_and_recover(self) -> None:
+        from sqlalchemy import func
+        from ..database import SessionLocal
+        from ..models import BackgroundJob
+
+        active = list(self._active_jobs)
+        if active:
+            # Long jobs that don't report progress must not look orphaned
+            with SessionLocal() as db:
+                db.query(BackgroundJob).filter(
+                    BackgroundJob.id.in_(active),
+                    BackgroundJob.status == "running",
+                    BackgroundJob.locked_by == self.worker_id,
+                ).update({"locked_at": func.now()}, synchronize_session=False)
+                db.commit()
+        self._recover_and_prune()
+
+    def _claim(self, max_priority: Optional[int]) -> Optional[Dict[str, Any]]:
+        from sqlalchemy import func
+        from ..database import SessionLocal
+        from ..models import BackgroundJob
+
+        with SessionLocal() as db:
+            query = db.query(BackgroundJob).filter(
+                BackgroundJob.status == "pending",
+                BackgroundJob.run_after <= func.now(),
+            )
+            if max_priority is not None:
+                query = query.filter(BackgroundJob.priority <= max_priority)
+            job = query.order_by(BackgroundJob.priority, BackgroundJob.id).with_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status = "running"
+            job.locked_by = self.worker_id
+            job.locked_at = func.now()
+            job.attempts = (job.attempts or 0) + 1
+            claimed = {"id": job.id, "job_type": job.job_type, "payload": dict(job.payload or {}), "attempts": job.attempts}
+            db.commit()
+            return claimed
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        handler = _handlers.get(job["job_type"])
+        token = _current_job_id.set(job_id)
+        # LLM calls made by queued jobs queue behind user-facing generation
+        lane_token = set_llm_lane(LANE_BACKGROUND)
+        error: Optional[BaseException] = None
+        started = time.monotonic()
+        self._active_jobs.add(job_id)
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler registered for job type {job['job_type']}")
+            await handler(**job["payload"], **self._extras.get(job_id, {}))
+        except Exception as e:
+            error = e
+            logger.warning(f"[JOB QUEUE] Job {job_id} ({job['job_type']}) failed on attempt {job['attempts']}: {e}")
+        finally:
+            reset_llm_lane(lane_token)
+            _current_job_id.reset(token)
+        try:
+            status = await asyncio.to_thread(self._finish, job_id, error)
+        finally:
+            self._active_jobs.discard(job_id)
+        if status != "pending":
+            self._extras.pop(job_id, None)
+        logger.info(f"[JOB QUEUE] Job {job_id} ({job['job_type']}) {status} in {time.monotonic() - started:.1f}s")
+
+    def _finish(self, job_id: int, error: Optional[BaseException]) -> str:
+        from sqlalchemy import func
+        from ..database import SessionLocal
+        from ..models import BackgroundJob
+
+        with SessionLocal() as db:
+            job = db.query(BackgroundJob).filter(BackgroundJob.id == job_id).with_for_update().first()
+            if job is None:
+                return "deleted"
+            job.locked_by = None
+            if error is None:
+                job.status = "done"
+                job.last_error = None
+                job.finished_at = func.now()
+                self.completed += 1
+            elif job.attempts < job.max_attempts:
+                job.last_error = str(error)[:2000]
+                self._requeue(db, job, run_after=datetime.now(timezone.utc) + timedelta(
+                    seconds=retry_delay(job.attempts, self.retry_base_delay)
+                ))
+                self.retried += 1
+            else:
+                job.status = "failed"
+                job.last_error = str(error)[:2000]
+                job.finished_at = func.now()
+                self.failed += 1
+            status = job.status
+            db.commit()
+            return status
+
+    def _requeue(self, db, job, run_after: Optional[datetime] = None) -> None:
+        """
+        Put a locked job back to pending. Caller commits.
+
+        Only one job per coalesce_key may be pending (unique index), so when a
+        newer pending duplicate exists the job's payload is folded into it and
+        the job itself is closed as failed.
+        """
+        from sqlalchemy import func
+        from ..models import BackgroundJob
+
+        job.locked_by = None
+        duplicate = None
+        if job.coalesce_key:
+            duplicate = db.query(BackgroundJob).filter(
+                BackgroundJob.coalesce_key == job.coalesce_key,
+                BackgroundJob.status == "pending",
+                BackgroundJob.id != job.id,
+            ).with_for_update().first()
+        if duplicate is None:
+            job.status = "pending"
+            if run_after is not None:
+                job.run_after = run_after
+            return
+        # Newer pending job covers this work; fold the range into it
+        duplicate.payload = merge_payload(job.payload, duplicate.payload)
+        duplicate.priority = min(duplicate.priority, job.priority)
+        job.status = "failed"
+        job.last_error = job.last_error or f"Superseded by pending job {duplicate.id}"
+        job.finished_at = func.now()
+        if job.id in self._extras:
+            self._extras.setdefault(duplicate.id, self._extras.pop(job.id))
+
+    def _requeue_running(self, db, query) -> int:
+        """Re-queue the running jobs of a query one by one. Returns how many."""
+        jobs = query.with_for_update(skip_locked=True).all()
+        for job in jobs:
+            self._requeue(db, job)
+            # Flushed per row: the next job with the same key must see this one as pending
+            db.flush()
+        return len(jobs)
+
+    def _release_running(self) -> None:
+        """Hand jobs interrupted by shutdown back to the queue."""
+        from ..database import SessionLocal
+        from ..models import BackgroundJob
+
+        with SessionLocal() as db:
+            released = self._requeue_running(db, db.query(BackgroundJob).filter(
+                BackgroundJob.status == "running",
+                BackgroundJob.locked_by == self.worker_id,
+            ).order_by(BackgroundJob.id))
+            db.commit()
+        if released:
+            logger.info(f"[JOB QUEUE] Re-queued {released} jobs interrupted by shutdown")
+
+    def _recover_and_prune(self) -> None:
+        from ..database import SessionLocal
+        from ..models import BackgroundJob
+
+        now = datetime.now(timezone.utc)
+        with SessionLocal() as db:
+            recovered = self._requeue_running(db, db.query(BackgroundJob).filter(
+                BackgroundJob.status == "running",
+                BackgroundJob.locked_at < now - timedelta(seconds=self.stale_after),
+            ).order_by(BackgroundJob.id))
+            pruned = db.query(BackgroundJob).filter(
+                BackgroundJob.status.in_(("done", "failed")),
+                BackgroundJob.finished_at < now - timedelta(hours=self.retention_hours),
+            ).delete(synchronize_session=False)
+            db.commit()
+        if recovered or pruned:
+            logger.info(f"[JOB QUEUE] Re-queued {recovered} orphaned jobs, pruned {pruned} finished jobs")
+
+    # ------------------------------------------------------------------
+    # Progress
+    # ------------------------------------------------------------------
+
+    def update_progress(self, job_id: int, progress: Dict[str, Any]) -> None:
+        from sqlalchemy import func
+        from ..database import SessionLocal
+        from ..models import BackgroundJob
+
+        with SessionLocal() as db:
+            # Progress doubles as a heartbeat: long jobs that report aren't taken for orphans
+            db.query(BackgroundJob).filter(BackgroundJob.id == job_id).update(
+                {"progress": progress, "locked_at": func.now()}, synchronize_session=False
+            )
+            db.commit()
+
+    def list_jobs(self, story_id: int, include_finished: bool = True, limit: int = 50) -> List[Dict[str, Any]]:
+        """Jobs of a story, newest first, with queue position for pending ones."""
+        from sqlalchemy import and_, or_
+        from ..database import SessionLocal
+        from ..models import BackgroundJob
+
+        with SessionLocal() as db:
+            query = db.query(BackgroundJob).filter(BackgroundJob.story_id == story_id)
+            if not include_finished:
+                query = query.filter(BackgroundJob.status.in_(("pending", "running")))
+            jobs = query.order_by(BackgroundJob.id.desc()).limit(limit).all()
+            result = []
+            for job in jobs:
+                data = job.to_dict()
+                if job.status == "pending":
+                    data["queue_position"] = db.query(BackgroundJob).filter(
+                        BackgroundJob.status == "pending",
+                        or_(
+                            BackgroundJob.priority < job.priority,
+                            and_(BackgroundJob.priority == job.priority, BackgroundJob.id < job.id),
+                        ),
+                    ).count()
+                result.append(data)
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue counters for monitoring"""
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "workers": self.workers,
+            "worker_id": self.worker_id,
+            "interactive_active": self._interactive_active(),
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+async def _run_direct(handler: JobHandler, kwargs: Dict[str, Any]) -> None:
+    # Started from inside a queued job the task inherits its job id; it isn't that job
+    _current_job_id.set(None)
+    await handler(**kwargs)
+
+
+async def submit_job(
+    job_type: str,
+    payload: Dict[str, Any],
+    priority: int = PRIORITY_EXTRACTION,
+    coalesce_key: Optional[str] = None,
+    extras: Optional[Dict[str, Any]] = None,
+) -> Optional[int]:
+    """
+    Queue a job, or run it as a plain asyncio task when the queue isn't running.
+
+    story_id / user_id are taken from the payload. Returns the job id, or None
+    when the job was started directly.
+    """
+    queue = get_job_queue()
+    if queue.enabled and queue.running:
+        try:
+            return await asyncio.to_thread(
+                queue.enqueue, job_type, payload,
+                payload.get("story_id"), payload.get("user_id"),
+                priority, coalesce_key, extras,
+            )
+        except Exception as e:
+            logger.error(f"[JOB QUEUE] Failed to enqueue {job_type}, running directly: {e}")
+
+    handler = _handlers.get(job_type)
+    if handler is None:
+        raise ValueError(f"No handler registered for job type {job_type}")
+    task = asyncio.create_task(_run_direct(handler, {**payload, **(extras or {})}))
+    # The event loop only keeps weak references to tasks
+    _direct_tasks.add(task)
+    task.add_done_callback(_direct_tasks.discard)
+    return None
+
+
+def in_queued_job() -> bool:
+    """Whether the caller runs as a queued job, whose failures should raise so it is retried."""
+    return _current_job_id.get() is not None
+
+
+async def report_job_progress(progress: Dict[str, Any]) -> None:
+    """Store progress for the job the calling handler is running (no-op outside the queue)."""
+    job_id = _current_job_id.get()
+    if job_id is None:
+        return
+    try:
+        await asyncio.to_thread(get_job_queue().update_progress, job_id, progress)
+    except Exception as e:
+        logger.debug(f"[JOB QUEUE] Failed to store progress for job {job_id}: {e}")
+
+
+# Global singleton
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        from ..config import settings
+        config = settings.job_queue
+        _job_queue = JobQueue(
+            workers=int(config.get('workers', 2)),
+            poll_interval=float(config.get('poll_interval_seconds', 2)),
+            max_attempts=int(config.get('max_attempts', 3)),
+            retry_base_delay=float(config.get('retry_base_delay', 5)),
+            stale_after=float(config.get('stale_after_seconds', 600)),
+            interactive_grace=float(config.get('interactive_grace_seconds', 30)),
+            retention_hours=float(config.get('retention_hours', 24)),
+            enabled=bool(config.get('enabled', True)),
+        )
+    return _job_queue
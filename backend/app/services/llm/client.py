@@ -9,6 +9,8 @@ import httpx
 from typing import Dict, Any, Optional, Tuple
 import logging
 
+from .client_registry import get_shared_http_client, litellm_pool_kwargs
+
 logger = logging.getLogger(__name__)
 
 class LLMClient:
@@ -356,6 +358,9 @@ class LLMClient:
                 params["extra_body"]["include_reasoning"] = False
                 logger.debug("Reasoning disabled for local server via include_reasoning=False")
         
+        # Reuse the running loop's keep-alive connections (OpenAI-compatible endpoints)
+        params.update(litellm_pool_kwargs(params["model"], params.get("api_base"), params.get("api_key")))
+
         logger.debug(f"Final generation params: {params}")
         return params
     
@@ -431,48 +436,48 @@ class LLMClient:
             base_url = f"{base_url}/v1"
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
-
-                # For TabbyAPI, use dedicated /health endpoint at root
-                if self.api_type == 'tabbyapi':
-                    health_url = f"{root_url}/health"
-                    logger.debug(f"[HEALTH CHECK] TabbyAPI health check: {health_url}")
-                    try:
-                        response = await client.get(health_url, headers=headers)
-                        if response.status_code == 200:
-                            return True, "TabbyAPI server is healthy"
-                        elif response.status_code >= 500:
-                            return False, f"TabbyAPI server error (status {response.status_code})"
-                    except httpx.HTTPStatusError:
-                        pass  # Fall through to generic check
+            client = get_shared_http_client()
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
 
-                # Try /models endpoint (standard OpenAI-compatible endpoint)
-                models_url = f"{base_url}/models"
-                logger.debug(f"[HEALTH CHECK] Checking {models_url}")
+            # For TabbyAPI, use dedicated /health endpoint at root
+            if self.api_type == 'tabbyapi':
+                health_url = f"{root_url}/health"
+                logger.debug(f"[HEALTH CHECK] TabbyAPI health check: {health_url}")
                 try:
-                    response = await client.get(models_url, headers=headers)
-                    if response.status_code < 500:
-                        return True, "LLM server is reachable"
+                    response = await client.get(health_url, headers=headers, timeout=timeout)
+                    if response.status_code == 200:
+                        return True, "TabbyAPI server is healthy"
                     elif response.status_code >= 500:
-                        return False, f"LLM server error (status {response.status_code})"
+                        return False, f"TabbyAPI server error (status {response.status_code})"
                 except httpx.HTTPStatusError:
-                    pass  # Try fallback
+                    pass  # Fall through to generic check
 
-                # Fallback: try HEAD request to base URL
-                try:
-                    response = await client.head(base_url, headers=headers)
-                    if response.status_code < 500:
-                        return True, "LLM server is reachable"
-                except httpx.HTTPStatusError:
-                    pass
+            # Try /models endpoint (standard OpenAI-compatible endpoint)
+            models_url = f"{base_url}/models"
+            logger.debug(f"[HEALTH CHECK] Checking {models_url}")
+            try:
+                response = await client.get(models_url, headers=headers, timeout=timeout)
+                if response.status_code < 500:
+                    return True, "LLM server is reachable"
+                elif response.status_code >= 500:
+                    return False, f"LLM server error (status {response.status_code})"
+            except httpx.HTTPStatusError:
+                pass  # Try fallback
 
-                # Last resort: try GET to base URL
-                response = await client.get(base_url, headers=headers)
+            # Fallback: try HEAD request to base URL
+            try:
+                response = await client.head(base_url, headers=headers, timeout=timeout)
                 if response.status_code < 500:
                     return True, "LLM server is reachable"
-                else:
-                    return False, f"LLM server returned error status {response.status_code}"
+            except httpx.HTTPStatusError:
+                pass
+
+            # Last resort: try GET to base URL
+            response = await client.get(base_url, headers=headers, timeout=timeout)
+            if response.status_code < 500:
+                return True, "LLM server is reachable"
+            else:
+                return False, f"LLM server returned error status {response.status_code}"
 
         except httpx.ConnectError:
             return False, f"Cannot connect to LLM server at {self.api_url}. Is it running?"
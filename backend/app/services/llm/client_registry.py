@@ -0,0 +1,225 @@
+"""
+LLM Client Registry
+
+Process-wide cache of configured LLM clients and a shared HTTP connection pool.
+
+LLMClient and ExtractionLLMService used to be rebuilt on nearly every call
+(every UnifiedLLMService() had its own client cache, every background task
+called ExtractionLLMService.from_settings). The registry keeps one instance per
+settings fingerprint instead:
+- main LLM clients are keyed by user; a cached client is reused while the
+  fingerprint of the user's settings is unchanged and dropped by
+  invalidate_user() when the user saves settings
+- extraction services are keyed by the fingerprint of their resolved
+  constructor arguments (LRU, max_entries)
+
+LiteLLM's module-level configuration (api_key / api_base for some providers)
+is still global, so a cached LLMClient re-applies it only when a client with a
+different fingerprint configured LiteLLM last.
+
+get_shared_http_client() returns one pooled httpx.AsyncClient per event loop
+with keep-alive to the inference servers. litellm_pool_kwargs() wraps the
+running loop's client for LiteLLM's per-call `client=` argument, so
+OpenAI-compatible requests reuse connections instead of paying a TCP/TLS
+handshake per call - also from calls made in other loops (asyncio.run in admin
+re-embeds and background threads), which a global LiteLLM session can't serve.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def settings_fingerprint(value: Any) -> str:
+    """Stable hash of a settings structure (dict key order doesn't matter)."""
+    encoded = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMClientRegistry:
+    """
+    Cache of configured LLM client objects.
+
+    Args:
+        max_entries: Extraction services kept before the least recently used is dropped
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._clients: Dict[int, Tuple[str, Any]] = {}
+        self._extraction: "OrderedDict[str, Any]" = OrderedDict()
+        self._litellm_configured_for: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_llm_client(self, user_id: int, user_settings: Dict[str, Any], factory: Callable[[], Any]) -> Any:
+        """
+        Return the user's cached LLMClient, building it with factory() when the
+        user has none or their settings changed.
+        """
+        fingerprint = settings_fingerprint(user_settings)
+        with self._lock:
+            cached = self._clients.get(user_id)
+            if cached is not None and cached[0] == fingerprint:
+                self.hits += 1
+                client = cached[1]
+            else:
+                client = None
+                self.misses += 1
+
+        if client is None:
+            # LLMClient.__init__ configures LiteLLM itself
+            client = factory()
+            with self._lock:
+                self._clients[user_id] = (fingerprint, client)
+                self._litellm_configured_for = fingerprint
+            logger.info(f"[LLM REGISTRY] Created LLM client for user {user_id} with provider {client.api_type}")
+            return client
+
+        with self._lock:
+            reconfigure = self._litellm_configured_for != fingerprint
+            self._litellm_configured_for = fingerprint
+        if reconfigure:
+            client._configure_litellm()
+        return client
+
+    def get_extraction_service(self, kwargs: Dict[str, Any], factory: Callable[[], Any]) -> Any:
+        """Return the ExtractionLLMService built from these constructor arguments."""
+        fingerprint = settings_fingerprint(kwargs)
+        with self._lock:
+            service = self._extraction.get(fingerprint)
+            if service is not None:
+                self._extraction.move_to_end(fingerprint)
+                self.hits += 1
+                return service
+            self.misses += 1
+
+        service = factory()
+        with self._lock:
+            self._extraction[fingerprint] = service
+            while len(self._extraction) > self.max_entries:
+                self._extraction.popitem(last=False)
+        return service
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop the user's cached main LLM client (called when settings are saved)."""
+        with self._lock:
+            if self._clients.pop(user_id, None) is not None:
+                logger.info(f"[LLM REGISTRY] Invalidated LLM client for user {user_id}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._extraction.clear()
+            self._litellm_configured_for = None
+
+    def get_stats(self) -> dict:
+        """Get registry counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "llm_clients": len(self._clients),
+                "extraction_services": len(self._extraction),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# Global singleton
+_registry: Optional[LLMClientRegistry] = None
+
+
+def get_client_registry() -> LLMClientRegistry:
+    global _registry
+    if _registry is None:
+        from ...config import settings
+        config = settings.llm_client_registry
+        _registry = LLMClientRegistry(max_entries=int(config.get('max_entries', 64)))
+    return _registry
+
+
+# One pooled client per event loop - httpx connections are bound to the loop that opened them.
+# Each entry also holds the loop's AsyncOpenAI wrappers handed to LiteLLM, keyed by (api_base, api_key hash).
+_http_clients: Dict[int, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient, Dict[Tuple[str, str], Any]]] = {}
+_http_lock = threading.Lock()
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    from ...config import settings
+    config = settings.llm_client_registry
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(config.get('max_connections', 100)),
+            max_keepalive_connections=int(config.get('max_keepalive_connections', 20)),
+            keepalive_expiry=float(config.get('keepalive_expiry_seconds', 120)),
+        ),
+        timeout=httpx.Timeout(None, connect=float(config.get('connect_timeout_seconds', 10))),
+    )
+
+
+def _loop_entry() -> Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient, Dict[Tuple[str, str], Any]]:
+    loop = asyncio.get_running_loop()
+    with _http_lock:
+        # Drop clients of loops that have finished (asyncio.run in worker threads)
+        for key in [key for key, entry in _http_clients.items() if entry[0].is_closed()]:
+            del _http_clients[key]
+        entry = _http_clients.get(id(loop))
+        if entry is None or entry[0] is not loop or entry[1].is_closed:
+            entry = (loop, _build_http_client(), {})
+            _http_clients[id(loop)] = entry
+        return entry
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Pooled httpx client for the running event loop (callers pass per-request timeouts)."""
+    return _loop_entry()[1]
+
+
+def litellm_pool_kwargs(model: str, api_base: Optional[str], api_key: Optional[str]) -> Dict[str, Any]:
+    """
+    Extra acompletion() kwargs that route a LiteLLM call over the running loop's pooled connections.
+
+    Only OpenAI-compatible endpoints ("openai/..." models with an api_base) go through
+    LiteLLM's OpenAI handler, which takes a ready AsyncOpenAI client; everything else
+    (and calls outside an event loop) gets {} and LiteLLM's own clients.
+    """
+    from ...config import settings
+    if not settings.llm_client_registry.get('shared_http_pool', True):
+        return {}
+    if not api_base or not str(model).startswith("openai/"):
+        return {}
+    try:
+        _, http_client, openai_clients = _loop_entry()
+    except RuntimeError:
+        return {}
+    key = (api_base, hashlib.sha256((api_key or "").encode()).hexdigest())
+    client = openai_clients.get(key)
+    if client is None:
+        from openai import AsyncOpenAI
+        client = openai_clients[key] = AsyncOpenAI(
+            api_key=api_key or "not-needed",
+            base_url=api_base,
+            http_client=http_client,
+            max_retries=2,
+        )
+    return {"client": client}
+
+
+async def close_shared_http_clients() -> None:
+    """Close the running loop's pooled client (shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _http_lock:
+        entry = _http_clients.pop(id(loop), None)
+    if entry is None:
+        return
+    await entry[1].aclose()
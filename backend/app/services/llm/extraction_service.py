@@ -13,6 +13,7 @@ import json
 import re
 import httpx
 from .prompts import prompt_manager
+from .client_registry import get_client_registry, get_shared_http_client, litellm_pool_kwargs
 
 logger = logging.getLogger(__name__)
 
@@ -229,7 +230,7 @@ class ExtractionLLMService:
             temperature_override: Override the configured temperature (e.g. for image prompts)
 
         Returns:
-            ExtractionLLMService instance, or None if URL/model not configured
+            ExtractionLLMService instance (shared for identical settings), or None if URL/model not configured
         """
         from ...config import settings as app_settings
 
@@ -260,7 +261,7 @@ class ExtractionLLMService:
         thinking_disable_method = ext_settings.get('thinking_disable_method', ext_defaults.get('thinking_disable_method', 'none'))
         thinking_disable_custom = ext_settings.get('thinking_disable_custom', ext_defaults.get('thinking_disable_custom', ''))
 
-        return cls(
+        kwargs = dict(
             url=url or '',
             model=model,
             api_key=api_key,
@@ -274,6 +275,8 @@ class ExtractionLLMService:
             thinking_disable_custom=thinking_disable_custom,
             api_type=api_type,
         )
+        # Same resolved settings -> same (stateless) instance, process-wide
+        return get_client_registry().get_extraction_service(kwargs, lambda: cls(**kwargs))
 
     def _compile_thinking_pattern(self) -> Optional[re.Pattern]:
         """Compile the regex pattern for thinking tag removal based on method"""
@@ -343,6 +346,16 @@ class ExtractionLLMService:
         # Local providers: use openai/ prefix for OpenAI-compatible APIs
         return f"openai/{self.model}"
     
+    async def _acompletion(self, **kwargs):
+        """litellm.acompletion through the shared per-endpoint scheduler (background lane)."""
+        from litellm import acompletion
+        from ...utils.circuit_breaker import LANE_BACKGROUND, get_llm_scheduler
+
+        async with get_llm_scheduler().slot(self.url, kwargs.get("model", self.model), LANE_BACKGROUND) as slot:
+            response = await acompletion(**kwargs)
+            slot.record_usage(response)
+            return response
+
     def _get_generation_params(self, max_tokens: Optional[int] = None, allow_thinking: bool = False) -> Dict[str, Any]:
         """Get generation parameters for API calls.
 
@@ -396,6 +409,9 @@ class ExtractionLLMService:
         if extra_body:
             params["extra_body"] = extra_body
 
+        # Reuse the running loop's keep-alive connections (OpenAI-compatible endpoints)
+        params.update(litellm_pool_kwargs(params["model"], params.get("api_base"), params.get("api_key")))
+
         # Log the params being used (excluding api_key)
         log_params = {k: v for k, v in params.items() if k != "api_key"}
         logger.info(f"[EXTRACTION] Generation params: temp={params.get('temperature')}, top_p={params.get('top_p', 1.0)}, allow_thinking={allow_thinking}, extra_body={extra_body if extra_body else 'none'}")
@@ -469,25 +485,25 @@ class ExtractionLLMService:
             base_url = f"{base_url}/v1"
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
-
-                # Try /models endpoint (standard OpenAI-compatible endpoint)
-                try:
-                    response = await client.get(f"{base_url}/models", headers=headers)
-                    if response.status_code < 500:
-                        return True, "Extraction server is reachable"
-                    elif response.status_code >= 500:
-                        return False, f"Extraction server error (status {response.status_code})"
-                except httpx.HTTPStatusError:
-                    pass  # Try fallback
-
-                # Fallback: try base URL
-                response = await client.get(base_url, headers=headers)
+            client = get_shared_http_client()
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+            # Try /models endpoint (standard OpenAI-compatible endpoint)
+            try:
+                response = await client.get(f"{base_url}/models", headers=headers, timeout=timeout)
                 if response.status_code < 500:
                     return True, "Extraction server is reachable"
-                else:
-                    return False, f"Extraction server returned error status {response.status_code}"
+                elif response.status_code >= 500:
+                    return False, f"Extraction server error (status {response.status_code})"
+            except httpx.HTTPStatusError:
+                pass  # Try fallback
+
+            # Fallback: try base URL
+            response = await client.get(base_url, headers=headers, timeout=timeout)
+            if response.status_code < 500:
+                return True, "Extraction server is reachable"
+            else:
+                return False, f"Extraction server returned error status {response.status_code}"
 
         except httpx.ConnectError:
             return False, f"Cannot connect to extraction server at {self.url}. Is it running?"
@@ -516,8 +532,6 @@ class ExtractionLLMService:
             Generated text response
         """
         try:
-            from litellm import acompletion
-
             params = self._get_generation_params(max_tokens=max_tokens, allow_thinking=allow_thinking)
 
             # Apply prompt prefix if needed (e.g., /no_think for Qwen3)
@@ -529,7 +543,7 @@ class ExtractionLLMService:
                 messages.append({"role": "system", "content": system_prompt})
             messages.append({"role": "user", "content": final_prompt})
 
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=messages,
                 timeout=self.timeout_total
@@ -568,8 +582,6 @@ class ExtractionLLMService:
             Generated text response
         """
         try:
-            from litellm import acompletion
-
             params = self._get_generation_params(max_tokens=max_tokens, allow_thinking=allow_thinking)
 
             # Apply prompt prefix to last user message if needed (e.g., /no_think for Qwen3)
@@ -581,11 +593,13 @@ class ExtractionLLMService:
                         messages[i]["content"] = f"{prefix}{messages[i]['content']}"
                         break
 
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=messages,
                 timeout=self.timeout_total
             )
+            from .prefix_cache import prefix_tracker
+            prefix_tracker.record_completion(response)
 
             content = response.choices[0].message.content
             content = content.strip() if content else ""
@@ -618,8 +632,6 @@ class ExtractionLLMService:
             List of event dictionaries
         """
         try:
-            from litellm import acompletion
-
             # Pull both prompts from prompts.yml (single source of truth).
             # Fall back to a minimal one-liner only if YAML lookup fails so the
             # extraction still produces an answer instead of crashing.
@@ -634,7 +646,7 @@ class ExtractionLLMService:
             )
 
             params = self._get_generation_params()
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -671,8 +683,6 @@ class ExtractionLLMService:
             List of event dictionaries
         """
         try:
-            from litellm import acompletion
-
             if system_prompt is None:
                 system_prompt = prompt_manager.get_prompt("plot_events_extraction", "system") \
                     or "You are an expert story analyst skilled at identifying plot events, narrative threads, and story structure."
@@ -684,7 +694,7 @@ class ExtractionLLMService:
             )
 
             params = self._get_generation_params(max_tokens=self.max_tokens * 2)  # Allow more tokens for batch
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -798,8 +808,6 @@ class ExtractionLLMService:
             List of moment dictionaries
         """
         try:
-            from litellm import acompletion
-
             if system_prompt is None:
                 system_prompt = prompt_manager.get_prompt("character_moments_extraction", "system") \
                     or "You are an expert literary analyst skilled at identifying significant character moments and development in narratives."
@@ -811,7 +819,7 @@ class ExtractionLLMService:
             )
 
             params = self._get_generation_params()
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -847,8 +855,6 @@ class ExtractionLLMService:
             List of moment dictionaries
         """
         try:
-            from litellm import acompletion
-
             if system_prompt is None:
                 system_prompt = prompt_manager.get_prompt("character_moments_extraction", "system") \
                     or "You are an expert literary analyst skilled at identifying significant character moments and development in narratives."
@@ -860,7 +866,7 @@ class ExtractionLLMService:
             )
 
             params = self._get_generation_params(max_tokens=self.max_tokens * 2)
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -898,8 +904,6 @@ class ExtractionLLMService:
             Dictionary with 'npcs' array
         """
         try:
-            from litellm import acompletion
-
             explicit_names_str = ", ".join(explicit_character_names) if explicit_character_names else "None"
 
             if system_prompt is None:
@@ -913,7 +917,7 @@ class ExtractionLLMService:
             )
 
             params = self._get_generation_params()
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -948,8 +952,6 @@ class ExtractionLLMService:
             Dictionary with 'npcs' array
         """
         try:
-            from litellm import acompletion
-
             explicit_names_str = ", ".join(explicit_character_names) if explicit_character_names else "None"
 
             if system_prompt is None:
@@ -962,7 +964,7 @@ class ExtractionLLMService:
             )
 
             params = self._get_generation_params(max_tokens=self.max_tokens * 2)
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -1003,8 +1005,6 @@ class ExtractionLLMService:
             Dictionary with 'characters', 'locations', 'objects', and optionally 'interactions' arrays
         """
         try:
-            from litellm import acompletion
-
             # Get prompts from centralized prompts.yml (use same template as main LLM fallback)
             if system_prompt is None:
                 system_prompt = prompt_manager.get_prompt("entity_state_extraction.single", "system")
@@ -1043,7 +1043,7 @@ Include "interactions": [] in your JSON response (empty array if no tracked inte
                 prompt += interaction_section
 
             params = self._get_generation_params()
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -1077,8 +1077,6 @@ Include "interactions": [] in your JSON response (empty array if no tracked inte
             Dictionary with character details
         """
         try:
-            from litellm import acompletion
-
             if system_prompt is None:
                 system_prompt = prompt_manager.get_prompt("character_details_extraction", "system") \
                     or "You are a detailed character profiling assistant. Analyze all appearances of a character in a story and extract comprehensive details about them. Be thorough but accurate - only include information that is clearly supported by the text. Return ONLY valid JSON, no other text."
@@ -1090,7 +1088,7 @@ Include "interactions": [] in your JSON response (empty array if no tracked inte
 
             # Use configured max_tokens from initialization
             params = self._get_generation_params(max_tokens=self.max_tokens)
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -1126,8 +1124,6 @@ Include "interactions": [] in your JSON response (empty array if no tracked inte
             Generated summary text
         """
         try:
-            from litellm import acompletion
-            
             # Use higher max_tokens for summaries (default 2000)
             summary_max_tokens = max_tokens if max_tokens is not None else 2000
 
@@ -1146,7 +1142,7 @@ Include "interactions": [] in your JSON response (empty array if no tracked inte
             params = self._get_generation_params(max_tokens=summary_max_tokens)
             logger.info(f"Generating summary with extraction model: max_tokens={summary_max_tokens}")
             
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -1359,8 +1355,6 @@ Include "interactions": [] in your JSON response (empty array if no tracked inte
             Dictionary with 'character_moments', 'npcs', 'plot_events', 'entity_states' keys
         """
         try:
-            from litellm import acompletion
-            
             explicit_names_str = ", ".join(explicit_character_names) if explicit_character_names else "None"
             character_names_str = ", ".join(character_names) if character_names else "None"
             
@@ -1390,7 +1384,7 @@ Include "interactions": [] in your JSON response (empty array if no tracked inte
             params = self._get_generation_params(max_tokens=max_tokens)
             logger.info(f"Starting combined extraction: {num_scenes} scenes, timeout={timeout_seconds}s, max_tokens={max_tokens}")
             
-            response = await acompletion(
+            response = await self._acompletion(
                 **params,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -0,0 +1,241 @@
+"""
+Fused Extraction
+
+Runs several per-scene extraction tasks (scene events, entity states) as one
+structured-output LLM call instead of one call per task.
+
+Post-scene generation only fuses when the inline contradiction check is
+enabled: its entity states then ride along with the per-scene scene events
+call. With the check off (the default) scene events are the only per-scene
+task, so nothing is fused and no LLM calls are saved.
+
+Every task keeps its own prompt from prompts.yml; the fused message shows the
+scene once, then each task's instructions under a "=== TASK: <name> ==="
+header, and asks for a single JSON object keyed by task name. The value under
+each key is parsed and validated exactly as the task's standalone output.
+
+Which tasks get fused is decided per call by FusedExtractionPlanner:
+- tasks routed to different LLMs (extraction vs main) are never fused together
+- a group's combined output budget (sum of the tasks' max_tokens) must fit in
+  fused_extraction.max_output_tokens
+- a task whose measured fused success rate drops below min_quality runs
+  standalone (re-probed every reprobe_every plans so it can recover)
+
+When a fused response can't be parsed at all, the group is split in half and
+each half retried; tasks whose key is missing or invalid are rerun standalone.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the scene text inside each task's prompt in a fused message
+SCENE_REFERENCE = "(the scene shown under SCENE TO ANALYZE at the top of this message)"
+
+
+@dataclass
+class FusedTask:
+    """
+    One extraction task that can run standalone or fused.
+
+    Args:
+        name: JSON key of the task's output in a fused response
+        render: Builds the task's user prompt for a given scene text
+        system_prompt: System prompt for the standalone simple-message structure
+        max_tokens: Output budget of the task when run standalone
+        validate: Returns True when a parsed output has the task's expected shape
+        force_main_llm: Route to the main LLM even when the extraction LLM is enabled
+    """
+    name: str
+    render: Callable[[str], str]
+    system_prompt: str
+    max_tokens: int
+    validate: Callable[[Any], bool]
+    force_main_llm: bool = False
+
+
+def has_list_key(key: str) -> Callable[[Any], bool]:
+    """Validator for outputs shaped like {"<key>": [...]}."""
+    def validate(value: Any) -> bool:
+        return isinstance(value, dict) and isinstance(value.get(key), list)
+    return validate
+
+
+def build_fused_message(scene_content: str, tasks: List[FusedTask]) -> str:
+    """Build the final user message asking for all tasks at once."""
+    names = ", ".join(f'"{task.name}"' for task in tasks)
+    sections = [f"=== SCENE TO ANALYZE ===\n{scene_content}"]
+    sections.append(
+        f"Complete the following {len(tasks)} extraction tasks for this scene. "
+        f"Each task has its own instructions and output format."
+    )
+    for task in tasks:
+        sections.append(f"=== TASK: {task.name} ===\n{task.render(SCENE_REFERENCE).strip()}")
+    sections.append(
+        "=== OUTPUT ===\n"
+        f"Return ONE JSON object with exactly these keys: {names}. "
+        "The value of each key is the JSON object that task asks for. "
+        "Return ONLY JSON — no explanation, no markdown."
+    )
+    return "\n\n".join(sections)
+
+
+def parse_fused_response(raw: str, tasks: List[FusedTask]) -> Tuple[Dict[str, Any], List[FusedTask]]:
+    """
+    Split a fused response into per-task outputs.
+
+    Returns (outputs by task name, tasks whose output is missing or invalid).
+    Raises ValueError when the response is not a JSON object at all.
+    """
+    from .extraction_service import extract_json_robust
+
+    parsed = extract_json_robust(raw)
+    if not isinstance(parsed, dict):
+        raise ValueError("fused extraction response is not a JSON object")
+
+    outputs: Dict[str, Any] = {}
+    failed: List[FusedTask] = []
+    for task in tasks:
+        value = parsed.get(task.name)
+        if task.validate(value):
+            outputs[task.name] = value
+        else:
+            failed.append(task)
+    return outputs, failed
+
+
+class FusedExtractionPlanner:
+    """
+    Groups tasks into fused calls and tracks per-task fused output quality.
+
+    Args:
+        max_output_tokens: Largest combined output budget of a fused call
+        min_quality: Fused success rate below which a task runs standalone
+        min_samples: Fused attempts before min_quality is enforced
+        reprobe_every: Plans after which an excluded task is fused again once
+    """
+
+    def __init__(
+        self,
+        max_output_tokens: int = 8192,
+        min_quality: float = 0.8,
+        min_samples: int = 5,
+        reprobe_every: int = 20,
+    ):
+        self.max_output_tokens = max_output_tokens
+        self.min_quality = min_quality
+        self.min_samples = min_samples
+        self.reprobe_every = reprobe_every
+        self._lock = threading.Lock()
+        self._attempts: Dict[str, int] = {}
+        self._valid: Dict[str, int] = {}
+        self._excluded_plans: Dict[str, int] = {}
+        self.fused_calls = 0
+        self.standalone_calls = 0
+        self.splits = 0
+        self.tasks_requested = 0
+
+    def quality(self, name: str) -> Optional[float]:
+        attempts = self._attempts.get(name, 0)
+        if not attempts:
+            return None
+        return self._valid.get(name, 0) / attempts
+
+    def _eligible(self, name: str) -> bool:
+        attempts = self._attempts.get(name, 0)
+        quality = self.quality(name)
+        if attempts < self.min_samples or quality is None or quality >= self.min_quality:
+            self._excluded_plans.pop(name, None)
+            return True
+        excluded = self._excluded_plans.get(name, 0) + 1
+        self._excluded_plans[name] = excluded
+        return excluded % self.reprobe_every == 0
+
+    def plan(self, tasks: List[FusedTask]) -> List[List[FusedTask]]:
+        """Partition tasks into call groups; single-task groups run standalone."""
+        with self._lock:
+            self.tasks_requested += len(tasks)
+            groups: List[List[FusedTask]] = []
+            by_route: Dict[bool, List[FusedTask]] = {}
+            for task in tasks:
+                if self._eligible(task.name):
+                    by_route.setdefault(task.force_main_llm, []).append(task)
+                else:
+                    groups.append([task])
+
+        for route_tasks in by_route.values():
+            current: List[FusedTask] = []
+            budget = 0
+            for task in route_tasks:
+                if current and budget + task.max_tokens > self.max_output_tokens:
+                    groups.append(current)
+                    current, budget = [], 0
+                current.append(task)
+                budget += task.max_tokens
+            if current:
+                groups.append(current)
+        return groups
+
+    def record(self, name: str, valid: bool) -> None:
+        """Record whether a task's output in a fused call was usable."""
+        with self._lock:
+            self._attempts[name] = self._attempts.get(name, 0) + 1
+            if valid:
+                self._valid[name] = self._valid.get(name, 0) + 1
+
+    def record_call(self, fused: bool) -> None:
+        with self._lock:
+            if fused:
+                self.fused_calls += 1
+            else:
+                self.standalone_calls += 1
+
+    def record_split(self) -> None:
+        with self._lock:
+            self.splits += 1
+
+    def get_stats(self) -> dict:
+        """Get fused extraction counters for monitoring"""
+        with self._lock:
+            calls = self.fused_calls + self.standalone_calls
+            return {
+                "tasks_requested": self.tasks_requested,
+                "fused_calls": self.fused_calls,
+                "standalone_calls": self.standalone_calls,
+                "splits": self.splits,
+                "tasks_per_call": (self.tasks_requested / calls) if calls else 0.0,
+                "task_quality": {
+                    name: {"attempts": attempts, "quality": round(self._valid.get(name, 0) / attempts, 3)}
+                    for name, attempts in self._attempts.items()
+                },
+            }
+
+
+# Global singleton
+_planner: Optional[FusedExtractionPlanner] = None
+
+
+def get_fused_planner() -> FusedExtractionPlanner:
+    global _planner
+    if _planner is None:
+        from ...config import settings
+        config = settings.fused_extraction
+        _planner = FusedExtractionPlanner(
+            max_output_tokens=int(config.get('max_output_tokens', 8192)),
+            min_quality=float(config.get('min_quality', 0.8)),
+            min_samples=int(config.get('min_samples', 5)),
+            reprobe_every=int(config.get('reprobe_every', 20)),
+        )
+    return _planner
+
+
+def fused_extraction_enabled(user_settings: Dict[str, Any]) -> bool:
+    """Fused mode is on when enabled in config and the user allows combined extraction."""
+    from ...config import settings
+    if not settings.fused_extraction.get('enabled', True):
+        return False
+    ext_settings = (user_settings or {}).get('extraction_model_settings', {}) or {}
+    return bool(ext_settings.get('enable_combined_extraction', True))
@@ -0,0 +1,251 @@
+"""
+LLM Endpoint Health Prober
+
+Tracks the health of every LLM endpoint (main and extraction) in the
+background so callers don't run a blocking check_health() before each task.
+
+Endpoints register themselves the first time a caller asks about them
+(check()); that first check probes inline, afterwards the prober's loop
+re-probes every interval_seconds (down_interval_seconds while an endpoint is
+down) and check() answers from the cached state in O(1). Endpoints nobody
+asked about for idle_ttl_seconds stop being probed.
+
+States:
+- healthy: last probe succeeded within degraded_latency_seconds
+- degraded: last probe succeeded but slowly, or the circuit is HALF_OPEN
+- down: last probe failed, or the endpoint's circuit breaker is OPEN
+
+The state is shared with the LLM scheduler's per-endpoint circuit breaker:
+a failed probe counts as one failure (failure_threshold of them in a row, with
+no successful call in between, open the circuit so requests fail fast instead
+of waiting for timeouts) and a successful probe moves an open circuit to
+HALF_OPEN so traffic resumes without waiting out the recovery timeout.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from ...utils.circuit_breaker import CircuitState, get_llm_scheduler, normalize_api_base
+
+logger = logging.getLogger(__name__)
+
+STATE_UNKNOWN = "unknown"
+STATE_HEALTHY = "healthy"
+STATE_DEGRADED = "degraded"
+STATE_DOWN = "down"
+
+
+@dataclass
+class EndpointHealth:
+    """Cached health of one (api_base, model) endpoint."""
+    api_base: str
+    model: str
+    target: Any = field(repr=False, default=None)
+    state: str = STATE_UNKNOWN
+    message: str = ""
+    latency: Optional[float] = None
+    last_checked: float = 0.0
+    last_used: float = field(default_factory=time.monotonic)
+    consecutive_failures: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "api_base": self.api_base,
+            "model": self.model,
+            "state": self.state,
+            "message": self.message,
+            "latency_seconds": round(self.latency, 3) if self.latency is not None else None,
+            "seconds_since_check": round(time.monotonic() - self.last_checked, 1) if self.last_checked else None,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+def endpoint_key(target: Any) -> Tuple[str, str]:
+    """(api_base, model) of an LLMClient or ExtractionLLMService, matching the scheduler's keys."""
+    api_base = getattr(target, "api_url", None) or getattr(target, "url", "") or ""
+    model = getattr(target, "model_string", None) or target._build_model_string()
+    return normalize_api_base(api_base), model
+
+
+class HealthProber:
+    """
+    Background health tracker for LLM endpoints.
+
+    Args:
+        interval: Seconds between probes of a healthy endpoint
+        down_interval: Seconds between probes of a down endpoint
+        probe_timeout: Timeout of one probe
+        degraded_latency: Probe latency above which an endpoint counts as degraded
+        idle_ttl: Seconds after the last check() before an endpoint is forgotten
+    """
+
+    def __init__(
+        self,
+        interval: float = 15.0,
+        down_interval: float = 5.0,
+        probe_timeout: float = 3.0,
+        degraded_latency: float = 2.0,
+        idle_ttl: float = 600.0,
+    ):
+        self.interval = interval
+        self.down_interval = down_interval
+        self.probe_timeout = probe_timeout
+        self.degraded_latency = degraded_latency
+        self.idle_ttl = idle_ttl
+        self._endpoints: Dict[Tuple[str, str], EndpointHealth] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.probes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _breaker(self, health: EndpointHealth):
+        return get_llm_scheduler().get_limiter(health.api_base, health.model).breaker
+
+    def _effective_state(self, health: EndpointHealth) -> str:
+        breaker = self._breaker(health)
+        if breaker is not None:
+            if breaker.state == CircuitState.OPEN:
+                return STATE_DOWN
+            if breaker.state == CircuitState.HALF_OPEN and health.state == STATE_HEALTHY:
+                return STATE_DEGRADED
+        return health.state
+
+    def _register(self, target: Any) -> EndpointHealth:
+        key = endpoint_key(target)
+        health = self._endpoints.get(key)
+        if health is None:
+            health = EndpointHealth(api_base=key[0], model=key[1], target=target)
+            self._endpoints[key] = health
+        else:
+            # Keep the newest client object - older ones may carry stale credentials
+            health.target = target
+        health.last_used = time.monotonic()
+        return health
+
+    async def check(self, target: Any) -> Tuple[bool, str]:
+        """
+        Drop-in for target.check_health(): (is_available, message).
+
+        Answers from the cached state; probes inline only for an endpoint seen
+        for the first time or when the prober loop isn't running and the cached
+        state is older than interval.
+        """
+        health = self._register(target)
+        stale = time.monotonic() - health.last_checked > self.interval
+        if health.state == STATE_UNKNOWN or (stale and not self.running):
+            await self._probe(health)
+        state = self._effective_state(health)
+        if state == STATE_DOWN:
+            return False, health.message or "LLM endpoint circuit is open"
+        return True, health.message
+
+    def get_status(self, target: Any) -> Optional[dict]:
+        """Cached status of the target's endpoint, or None if it was never checked."""
+        health = self._endpoints.get(endpoint_key(target))
+        if health is None:
+            return None
+        status = health.to_dict()
+        status["state"] = self._effective_state(health)
+        return status
+
+    async def _probe(self, health: EndpointHealth) -> None:
+        started = time.monotonic()
+        try:
+            ok, message = await health.target.check_health(timeout=self.probe_timeout)
+        except Exception as e:
+            ok, message = False, f"Health check failed: {e}"
+        latency = time.monotonic() - started
+        self.probes += 1
+
+        previous = health.state
+        health.last_checked = time.monotonic()
+        health.latency = latency
+        health.message = message
+        breaker = self._breaker(health)
+        if ok:
+            health.consecutive_failures = 0
+            health.state = STATE_DEGRADED if latency > self.degraded_latency else STATE_HEALTHY
+            if breaker is not None:
+                breaker.allow_recovery()
+        else:
+            health.consecutive_failures += 1
+            health.state = STATE_DOWN
+            if breaker is not None:
+                # Counts like a failed call; failure_threshold decides when requests start failing fast
+                breaker.record_failure(RuntimeError(message))
+
+        if health.state != previous and previous != STATE_UNKNOWN:
+            logger.info(f"[HEALTH PROBER] {health.model}@{health.api_base or 'cloud'}: {previous} -> {health.state} ({message})")
+
+    async def probe_all(self) -> None:
+        """Probe every endpoint that is due; forget idle ones."""
+        now = time.monotonic()
+        due = []
+        for key, health in list(self._endpoints.items()):
+            if now - health.last_used > self.idle_ttl:
+                del self._endpoints[key]
+                continue
+            interval = self.down_interval if health.state == STATE_DOWN else self.interval
+            if now - health.last_checked >= interval:
+                due.append(health)
+        if due:
+            await asyncio.gather(*(self._probe(health) for health in due))
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[HEALTH PROBER] Probe round failed: {e}")
+            await asyncio.sleep(min(self.interval, self.down_interval))
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"[HEALTH PROBER] Started (interval {self.interval}s, down {self.down_interval}s)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_stats(self) -> dict:
+        """Get all tracked endpoints for monitoring"""
+        endpoints = {}
+        for health in list(self._endpoints.values()):
+            status = health.to_dict()
+            status["state"] = self._effective_state(health)
+            endpoints[f"{health.model}@{health.api_base}" if health.api_base else health.model] = status
+        return {"running": self.running, "probes": self.probes, "endpoints": endpoints}
+
+
+# Global singleton
+_prober: Optional[HealthProber] = None
+
+
+def get_health_prober() -> HealthProber:
+    global _prober
+    if _prober is None:
+        from ...config import settings
+        config = settings.llm_health_prober
+        _prober = HealthProber(
+            interval=float(config.get('interval_seconds', 15)),
+            down_interval=float(config.get('down_interval_seconds', 5)),
+            probe_timeout=float(config.get('probe_timeout_seconds', 3)),
+            degraded_latency=float(config.get('degraded_latency_seconds', 2)),
+            idle_ttl=float(config.get('idle_ttl_seconds', 600)),
+        )
+    return _prober
@@ -0,0 +1,262 @@
+"""
+Prompt Prefix Cache
+
+Memoizes the message prefix built by
+UnifiedLLMService._build_cache_friendly_message_prefix and measures how well
+consecutive prefixes line up for the LLM server's KV cache.
+
+After a scene is generated, every post-scene extraction (combined, entity
+states, NPCs, moments, ...) rebuilds the same system + story + scene-batch
+prefix from the same context dict: system prompt lookups, the POV preset
+query and the full context formatting each time. The prefix is now cached per
+(user, story, branch, scene-batch boundary) plus a fingerprint of the context
+and the settings that shape it, so a changed context can never reuse a stale
+prefix. Entries expire after a short TTL, which bounds staleness from
+template edits that are not part of the key.
+
+PrefixIdentityTracker records, per story branch, how many leading bytes of
+each prefix are identical to the previous one. llama.cpp / vLLM can only reuse
+KV cache for a byte-identical prefix, so this is the number to watch when a
+prompt change silently breaks caching. Completion usage is recorded too:
+cached prompt tokens when the server reports them (usage.prompt_tokens_details)
+and, for llama.cpp, the prompt-processing time those tokens saved (timings).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PrefixKey = Tuple[Any, ...]
+Messages = List[Dict[str, Any]]
+
+
+def _fingerprint(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def make_prefix_key(context: Dict[str, Any], user_id: int, user_settings: Dict[str, Any], scene_batch_size: int) -> PrefixKey:
+    """
+    Cache key for the prefix of a context.
+
+    Internal keys (leading underscore: context manager refs, search state) are
+    left out of the fingerprint, except whether semantic improvement already ran.
+    """
+    public_context = {k: v for k, v in context.items() if not str(k).startswith("_")}
+    settings_part = {
+        "generation_preferences": (user_settings or {}).get("generation_preferences", {}),
+        "context_settings": (user_settings or {}).get("context_settings", {}),
+        "allow_nsfw": (user_settings or {}).get("allow_nsfw", False),
+    }
+    scene_number = context.get("scene_number") or context.get("total_scenes") or 0
+    return (
+        user_id,
+        context.get("story_id"),
+        context.get("branch_id"),
+        int(scene_number) // max(1, scene_batch_size),
+        bool(context.get("_semantic_improved")),
+        _fingerprint(settings_part),
+        _fingerprint(public_context),
+    )
+
+
+def _copy_messages(messages: Messages) -> Messages:
+    # Callers append their task message and may edit the system message in place
+    return [dict(message) for message in messages]
+
+
+class PromptPrefixCache:
+    """
+    TTL + LRU cache of built prefixes.
+
+    Args:
+        max_entries: Prefixes kept before the least recently used is evicted
+        ttl_seconds: Age after which an entry is rebuilt
+    """
+
+    def __init__(self, max_entries: int = 64, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[PrefixKey, Tuple[float, Messages]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.build_seconds = 0.0
+        self.builds = 0
+
+    def get(self, key: PrefixKey) -> Optional[Messages]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy_messages(entry[1])
+
+    def put(self, key: PrefixKey, messages: Messages, build_seconds: float = 0.0) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), _copy_messages(messages))
+            self._entries.move_to_end(key)
+            self.builds += 1
+            self.build_seconds += build_seconds
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop a user's prefixes (e.g. after a prompt template or preset change)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache counters for monitoring"""
+        with self._lock:
+            total = self.hits + self.misses
+            avg_build = (self.build_seconds / self.builds) if self.builds else 0.0
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "avg_build_seconds": round(avg_build, 4),
+                "estimated_build_seconds_saved": round(self.hits * avg_build, 3),
+            }
+
+
+def _message_bytes(message: Dict[str, Any]) -> bytes:
+    content = message.get("content")
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, default=str)
+    return f"{message.get('role', '')}\x00{content}".encode("utf-8")
+
+
+def shared_prefix_bytes(previous: List[bytes], current: List[bytes]) -> Tuple[int, int]:
+    """Return (identical leading messages, identical leading bytes) of two serialized prefixes."""
+    shared_messages = 0
+    shared_bytes = 0
+    for old, new in zip(previous, current):
+        if old == new:
+            shared_messages += 1
+            shared_bytes += len(new)
+            continue
+        limit = min(len(old), len(new))
+        i = 0
+        while i < limit and old[i] == new[i]:
+            i += 1
+        shared_bytes += i
+        break
+    return shared_messages, shared_bytes
+
+
+class PrefixIdentityTracker:
+    """
+    Byte-identity of consecutive prefixes per (user, story, branch), plus
+    completion usage reported by the LLM server.
+    """
+
+    def __init__(self, max_streams: int = 256):
+        self.max_streams = max_streams
+        self._previous: "OrderedDict[Tuple[Any, ...], List[bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.identical_calls = 0
+        self.total_bytes = 0
+        self.shared_bytes = 0
+        self.completions = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.prompt_ms = 0.0
+        self.saved_prompt_ms = 0.0
+
+    def observe(self, stream_key: Tuple[Any, ...], messages: Messages) -> dict:
+        """Compare a prefix to the previous one of the same stream."""
+        current = [_message_bytes(m) for m in messages]
+        total = sum(len(b) for b in current)
+        with self._lock:
+            previous = self._previous.get(stream_key)
+            self._previous[stream_key] = current
+            self._previous.move_to_end(stream_key)
+            while len(self._previous) > self.max_streams:
+                self._previous.popitem(last=False)
+            if previous is None:
+                return {"first": True, "total_bytes": total}
+
+            shared_messages, shared = shared_prefix_bytes(previous, current)
+            identical = previous == current
+            self.calls += 1
+            self.total_bytes += total
+            self.shared_bytes += shared
+            if identical:
+                self.identical_calls += 1
+        logger.debug(
+            f"[PREFIX] Byte-identical prefix: {shared}/{total} bytes, "
+            f"{shared_messages}/{len(current)} messages (stream={stream_key})"
+        )
+        return {
+            "first": False,
+            "identical": identical,
+            "shared_messages": shared_messages,
+            "shared_bytes": shared,
+            "total_bytes": total,
+        }
+
+    def record_completion(self, response: Any) -> None:
+        """Record prompt-cache usage from a (non-streaming) completion response."""
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+
+        # llama.cpp server: {"timings": {"cache_n", "prompt_n", "prompt_ms", ...}}
+        timings = getattr(response, "timings", None)
+        if timings is None:
+            timings = (getattr(response, "model_extra", None) or {}).get("timings")
+        prompt_ms = saved_ms = 0.0
+        if isinstance(timings, dict):
+            prompt_ms = float(timings.get("prompt_ms") or 0.0)
+            prompt_n = timings.get("prompt_n") or 0
+            cache_n = timings.get("cache_n") or 0
+            cached = cached or cache_n
+            if prompt_n and cache_n:
+                saved_ms = cache_n * (prompt_ms / prompt_n)
+
+        with self._lock:
+            self.completions += 1
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached
+            self.prompt_ms += prompt_ms
+            self.saved_prompt_ms += saved_ms
+
+    def get_stats(self) -> dict:
+        """Get prefix identity / prompt cache counters for monitoring"""
+        with self._lock:
+            return {
+                "compared_calls": self.calls,
+                "identical_calls": self.identical_calls,
+                "identical_rate": (self.identical_calls / self.calls) if self.calls else 0.0,
+                "shared_byte_ratio": (self.shared_bytes / self.total_bytes) if self.total_bytes else 0.0,
+                "completions": self.completions,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_prompt_tokens": self.cached_tokens,
+                "cached_token_ratio": (self.cached_tokens / self.prompt_tokens) if self.prompt_tokens else 0.0,
+                "prompt_processing_ms": round(self.prompt_ms, 1),
+                "estimated_prompt_ms_saved": round(self.saved_prompt_ms, 1),
+            }
+
+
+# Global instances shared by all UnifiedLLMService users in this process
+prefix_cache = PromptPrefixCache()
+prefix_tracker = PrefixIdentityTracker()
@@ -21,7 +21,15 @@ import time
 import uuid
 
 from .client import LLMClient
+from .client_registry import get_client_registry
 from .prompts import prompt_manager
+from .fused_extraction import (
+    FusedTask,
+    build_fused_message,
+    get_fused_planner,
+    has_list_key,
+    parse_fused_response,
+)
 from .thinking_parser import ThinkingTagParser
 from .content_cleaner import (
     clean_scene_content,
@@ -63,6 +71,8 @@ from .context_formatter import (
 from .scene_database_operations import SceneDatabaseOperations
 from .llm_generation_core import LLMGenerationCore
 from .multi_variant_generation import MultiVariantGeneration
+from .prefix_cache import make_prefix_key, prefix_cache, prefix_tracker
+from ...utils.circuit_breaker import LANE_GENERATION, LANE_INTERACTIVE, get_llm_scheduler
 from ...config import settings
 
 # Import for type hints (will be imported within functions to avoid circular imports)
@@ -85,27 +95,22 @@ class UnifiedLLMService:
     """
     
     def __init__(self):
-        self._client_cache: Dict[int, LLMClient] = {}
         self._scene_db_ops = SceneDatabaseOperations()
         self._generation_core = LLMGenerationCore(self)
         self._multi_variant = MultiVariantGeneration(self)
+
+        prefix_config = settings.prompt_prefix_cache
+        prefix_cache.max_entries = int(prefix_config.get('max_entries', 64))
+        prefix_cache.ttl_seconds = float(prefix_config.get('ttl_seconds', 300))
+        self._prefix_cache = prefix_cache if prefix_config.get('enabled', True) else None
     
     def get_user_client(self, user_id: int, user_settings: Dict[str, Any]) -> LLMClient:
-        """Get or create LLM client configuration for user"""
-        # Always recreate client from user_settings to ensure we have latest settings
+        """Get the user's LLM client from the process-wide registry (rebuilt when settings change)"""
         try:
-            client = LLMClient(user_settings)
-            # Update cache with new client
-            self._client_cache[user_id] = client
-            logger.info(f"Created/updated LLM client for user {user_id} with provider {client.api_type}")
+            return get_client_registry().get_llm_client(user_id, user_settings, lambda: LLMClient(user_settings))
         except Exception as e:
             logger.error(f"Failed to create LLM client for user {user_id}: {e}")
             raise
-        
-        # Ensure the global LiteLLM configuration is set correctly for this user
-        client._configure_litellm()
-        
-        return client
     
     async def validate_user_connection(self, user_id: int, user_settings: Dict[str, Any]) -> tuple[bool, str]:
         """Validate user's LLM connection and return detailed error info"""
@@ -116,10 +121,10 @@ class UnifiedLLMService:
             return False, f"Failed to create client: {str(e)}"
     
     def invalidate_user_client(self, user_id: int):
-        """Invalidate cached client when user updates settings"""
-        if user_id in self._client_cache:
-            del self._client_cache[user_id]
-            logger.info(f"Invalidated LLM client cache for user {user_id}")
+        """Invalidate cached client and prompt prefixes when user updates settings or presets"""
+        get_client_registry().invalidate_user(user_id)
+        # The system prompt embeds the writing preset and POV, which the prefix key doesn't see
+        prefix_cache.invalidate_user(user_id)
     
     def _get_prompt_debug_path(self, filename: str) -> str:
         """Get the path for prompt debug files, handling both Docker and bare-metal environments.
@@ -379,8 +384,20 @@ class UnifiedLLMService:
         saved_prefix = context.get("_saved_prompt_prefix")
         if saved_prefix:
             logger.info(f"[PREFIX] Using saved prompt prefix ({len(saved_prefix)} messages)")
+            self._observe_prefix(context, user_id, saved_prefix)
             return saved_prefix
 
+        # Memoized prefix: post-scene extractions reuse the prefix built for the same context
+        scene_batch_size = user_settings.get('context_settings', {}).get('scene_batch_size', 10) if user_settings else 10
+        if self._prefix_cache is not None:
+            cached_prefix = self._prefix_cache.get(make_prefix_key(context, user_id, user_settings, scene_batch_size))
+            if cached_prefix is not None:
+                logger.info(f"[PREFIX] Reusing memoized prefix ({len(cached_prefix)} messages)")
+                context["_semantic_improved"] = True
+                self._observe_prefix(context, user_id, cached_prefix)
+                return cached_prefix
+        build_start = time.perf_counter()
+
         # 1. Get user settings
         generation_prefs = user_settings.get("generation_preferences", {})
         scene_length = generation_prefs.get("scene_length", "medium")
@@ -430,7 +447,6 @@ class UnifiedLLMService:
         messages = [{"role": "system", "content": system_prompt.strip()}]
 
         # 6. Add context messages
-        scene_batch_size = user_settings.get('context_settings', {}).get('scene_batch_size', 10) if user_settings else 10
         context_messages = self._format_context_as_messages(context, scene_batch_size=scene_batch_size)
         messages.extend(context_messages)
 
@@ -442,8 +458,23 @@ class UnifiedLLMService:
         # Prevents choices from re-running improvement with potentially different results.
         context["_semantic_improved"] = True
 
+        if self._prefix_cache is not None:
+            # Keyed on the context as it is now (after semantic improvement), so the next call hits
+            self._prefix_cache.put(
+                make_prefix_key(context, user_id, user_settings, scene_batch_size),
+                messages,
+                build_seconds=time.perf_counter() - build_start,
+            )
+        self._observe_prefix(context, user_id, messages)
         return messages
 
+    def _observe_prefix(self, context: Dict[str, Any], user_id: int, messages: List[Dict[str, str]]) -> None:
+        """Record prefix byte-identity against the previous call for the same story branch."""
+        try:
+            prefix_tracker.observe((user_id, context.get("story_id"), context.get("branch_id")), messages)
+        except Exception as e:
+            logger.debug(f"[PREFIX] Identity tracking failed: {e}")
+
     def _build_scene_task_message(
         self,
         context: Dict[str, Any],
@@ -3188,6 +3219,170 @@ Chapter Conclusion:"""
             logger.error(f"[EVENTS_NPCS] Extraction failed: {e}")
             raise
 
+    def fused_scene_events_task(
+        self,
+        character_names: List[str],
+        user_settings: Dict[str, Any],
+        force_main_llm: bool = False,
+    ) -> FusedTask:
+        """Scene events ({"events": [...]}) as a fusable task - same prompt as extract_scene_events_cache_friendly."""
+        character_names_str = ", ".join(character_names) if character_names else "None"
+        return FusedTask(
+            name="scene_events",
+            render=lambda scene: prompt_manager.get_prompt(
+                "scene_event_extraction.cache_friendly", "user",
+                scene_content=scene,
+                character_names=character_names_str
+            ),
+            system_prompt=prompt_manager.get_raw_prompt("simple_extraction_systems.scene_event_extraction")
+                or "You extract factual events from story scenes. Return only valid JSON.",
+            max_tokens=prompt_manager.get_max_tokens("scene_events", user_settings),
+            validate=has_list_key("events"),
+            force_main_llm=force_main_llm,
+        )
+
+    def fused_entity_states_task(
+        self,
+        character_names: List[str],
+        chapter_location: str,
+        user_settings: Dict[str, Any],
+        previous_states: str = "",
+    ) -> FusedTask:
+        """Entity states ({"characters": [...]}) as a fusable task - same prompt as extract_entity_states_cache_friendly."""
+        character_names_str = ", ".join(character_names) if character_names else "None"
+        return FusedTask(
+            name="entity_states",
+            render=lambda scene: prompt_manager.get_prompt(
+                "entity_only_extraction", "user",
+                scene_content=scene,
+                character_names=character_names_str,
+                chapter_location=chapter_location or "unspecified location",
+                previous_states=previous_states or ""
+            ),
+            system_prompt=prompt_manager.get_raw_prompt("simple_extraction_systems.entity_states_cache_friendly")
+                or "You extract entity states (characters, locations, objects) from story scenes. Return only valid JSON.",
+            max_tokens=prompt_manager.get_max_tokens("entity_states", user_settings),
+            validate=has_list_key("characters"),
+        )
+
+    async def extract_fused_cache_friendly(
+        self,
+        scene_content: str,
+        tasks: List[FusedTask],
+        context: Dict[str, Any],
+        user_id: int,
+        user_settings: Dict[str, Any],
+        db: Optional[Session] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run several extraction tasks on one scene with as few LLM calls as possible.
+
+        Tasks are grouped by the fused extraction planner (see fused_extraction.py).
+        A group that fails to parse is split in half and retried; tasks with a
+        missing or invalid output are rerun standalone.
+
+        Returns:
+            Parsed output per task name. Tasks that failed even standalone are absent.
+        """
+        planner = get_fused_planner()
+        cleaned_scene = self._clean_scene_numbers(scene_content)
+        outputs: Dict[str, Any] = {}
+        for group in planner.plan(tasks):
+            outputs.update(await self._run_fused_group(
+                cleaned_scene, group, context, user_id, user_settings, db, planner
+            ))
+        logger.info(
+            f"[FUSED_EXTRACTION] {len(outputs)}/{len(tasks)} tasks extracted "
+            f"({', '.join(task.name for task in tasks)})"
+        )
+        return outputs
+
+    async def _run_fused_group(
+        self,
+        cleaned_scene: str,
+        group: List[FusedTask],
+        context: Dict[str, Any],
+        user_id: int,
+        user_settings: Dict[str, Any],
+        db: Optional[Session],
+        planner,
+    ) -> Dict[str, Any]:
+        from .extraction_service import extract_json_robust
+
+        force_main_llm = group[0].force_main_llm
+        use_extraction_llm = self._will_use_extraction_llm(user_settings, force_main_llm)
+        use_cache = user_settings.get('generation_preferences', {}).get('use_cache_friendly_prompts', True)
+
+        if len(group) == 1:
+            task = group[0]
+            final_message = task.render(cleaned_scene)
+            system_prompt = task.system_prompt
+        else:
+            final_message = build_fused_message(cleaned_scene, group)
+            system_prompt = prompt_manager.get_raw_prompt("simple_extraction_systems.fused_extraction") \
+                or "You are a precise story analysis assistant. Complete every extraction task and return only valid JSON."
+
+        if use_extraction_llm or not use_cache:
+            messages = self._build_simple_extraction_messages(system_prompt, final_message)
+        else:
+            messages = await self._build_cache_friendly_message_prefix(
+                context=context,
+                user_id=user_id,
+                user_settings=user_settings,
+                db=db,
+            )
+            messages.append({"role": "user", "content": final_message})
+
+        max_tokens = min(sum(task.max_tokens for task in group), max(planner.max_output_tokens, group[0].max_tokens))
+        planner.record_call(fused=len(group) > 1)
+        logger.debug(f"[FUSED_EXTRACTION] Calling {len(group)} task(s): {[task.name for task in group]}, {len(messages)} messages")
+        try:
+            response = await self.generate_for_task(
+                messages=messages, user_id=user_id, user_settings=user_settings,
+                max_tokens=max_tokens, task_type="extraction",
+                force_main_llm=force_main_llm,
+            )
+        except Exception as e:
+            logger.error(f"[FUSED_EXTRACTION] LLM call failed for {[task.name for task in group]}: {e}")
+            return {}
+
+        if len(group) == 1:
+            task = group[0]
+            try:
+                value = extract_json_robust(response)
+            except Exception as e:
+                logger.warning(f"[FUSED_EXTRACTION] Standalone {task.name} output unparseable: {e}")
+                return {}
+            if not task.validate(value):
+                logger.warning(f"[FUSED_EXTRACTION] Standalone {task.name} output has unexpected shape")
+                return {}
+            return {task.name: value}
+
+        try:
+            outputs, failed = parse_fused_response(response, group)
+        except Exception as e:
+            # Whole response unusable - split and retry smaller groups
+            logger.warning(f"[FUSED_EXTRACTION] Fused response unparseable ({e}), splitting {len(group)} tasks")
+            for task in group:
+                planner.record(task.name, False)
+            planner.record_split()
+            middle = len(group) // 2
+            outputs = {}
+            for half in (group[:middle], group[middle:]):
+                outputs.update(await self._run_fused_group(
+                    cleaned_scene, half, context, user_id, user_settings, db, planner
+                ))
+            return outputs
+
+        for task in group:
+            planner.record(task.name, task not in failed)
+        for task in failed:
+            logger.warning(f"[FUSED_EXTRACTION] {task.name} missing or invalid in fused output, rerunning standalone")
+            outputs.update(await self._run_fused_group(
+                cleaned_scene, [task], context, user_id, user_settings, db, planner
+            ))
+        return outputs
+
     async def extract_scene_events_cache_friendly(
         self,
         scene_content: str,
@@ -5673,7 +5868,10 @@ Chapter Conclusion:"""
         gen_params["timeout"] = user_timeout if user_timeout is not None else settings.llm_timeout_total
 
         try:
-            response = await acompletion(**gen_params)
+            async with get_llm_scheduler().slot(gen_params.get("api_base") or client.api_url, gen_params["model"], LANE_GENERATION) as slot:
+                response = await acompletion(**gen_params)
+                slot.record_usage(response)
+            prefix_tracker.record_completion(response)
 
             # Check finish_reason for truncation
             if hasattr(response, 'choices') and len(response.choices) > 0:
@@ -5836,8 +6034,10 @@ Chapter Conclusion:"""
         suppress_reasoning = client.reasoning_effort == "disabled"
         is_openrouter = client.api_type == "openrouter" or "openrouter" in (client.api_url or "").lower()
 
+        slot = None
         try:
             import time
+            slot = await get_llm_scheduler().acquire(gen_params.get("api_base") or client.api_url, gen_params["model"], LANE_INTERACTIVE)
             stream_start = time.monotonic()
             response = await acompletion(**gen_params)
 
@@ -5871,6 +6071,7 @@ Chapter Conclusion:"""
 
             async for chunk in response:
                 chunk_count += 1
+                slot.mark_first_token()
                 if hasattr(chunk, 'choices') and len(chunk.choices) > 0:
                     delta = chunk.choices[0].delta
 
@@ -6037,8 +6238,15 @@ Chapter Conclusion:"""
                     logger.warning(f"[MULTI-MSG STREAMING] Received {chunk_count} chunks but no content or reasoning! Check model response format.")
             if has_reasoning:
                 logger.info(f"[MULTI-MSG REASONING] Streamed {reasoning_chars} chars of reasoning content (suppressed={suppress_reasoning})")
+            slot.release()
 
         except Exception as e:
+            if slot is not None:
+                slot.release(error=e)
             error_msg = str(e)
             logger.error(f"Multi-message streaming failed for user {user_id}: {error_msg}")
             raise ValueError(f"LLM streaming failed: {error_msg}")
+        finally:
+            # Consumer stopped iterating early - free the slot without feedback
+            if slot is not None:
+                slot.release(record=False)
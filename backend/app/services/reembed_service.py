@@ -3,14 +3,61 @@ Re-embedding Service
 
 Handles re-embedding all vector data when the embedding model or dimensions change.
 Runs as a background task with progress tracking.
+
+Each table goes through a streaming pipeline: rows are read through a
+server-side cursor, encoded in chunks by semantic_memory.reembed.workers
+concurrent workers and written back with one executemany per chunk. Progress
+is checkpointed per table in reembed_checkpoints, so a cancelled or
+interrupted run resumes after the last fully written chunk. A chunk that
+fails to encode or write holds the checkpoint back and the table is not cut
+over; the next run retries from there.
+
+When the dimension is unchanged the new vectors go into a shadow column and
+the old ones keep serving searches until the table is cut over (a short
+metadata-only swap). A dimension change has to alter the column in place,
+since old vectors can't be compared with queries of the new size anyway.
 """
 
 import logging
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
+SHADOW_COLUMN = "embedding_next"
+
+
+class ChunkWatermark:
+    """
+    Tracks the highest row id below which every dispatched chunk is written.
+
+    Chunks finish out of order when several workers run; the checkpoint may
+    only move past a chunk once all earlier chunks are done too. A failed
+    chunk stops the watermark for the rest of the run.
+    """
+
+    def __init__(self, start_id: int = 0):
+        self.last_id = start_id
+        self.rows = 0  # Rows written in the chunks below the watermark
+        self.failed = False
+        self._next_seq = 0
+        self._done: Dict[int, tuple] = {}
+
+    def complete(self, seq: int, end_id: int, rows: int = 0, ok: bool = True) -> Optional[int]:
+        """Mark chunk seq (ending at row end_id, rows written) finished. Returns the new watermark if it moved."""
+        self._done[seq] = (end_id, rows, ok)
+        advanced = False
+        while not self.failed and self._next_seq in self._done:
+            end_id, rows, ok = self._done.pop(self._next_seq)
+            if not ok:
+                self.failed = True
+                break
+            self.last_id = end_id
+            self.rows += rows
+            self._next_seq += 1
+            advanced = True
+        return self.last_id if advanced else None
+
 
 class ReembedService:
     """
@@ -55,8 +102,11 @@ class ReembedService:
 
     async def start_reembed(self, user_id: int, new_dimension: int):
         """Main re-embedding workflow"""
+        from ..config import settings
         from ..database import SessionLocal, engine as db_engine
+        from .semantic_memory import get_semantic_memory_service
 
+        config = settings.semantic_reembed
         self._cancel_flags[user_id] = False
         self._progress[user_id] = {
             "status": "running",
@@ -68,30 +118,47 @@ class ReembedService:
         }
 
         try:
-            # Step 1: ALTER vector columns if dimension changed
-            self._progress[user_id]["message"] = "Altering vector columns..."
-            await self._alter_vector_columns(new_dimension, db_engine)
+            # Checkpoints are only reused for the same model and dimension
+            model_key = get_semantic_memory_service().embedding_model_key()
+            current_dimensions = await asyncio.to_thread(self._column_dimensions, db_engine)
 
-            # Step 2: Re-embed each table
             total_rows = 0
             total_errors = 0
+            incomplete = []
 
             for table_name, model_name, text_column in self.TABLES:
                 if self._cancel_flags.get(user_id):
-                    self._progress[user_id]["status"] = "cancelled"
-                    self._progress[user_id]["message"] = "Cancelled by user"
-                    return
+                    break
 
                 self._progress[user_id]["current_table"] = table_name
                 self._progress[user_id]["message"] = f"Processing {table_name}..."
 
-                rows, errors = await self._reembed_table(
-                    table_name, model_name, text_column, user_id
+                rows, errors, completed = await self._reembed_table(
+                    db_engine, table_name, model_name, text_column, user_id,
+                    new_dimension, model_key, current_dimensions.get(table_name), config,
                 )
                 total_rows += rows
                 total_errors += errors
-
-            # Step 3: Clear event embedding cache
+                if not completed:
+                    incomplete.append(table_name)
+
+            if self._cancel_flags.get(user_id):
+                self._progress[user_id]["status"] = "cancelled"
+                self._progress[user_id]["message"] = "Cancelled by user. Progress is saved; start again to resume."
+                return
+
+            if incomplete:
+                # Keep needs_reembed and the checkpoints; the next run retries the failed chunks
+                self._progress[user_id].update({
+                    "status": "error",
+                    "current_table": "",
+                    "errors": total_errors,
+                    "message": f"{total_errors} rows failed to embed in {', '.join(incomplete)}. "
+                               f"Start again to retry; those tables still use the old embeddings.",
+                })
+                return
+
+            # Clear event embedding cache
             try:
                 from .context_manager import ContextManager
                 ContextManager._event_embedding_cache = {}
@@ -99,13 +166,14 @@ class ReembedService:
             except Exception:
                 pass
 
-            # Step 4: Clear needs_reembed flag
+            # Clear needs_reembed flag and the per-table checkpoints
             with SessionLocal() as db:
                 from ..models import UserSettings
                 us = db.query(UserSettings).first()
                 if us:
                     us.embedding_needs_reembed = False
                     db.commit()
+            await asyncio.to_thread(self._clear_checkpoints, db_engine)
 
             self._progress[user_id] = {
                 "status": "completed",
@@ -121,123 +189,283 @@ class ReembedService:
             self._progress[user_id]["status"] = "error"
             self._progress[user_id]["message"] = f"Error: {str(e)}"
 
-    async def _alter_vector_columns(self, new_dimension: int, engine):
-        """ALTER all vector columns to new dimension and rebuild HNSW indexes"""
-        from sqlalchemy import text
-
-        # scene_embeddings disabled — recall now uses event embeddings exclusively
-        tables_and_indexes = [
-            # ("scene_embeddings", "ix_scene_embeddings_embedding_hnsw"),
-            ("character_memories", "ix_character_memories_embedding_hnsw"),
-            ("plot_events", "ix_plot_events_embedding_hnsw"),
-            ("character_chronicles", "ix_character_chronicles_embedding_hnsw"),
-            ("location_lorebooks", "ix_location_lorebooks_embedding_hnsw"),
-            ("scene_events", "ix_scene_events_embedding_hnsw"),
-        ]
-
-        def _alter():
-            with engine.connect() as conn:
-                for table_name, index_name in tables_and_indexes:
-                    # Drop HNSW index if exists (silently ignore if not found)
-                    conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
-
-                    # Set all embeddings to NULL (required before ALTER type)
-                    conn.execute(text(f"UPDATE {table_name} SET embedding = NULL"))
-
-                    # ALTER column type
-                    conn.execute(text(
-                        f"ALTER TABLE {table_name} ALTER COLUMN embedding TYPE vector({new_dimension})"
-                    ))
-
-                    # Recreate HNSW index
-                    conn.execute(text(
-                        f"CREATE INDEX {index_name} ON {table_name} "
-                        f"USING hnsw (embedding vector_cosine_ops)"
-                    ))
-
-                conn.commit()
-
-        await asyncio.to_thread(_alter)
-        logger.info(f"Altered all vector columns to dimension {new_dimension}")
-
     async def _reembed_table(
-        self, table_name: str, model_name: str, text_column: str, user_id: int,
-        batch_size: int = 50
+        self, engine, table_name: str, model_name: str, text_column: str, user_id: int,
+        new_dimension: int, model_key: str, current_dimension: Optional[int], config: dict,
     ) -> tuple:
-        """Re-embed all rows in a table. Returns (processed_count, error_count)."""
-        from ..database import SessionLocal
-        from ..models.semantic_memory import SceneEmbedding, CharacterMemory, PlotEvent
-        from ..models.chronicle import CharacterChronicle, LocationLorebook
-        from ..models.scene_event import SceneEvent
+        """
+        Re-embed all rows in a table, resuming from its checkpoint.
+
+        Returns (processed_count, error_count, completed); completed is False
+        when cancelled or when a chunk failed (the table is then not cut over).
+        """
+        checkpoint = await asyncio.to_thread(self._load_checkpoint, engine, table_name)
+        if checkpoint and checkpoint["model_key"] == model_key and checkpoint["dimension"] == new_dimension:
+            if checkpoint["status"] == "completed":
+                logger.info(f"[REEMBED] {table_name}: already re-embedded, skipping")
+                return checkpoint["processed"], checkpoint["errors"], True
+            logger.info(f"[REEMBED] {table_name}: resuming after id {checkpoint['last_id']}")
+            # Rows after the checkpoint (including the ones that failed) are encoded again
+            checkpoint["errors"] = 0
+        else:
+            use_shadow = bool(config.get('shadow_column', True)) and current_dimension == new_dimension
+            mode = "shadow" if use_shadow else "in_place"
+            max_id = await asyncio.to_thread(self._prepare_table, engine, table_name, mode, new_dimension)
+            checkpoint = {
+                "table_name": table_name, "model_key": model_key, "dimension": new_dimension,
+                "mode": mode, "last_id": 0, "max_id": max_id, "processed": 0, "errors": 0,
+                "status": "running",
+            }
+            await asyncio.to_thread(self._save_checkpoint, engine, checkpoint)
+            logger.info(f"[REEMBED] {table_name}: {mode} re-embed of rows up to id {max_id}")
+
+        remaining = await asyncio.to_thread(
+            self._count_rows, engine, table_name, checkpoint["last_id"], checkpoint["max_id"]
+        )
+        self._progress[user_id]["total"] = checkpoint["processed"] + checkpoint["errors"] + remaining
+
+        failed_rows = await self._stream_table(engine, table_name, model_name, text_column, user_id, checkpoint, config)
+        if self._cancel_flags.get(user_id):
+            return checkpoint["processed"], failed_rows, False
+        if failed_rows:
+            checkpoint["errors"] = failed_rows
+            await asyncio.to_thread(self._save_checkpoint, engine, checkpoint)
+            logger.warning(
+                f"[REEMBED] {table_name}: {failed_rows} rows failed, keeping the old embeddings "
+                f"(resume after id {checkpoint['last_id']})"
+            )
+            return checkpoint["processed"], failed_rows, False
+
+        self._progress[user_id]["message"] = f"Switching {table_name} to the new embeddings..."
+        await asyncio.to_thread(self._cut_over, engine, table_name, checkpoint["mode"], checkpoint["max_id"])
+        checkpoint["status"] = "completed"
+        await asyncio.to_thread(self._save_checkpoint, engine, checkpoint)
+        return checkpoint["processed"], checkpoint["errors"], True
+
+    async def _stream_table(
+        self, engine, table_name: str, model_name: str, text_column: str, user_id: int,
+        checkpoint: dict, config: dict,
+    ) -> int:
+        """
+        Read, encode and write rows (last_id, max_id] with a bounded worker pool.
+
+        Returns the number of rows that failed. The checkpoint only moves past
+        chunks that were written, so a failed chunk is retried on the next run.
+        """
         from .semantic_memory import get_semantic_memory_service
 
-        model_map = {
-            "SceneEmbedding": SceneEmbedding,
-            "CharacterMemory": CharacterMemory,
-            "PlotEvent": PlotEvent,
-            "CharacterChronicle": CharacterChronicle,
-            "LocationLorebook": LocationLorebook,
-            "SceneEvent": SceneEvent,
-        }
-
-        model_class = model_map[model_name]
         semantic_memory = get_semantic_memory_service()
+        chunk_size = max(1, int(config.get('chunk_size', 256)))
+        worker_count = max(1, int(config.get('workers', 2)))
+        target_column = SHADOW_COLUMN if checkpoint["mode"] == "shadow" else "embedding"
+        watermark = ChunkWatermark(checkpoint["last_id"])
+        processed_before = checkpoint["processed"]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count * 2)
+        live = {"processed": 0, "errors": 0}
+
+        async def reader():
+            conn, chunks = await asyncio.to_thread(
+                self._open_row_stream, engine, table_name, model_name, text_column,
+                checkpoint["last_id"], checkpoint["max_id"], chunk_size,
+            )
+            try:
+                seq = 0
+                while not self._cancel_flags.get(user_id):
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if not chunk:
+                        break
+                    await queue.put((seq, chunk[-1][0], [(row[0], row[1]) for row in chunk if row[1]]))
+                    seq += 1
+            finally:
+                await asyncio.to_thread(conn.close)
+            for _ in range(worker_count):
+                await queue.put(None)
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                seq, end_id, rows = item
+                ok = True
+                if rows:
+                    try:
+                        embeddings = await semantic_memory.encode_texts([text for _, text in rows])
+                        await asyncio.to_thread(
+                            self._write_chunk, engine, table_name, target_column,
+                            [row_id for row_id, _ in rows], embeddings,
+                        )
+                        live["processed"] += len(rows)
+                    except Exception as e:
+                        logger.error(f"Batch embedding failed for {table_name}: {e}")
+                        live["errors"] += len(rows)
+                        ok = False
+
+                self._progress[user_id]["processed"] = processed_before + live["processed"]
+                self._progress[user_id]["errors"] = checkpoint["errors"] + live["errors"]
+                if watermark.complete(seq, end_id, len(rows), ok) is not None:
+                    checkpoint["last_id"] = watermark.last_id
+                    checkpoint["processed"] = processed_before + watermark.rows
+                    await asyncio.to_thread(self._save_checkpoint, engine, checkpoint)
+
+        # If any task dies the others are cancelled, so the reader can't stay
+        # blocked on a full queue that nobody drains
+        tasks = [asyncio.ensure_future(reader())] + [asyncio.ensure_future(worker()) for _ in range(worker_count)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return live["errors"]
+
+    # ------------------------------------------------------------------
+    # SQL helpers (run via asyncio.to_thread)
+    # ------------------------------------------------------------------
+
+    def _column_dimensions(self, engine) -> Dict[str, Optional[int]]:
+        """Current vector(N) size of each embedding column (None if untyped)."""
+        from sqlalchemy import text
 
-        processed = 0
-        errors = 0
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT c.relname, a.atttypmod FROM pg_attribute a "
+                "JOIN pg_class c ON c.oid = a.attrelid "
+                "WHERE a.attname = 'embedding' AND NOT a.attisdropped AND c.relname = ANY(:tables)"
+            ), {"tables": [t for t, _, _ in self.TABLES]}).fetchall()
+        return {row[0]: (row[1] if row[1] and row[1] > 0 else None) for row in rows}
 
-        with SessionLocal() as db:
-            total = db.query(model_class).count()
-            self._progress[user_id]["total"] = total
+    def _prepare_table(self, engine, table_name: str, mode: str, new_dimension: int) -> int:
+        """Create the shadow column or reset the column in place. Returns the max id to process."""
+        from sqlalchemy import text
+        from .vector_index import drop_index_sql
+
+        with engine.begin() as conn:
+            if mode == "shadow":
+                conn.execute(text(f"DROP INDEX IF EXISTS ix_{table_name}_{SHADOW_COLUMN}"))
+                conn.execute(text(f"ALTER TABLE {table_name} DROP COLUMN IF EXISTS {SHADOW_COLUMN}"))
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {SHADOW_COLUMN} vector({new_dimension})"))
+            else:
+                # Index is rebuilt once after the bulk load (cheaper than maintaining it row by row)
+                for statement in drop_index_sql(table_name):
+                    conn.execute(text(statement))
+                # Set all embeddings to NULL (required before ALTER type)
+                conn.execute(text(f"UPDATE {table_name} SET embedding = NULL"))
+                conn.execute(text(
+                    f"ALTER TABLE {table_name} ALTER COLUMN embedding TYPE vector({new_dimension})"
+                ))
+            return conn.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table_name}")).scalar()
+
+    def _count_rows(self, engine, table_name: str, last_id: int, max_id: int) -> int:
+        from sqlalchemy import text
 
-            offset = 0
-            while True:
-                if self._cancel_flags.get(user_id):
-                    break
+        with engine.connect() as conn:
+            return conn.execute(
+                text(f"SELECT COUNT(*) FROM {table_name} WHERE id > :last_id AND id <= :max_id"),
+                {"last_id": last_id, "max_id": max_id},
+            ).scalar()
+
+    def _open_row_stream(
+        self, engine, table_name: str, model_name: str, text_column: str,
+        last_id: int, max_id: int, chunk_size: int,
+    ):
+        """Server-side cursor over (id, text) rows. Returns (connection, chunk iterator)."""
+        from sqlalchemy import text
 
-                rows = db.query(model_class).order_by(model_class.id).offset(offset).limit(batch_size).all()
-                if not rows:
-                    break
+        if model_name == "SceneEmbedding":
+            # Fall back to scene content if embedding_text is NULL
+            sql = (
+                f"SELECT t.id, COALESCE(t.{text_column}, LEFT(v.content, 1000)) FROM {table_name} t "
+                f"LEFT JOIN scene_variants v ON v.id = t.variant_id "
+                f"WHERE t.id > :last_id AND t.id <= :max_id ORDER BY t.id"
+            )
+        else:
+            sql = (
+                f"SELECT id, {text_column} FROM {table_name} "
+                f"WHERE id > :last_id AND id <= :max_id ORDER BY id"
+            )
+        conn = engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size)
+        result = conn.execute(text(sql), {"last_id": last_id, "max_id": max_id})
+        return conn, result.partitions(chunk_size)
+
+    def _write_chunk(self, engine, table_name: str, column: str, ids: List[int], embeddings) -> None:
+        """Write one chunk of embeddings with a single executemany."""
+        from pgvector.sqlalchemy import Vector
+        from sqlalchemy import bindparam, text
+
+        statement = text(
+            f"UPDATE {table_name} SET {column} = :embedding WHERE id = :id"
+        ).bindparams(bindparam("embedding", type_=Vector()))
+        with engine.begin() as conn:
+            conn.execute(statement, [
+                {"id": row_id, "embedding": embedding.tolist()}
+                for row_id, embedding in zip(ids, embeddings)
+            ])
+
+    def _cut_over(self, engine, table_name: str, mode: str, max_id: int) -> None:
+        """Make the re-embedded vectors the ones searches use."""
+        from sqlalchemy import text
+        from .vector_index import create_index_sql, drop_index_sql, get_vector_index_config, index_name
+
+        if mode != "shadow":
+            # Recreate index with the configured type (semantic_memory.vector_index)
+            with engine.begin() as conn:
+                conn.execute(text(create_index_sql(table_name)))
+            logger.info(f"[REEMBED] {table_name}: index rebuilt")
+            return
+
+        config = get_vector_index_config()
+        shadow_index = f"ix_{table_name}_{SHADOW_COLUMN}"
+        # Build the index before locking, so the swap itself is metadata-only
+        with engine.begin() as conn:
+            conn.execute(text(create_index_sql(table_name, config, column=SHADOW_COLUMN, name=shadow_index)))
+        with engine.begin() as conn:
+            conn.execute(text(f"LOCK TABLE {table_name} IN ACCESS EXCLUSIVE MODE"))
+            # Rows added after the re-embed started were already embedded by the new model
+            conn.execute(
+                text(f"UPDATE {table_name} SET {SHADOW_COLUMN} = embedding WHERE id > :max_id AND {SHADOW_COLUMN} IS NULL"),
+                {"max_id": max_id},
+            )
+            for statement in drop_index_sql(table_name):
+                conn.execute(text(statement))
+            conn.execute(text(f"ALTER TABLE {table_name} DROP COLUMN embedding"))
+            conn.execute(text(f"ALTER TABLE {table_name} RENAME COLUMN {SHADOW_COLUMN} TO embedding"))
+            conn.execute(text(
+                f"ALTER INDEX {shadow_index} RENAME TO {index_name(table_name, config.get('index_type', 'hnsw'))}"
+            ))
+        logger.info(f"[REEMBED] {table_name}: cut over to re-embedded vectors")
+
+    def _load_checkpoint(self, engine, table_name: str) -> Optional[Dict[str, Any]]:
+        from sqlalchemy import text
 
-                texts = []
-                valid_rows = []
-
-                for row in rows:
-                    text_value = getattr(row, text_column, None)
-
-                    # For scene_embeddings, fall back to joining scene content if embedding_text is NULL
-                    if not text_value and model_name == "SceneEmbedding":
-                        try:
-                            from ..models import SceneVariant
-                            variant = db.query(SceneVariant).filter(
-                                SceneVariant.id == row.variant_id
-                            ).first()
-                            if variant and variant.content:
-                                text_value = variant.content[:1000]
-                        except Exception:
-                            pass
-
-                    if text_value:
-                        texts.append(text_value)
-                        valid_rows.append(row)
-
-                if texts:
-                    try:
-                        embeddings = await semantic_memory.encode_texts(texts)
-                        for row, emb in zip(valid_rows, embeddings):
-                            row.embedding = emb.tolist()
-                        db.commit()
-                        processed += len(valid_rows)
-                    except Exception as e:
-                        logger.error(f"Batch embedding failed for {table_name}: {e}")
-                        db.rollback()
-                        errors += len(texts)
+        with engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT * FROM reembed_checkpoints WHERE table_name = :table_name"),
+                {"table_name": table_name},
+            ).mappings().first()
+        return dict(row) if row else None
 
-                self._progress[user_id]["processed"] = processed
-                self._progress[user_id]["errors"] = errors
-                offset += batch_size
+    def _save_checkpoint(self, engine, checkpoint: Dict[str, Any]) -> None:
+        from sqlalchemy import text
+
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO reembed_checkpoints "
+                "(table_name, model_key, dimension, mode, last_id, max_id, processed, errors, status, updated_at) "
+                "VALUES (:table_name, :model_key, :dimension, :mode, :last_id, :max_id, :processed, :errors, :status, NOW()) "
+                "ON CONFLICT (table_name) DO UPDATE SET model_key = EXCLUDED.model_key, "
+                "dimension = EXCLUDED.dimension, mode = EXCLUDED.mode, last_id = EXCLUDED.last_id, "
+                "max_id = EXCLUDED.max_id, processed = EXCLUDED.processed, errors = EXCLUDED.errors, "
+                "status = EXCLUDED.status, updated_at = NOW()"
+            ), {key: checkpoint[key] for key in (
+                "table_name", "model_key", "dimension", "mode", "last_id", "max_id", "processed", "errors", "status",
+            )})
+
+    def _clear_checkpoints(self, engine) -> None:
+        from sqlalchemy import text
 
-        return processed, errors
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM reembed_checkpoints"))
 
 
 # Global singleton
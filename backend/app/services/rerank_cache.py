@@ -0,0 +1,105 @@
+"""
+Rerank Score Cache
+
+Process-wide cache of cross-encoder scores for (query, document) pairs.
+
+Regenerating a variant or re-running the recall agent reranks the same
+candidates against the same query text, and the BGE cross-encoder is the
+slowest step of a search on CPU. Scores are keyed by (reranker model,
+sha256(query), document id, sha256(document text)), so an edited document or
+a different query never reuses a stale score.
+
+Also holds the counters for the margin-based early exit in
+SemanticMemoryService, so cache hits and skipped reranks are reported
+together.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PairKey = Tuple[str, str, str, str]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_pair_key(model: str, query_hash: str, doc_id: Any, doc_text: str) -> PairKey:
+    """Cache key for a (query, document) pair scored by a reranker model."""
+    return (model or "", query_hash, str(doc_id), text_hash(doc_text))
+
+
+class RerankScoreCache:
+    """
+    LRU cache of raw cross-encoder scores.
+
+    Args:
+        max_entries: Number of pair scores kept before the least recently
+            used one is evicted.
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._scores: "OrderedDict[PairKey, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.pairs_scored = 0
+        self.predict_seconds = 0.0
+        self.early_exits = 0
+
+    def get(self, key: PairKey) -> Optional[float]:
+        with self._lock:
+            score = self._scores.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key: PairKey, score: float) -> None:
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+
+    def record_predict(self, pairs: int, seconds: float) -> None:
+        """Record a cross-encoder call (used to estimate time saved by hits)."""
+        with self._lock:
+            self.pairs_scored += pairs
+            self.predict_seconds += seconds
+
+    def record_early_exit(self) -> None:
+        with self._lock:
+            self.early_exits += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scores.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache counters for monitoring"""
+        with self._lock:
+            total = self.hits + self.misses
+            per_pair = (self.predict_seconds / self.pairs_scored) if self.pairs_scored else 0.0
+            return {
+                "entries": len(self._scores),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "pairs_scored": self.pairs_scored,
+                "predict_seconds": round(self.predict_seconds, 3),
+                "estimated_seconds_saved": round(self.hits * per_pair, 3),
+                "early_exits": self.early_exits,
+            }
+
+
+# Global instance shared by all SemanticMemoryService users in this process
+rerank_score_cache = RerankScoreCache()
@@ -380,7 +380,7 @@ async def _store_scene_events(
         try:
             semantic_memory = get_semantic_memory_service()
             texts = [e.event_text for e in new_events]
-            embeddings = await semantic_memory.encode_texts(texts)
+            embeddings = await semantic_memory.encode_batched(texts)
             for event_obj, emb in zip(new_events, embeddings):
                 event_obj.embedding = emb.tolist()
             db.flush()
@@ -391,6 +391,17 @@ async def _store_scene_events(
     return stored
 
 
+def _story_character_names(db: Session, story_id: int) -> List[str]:
+    """Names of the story's characters, in StoryCharacter order."""
+    story_characters = db.query(StoryCharacter).filter(StoryCharacter.story_id == story_id).all()
+    names = []
+    for sc in story_characters:
+        char = db.query(Character).filter(Character.id == sc.character_id).first()
+        if char:
+            names.append(char.name)
+    return names
+
+
 async def _try_combined_extraction(
     scenes_data: List[Tuple[int, int, Optional[int], str]],
     story_id: int,
@@ -516,7 +527,8 @@ async def run_inline_entity_extraction(
     user_settings: Dict[str, Any],
     db: Session,
     branch_id: int = None,
-    scene_generation_context: Optional[Dict[str, Any]] = None
+    scene_generation_context: Optional[Dict[str, Any]] = None,
+    entity_states: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Fast inline entity extraction for contradiction checking.
@@ -537,6 +549,8 @@ async def run_inline_entity_extraction(
         db: Database session
         branch_id: Branch ID
         scene_generation_context: Context from scene generation (for cache hits)
+        entity_states: Already extracted entity states (e.g. from a fused extraction
+            call); skips the LLM call when provided
 
     Returns:
         Dictionary with entity states updated and contradictions found
@@ -563,47 +577,48 @@ async def run_inline_entity_extraction(
             logger.error(f"[INLINE_ENTITY] Story or chapter not found")
             return results
 
-        # Get character names
-        story_characters = db.query(StoryCharacter).filter(
-            StoryCharacter.story_id == story_id
-        ).all()
-        character_names = [sc.character.name for sc in story_characters if sc.character]
+        if entity_states is None:
+            # Get character names
+            story_characters = db.query(StoryCharacter).filter(
+                StoryCharacter.story_id == story_id
+            ).all()
+            character_names = [sc.character.name for sc in story_characters if sc.character]
 
-        # Get chapter location
-        chapter_location = chapter.location_name or story.setting or "unspecified location"
+            # Get chapter location
+            chapter_location = chapter.location_name or story.setting or "unspecified location"
 
-        # Get or create LLM service
-        llm_service = UnifiedLLMService()
+            # Get or create LLM service
+            llm_service = UnifiedLLMService()
 
-        # Check if we have scene generation context for cache-friendly extraction
-        if scene_generation_context is None:
-            logger.warning("[INLINE_ENTITY] No scene_generation_context provided, cache may not be optimal")
-            # Still proceed, just won't have cache benefits
-            scene_generation_context = {}
-
-        # Call the fast entity-only extraction
-        logger.debug(f"[INLINE_ENTITY] Calling extract_entity_states_cache_friendly")
-        raw_response = await llm_service.extract_entity_states_cache_friendly(
-            scene_content=scene_content,
-            character_names=character_names,
-            chapter_location=chapter_location,
-            context=scene_generation_context,
-            user_id=user_id,
-            user_settings=user_settings,
-            db=db
-        )
+            # Check if we have scene generation context for cache-friendly extraction
+            if scene_generation_context is None:
+                logger.warning("[INLINE_ENTITY] No scene_generation_context provided, cache may not be optimal")
+                # Still proceed, just won't have cache benefits
+                scene_generation_context = {}
 
-        extraction_time = (time.perf_counter() - start_time) * 1000
-        logger.debug(f"[INLINE_ENTITY] LLM response received in {extraction_time:.0f}ms")
+            # Call the fast entity-only extraction
+            logger.debug(f"[INLINE_ENTITY] Calling extract_entity_states_cache_friendly")
+            raw_response = await llm_service.extract_entity_states_cache_friendly(
+                scene_content=scene_content,
+                character_names=character_names,
+                chapter_location=chapter_location,
+                context=scene_generation_context,
+                user_id=user_id,
+                user_settings=user_settings,
+                db=db
+            )
 
-        # Parse JSON response using robust extractor
-        try:
-            entity_states = extract_json_robust(raw_response)
-        except json.JSONDecodeError as e:
-            logger.error(f"[INLINE_ENTITY] Failed to parse JSON response: {e}")
-            logger.debug(f"[INLINE_ENTITY] Raw response: {raw_response[:500]}...")
-            results['extraction_time_ms'] = extraction_time
-            return results
+            extraction_time = (time.perf_counter() - start_time) * 1000
+            logger.debug(f"[INLINE_ENTITY] LLM response received in {extraction_time:.0f}ms")
+
+            # Parse JSON response using robust extractor
+            try:
+                entity_states = extract_json_robust(raw_response)
+            except json.JSONDecodeError as e:
+                logger.error(f"[INLINE_ENTITY] Failed to parse JSON response: {e}")
+                logger.debug(f"[INLINE_ENTITY] Raw response: {raw_response[:500]}...")
+                results['extraction_time_ms'] = extraction_time
+                return results
 
         # Process entity states and check for contradictions
         from .entity_state_service import EntityStateService
@@ -847,14 +862,20 @@ async def batch_process_scene_extractions(
             logger.warning(f"No valid scenes to process in batch")
             return results
 
+        # Independent steps run concurrently, capped per LLM endpoint; each step
+        # uses its own session and commits its own short transaction
+        # (see extraction_executor.py).
+        from .extraction_executor import ExtractionStep, get_extraction_executor
+
+        llm_endpoint = "llm:extraction" if UnifiedLLMService._will_use_extraction_llm(user_settings) else "llm:main"
+        single_scene_with_context = len(scenes_data) == 1 and scene_generation_context is not None
+
         # === STEP 1: Generate scene summary + contextual embedding ===
-        # This runs FIRST (before other extractions) to:
-        #   a) Warm the LLM cache for subsequent extraction calls
-        #   b) Create enriched embeddings immediately
-        contextual_embedding_done = False
-        if len(scenes_data) == 1 and scene_generation_context is not None:
+        # Runs concurrently with the extraction calls below (no dependency).
+        async def scene_summary_step(step_db, outputs):
             scene_id_embed, seq_embed, chapter_id_embed, scene_content_embed = scenes_data[0]
             _, variant_id_embed, _, _ = scenes_for_embeddings[0]
+            contextual_embedding_done = False
 
             # Step 1a: Generate 1-sentence summary + specific location via LLM
             summary_result = None
@@ -865,7 +886,7 @@ async def batch_process_scene_extractions(
                     context=scene_generation_context,
                     user_id=user_id,
                     user_settings=user_settings,
-                    db=db
+                    db=step_db
                 )
                 if summary_result:
                     logger.debug(f"[EXTRACTION] Scene location: {summary_result.get('location', '')}, summary: {summary_result.get('summary', '')[:80]}")
@@ -904,7 +925,7 @@ async def batch_process_scene_extractions(
                     import hashlib
                     content_hash = hashlib.sha256(enriched_content.encode('utf-8')).hexdigest()
 
-                    existing_embedding = db.query(SceneEmbedding).filter(
+                    existing_embedding = step_db.query(SceneEmbedding).filter(
                         SceneEmbedding.embedding_id == embedding_id
                     ).first()
 
@@ -931,196 +952,202 @@ async def batch_process_scene_extractions(
                             content_length=len(enriched_content),
                             embedding_text=enriched_content,
                         )
-                        db.add(scene_embedding)
+                        step_db.add(scene_embedding)
 
-                    db.commit()
+                    step_db.commit()
                     contextual_embedding_done = True
                     results['scene_embeddings'] += 1
                     logger.warning(f"[EXTRACTION] Contextual embedding created: {embedding_id} (prefix: {len(context_prefix)} chars)")
 
                 except Exception as e:
                     logger.warning(f"[EXTRACTION] Contextual embedding failed, will fall back to plain embedding: {e}")
-                    db.rollback()
+                    step_db.rollback()
+            return contextual_embedding_done
 
         # Check if combined extraction is enabled (default: True)
         enable_combined = user_settings.get('extraction_model_settings', {}).get('enable_combined_extraction', True)
-        
+
         # BATCH EXTRACTION: Try combined extraction first, fallback to separate calls
-        combined_success = False
-        if enable_combined:
+        async def combined_step(step_db, outputs):
+            logger.debug(f"[EXTRACTION] Attempting combined extraction for {len(scenes_data)} scenes")
             try:
-                logger.debug(f"[EXTRACTION] Attempting combined extraction for {len(scenes_data)} scenes")
                 combined_success = await _try_combined_extraction(
                     scenes_data=scenes_data,
                     story_id=story_id,
                     user_id=user_id,
                     user_settings=user_settings,
-                    db=db,
+                    db=step_db,
                     results=results,
                     branch_id=branch_id,
                     scene_generation_context=scene_generation_context,
                     skip_entity_states=skip_entity_states
                 )
-                if combined_success:
-                    logger.debug(f"[EXTRACTION] Combined extraction successful!")
             except Exception as e:
                 logger.warning(f"[EXTRACTION] Combined extraction failed: {e}, falling back to separate calls")
-                combined_success = False
-        
-        # Fallback to separate calls if combined extraction failed or disabled
-        if not combined_success:
-            logger.debug(f"[EXTRACTION] Using separate extraction calls")
-
-            # Check if we can use cache-friendly extraction (single scene with context)
-            use_cache_friendly = len(scenes_data) == 1 and scene_generation_context is not None
-            if use_cache_friendly:
-                logger.debug("[EXTRACTION] Using cache-friendly fallback extraction for single scene")
-                scene_id, sequence_number, chapter_id_local, scene_content = scenes_data[0]
-
-                # Get character names for extraction
-                story_characters = db.query(StoryCharacter).filter(StoryCharacter.story_id == story_id).all()
-                character_names = []
-                explicit_names = []
-                character_map = {}
-                for sc in story_characters:
-                    char = db.query(Character).filter(Character.id == sc.character_id).first()
-                    if char:
-                        character_names.append(char.name)
-                        explicit_names.append(char.name.lower())
-                        character_map[char.name.lower()] = char
-
-                llm_service = UnifiedLLMService()
-
-                # 1. Cache-friendly NPC extraction
-                try:
-                    npcs = await llm_service.extract_npcs_cache_friendly(
-                        scene_content=scene_content,
-                        explicit_names=explicit_names,
-                        context=scene_generation_context,
-                        user_id=user_id,
-                        user_settings=user_settings,
-                        db=db
-                    )
-                    if npcs:
-                        from .npc_tracking_service import NPCTrackingService
-                        npc_service = NPCTrackingService(user_id=user_id, user_settings=user_settings)
-                        for npc_data in npcs:
-                            try:
-                                await npc_service.track_npc(
-                                    db=db,
-                                    story_id=story_id,
-                                    scene_id=scene_id,
-                                    scene_sequence=sequence_number,
-                                    npc_data=npc_data,
-                                    branch_id=branch_id
-                                )
-                                results['npc_tracking'] += 1
-                            except Exception as e:
-                                logger.warning(f"Failed to track NPC: {e}")
-                        logger.debug(f"[EXTRACTION] Cache-friendly extracted {len(npcs)} NPCs")
-                except Exception as e:
-                    logger.error(f"Cache-friendly NPC extraction failed: {e}")
-
-                # 2. Cache-friendly scene events extraction (replaces plot events + character moments)
-                try:
-                    events_response = await llm_service.extract_scene_events_cache_friendly(
-                        scene_content=scene_content,
-                        character_names=character_names,
-                        context=scene_generation_context,
-                        user_id=user_id,
-                        user_settings=user_settings,
-                        db=db
-                    )
-                    if events_response:
-                        events_data = extract_json_robust(events_response)
-                        events = events_data.get('events', [])
-                        if events:
-                            stored = await _store_scene_events(
-                                db=db,
-                                events=events,
+                return False
+            if combined_success:
+                logger.debug(f"[EXTRACTION] Combined extraction successful!")
+            return combined_success
+
+        def combined_failed(outputs):
+            return outputs.get("combined_extraction") is not True
+
+        # Fallback to separate calls if combined extraction failed or disabled.
+        # Single scene with context: cache-friendly NPC and scene event calls (independent, run together)
+        async def fallback_npcs_step(step_db, outputs):
+            scene_id, sequence_number, chapter_id_local, scene_content = scenes_data[0]
+            explicit_names = [name.lower() for name in _story_character_names(step_db, story_id)]
+            try:
+                npcs = await UnifiedLLMService().extract_npcs_cache_friendly(
+                    scene_content=scene_content,
+                    explicit_names=explicit_names,
+                    context=scene_generation_context,
+                    user_id=user_id,
+                    user_settings=user_settings,
+                    db=step_db
+                )
+                if npcs:
+                    from .npc_tracking_service import NPCTrackingService
+                    npc_service = NPCTrackingService(user_id=user_id, user_settings=user_settings)
+                    for npc_data in npcs:
+                        try:
+                            await npc_service.track_npc(
+                                db=step_db,
                                 story_id=story_id,
                                 scene_id=scene_id,
                                 scene_sequence=sequence_number,
-                                chapter_id=chapter_id_local,
-                                branch_id=branch_id,
-                                world_id=world_id,
+                                npc_data=npc_data,
+                                branch_id=branch_id
                             )
-                            results['scene_events'] = results.get('scene_events', 0) + stored
-                            logger.debug(f"[SCENE EVENTS] Fallback extracted {stored} events for scene {scene_id}")
-                except Exception as e:
-                    logger.error(f"Cache-friendly scene events extraction failed: {e}")
+                            results['npc_tracking'] += 1
+                        except Exception as e:
+                            logger.warning(f"Failed to track NPC: {e}")
+                    logger.debug(f"[EXTRACTION] Cache-friendly extracted {len(npcs)} NPCs")
+            except Exception as e:
+                logger.error(f"Cache-friendly NPC extraction failed: {e}")
 
-            else:
-                # Original batch extraction path (multiple scenes or no context)
+        async def fallback_events_step(step_db, outputs):
+            # Cache-friendly scene events extraction (replaces plot events + character moments)
+            scene_id, sequence_number, chapter_id_local, scene_content = scenes_data[0]
+            try:
+                events_response = await UnifiedLLMService().extract_scene_events_cache_friendly(
+                    scene_content=scene_content,
+                    character_names=_story_character_names(step_db, story_id),
+                    context=scene_generation_context,
+                    user_id=user_id,
+                    user_settings=user_settings,
+                    db=step_db
+                )
+                if events_response:
+                    events_data = extract_json_robust(events_response)
+                    events = events_data.get('events', [])
+                    if events:
+                        stored = await _store_scene_events(
+                            db=step_db,
+                            events=events,
+                            story_id=story_id,
+                            scene_id=scene_id,
+                            scene_sequence=sequence_number,
+                            chapter_id=chapter_id_local,
+                            branch_id=branch_id,
+                            world_id=world_id,
+                        )
+                        results['scene_events'] = results.get('scene_events', 0) + stored
+                        logger.debug(f"[SCENE EVENTS] Fallback extracted {stored} events for scene {scene_id}")
+            except Exception as e:
+                logger.error(f"Cache-friendly scene events extraction failed: {e}")
+
+        # Multiple scenes or no context: original batch NPC extraction.
+        # Plot events and character moments extraction removed; scene events are
+        # extracted via the cache-friendly single-scene path only.
+        async def fallback_batch_npcs_step(step_db, outputs):
+            try:
+                from .npc_tracking_service import NPCTrackingService
+                npc_service = NPCTrackingService(user_id=user_id, user_settings=user_settings)
+                npc_scenes_data = [(scene_id, seq_num, content) for scene_id, seq_num, _, content in scenes_data]
+                npc_results = await npc_service.extract_npcs_from_scenes_batch(
+                    db=step_db,
+                    story_id=story_id,
+                    scenes=npc_scenes_data,
+                    branch_id=branch_id
+                )
+                if npc_results.get('extraction_successful'):
+                    results['npc_tracking'] += npc_results.get('npcs_tracked', 0)
+                    logger.debug(f"[EXTRACTION] Batch extracted {npc_results.get('npcs_tracked', 0)} NPCs")
+            except Exception as e:
+                logger.error(f"Failed to batch extract NPCs: {e}")
+
+        # PER-SCENE PROCESSING: Scene embeddings and entity states (still per-scene)
+        async def scene_embeddings_step(step_db, outputs):
+            contextual_embedding_done = outputs.get("scene_summary") is True
+            for scene_id, variant_id, sequence_number, scene_content in scenes_for_embeddings:
                 try:
-                    # 1. Batch extract NPCs
-                    from .npc_tracking_service import NPCTrackingService
-                    npc_service = NPCTrackingService(user_id=user_id, user_settings=user_settings)
-                    npc_scenes_data = [(scene_id, seq_num, content) for scene_id, seq_num, _, content in scenes_data]
-                    npc_results = await npc_service.extract_npcs_from_scenes_batch(
-                        db=db,
+                    # Verify scene still exists (may have been deleted during batch extraction)
+                    scene_exists = step_db.query(Scene).filter(Scene.id == scene_id).first()
+                    if not scene_exists:
+                        logger.warning(f"Scene {scene_id} was deleted during extraction, skipping embedding")
+                        continue
+
+                    # Skip scene embedding if contextual embedding was already created above
+                    skip_embed = contextual_embedding_done and scene_id == scenes_for_embeddings[0][0]
+
+                    # Process scene embeddings (still per-scene)
+                    # Skip NPC/plot/character/entity extraction since they're done in batch above
+                    scene_results = await process_scene_embeddings(
+                        scene_id=scene_id,
+                        variant_id=variant_id,
                         story_id=story_id,
-                        scenes=npc_scenes_data,
-                        branch_id=branch_id
+                        scene_content=scene_content,
+                        sequence_number=sequence_number,
+                        chapter_id=chapter_id,
+                        user_id=user_id,
+                        user_settings=user_settings,
+                        db=step_db,
+                        skip_npc_extraction=True,
+                        skip_plot_extraction=True,
+                        skip_character_moments=True,
+                        skip_entity_states=True,
+                        skip_scene_embedding=skip_embed
                     )
-                    if npc_results.get('extraction_successful'):
-                        results['npc_tracking'] += npc_results.get('npcs_tracked', 0)
-                        logger.debug(f"[EXTRACTION] Batch extracted {npc_results.get('npcs_tracked', 0)} NPCs")
-                except Exception as e:
-                    logger.error(f"Failed to batch extract NPCs: {e}")
 
-                # Note: Plot events and character moments extraction removed.
-                # Scene events are extracted via cache-friendly single-scene path only.
-                # Batch path only handles NPCs now.
-        
-        # PER-SCENE PROCESSING: Scene embeddings and entity states (still per-scene)
-        for scene_id, variant_id, sequence_number, scene_content in scenes_for_embeddings:
-            try:
-                # Verify scene still exists (may have been deleted during batch extraction)
-                scene_exists = db.query(Scene).filter(Scene.id == scene_id).first()
-                if not scene_exists:
-                    logger.warning(f"Scene {scene_id} was deleted during extraction, skipping embedding")
-                    continue
+                    # Aggregate results (NPCs, plot events, moments already counted above)
+                    results['scenes_processed'] += 1
+                    if scene_results.get('scene_embedding'):
+                        results['scene_embeddings'] += 1
+                    if scene_results.get('entity_states'):
+                        results['entity_states'] += 1
 
-                # Skip scene embedding if contextual embedding was already created above
-                skip_embed = contextual_embedding_done and scene_id == scenes_for_embeddings[0][0]
+                    logger.debug(f"Processed scene {scene_id} (sequence {sequence_number}): "
+                               f"embedding={scene_results.get('scene_embedding')}, "
+                               f"entities={scene_results.get('entity_states')}, "
+                               f"skip_embed={skip_embed}")
 
-                # Process scene embeddings (still per-scene)
-                # Skip NPC/plot/character/entity extraction since they're done in batch above
-                scene_results = await process_scene_embeddings(
-                    scene_id=scene_id,
-                    variant_id=variant_id,
-                    story_id=story_id,
-                    scene_content=scene_content,
-                    sequence_number=sequence_number,
-                    chapter_id=chapter_id,
-                    user_id=user_id,
-                    user_settings=user_settings,
-                    db=db,
-                    skip_npc_extraction=True,
-                    skip_plot_extraction=True,
-                    skip_character_moments=True,
-                    skip_entity_states=True,
-                    skip_scene_embedding=skip_embed
-                )
+                except Exception as e:
+                    logger.error(f"Failed to process scene {scene_id} embeddings: {e}")
+                    # Continue with next scene
+                    continue
 
-                # Aggregate results (NPCs, plot events, moments already counted above)
-                results['scenes_processed'] += 1
-                if scene_results.get('scene_embedding'):
-                    results['scene_embeddings'] += 1
-                if scene_results.get('entity_states'):
-                    results['entity_states'] += 1
+        steps = []
+        if single_scene_with_context:
+            steps.append(ExtractionStep("scene_summary", scene_summary_step, endpoint=llm_endpoint))
+        if enable_combined:
+            steps.append(ExtractionStep("combined_extraction", combined_step, endpoint=llm_endpoint))
+        fallback_deps = ["combined_extraction"] if enable_combined else []
+        if single_scene_with_context:
+            steps.append(ExtractionStep("npcs", fallback_npcs_step, endpoint=llm_endpoint,
+                                        depends_on=fallback_deps, condition=combined_failed))
+            steps.append(ExtractionStep("scene_events", fallback_events_step, endpoint=llm_endpoint,
+                                        depends_on=fallback_deps, condition=combined_failed))
+        else:
+            steps.append(ExtractionStep("batch_npcs", fallback_batch_npcs_step, endpoint=llm_endpoint,
+                                        depends_on=fallback_deps, condition=combined_failed))
+        steps.append(ExtractionStep(
+            "scene_embeddings", scene_embeddings_step, endpoint="embedding",
+            depends_on=["scene_summary"] if single_scene_with_context else [],
+        ))
 
-                logger.debug(f"Processed scene {scene_id} (sequence {sequence_number}): "
-                           f"embedding={scene_results.get('scene_embedding')}, "
-                           f"entities={scene_results.get('entity_states')}, "
-                           f"skip_embed={skip_embed}")
+        await get_extraction_executor().run(steps)
 
-            except Exception as e:
-                logger.error(f"Failed to process scene {scene_id} embeddings: {e}")
-                # Continue with next scene
-                continue
-        
         logger.debug(f"[EXTRACTION] Batch processing complete: {results}")
         return results
         
@@ -15,6 +15,8 @@ from datetime import datetime
 # SentenceTransformer is imported lazily in _ensure_model_loaded to avoid blocking startup
 import hashlib
 
+from .vector_index import apply_vector_search_settings
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +64,31 @@ class SemanticMemoryService:
         self._litellm_model = None
         self._litellm_api_key = None
         self._litellm_api_base = None
+        self._litellm_dimensions = None
+        self._worker_client = None
+
+        # Shared query embedding cache (keyed by provider/model, so provider switches are safe)
+        from ..config import settings
+        from .embedding_cache import get_query_embedding_cache
+        self._query_cache = get_query_embedding_cache() if settings.semantic_query_cache.get('enabled', True) else None
+
+        # Micro-batching dispatcher: concurrent generate_embedding / encode_batched calls share one encode
+        from .embedding_batcher import EmbeddingBatcher
+        batching = settings.semantic_embedding_batching
+        self._batcher = EmbeddingBatcher(
+            self.encode_texts,
+            max_batch_size=int(batching.get('max_batch_size', 32)),
+            max_wait_ms=float(batching.get('max_wait_ms', 5)),
+            enabled=bool(batching.get('enabled', True)),
+        )
+
+        # Cross-encoder pair-score cache + bi-encoder margin early exit
+        from .rerank_cache import rerank_score_cache
+        rerank_config = settings.semantic_rerank
+        self._rerank_cache = rerank_score_cache if rerank_config.get('cache_enabled', True) else None
+        rerank_score_cache.max_entries = int(rerank_config.get('cache_max_entries', 50000))
+        self._rerank_stats = rerank_score_cache
+        self.rerank_early_exit_margin = float(rerank_config.get('early_exit_margin', 0.0))
 
         logger.info("SemanticMemoryService initialized (pgvector backend)")
 
@@ -71,16 +98,33 @@ class SemanticMemoryService:
         sentence-transformers and cloud/API-based embedding providers.
         """
         self._embedding_provider = provider or "local"
+        if provider != "worker" and self._worker_client is not None:
+            # Leaving the worker: drop its client and its reranker proxy (the local one loads lazily)
+            self._worker_client = None
+            self.reranker = None
         if provider == "local":
             self.embedding_model_name = model_name or "sentence-transformers/all-mpnet-base-v2"
             self.embedding_model = None  # Force reload on next use
             self._litellm_model = None
+        elif provider == "worker":
+            # Shared out-of-process worker owns the models (see embedding_worker.py)
+            from ..config import settings
+            from .embedding_worker import EmbeddingWorkerClient
+            worker_config = settings.semantic_worker
+            self.embedding_model_name = model_name or self.embedding_model_name
+            self.embedding_model = None
+            self.reranker = None  # Rerank through the worker too
+            self._litellm_model = None
+            self._worker_client = EmbeddingWorkerClient(
+                api_url or worker_config.get('url'), timeout=float(worker_config.get('timeout', 60))
+            )
         else:
             from ..api.settings import _resolve_embedding_litellm_args
             self._litellm_model, self._litellm_api_base = _resolve_embedding_litellm_args(
                 provider, model_name, api_url
             )
             self._litellm_api_key = api_key
+            self._litellm_dimensions = dimensions
         if dimensions:
             self._embedding_dimension = dimensions
         logger.info(f"Embedding provider configured: {provider} (model={model_name}, dim={dimensions})")
@@ -122,6 +166,8 @@ class SemanticMemoryService:
 
         if self._embedding_provider == "local":
             await self._ensure_model_loaded()
+        elif self._worker_client is not None and not self._embedding_dimension:
+            await self.encode_texts(["dimension probe"])
         current_dim = self._embedding_dimension or 768
 
         try:
@@ -230,8 +276,14 @@ class SemanticMemoryService:
 
     def _load_embedding_model_sync(self):
         """Synchronous model loading - to be called via asyncio.to_thread()"""
-        from sentence_transformers import SentenceTransformer
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
+        from ..config import settings
+        from .inference_backends import load_embedding_model
+        inference = settings.semantic_inference
+        self.embedding_model = load_embedding_model(
+            self.embedding_model_name,
+            backend=inference.get('embedding_backend', 'torch'),
+            onnx_cache_dir=inference.get('onnx_cache_dir', './data/models/onnx'),
+        )
         self._embedding_dimension = self.embedding_model.get_sentence_embedding_dimension()
 
     async def _ensure_model_loaded(self):
@@ -246,8 +298,18 @@ class SemanticMemoryService:
 
     def _load_reranker_model_sync(self):
         """Synchronous reranker loading - to be called via asyncio.to_thread()"""
-        from sentence_transformers import CrossEncoder
-        self.reranker = CrossEncoder(self.reranker_model_name)
+        from ..config import settings
+        if self._worker_client is not None:
+            from .embedding_worker import WorkerReranker
+            self.reranker = WorkerReranker(self._worker_client.url, timeout=self._worker_client.timeout)
+            return
+        from .inference_backends import load_reranker_model
+        inference = settings.semantic_inference
+        self.reranker = load_reranker_model(
+            self.reranker_model_name,
+            backend=inference.get('reranker_backend', 'torch'),
+            onnx_cache_dir=inference.get('onnx_cache_dir', './data/models/onnx'),
+        )
 
     async def encode_texts(self, texts: List[str]) -> "np.ndarray":
         """
@@ -264,6 +326,11 @@ class SemanticMemoryService:
                 )
             )
             return embeddings
+        elif self._worker_client is not None:
+            embeddings = await self._worker_client.embed(texts)
+            if embeddings.ndim == 2 and embeddings.shape[0]:
+                self._embedding_dimension = embeddings.shape[1]
+            return embeddings
         else:
             return np.array(await self._batch_embedding_litellm(texts))
 
@@ -304,12 +371,11 @@ class SemanticMemoryService:
             if self.reranker is None:
                 return None
 
-            # Build (query, document) pairs for top_k scenes
+            # Score (query, document) pairs for top_k scenes
             scene_ids = list(scene_contents.keys())[:top_k]
-            pairs = [(query_text, scene_contents[sid]) for sid in scene_ids]
-
-            # Run cross-encoder in thread pool (CPU-intensive)
-            raw_scores = await asyncio.to_thread(self.reranker.predict, pairs)
+            raw_scores = await self._rerank_pairs(
+                query_text, [(f"scene_{sid}", scene_contents[sid]) for sid in scene_ids]
+            )
 
             # Normalize scores to [0, 1] via sigmoid (bge-reranker outputs raw logits)
             import math
@@ -325,6 +391,77 @@ class SemanticMemoryService:
             logger.warning(f"[RERANK] Cross-encoder reranking failed: {e}")
             return None
 
+    async def encode_batched(self, texts: List[str]) -> "np.ndarray":
+        """
+        Like encode_texts(), but coalesced with concurrent requests (see EmbeddingBatcher).
+
+        Use for small, latency-sensitive encodes (scene saves, queries); bulk
+        jobs such as backfills and re-embeds should call encode_texts() directly.
+        """
+        return await self._batcher.submit(texts)
+
+    def get_batching_stats(self) -> Dict[str, Any]:
+        """Embedding micro-batching counters."""
+        return self._batcher.get_stats()
+
+    async def _rerank_pairs(self, query_text: str, docs: List[Tuple[Any, str]]) -> List[float]:
+        """
+        Raw cross-encoder scores for (doc_id, text) documents against a query.
+
+        Pairs scored before (same model, query, document id and text) come from
+        the rerank score cache; only the rest go through the cross-encoder.
+        Caller must have loaded the reranker.
+        """
+        import time
+        from .rerank_cache import make_pair_key, text_hash
+
+        if self._rerank_cache is None:
+            start = time.perf_counter()
+            scores = await asyncio.to_thread(self.reranker.predict, [[query_text, t] for _, t in docs])
+            self._rerank_stats.record_predict(len(docs), time.perf_counter() - start)
+            return [float(s) for s in scores]
+
+        query_hash = text_hash(query_text)
+        keys = [make_pair_key(self.reranker_model_name, query_hash, doc_id, t) for doc_id, t in docs]
+        scores: List[Optional[float]] = [self._rerank_cache.get(k) for k in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        if missing:
+            start = time.perf_counter()
+            predicted = await asyncio.to_thread(
+                self.reranker.predict, [[query_text, docs[i][1]] for i in missing]
+            )
+            self._rerank_cache.record_predict(len(missing), time.perf_counter() - start)
+            for i, score in zip(missing, predicted):
+                scores[i] = float(score)
+                self._rerank_cache.put(keys[i], float(score))
+
+        if len(missing) < len(docs):
+            logger.debug(f"[RERANK] {len(docs) - len(missing)}/{len(docs)} pair scores from cache")
+        return scores
+
+    def _can_skip_rerank(self, candidates: List[Dict[str, Any]], top_k: int) -> bool:
+        """
+        Early exit: skip the cross-encoder when the bi-encoder gap between
+        rank top_k and top_k+1 is at least early_exit_margin, i.e. reranking
+        is unlikely to change which candidates make the cut.
+        """
+        if self.rerank_early_exit_margin <= 0 or len(candidates) <= top_k:
+            return False
+        ranked = sorted((c['bi_encoder_score'] for c in candidates), reverse=True)
+        if ranked[top_k - 1] - ranked[top_k] >= self.rerank_early_exit_margin:
+            self._rerank_stats.record_early_exit()
+            logger.debug(f"[RERANK] Early exit: bi-encoder margin {ranked[top_k - 1] - ranked[top_k]:.3f} at rank {top_k}")
+            return True
+        return False
+
+    def get_rerank_stats(self) -> Dict[str, Any]:
+        """Rerank score cache / early exit counters."""
+        stats = self._rerank_stats.get_stats()
+        stats["cache_enabled"] = self._rerank_cache is not None
+        stats["early_exit_margin"] = self.rerank_early_exit_margin
+        return stats
+
     def _generate_embedding_sync(self, text: str) -> List[float]:
         """Synchronous embedding generation - to be called via asyncio.to_thread()"""
         embedding = self.embedding_model.encode(text, convert_to_numpy=True)
@@ -341,17 +478,91 @@ class SemanticMemoryService:
             List of floats representing the embedding
         """
         try:
+            if self._batcher.enabled:
+                # Coalesced with concurrent requests into one encoder call
+                embeddings = await self._batcher.submit([text])
+                return embeddings[0].tolist()
             if self._embedding_provider == "local":
                 await self._ensure_model_loaded()
                 # Run CPU-intensive encoding in thread pool
                 embedding = await asyncio.to_thread(self._generate_embedding_sync, text)
                 return embedding
+            elif self._worker_client is not None:
+                return (await self.encode_texts([text]))[0].tolist()
             else:
                 return await self._generate_embedding_litellm(text)
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             raise
 
+    def embedding_model_key(self) -> str:
+        """
+        Identifier of the active embedding model and endpoint.
+
+        Used in query cache keys and re-embed checkpoints: vectors made under
+        different keys are not comparable. Local models include the inference
+        backend in use (torch / int8 / onnx), API models the dimensions.
+        """
+        if self._embedding_provider == "local":
+            backend = getattr(self.embedding_model, "inference_backend", None)
+            if backend is None:
+                from ..config import settings
+                backend = settings.semantic_inference.get('embedding_backend', 'torch')
+            return f"{self.embedding_model_name}#{backend}"
+        if self._worker_client is not None:
+            return f"worker:{self.embedding_model_name}@{self._worker_client.url}"
+        return f"{self._litellm_model}@{self._litellm_api_base or ''}#{self._litellm_dimensions or ''}"
+
+    async def encode_queries(self, texts: List[str]) -> "np.ndarray":
+        """
+        Encode query texts, reusing cached embeddings where possible.
+
+        Same contract as encode_texts(); only the cache misses are encoded
+        (in one batch). Use this for search queries, not for documents that
+        get stored in pgvector.
+        """
+        import numpy as np
+        from .embedding_cache import make_key
+
+        if self._query_cache is None or not texts:
+            return await self.encode_texts(texts)
+
+        provider = self._embedding_provider
+        if provider == "local":
+            # The key names the backend that actually loaded (it may have fallen back to torch)
+            await self._ensure_model_loaded()
+        model = self.embedding_model_key()
+        keys = [make_key(provider, model, t) for t in texts]
+        cached = self._query_cache.get_many(keys)
+
+        missing = [i for i, vec in enumerate(cached) if vec is None]
+        if missing:
+            # Encode each distinct missing text once
+            unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = await self.encode_batched(unique_texts)
+            by_text = {}
+            for text, vec in zip(unique_texts, encoded):
+                vec = np.asarray(vec, dtype=np.float32)
+                by_text[text] = vec
+                self._query_cache.put(make_key(provider, model, text), vec)
+            for i in missing:
+                cached[i] = by_text[texts[i]]
+
+        if len(missing) < len(texts):
+            logger.debug(f"[EMBED CACHE] {len(texts) - len(missing)}/{len(texts)} query embeddings from cache")
+        return np.stack(cached)
+
+    async def embed_query(self, text: str) -> List[float]:
+        """Single-query variant of encode_queries(), returning a list like generate_embedding()."""
+        if self._query_cache is None:
+            return await self.generate_embedding(text)
+        embeddings = await self.encode_queries([text])
+        return embeddings[0].tolist()
+
+    def get_query_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Query embedding cache counters (None when the cache is disabled)."""
+        return self._query_cache.get_stats() if self._query_cache is not None else None
+
     # Scene Embeddings
 
     async def add_scene_embedding(
@@ -398,7 +609,8 @@ class SemanticMemoryService:
         exclude_sequences: Optional[List[int]] = None,
         chapter_id: Optional[int] = None,
         branch_id: Optional[int] = None,
-        use_reranking: bool = True
+        use_reranking: bool = True,
+        ef_search: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for semantically similar scenes with optional cross-encoder reranking
@@ -415,6 +627,7 @@ class SemanticMemoryService:
             chapter_id: Optional chapter filter
             branch_id: Optional branch filter (SQL-native, not post-hoc)
             use_reranking: Whether to use cross-encoder reranking
+            ef_search: Per-query hnsw.ef_search override (ANN mode, see vector_index.py)
 
         Returns:
             List of similar scenes with metadata and similarity scores
@@ -426,10 +639,11 @@ class SemanticMemoryService:
             retrieval_k = top_k * 3 if (use_reranking and self.enable_reranking) else top_k * 2
 
             # Generate query embedding (async)
-            query_embedding = await self.generate_embedding(query_text)
+            query_embedding = await self.embed_query(query_text)
 
             def _db_search():
                 with self._session_factory() as session:
+                    apply_vector_search_settings(session, ef_search=ef_search, limit=retrieval_k)
                     query = (
                         session.query(
                             SceneEmbedding,
@@ -478,7 +692,7 @@ class SemanticMemoryService:
                 return []
 
             # Stage 2: Cross-encoder reranking (if enabled)
-            if use_reranking and self.enable_reranking and len(candidates) > top_k:
+            if use_reranking and self.enable_reranking and len(candidates) > top_k and not self._can_skip_rerank(candidates, top_k):
                 try:
                     await self._ensure_reranker_loaded()
 
@@ -501,17 +715,17 @@ class SemanticMemoryService:
                     doc_texts = await asyncio.to_thread(_fetch_texts)
 
                     # Prepare query-document pairs
-                    pairs = []
+                    docs = []
                     valid_candidates = []
                     for candidate in candidates:
                         text = doc_texts.get(candidate['embedding_id'])
                         if text:
-                            pairs.append([query_text, text[:2000]])
+                            docs.append((candidate['embedding_id'], text[:2000]))
                             valid_candidates.append(candidate)
 
-                    if pairs:
-                        # Get reranking scores - run in thread pool
-                        rerank_scores = await asyncio.to_thread(self.reranker.predict, pairs)
+                    if docs:
+                        # Get reranking scores (cached pairs are not re-scored)
+                        rerank_scores = await self._rerank_pairs(query_text, docs)
 
                         # Update candidates with reranked scores
                         for candidate, rerank_score in zip(valid_candidates, rerank_scores):
@@ -560,7 +774,8 @@ class SemanticMemoryService:
         top_k: int = 5,
         exclude_sequences: Optional[List[int]] = None,
         exclude_story_id: Optional[int] = None,
-        chapter_id: Optional[int] = None
+        chapter_id: Optional[int] = None,
+        ef_search: Optional[int] = None
     ) -> List[List[Dict[str, Any]]]:
         """
         Batch search for semantically similar scenes using multiple queries.
@@ -577,6 +792,7 @@ class SemanticMemoryService:
             exclude_sequences: Scene sequences to exclude (only for exclude_story_id)
             exclude_story_id: Story whose sequences to exclude (defaults to story_id)
             chapter_id: Optional chapter filter
+            ef_search: Per-query hnsw.ef_search override (ANN mode, see vector_index.py)
 
         Returns:
             List of result lists — one per query, same dict structure as search_similar_scenes()
@@ -595,7 +811,7 @@ class SemanticMemoryService:
 
         try:
             # Single batch encode (one GPU pass for local, one API call for cloud)
-            embeddings_np = await self.encode_texts(query_texts)
+            embeddings_np = await self.encode_queries(query_texts)
             query_embeddings = embeddings_np.tolist()
 
             retrieval_k = top_k * 2
@@ -603,6 +819,7 @@ class SemanticMemoryService:
             def _db_batch_search():
                 all_results = []
                 with self._session_factory() as session:
+                    apply_vector_search_settings(session, ef_search=ef_search, limit=retrieval_k)
                     for emb in query_embeddings:
                         query = (
                             session.query(
@@ -704,7 +921,8 @@ class SemanticMemoryService:
         exclude_sequences: Optional[List[int]] = None,
         chapter_id: Optional[int] = None,
         branch_id: Optional[int] = None,
-        use_reranking: bool = False
+        use_reranking: bool = False,
+        ef_search: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Single-query event embedding search — drop-in replacement for search_similar_scenes().
@@ -717,11 +935,12 @@ class SemanticMemoryService:
         from sqlalchemy import and_
 
         try:
-            query_embedding = await self.generate_embedding(query_text)
+            query_embedding = await self.embed_query(query_text)
             retrieval_k = top_k * 5  # Over-retrieve since multiple events per scene
 
             def _db_search():
                 with self._session_factory() as session:
+                    apply_vector_search_settings(session, ef_search=ef_search, limit=retrieval_k)
                     query = (
                         session.query(
                             SceneEvent.id,
@@ -787,6 +1006,7 @@ class SemanticMemoryService:
         top_k: int = 5,
         exclude_sequences: Optional[List[int]] = None,
         exclude_story_id: Optional[int] = None,
+        ef_search: Optional[int] = None,
     ) -> List[List[Dict[str, Any]]]:
         """
         Batch search for semantically similar scene events using multiple queries.
@@ -811,7 +1031,7 @@ class SemanticMemoryService:
             exclude_story_id = story_id
 
         try:
-            embeddings_np = await self.encode_texts(query_texts)
+            embeddings_np = await self.encode_queries(query_texts)
             query_embeddings = embeddings_np.tolist()
 
             retrieval_k = top_k * 3  # More results pre-dedup since multiple events per scene
@@ -819,6 +1039,7 @@ class SemanticMemoryService:
             def _db_batch_search():
                 all_results = []
                 with self._session_factory() as session:
+                    apply_vector_search_settings(session, ef_search=ef_search, limit=retrieval_k)
                     for emb in query_embeddings:
                         query = (
                             session.query(
@@ -961,7 +1182,8 @@ class SemanticMemoryService:
         story_id: int,
         top_k: int = 3,
         moment_type: Optional[str] = None,
-        use_reranking: bool = True
+        use_reranking: bool = True,
+        ef_search: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for relevant character moments with optional reranking
@@ -973,6 +1195,7 @@ class SemanticMemoryService:
             top_k: Number of results
             moment_type: Optional filter by moment type
             use_reranking: Whether to use cross-encoder reranking
+            ef_search: Per-query hnsw.ef_search override (ANN mode, see vector_index.py)
 
         Returns:
             List of relevant character moments
@@ -984,10 +1207,11 @@ class SemanticMemoryService:
             retrieval_k = top_k * 3 if (use_reranking and self.enable_reranking) else top_k * 2
 
             # Generate query embedding (async)
-            query_embedding = await self.generate_embedding(query_text)
+            query_embedding = await self.embed_query(query_text)
 
             def _db_search():
                 with self._session_factory() as session:
+                    apply_vector_search_settings(session, ef_search=ef_search, limit=retrieval_k)
                     query = (
                         session.query(
                             CharacterMemory,
@@ -1038,13 +1262,13 @@ class SemanticMemoryService:
                 })
 
             # Apply reranking if enabled
-            if use_reranking and self.enable_reranking and len(candidates) > top_k:
+            if use_reranking and self.enable_reranking and len(candidates) > top_k and not self._can_skip_rerank(candidates, top_k):
                 try:
                     await self._ensure_reranker_loaded()
-                    pairs = [[query_text, c['document_text']] for c in candidates if c.get('document_text')]
+                    docs = [(c['embedding_id'], c['document_text']) for c in candidates if c.get('document_text')]
 
-                    if pairs:
-                        rerank_scores = await asyncio.to_thread(self.reranker.predict, pairs)
+                    if docs:
+                        rerank_scores = await self._rerank_pairs(query_text, docs)
 
                         valid_idx = 0
                         for candidate in candidates:
@@ -1174,7 +1398,8 @@ class SemanticMemoryService:
         story_id: int,
         top_k: int = 5,
         only_unresolved: bool = False,
-        use_reranking: bool = True
+        use_reranking: bool = True,
+        ef_search: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for related plot events with optional reranking
@@ -1185,6 +1410,7 @@ class SemanticMemoryService:
             top_k: Number of results
             only_unresolved: Only return unresolved plot threads
             use_reranking: Whether to use cross-encoder reranking
+            ef_search: Per-query hnsw.ef_search override (ANN mode, see vector_index.py)
 
         Returns:
             List of related plot events
@@ -1196,10 +1422,11 @@ class SemanticMemoryService:
             retrieval_k = top_k * 3 if (use_reranking and self.enable_reranking) else top_k * 2
 
             # Generate query embedding (async)
-            query_embedding = await self.generate_embedding(query_text)
+            query_embedding = await self.embed_query(query_text)
 
             def _db_search():
                 with self._session_factory() as session:
+                    apply_vector_search_settings(session, ef_search=ef_search, limit=retrieval_k)
                     query = (
                         session.query(
                             PlotEvent,
@@ -1252,13 +1479,13 @@ class SemanticMemoryService:
                 })
 
             # Apply reranking if enabled
-            if use_reranking and self.enable_reranking and len(candidates) > top_k:
+            if use_reranking and self.enable_reranking and len(candidates) > top_k and not self._can_skip_rerank(candidates, top_k):
                 try:
                     await self._ensure_reranker_loaded()
-                    pairs = [[query_text, c['document_text']] for c in candidates if c.get('document_text')]
+                    docs = [(c['embedding_id'], c['document_text']) for c in candidates if c.get('document_text')]
 
-                    if pairs:
-                        rerank_scores = await asyncio.to_thread(self.reranker.predict, pairs)
+                    if docs:
+                        rerank_scores = await self._rerank_pairs(query_text, docs)
 
                         valid_idx = 0
                         for candidate in candidates:
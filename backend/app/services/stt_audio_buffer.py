@@ -0,0 +1,96 @@
+"""
+Preallocated audio buffer for streaming STT
+
+STTStream used to grow its buffer with np.concatenate on every WebSocket frame
+(plus a fresh int16 -> float32 array per frame), so an utterance of N frames
+copied O(N^2) samples. AudioRingBuffer allocates once per session:
+
+- write() converts the int16 PCM straight into the buffer (no temporary
+  float array) and returns a view of the new samples for VAD
+- the storage is mirrored (every sample is written at i and i + capacity), so
+  any window of up to capacity samples - the whole pending utterance, the
+  latest VAD frames, an overlap tail - is one contiguous zero-copy view
+- consume() hands the pending audio to Whisper as a single copy and resets
+  the buffer; that copy is needed because new frames keep arriving while
+  the transcription runs in a worker thread
+
+If more than capacity samples accumulate without consume(), the oldest are
+dropped (counted in overflowed_samples).
+"""
+
+import numpy as np
+
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity float32 sample buffer fed with int16 PCM.
+
+    Args:
+        capacity: Samples kept (pending audio beyond this drops the oldest)
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._storage = np.zeros(2 * self.capacity, dtype=np.float32)
+        self._write = 0  # Next write position in [0, capacity)
+        self._length = 0  # Pending samples
+        self.overflowed_samples = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _window(self, count: int) -> np.ndarray:
+        """View of the latest count samples (count <= capacity)."""
+        end = self._write + self.capacity
+        return self._storage[end - count:end]
+
+    def write(self, pcm: bytes) -> np.ndarray:
+        """
+        Append int16 PCM, converting in place.
+
+        Returns:
+            Zero-copy view of the appended float32 samples (valid until
+            capacity more samples have been written)
+        """
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if len(samples) > self.capacity:
+            self.overflowed_samples += len(samples) - self.capacity
+            samples = samples[-self.capacity:]
+        count = len(samples)
+        if not count:
+            return self._storage[:0]
+
+        # Up to two contiguous runs in the primary half, each mirrored into the second half
+        first = min(count, self.capacity - self._write)
+        runs = [(self._write, samples[:first])]
+        if count > first:
+            runs.append((0, samples[first:]))
+        for start, chunk in runs:
+            primary = self._storage[start:start + len(chunk)]
+            np.multiply(chunk, _INT16_SCALE, out=primary, dtype=np.float32, casting="unsafe")
+            self._storage[start + self.capacity:start + self.capacity + len(chunk)] = primary
+
+        self._write = (self._write + count) % self.capacity
+        if self._length + count > self.capacity:
+            self.overflowed_samples += self._length + count - self.capacity
+        self._length = min(self.capacity, self._length + count)
+        return self._window(count)
+
+    def view(self) -> np.ndarray:
+        """Zero-copy view of all pending samples (oldest first)."""
+        return self._window(self._length)
+
+    def tail(self, count: int) -> np.ndarray:
+        """Zero-copy view of the latest count pending samples (e.g. an overlap window)."""
+        return self._window(min(count, self._length))
+
+    def consume(self) -> np.ndarray:
+        """Return a copy of the pending samples and empty the buffer."""
+        audio = self.view().copy()
+        self._length = 0
+        return audio
+
+    def clear(self) -> None:
+        self._length = 0
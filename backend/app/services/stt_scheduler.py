@@ -0,0 +1,254 @@
+"""
+STT Inference Scheduler
+
+Central queue in front of the shared Whisper and Silero VAD models.
+
+Every dictation session (STTStream) submits its work here instead of calling
+the models itself:
+- transcribe(): a finished speech segment. Segments waiting from many
+  sessions are decoded in ONE batched faster-whisper call (grouped by
+  language); a lone segment keeps the sequential path with temperature
+  fallback, so a single user sees no quality change.
+- detect_speech(): the 512-sample VAD frames of an audio packet. Silero is
+  recurrent, so each session keeps its own VADState (model state plus the
+  samples short of a full frame) between packets; the sessions of a batch
+  are rows of one Silero forward pass per frame step.
+
+Each queue has one worker task: it waits batch_window_ms after the first
+request so concurrent sessions can join, runs the batch in a worker thread,
+and resolves every caller's future. Requests that arrive while a batch is
+running form the next batch, so the batch size grows with load while the
+models stay single-threaded.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VAD_FRAME_SAMPLES = 512  # Silero VAD frame at 16 kHz
+
+
+@dataclass
+class VADState:
+    """Silero VAD state of one session, carried from packet to packet."""
+    model_state: Any = None  # Owned by ProfessionalSTTService.vad_probabilities
+    remainder: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))
+
+
+@dataclass
+class _Pending:
+    payload: Any
+    future: asyncio.Future
+    language: Optional[str] = None
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class _BatchQueue:
+    """A request queue drained in batches by one worker task."""
+
+    def __init__(self, name: str, run_batch, max_batch_size: int, batch_window: float):
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self._pending: List[_Pending] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.items = 0
+        self.max_batch_seen = 0
+        self.wait_seconds = 0.0
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._worker())
+
+    async def submit(self, payload: Any, language: Optional[str] = None) -> Any:
+        self._ensure_worker()
+        pending = _Pending(payload=payload, future=asyncio.get_running_loop().create_future(), language=language)
+        self._pending.append(pending)
+        self._wakeup.set()
+        return await pending.future
+
+    async def _worker(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._pending:
+                continue
+            # Let concurrent sessions join the batch
+            if self.batch_window and len(self._pending) < self.max_batch_size:
+                await asyncio.sleep(self.batch_window)
+
+            batch = [p for p in self._pending[:self.max_batch_size] if not p.future.done()]
+            del self._pending[:self.max_batch_size]
+            if self._pending:
+                self._wakeup.set()
+            if not batch:
+                continue
+
+            now = time.monotonic()
+            self.batches += 1
+            self.items += len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            self.wait_seconds += sum(now - p.queued_at for p in batch)
+            try:
+                results = await self.run_batch(batch)
+            except Exception as e:
+                logger.error(f"[STT SCHEDULER] {self.name} batch of {len(batch)} failed: {e}", exc_info=True)
+                for p in batch:
+                    if not p.future.done():
+                        p.future.set_exception(e)
+                continue
+            for p, result in zip(batch, results):
+                if not p.future.done():
+                    p.future.set_result(result)
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        for p in self._pending:
+            if not p.future.done():
+                p.future.cancel()
+        self._pending.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "avg_queue_wait_ms": round(self.wait_seconds / self.items * 1000, 1) if self.items else 0.0,
+            "pending": len(self._pending),
+        }
+
+
+class STTInferenceScheduler:
+    """
+    Batches Whisper and VAD work from all STT sessions.
+
+    Args:
+        service: ProfessionalSTTService holding the loaded models
+        max_batch_size: Whisper segments decoded per batch
+        batch_window_ms: Wait after the first Whisper request for others to join
+        vad_batch_window_ms: Same for VAD frames
+    """
+
+    def __init__(
+        self,
+        service,
+        max_batch_size: int = 8,
+        batch_window_ms: float = 50,
+        vad_batch_window_ms: float = 5,
+    ):
+        self.service = service
+        self._whisper = _BatchQueue("whisper", self._run_whisper_batch, max_batch_size, batch_window_ms / 1000.0)
+        self._vad = _BatchQueue("vad", self._run_vad_batch, 256, vad_batch_window_ms / 1000.0)
+
+    async def transcribe(self, audio: np.ndarray, language: Optional[str] = None) -> str:
+        """Transcribe one speech segment (batched with other sessions' segments)."""
+        return await self._whisper.submit(audio, language)
+
+    async def detect_speech(self, audio: np.ndarray, threshold: float, state: Optional[VADState] = None) -> bool:
+        """
+        True if any full VAD frame of the packet is speech.
+
+        Pass the session's VADState so the model continues where the previous
+        packet left off (one packet per session at a time). Without it the
+        packet is judged on its own and a partial last frame is dropped.
+        """
+        if self.service.silero_vad_model is None:
+            return _energy_is_speech(audio)
+        samples = np.concatenate([state.remainder, audio]) if state is not None and len(state.remainder) else audio
+        usable = len(samples) - len(samples) % VAD_FRAME_SAMPLES
+        if state is not None:
+            state.remainder = samples[usable:].copy()
+        if not usable:
+            return False
+        frames = samples[:usable].reshape(-1, VAD_FRAME_SAMPLES)
+        try:
+            probabilities = await self._vad.submit((frames, state if state is not None else VADState()))
+        except Exception as e:
+            logger.warning(f"VAD error: {e}")
+            return _energy_is_speech(audio)
+        return bool(np.any(probabilities > threshold))
+
+    async def _run_whisper_batch(self, batch: List[_Pending]) -> List[str]:
+        # One batched decode per language; results go back in request order
+        groups: Dict[Optional[str], List[int]] = {}
+        for index, pending in enumerate(batch):
+            groups.setdefault(pending.language, []).append(index)
+        results: List[str] = [""] * len(batch)
+        for language, indexes in groups.items():
+            texts = await asyncio.to_thread(
+                self.service.transcribe_batch, [batch[i].payload for i in indexes], language
+            )
+            for i, text in zip(indexes, texts):
+                results[i] = text
+        return results
+
+    async def _run_vad_batch(self, batch: List[_Pending]) -> List[np.ndarray]:
+        return await asyncio.to_thread(
+            self.service.vad_probabilities,
+            [p.payload[0] for p in batch],
+            [p.payload[1] for p in batch],
+        )
+
+    async def stop(self) -> None:
+        await self._whisper.stop()
+        await self._vad.stop()
+
+    def get_stats(self) -> dict:
+        """Get batching statistics for monitoring"""
+        return {"whisper": self._whisper.get_stats(), "vad": self._vad.get_stats()}
+
+
+def _energy_is_speech(audio: np.ndarray) -> bool:
+    """Fallback detection when Silero VAD isn't available."""
+    if len(audio) == 0:
+        return False
+    return float(np.sqrt(np.mean(audio ** 2))) > 0.01
+
+
+# Global singleton
+_scheduler: Optional[STTInferenceScheduler] = None
+
+
+def get_stt_scheduler() -> STTInferenceScheduler:
+    global _scheduler
+    if _scheduler is None:
+        from app.config import settings
+        from app.services.stt_service import stt_service
+        config = settings.stt_batching
+        if config.get('enabled', True):
+            _scheduler = STTInferenceScheduler(
+                stt_service,
+                max_batch_size=int(config.get('max_batch_size', 8)),
+                batch_window_ms=float(config.get('batch_window_ms', 50)),
+                vad_batch_window_ms=float(config.get('vad_batch_window_ms', 5)),
+            )
+        else:
+            # Sessions still share the models through the queue, one segment at a time
+            _scheduler = STTInferenceScheduler(stt_service, max_batch_size=1, batch_window_ms=0, vad_batch_window_ms=0)
+    return _scheduler
+
+
+async def stop_stt_scheduler() -> None:
+    """Stop the batch workers if the scheduler was ever used (application shutdown)."""
+    if _scheduler is not None:
+        await _scheduler.stop()
@@ -2,17 +2,27 @@ import os
 import asyncio
 import logging
 import re
+import threading
 import time
-from typing import Optional, Callable
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Callable
 from collections import deque
 
 import numpy as np
 import torch
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 from app.config import settings
+from app.services.stt_audio_buffer import AudioRingBuffer
+from app.services.stt_scheduler import VADState
 
 logger = logging.getLogger(__name__)
 
+# Whisper decodes at most 30 s per window; longer segments are split into clips
+MAX_CLIP_SAMPLES = 30 * 16000
+
+# Session buffer headroom beyond stt_max_speech_duration_s
+BUFFER_SLACK_SECONDS = 10
+
 
 class ProfessionalSTTService:
     """
@@ -22,6 +32,10 @@ class ProfessionalSTTService:
     - Sentence boundary detection
     - Sliding window with overlap for context continuity
     - Post-processing for natural output
+    
+    Process-wide owner of the Whisper and Silero models. Per-session state
+    lives in STTStream; model calls from all sessions are batched by
+    app.services.stt_scheduler.
     """
     
     _instance: Optional["ProfessionalSTTService"] = None
@@ -40,39 +54,9 @@ class ProfessionalSTTService:
             self.is_initialized = False
             self._initialization_lock = asyncio.Lock()
             
-            # Dynamic buffering for sentence-aware transcription
-            self.audio_buffer = np.array([], dtype=np.float32)
             self.sample_rate = 16000
-            
-            # Silence detection state
-            self.speech_timestamps = []  # List of (start, end) speech segments
-            self.is_speaking = False
-            self.speech_start_time = None
-            self.last_speech_time = None
-            
-            # Sliding window for context continuity
-            self.window_size_ms = 1500  # 1.5 second overlap
-            self.last_window_audio = np.array([], dtype=np.float32)
-            
-            # Sentence accumulation
-            self.accumulated_sentence = ""
-            self.last_transcription_time = 0
-            
-            # Audio position tracking (for deduplication)
-            self.total_audio_processed = 0
-
-            # Processing state
-            self.is_processing = False
-            self.processing_lock = asyncio.Lock()
-            # Timestamp of the last partial emit. Used to throttle the
-            # mid-speech "running partial" processing path so we don't
-            # invoke Whisper on every audio frame.
-            self.last_partial_emit_time: float = 0.0
-            
-            # Callbacks
-            self._on_partial_callback: Optional[Callable[[str], None]] = None
-            self._on_final_callback: Optional[Callable[[str], None]] = None
-            self._on_error_callback: Optional[Callable[[Exception], None]] = None
+            self._batched_pipeline: Optional[BatchedInferencePipeline] = None
+            self._vad_lock = threading.Lock()
             
             logger.info("Professional STT Service initialized")
 
@@ -155,281 +139,171 @@ class ProfessionalSTTService:
         on_error: Optional[Callable[[Exception], None]] = None,
         model: str = None,
         language: Optional[str] = None,
-    ):
-        """Start real-time transcription with professional quality."""
+    ) -> "STTStream":
+        """
+        Start real-time transcription for one dictation session.
+        
+        Returns a new STTStream holding that session's buffer, VAD state and
+        transcript; its Whisper/VAD work is batched with every other session's
+        by the STT inference scheduler.
+        """
         await self.initialize(model)
 
         if not self.whisper_model:
             raise RuntimeError("Whisper model not initialized")
 
-        # Set callbacks
-        self._on_partial_callback = on_partial
-        self._on_final_callback = on_final
-        self._on_error_callback = on_error
-
-        # Per-session language override. Whisper expects ISO 639-1 (2-letter)
-        # so we strip any region suffix ("en-IN" → "en"). Empty / "auto" /
-        # None falls through to the config default in _transcribe_with_quality.
-        if language is None:
-            self._session_language = None
-        else:
-            lang = language.strip().lower()
-            self._session_language = lang.split("-")[0] if lang and lang != "auto" else None
-        
-        # Reset state
-        self.audio_buffer = np.array([], dtype=np.float32)
-        self.last_window_audio = np.array([], dtype=np.float32)
-        self.accumulated_sentence = ""
-        self.is_speaking = False
-        self.speech_start_time = None
-        self.last_speech_time = None
-        self.speech_timestamps = []
-        self.total_audio_processed = 0
-        self.last_partial_emit_time = 0.0
-
+        stream = STTStream(self, on_partial=on_partial, on_final=on_final, on_error=on_error, language=language)
         logger.info("Professional STT transcription started")
+        return stream
 
-    async def stop_transcription(self):
-        """Stop transcription and process any remaining audio."""
-        # Process any remaining audio in buffer
-        if len(self.audio_buffer) > 0:
-            await self._process_final_buffer()
-        
-        # Send final transcript
-        if self.accumulated_sentence and self._on_final_callback:
-            await self._on_final_callback(self.accumulated_sentence)
-        
-        # NOW reset
-        self.audio_buffer = np.array([], dtype=np.float32)
-        self.last_window_audio = np.array([], dtype=np.float32)
-        self.accumulated_sentence = ""
-        self.is_speaking = False
-        self.total_audio_processed = 0
-        
-        logger.info("STT transcription stopped")
-
-    async def feed_audio_data(self, audio_data: bytes, sample_rate: int = 16000):
+    @staticmethod
+    def resolve_language(session_language: Optional[str] = None) -> Optional[str]:
         """
-        Feed audio data with intelligent buffering and silence detection.
+        Whisper language for a session: its own hint if set, else the config
+        default. None lets Whisper detect the language per utterance.
         """
-        if not self.whisper_model:
-            logger.warning("Whisper model not initialized")
-            return
-        
-        try:
-            # Convert bytes to float32
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            audio_float = audio_array.astype(np.float32) / 32768.0
-            
-            # Add to buffer
-            self.audio_buffer = np.concatenate([self.audio_buffer, audio_float])
-            
-            # Detect speech/silence using Silero VAD
-            is_speech = await self._detect_speech(audio_float)
-            current_time = time.time()
-            
-            # Update speech state
-            if is_speech:
-                if not self.is_speaking:
-                    # Speech started
-                    self.is_speaking = True
-                    self.speech_start_time = current_time
-                    logger.debug("Speech detected - started buffering")
-                
-                self.last_speech_time = current_time
-            
-            # Check if we should process the buffer
-            should_process = False
-            reason = ""
-            
-            if self.is_speaking:
-                buffer_duration = len(self.audio_buffer) / self.sample_rate
-
-                # Silence detected after speech
-                if self.last_speech_time and (current_time - self.last_speech_time) > (settings.stt_min_silence_duration_ms / 1000.0):
-                    should_process = True
-                    reason = "silence after speech (sentence boundary)"
-                    self.is_speaking = False
-
-                # Maximum speech duration reached
-                elif buffer_duration >= settings.stt_max_speech_duration_s:
-                    should_process = True
-                    reason = "maximum duration reached"
-
-                # Running-partial path: process accumulated audio every
-                # ~1s while the user is still talking, so the UI shows
-                # text in real time instead of waiting for a sentence
-                # boundary. We still keep the silence-triggered path
-                # above — that one fires `final-as-partial` at the
-                # natural break (and clears is_speaking so the next
-                # utterance starts fresh).
-                elif buffer_duration >= 1.0 and (current_time - self.last_partial_emit_time) >= 1.0:
-                    should_process = True
-                    reason = "periodic partial (mid-speech)"
-            
-            # Process buffer if conditions met
-            if should_process and len(self.audio_buffer) > 0 and not self.is_processing:
-                logger.debug(f"Processing buffer: {reason}")
-                asyncio.create_task(self._process_buffer_with_context())
-                
-        except Exception as e:
-            logger.error(f"Error feeding audio: {e}", exc_info=True)
-            if self._on_error_callback:
-                await self._on_error_callback(e)
-
-    async def _detect_speech(self, audio_chunk: np.ndarray) -> bool:
-        """Detect speech in audio chunk using Silero VAD."""
-        if not self.silero_vad_model:
-            # Fallback: simple energy-based detection
-            energy = np.sqrt(np.mean(audio_chunk ** 2))
-            return energy > 0.01
-        
-        try:
-            # Silero VAD needs exactly 512 samples for 16kHz
-            required_samples = 512
-            
-            # Process audio in 512-sample chunks
-            is_speech = False
-            for i in range(0, len(audio_chunk), required_samples):
-                chunk = audio_chunk[i:i+required_samples]
-                if len(chunk) == required_samples:
-                    audio_tensor = torch.from_numpy(chunk).float()
-                    speech_prob = await asyncio.to_thread(
-                        self.silero_vad_model,
-                        audio_tensor,
-                        self.sample_rate
-                    )
-                    if float(speech_prob) > settings.stt_vad_threshold:
-                        is_speech = True
-                        break
-            
-            return is_speech
-            
-        except Exception as e:
-            logger.warning(f"VAD error: {e}")
-            # Fallback to energy detection
-            energy = np.sqrt(np.mean(audio_chunk ** 2))
-            return energy > 0.01
+        # Language handling: treat "auto" / empty / None as "let
+        # Whisper detect per-utterance" so users can speak in any
+        # language they want. Forcing language="en" makes Whisper
+        # *translate* non-English audio (e.g. Hindi "Tumhara naam
+        # kya hai" → "What is your name") instead of transcribing
+        # it literally — which is almost never what the user wants
+        # in a story-writing app where they may type/speak prose
+        # in mixed languages.
+        if session_language:
+            return session_language
+        lang_cfg = (settings.stt_language or "").strip().lower()
+        return None if lang_cfg in ("", "auto") else lang_cfg
 
-    def _is_duplicate_text(self, new_text: str, existing_text: str) -> bool:
-        """Check if new_text is already in existing_text (with fuzzy matching)."""
-        if not existing_text:
-            return False
-        
-        # Check if new text is substring of existing (allowing for minor variations)
-        new_words = new_text.lower().split()
-        existing_words = existing_text.lower().split()
+    def vad_probabilities(self, frames: List[np.ndarray], states: List[VADState]) -> List[np.ndarray]:
+        """
+        Silero speech probability of each 512-sample frame, for several sessions at once.
         
-        # If first 5 words of new text match last 5-10 words of existing, it's duplicate
-        if len(new_words) >= 5 and len(existing_words) >= 5:
-            new_start = ' '.join(new_words[:5])
-            existing_end = ' '.join(existing_words[-10:])
+        frames[i] is an (N_i, 512) array of session i's consecutive frames and
+        states[i] its VADState, which is read and updated here. Silero is
+        recurrent, so a session's frames run one step after another; the
+        sessions are the batch rows of each step.
+        """
+        with self._vad_lock, torch.no_grad():
+            model = getattr(self.silero_vad_model, "_model", None)
+            if model is None or not hasattr(model, "context_size_samples"):
+                return self._vad_probabilities_sequential(frames)
+            context_size = int(model.context_size_samples)
             
-            if new_start in existing_end:
-                logger.debug(f"Detected duplicate: '{new_start}' found in '{existing_end}'")
-                return True
-        
-        return False
-
-    async def _process_buffer_with_context(self):
-        """Process buffer with sliding window for context continuity."""
-        if self.is_processing or len(self.audio_buffer) == 0:
-            return
+            # Longest first, so the sessions still running at a step are a prefix of the rows
+            order = sorted(range(len(frames)), key=lambda i: -len(frames[i]))
+            rnn_state = torch.cat([
+                states[i].model_state[0] if states[i].model_state is not None else torch.zeros(2, 1, 128)
+                for i in order
+            ], dim=1)
+            context = torch.cat([
+                states[i].model_state[1] if states[i].model_state is not None else torch.zeros(1, context_size)
+                for i in order
+            ])
+            results = [np.empty(len(f), dtype=np.float32) for f in frames]
+            for step in range(len(frames[order[0]]) if order else 0):
+                rows = sum(1 for i in order if len(frames[i]) > step)
+                x = torch.from_numpy(np.stack([frames[i][step] for i in order[:rows]])).float()
+                x = torch.cat([context[:rows], x], dim=1)
+                output, new_state = model(x, rnn_state[:, :rows])
+                rnn_state[:, :rows] = new_state
+                context[:rows] = x[:, -context_size:]
+                probabilities = output.reshape(-1).numpy()
+                for row, i in enumerate(order[:rows]):
+                    results[i][step] = probabilities[row]
+            for row, i in enumerate(order):
+                states[i].model_state = (rnn_state[:, row:row + 1].clone(), context[row:row + 1].clone())
+            return results
+
+    def _vad_probabilities_sequential(self, frames: List[np.ndarray]) -> List[np.ndarray]:
+        """Older Silero builds without a stateless inner model: state is kept within a packet only."""
+        results = []
+        for session_frames in frames:
+            self.silero_vad_model.reset_states()
+            results.append(np.array([
+                float(self.silero_vad_model(torch.from_numpy(np.ascontiguousarray(frame)).float().unsqueeze(0), self.sample_rate))
+                for frame in session_frames
+            ], dtype=np.float32))
+        return results
+
+    def transcribe_batch(self, audios: List[np.ndarray], language: Optional[str] = None) -> List[str]:
+        """
+        Transcribe several speech segments (from different sessions) in one call.
         
-        async with self.processing_lock:
-            self.is_processing = True
-            
-            try:
-                # No overlap - process sequential chunks for reliability
-                audio_to_process = self.audio_buffer.copy()
-                
-                # Track audio position to prevent re-processing
-                audio_start_pos = self.total_audio_processed
-                self.total_audio_processed += len(audio_to_process)
-                
-                # Clear buffer for new audio
-                self.audio_buffer = np.array([], dtype=np.float32)
-                
-                logger.debug(f"Processing audio from {audio_start_pos} to {self.total_audio_processed}")
-                
-                # Transcribe with optimized parameters
-                text = await asyncio.to_thread(self._transcribe_with_quality, audio_to_process)
-                
-                if text and text.strip():
-                    # Post-process for natural output. May return ""
-                    # if the chunk was a known hallucination (e.g.
-                    # "Thank you" on mic warmup); skip in that case.
-                    processed_text = self._post_process_text(text.strip())
-                    if not processed_text:
-                        return
-
-                    # Check for duplicate before appending
-                    if not self._is_duplicate_text(processed_text, self.accumulated_sentence):
-                        # ALWAYS append during recording session - NEVER reset
-                        if self.accumulated_sentence:
-                            # Add space between chunks
-                            self.accumulated_sentence += " " + processed_text
-                        else:
-                            self.accumulated_sentence = processed_text
-                        
-                        # Send the FULL accumulated sentence as partial
-                        if self._on_partial_callback:
-                            await self._on_partial_callback(self.accumulated_sentence)
-                        # Record the emit time so the running-partial
-                        # path knows when to fire the next tick.
-                        self.last_partial_emit_time = time.time()
+        A single segment uses _transcribe_with_quality. Several are laid end to
+        end and decoded as clips of one faster-whisper BatchedInferencePipeline
+        call (segments over 30 s are split into several clips); each decoded
+        segment is mapped back to its clip by its offset. The batched decode
+        uses greedy temperature 0 without the fallback ladder.
+        """
+        if len(audios) == 1:
+            return [self._transcribe_with_quality(audios[0], language)]
+
+        pieces, owners, starts = [], [], []
+        position = 0
+        for owner, audio in enumerate(audios):
+            for offset in range(0, len(audio), MAX_CLIP_SAMPLES):
+                piece = audio[offset:offset + MAX_CLIP_SAMPLES]
+                pieces.append(piece)
+                owners.append(owner)
+                starts.append(position)
+                position += len(piece)
+        if not pieces:
+            return [""] * len(audios)
+
+        if self._batched_pipeline is None:
+            self._batched_pipeline = BatchedInferencePipeline(self.whisper_model)
+        clips = [
+            {"start": start / self.sample_rate, "end": (start + len(piece)) / self.sample_rate}
+            for start, piece in zip(starts, pieces)
+        ]
+        segments, info = self._batched_pipeline.transcribe(
+            np.concatenate(pieces),
+            language=language,
+            task="transcribe",
+            # Auto language: detect per clip, sessions may speak different languages
+            multilingual=language is None,
+            clip_timestamps=clips,
+            vad_filter=False,  # We handle VAD ourselves
+            batch_size=len(clips),
+            beam_size=5,
+            temperature=0.0,
+            without_timestamps=True,
+            compression_ratio_threshold=2.4,
+            log_prob_threshold=-1.0,
+            no_speech_threshold=0.6,
+            repetition_penalty=1.2,
+            no_repeat_ngram_size=3,
+        )
 
-                        logger.info(f"[STT] New chunk: '{processed_text[:50]}...'")
-                        logger.info(f"[STT] Accumulated: '{self.accumulated_sentence[:100]}...' (length: {len(self.accumulated_sentence)})")
-                    else:
-                        logger.info(f"[STT] Skipped duplicate: '{processed_text[:50]}...'")
-                    
-            except Exception as e:
-                logger.error(f"Error processing buffer: {e}", exc_info=True)
-                if self._on_error_callback:
-                    await self._on_error_callback(e)
-            finally:
-                self.is_processing = False
+        clip_starts = [clip["start"] for clip in clips]
+        texts: List[List[str]] = [[] for _ in audios]
+        for segment in segments:
+            clip_index = max(0, bisect_right(clip_starts, segment.seek / self.whisper_model.frames_per_second + 1e-3) - 1)
+            texts[owners[clip_index]].append(segment.text)
+        return [self._join_segments(parts) for parts in texts]
 
-    async def _process_final_buffer(self):
-        """Process remaining buffer when stopping."""
-        if len(self.audio_buffer) > 0:
-            try:
-                text = await asyncio.to_thread(self._transcribe_with_quality, self.audio_buffer)
-                if text and text.strip():
-                    processed_text = self._post_process_text(text.strip())
-                    
-                    # Append to accumulated sentence (same logic as main processing)
-                    if self.accumulated_sentence:
-                        self.accumulated_sentence += " " + processed_text
-                    else:
-                        self.accumulated_sentence = processed_text
-                    
-                    logger.debug(f"Final buffer processed: {processed_text[:50]}... (Full: {self.accumulated_sentence[:100]}...)")
-                    
-            except Exception as e:
-                logger.error(f"Error processing final buffer: {e}", exc_info=True)
+    @staticmethod
+    def _join_segments(texts: Iterable[str]) -> str:
+        """Combine segments with natural spacing"""
+        full_text = ""
+        for text in texts:
+            text = text.strip()
+            if text:
+                if full_text and not full_text.endswith(('.', '!', '?', ',')):
+                    full_text += " "
+                full_text += text
+        return full_text.strip()
 
-    def _transcribe_with_quality(self, audio_data: np.ndarray) -> str:
+    def _transcribe_with_quality(self, audio_data: np.ndarray, language: Optional[str] = None) -> str:
         """
         Transcribe audio with optimized parameters for quality.
+        
+        Args:
+            audio_data: 16 kHz float32 samples
+            language: Resolved Whisper language (see resolve_language), None = detect
         """
         try:
-            # Language handling: treat "auto" / empty / None as "let
-            # Whisper detect per-utterance" so users can speak in any
-            # language they want. Forcing language="en" makes Whisper
-            # *translate* non-English audio (e.g. Hindi "Tumhara naam
-            # kya hai" → "What is your name") instead of transcribing
-            # it literally — which is almost never what the user wants
-            # in a story-writing app where they may type/speak prose
-            # in mixed languages.
-            session_lang = getattr(self, "_session_language", None)
-            if session_lang:
-                language = session_lang
-            else:
-                lang_cfg = (settings.stt_language or "").strip().lower()
-                language = None if lang_cfg in ("", "auto") else lang_cfg
-
             # Optimized Whisper parameters for quality and speed
             segments, info = self.whisper_model.transcribe(
                 audio_data,
@@ -468,16 +342,7 @@ class ProfessionalSTTService:
                 no_repeat_ngram_size=3
             )
             
-            # Combine segments with natural spacing
-            full_text = ""
-            for segment in segments:
-                text = segment.text.strip()
-                if text:
-                    if full_text and not full_text.endswith(('.', '!', '?', ',')):
-                        full_text += " "
-                    full_text += text
-            
-            return full_text.strip()
+            return self._join_segments(segment.text for segment in segments)
             
         except Exception as e:
             logger.error(f"Transcription error: {e}", exc_info=True)
@@ -611,5 +476,249 @@ class ProfessionalSTTService:
         return self._post_process_text(full_text.strip())
 
 
+class STTStream:
+    """
+    State of one dictation session: audio buffer, VAD/speech state and the
+    accumulated transcript.
+    
+    Created by ProfessionalSTTService.start_transcription(); every session has
+    its own, so concurrent speakers never share a buffer. Model work goes
+    through the STT inference scheduler, which batches it across sessions.
+    """
+
+    def __init__(
+        self,
+        service: ProfessionalSTTService,
+        on_partial: Optional[Callable[[str], None]] = None,
+        on_final: Optional[Callable[[str], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        language: Optional[str] = None,
+    ):
+        from app.services.stt_scheduler import get_stt_scheduler
+
+        self.service = service
+        self.scheduler = get_stt_scheduler()
+        self.sample_rate = service.sample_rate
+
+        # Callbacks
+        self._on_partial_callback = on_partial
+        self._on_final_callback = on_final
+        self._on_error_callback = on_error
+
+        # Per-session language override. Whisper expects ISO 639-1 (2-letter)
+        # so we strip any region suffix ("en-IN" → "en"). Empty / "auto" /
+        # None falls through to the config default (resolve_language).
+        session_language = None
+        if language is not None:
+            lang = language.strip().lower()
+            session_language = lang.split("-")[0] if lang and lang != "auto" else None
+        self.language = service.resolve_language(session_language)
+
+        # Dynamic buffering for sentence-aware transcription. Preallocated:
+        # the longest utterance plus slack for audio arriving while a segment
+        # is being transcribed.
+        self.audio_buffer = AudioRingBuffer(
+            int(((settings.stt_max_speech_duration_s or 60) + BUFFER_SLACK_SECONDS) * self.sample_rate)
+        )
+
+        # Silence detection state
+        self.vad_state = VADState()
+        self.is_speaking = False
+        self.speech_start_time = None
+        self.last_speech_time = None
+
+        # Sentence accumulation
+        self.accumulated_sentence = ""
+
+        # Audio position tracking (for deduplication)
+        self.total_audio_processed = 0
+
+        # Processing state
+        self.is_processing = False
+        self.processing_lock = asyncio.Lock()
+        # Timestamp of the last partial emit. Used to throttle the
+        # mid-speech "running partial" processing path so we don't
+        # invoke Whisper on every audio frame.
+        self.last_partial_emit_time: float = 0.0
+
+    async def stop_transcription(self):
+        """Stop transcription and process any remaining audio."""
+        # Wait for a segment still being transcribed so its text isn't lost
+        async with self.processing_lock:
+            # Process any remaining audio in buffer
+            if len(self.audio_buffer) > 0:
+                await self._process_final_buffer()
+        
+        # Send final transcript
+        if self.accumulated_sentence and self._on_final_callback:
+            await self._on_final_callback(self.accumulated_sentence)
+        
+        # NOW reset
+        self.audio_buffer.clear()
+        self.accumulated_sentence = ""
+        self.is_speaking = False
+        self.vad_state = VADState()
+        self.total_audio_processed = 0
+        
+        logger.info("STT transcription stopped")
+
+    async def feed_audio_data(self, audio_data: bytes, sample_rate: int = 16000):
+        """
+        Feed audio data with intelligent buffering and silence detection.
+        """
+        try:
+            # Convert int16 to float32 straight into the buffer; audio_float is a view
+            audio_float = self.audio_buffer.write(audio_data)
+            
+            # Detect speech/silence using Silero VAD (frames batched across sessions)
+            is_speech = await self.scheduler.detect_speech(audio_float, settings.stt_vad_threshold, self.vad_state)
+            current_time = time.time()
+            # Update speech state
+            if is_speech:
+                if not self.is_speaking:
+                    # Speech started
+                    self.is_speaking = True
+                    self.speech_start_time = current_time
+                    logger.debug("Speech detected - started buffering")
+                
+                self.last_speech_time = current_time
+            
+            # Check if we should process the buffer
+            should_process = False
+            reason = ""
+            
+            if self.is_speaking:
+                buffer_duration = len(self.audio_buffer) / self.sample_rate
+
+                # Silence detected after speech
+                if self.last_speech_time and (current_time - self.last_speech_time) > (settings.stt_min_silence_duration_ms / 1000.0):
+                    should_process = True
+                    reason = "silence after speech (sentence boundary)"
+                    self.is_speaking = False
+
+                # Maximum speech duration reached
+                elif buffer_duration >= settings.stt_max_speech_duration_s:
+                    should_process = True
+                    reason = "maximum duration reached"
+
+                # Running-partial path: process accumulated audio every
+                # ~1s while the user is still talking, so the UI shows
+                # text in real time instead of waiting for a sentence
+                # boundary. We still keep the silence-triggered path
+                # above — that one fires `final-as-partial` at the
+                # natural break (and clears is_speaking so the next
+                # utterance starts fresh).
+                elif buffer_duration >= 1.0 and (current_time - self.last_partial_emit_time) >= 1.0:
+                    should_process = True
+                    reason = "periodic partial (mid-speech)"
+            
+            # Process buffer if conditions met
+            if should_process and len(self.audio_buffer) > 0 and not self.is_processing:
+                logger.debug(f"Processing buffer: {reason}")
+                asyncio.create_task(self._process_buffer_with_context())
+                
+        except Exception as e:
+            logger.error(f"Error feeding audio: {e}", exc_info=True)
+            if self._on_error_callback:
+                await self._on_error_callback(e)
+
+    def _is_duplicate_text(self, new_text: str, existing_text: str) -> bool:
+        """Check if new_text is already in existing_text (with fuzzy matching)."""
+        if not existing_text:
+            return False
+        
+        # Check if new text is substring of existing (allowing for minor variations)
+        new_words = new_text.lower().split()
+        existing_words = existing_text.lower().split()
+        
+        # If first 5 words of new text match last 5-10 words of existing, it's duplicate
+        if len(new_words) >= 5 and len(existing_words) >= 5:
+            new_start = ' '.join(new_words[:5])
+            existing_end = ' '.join(existing_words[-10:])
+            
+            if new_start in existing_end:
+                logger.debug(f"Detected duplicate: '{new_start}' found in '{existing_end}'")
+                return True
+        
+        return False
+
+    async def _process_buffer_with_context(self):
+        """Process buffer with sliding window for context continuity."""
+        if self.is_processing or len(self.audio_buffer) == 0:
+            return
+        
+        async with self.processing_lock:
+            self.is_processing = True
+            
+            try:
+                # No overlap - process sequential chunks for reliability
+                # Take the pending audio and clear buffer for new audio
+                audio_to_process = self.audio_buffer.consume()
+                
+                # Track audio position to prevent re-processing
+                audio_start_pos = self.total_audio_processed
+                self.total_audio_processed += len(audio_to_process)
+                
+                logger.debug(f"Processing audio from {audio_start_pos} to {self.total_audio_processed}")
+                
+                # Transcribe with optimized parameters (batched with other sessions)
+                text = await self.scheduler.transcribe(audio_to_process, self.language)
+                
+                if text and text.strip():
+                    # Post-process for natural output. May return ""
+                    # if the chunk was a known hallucination (e.g.
+                    # "Thank you" on mic warmup); skip in that case.
+                    processed_text = self.service._post_process_text(text.strip())
+                    if not processed_text:
+                        return
+
+                    # Check for duplicate before appending
+                    if not self._is_duplicate_text(processed_text, self.accumulated_sentence):
+                        # ALWAYS append during recording session - NEVER reset
+                        if self.accumulated_sentence:
+                            # Add space between chunks
+                            self.accumulated_sentence += " " + processed_text
+                        else:
+                            self.accumulated_sentence = processed_text
+                        
+                        # Send the FULL accumulated sentence as partial
+                        if self._on_partial_callback:
+                            await self._on_partial_callback(self.accumulated_sentence)
+                        # Record the emit time so the running-partial
+                        # path knows when to fire the next tick.
+                        self.last_partial_emit_time = time.time()
+
+                        logger.info(f"[STT] New chunk: '{processed_text[:50]}...'")
+                        logger.info(f"[STT] Accumulated: '{self.accumulated_sentence[:100]}...' (length: {len(self.accumulated_sentence)})")
+                    else:
+                        logger.info(f"[STT] Skipped duplicate: '{processed_text[:50]}...'")
+                    
+            except Exception as e:
+                logger.error(f"Error processing buffer: {e}", exc_info=True)
+                if self._on_error_callback:
+                    await self._on_error_callback(e)
+            finally:
+                self.is_processing = False
+
+    async def _process_final_buffer(self):
+        """Process remaining buffer when stopping."""
+        if len(self.audio_buffer) > 0:
+            try:
+                text = await self.scheduler.transcribe(self.audio_buffer.consume(), self.language)
+                if text and text.strip():
+                    processed_text = self.service._post_process_text(text.strip())
+                    
+                    # Append to accumulated sentence (same logic as main processing)
+                    if self.accumulated_sentence:
+                        self.accumulated_sentence += " " + processed_text
+                    else:
+                        self.accumulated_sentence = processed_text
+                    
+                    logger.debug(f"Final buffer processed: {processed_text[:50]}... (Full: {self.accumulated_sentence[:100]}...)")
+                    
+            except Exception as e:
+                logger.error(f"Error processing final buffer: {e}", exc_info=True)
+
+
 # Singleton instance
 stt_service = ProfessionalSTTService()
@@ -8,7 +8,7 @@ and coordinates real-time audio streaming and transcription.
 import uuid
 import asyncio
 import logging
-from typing import Dict, Optional, Callable
+from typing import Any, Dict, Optional, Callable
 from datetime import datetime, timedelta
 from fastapi import WebSocket
 from pydantic import BaseModel
@@ -31,6 +31,7 @@ class STTSession(BaseModel):
     message_buffer: list = []  # Buffer messages when WebSocket not connected yet
     user_model: Optional[str] = None  # User's preferred STT model
     user_language: Optional[str] = None  # Per-session language hint (BCP-47 or "")
+    stt_stream: Optional[Any] = None  # STTStream with this session's buffer and transcript state
     
     class Config:
         arbitrary_types_allowed = True
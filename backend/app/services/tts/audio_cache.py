@@ -0,0 +1,292 @@
+"""
+Content-addressed TTS audio cache
+
+Synthesized audio is stored once per hash of everything that determines the
+output: text, provider type and URL, voice, speed, format and the
+audio-affecting extra_params. Regenerating a variant with unchanged text, a
+chapter intro shared between stories, or a repeated voice preview is served
+from disk instead of being synthesized again, and users with identical
+settings share the entry.
+
+Layout: <data_dir>/audio/cache/<key[:2]>/<key>.<ext> plus a <key>.json sidecar
+(format, duration, chunk count) so the index survives restarts.
+
+Scene audio files in the per-user directories are hard links to the cache
+entry (copies when the filesystem doesn't support links), so deleting a
+user's file never breaks the cache and evicting a cache entry never breaks a
+user's file, while identical audio takes the disk space once.
+
+The cache is bounded by max_size_mb; the least recently used entries are
+evicted when a store pushes it over the quota.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .base import AudioFormat
+
+logger = logging.getLogger(__name__)
+
+# extra_params that tune how audio is requested, not what it sounds like
+_NON_AUDIO_PARAMS = {"max_concurrent_requests"}
+
+
+def audio_cache_key(
+    text: str,
+    provider_type: str,
+    api_url: str,
+    voice_id: str,
+    speed: float,
+    format: AudioFormat,
+    extra_params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Content hash of one synthesis (dict key order doesn't matter)."""
+    params = {k: v for k, v in (extra_params or {}).items() if k not in _NON_AUDIO_PARAMS}
+    encoded = json.dumps(
+        {
+            "text": text,
+            "provider": provider_type,
+            "api_url": (api_url or "").rstrip("/"),
+            "voice": voice_id,
+            "speed": round(float(speed or 1.0), 3),
+            "format": format.value,
+            "params": params,
+        },
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedAudio:
+    """One cache entry."""
+    key: str
+    path: Path
+    size: int
+    format: AudioFormat
+    duration: float
+    chunk_count: int = 1
+    last_access: float = 0.0
+
+
+def _link_or_copy(source: Path, dest: Path) -> None:
+    """Hard link source to dest, replacing dest; copy when linking isn't possible."""
+    tmp = dest.with_name(dest.name + ".tmp")
+    try:
+        if tmp.exists():
+            tmp.unlink()
+        os.link(source, tmp)
+    except OSError:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, dest)
+
+
+class TTSAudioCache:
+    """
+    Disk cache of synthesized audio with an LRU size quota.
+
+    Args:
+        root: Cache directory
+        max_bytes: Disk quota; least recently used entries are evicted beyond it
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedAudio]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _paths(self, key: str, format: AudioFormat):
+        directory = self.root / key[:2]
+        return directory / f"{key}.{format.value}", directory / f"{key}.json"
+
+    def _load(self) -> None:
+        """Rebuild the index from the sidecars on disk (first use only; caller holds the lock)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.root.exists():
+            return
+        entries = []
+        for meta_path in self.root.glob("*/*.json"):
+            try:
+                meta = json.loads(meta_path.read_text())
+                format = AudioFormat(meta["format"])
+                path, _ = self._paths(meta_path.stem, format)
+                stat = path.stat()
+            except (OSError, ValueError, KeyError):
+                # Half-written or orphaned entry
+                self._remove_files(meta_path.stem)
+                continue
+            entries.append(CachedAudio(
+                key=meta_path.stem,
+                path=path,
+                size=stat.st_size,
+                format=format,
+                duration=float(meta.get("duration", 0.0)),
+                chunk_count=int(meta.get("chunk_count", 1)),
+                last_access=stat.st_mtime,
+            ))
+        for entry in sorted(entries, key=lambda e: e.last_access):
+            self._entries[entry.key] = entry
+            self._total_bytes += entry.size
+        if entries:
+            logger.info(f"[TTS CACHE] Loaded {len(entries)} entries ({self._total_bytes / 1024 / 1024:.1f} MB)")
+
+    def _remove_files(self, key: str) -> None:
+        for path in (self.root / key[:2]).glob(f"{key}.*"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def lookup(self, key: str) -> Optional[CachedAudio]:
+        """Return the entry for key (marking it recently used), or None on a miss."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is not None and not entry.path.exists():
+                # Deleted behind our back
+                del self._entries[key]
+                self._total_bytes -= entry.size
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry.last_access = time.time()
+            self._entries.move_to_end(key)
+        try:
+            # Persist recency for the index rebuilt after a restart
+            os.utime(entry.path)
+        except OSError:
+            pass
+        return entry
+
+    def store(
+        self,
+        key: str,
+        source: Path,
+        format: AudioFormat,
+        duration: float,
+        chunk_count: int = 1,
+    ) -> Optional[CachedAudio]:
+        """Add a finished audio file to the cache (linked, not moved). Returns None if it can't be cached."""
+        path, meta_path = self._paths(key, format)
+        try:
+            size = Path(source).stat().st_size
+            if size > self.max_bytes:
+                return None
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(Path(source), path)
+            meta_path.write_text(json.dumps({
+                "format": format.value,
+                "duration": duration,
+                "chunk_count": chunk_count,
+            }))
+        except OSError as e:
+            logger.warning(f"[TTS CACHE] Failed to store {key[:12]}: {e}")
+            return None
+
+        entry = CachedAudio(
+            key=key, path=path, size=size, format=format,
+            duration=duration, chunk_count=chunk_count, last_access=time.time(),
+        )
+        with self._lock:
+            self._load()
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous.size
+            self._entries[key] = entry
+            self._total_bytes += size
+            self.stores += 1
+            evicted = self._evict()
+        for stale in evicted:
+            self._remove_files(stale)
+        return entry
+
+    def store_bytes(self, key: str, audio: bytes, format: AudioFormat, duration: float) -> Optional[CachedAudio]:
+        """Add in-memory audio (voice previews) to the cache."""
+        path, _ = self._paths(key, format)
+        part = path.with_name(path.name + ".part")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            part.write_bytes(audio)
+            return self.store(key, part, format, duration)
+        except OSError as e:
+            logger.warning(f"[TTS CACHE] Failed to store {key[:12]}: {e}")
+            return None
+        finally:
+            try:
+                part.unlink()
+            except OSError:
+                pass
+
+    def materialize(self, entry: CachedAudio, dest: Path) -> int:
+        """Link (or copy) a cached entry to dest; returns its size."""
+        _link_or_copy(entry.path, Path(dest))
+        return entry.size
+
+    def _evict(self) -> list:
+        """Drop least recently used entries beyond the quota (caller holds the lock)."""
+        evicted = []
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.size
+            self.evictions += 1
+            evicted.append(key)
+        if evicted:
+            logger.info(f"[TTS CACHE] Evicted {len(evicted)} entries, {self._total_bytes / 1024 / 1024:.1f} MB in use")
+        return evicted
+
+    def get_stats(self) -> dict:
+        """Get cache statistics for monitoring"""
+        with self._lock:
+            self._load()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_mb": round(self._total_bytes / 1024 / 1024, 2),
+                "max_size_mb": round(self.max_bytes / 1024 / 1024, 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+            }
+
+
+# Global singleton
+_cache: Optional[TTSAudioCache] = None
+
+
+def get_tts_audio_cache() -> Optional[TTSAudioCache]:
+    """The shared audio cache, or None when disabled in config.yaml."""
+    global _cache
+    from app.config import settings
+    config = settings.tts_audio_cache
+    if not config.get('enabled', True):
+        return None
+    if _cache is None:
+        _cache = TTSAudioCache(
+            root=Path(settings.data_dir) / "audio" / "cache",
+            max_bytes=int(float(config.get('max_size_mb', 2048)) * 1024 * 1024),
+        )
+    return _cache
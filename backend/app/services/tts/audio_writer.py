@@ -0,0 +1,265 @@
+"""
+Streaming audio assembly
+
+Joins the per-chunk audio a TTS provider returns into one file or HTTP stream
+without holding the whole scene in memory.
+
+WAV chunks are parsed as RIFF (chunk by chunk, so a 'data' byte pattern inside
+a LIST/INFO chunk or the samples themselves can't be mistaken for the data
+header). The first chunk's 'fmt ' chunk becomes the output header; every
+chunk's PCM frames are written straight through as memoryview slices. Files
+get their RIFF and data sizes patched when the writer is closed; HTTP streams
+can't seek back, so they carry the 0xFFFFFFFF "unknown length" sizes that
+browsers and ffmpeg accept for streamed WAV.
+
+Other formats (MP3, OGG, ...) are frame-based and are appended as-is.
+"""
+
+import logging
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple, Union
+
+from .base import AudioFormat, TTSResponse
+
+logger = logging.getLogger(__name__)
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+class WavFormatError(ValueError):
+    """Audio is not a RIFF/WAVE file this writer can join."""
+
+
+@dataclass
+class WavInfo:
+    """Location of the PCM frames inside a WAV buffer."""
+    fmt: bytes
+    data_offset: int
+    data_length: int
+    channels: int
+    sample_rate: int
+    byte_rate: int
+    block_align: int
+    bits_per_sample: int
+
+
+def parse_wav(data: Buffer) -> WavInfo:
+    """
+    Walk the RIFF chunks of a WAV buffer.
+
+    A data chunk whose declared size is 0, 0xFFFFFFFF or past the end of the
+    buffer (streaming TTS servers) is taken to run to the end of the buffer.
+
+    Raises:
+        WavFormatError: Not RIFF/WAVE, or no 'fmt ' chunk before 'data'
+    """
+    view = memoryview(data)
+    if len(view) < 12 or view[0:4] != b"RIFF" or view[8:12] != b"WAVE":
+        raise WavFormatError("Not a RIFF/WAVE file")
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(view):
+        chunk_id = bytes(view[pos:pos + 4])
+        (size,) = struct.unpack_from("<I", view, pos + 4)
+        body = pos + 8
+        if chunk_id == b"data":
+            if fmt is None:
+                raise WavFormatError("'data' chunk before 'fmt ' chunk")
+            available = len(view) - body
+            if size == 0 or size == UNKNOWN_SIZE or size > available:
+                size = available
+            channels, sample_rate, byte_rate, block_align, bits = struct.unpack_from("<HIIHH", fmt, 2)
+            return WavInfo(
+                fmt=fmt,
+                data_offset=body,
+                data_length=size,
+                channels=channels,
+                sample_rate=sample_rate,
+                byte_rate=byte_rate,
+                block_align=block_align or 1,
+                bits_per_sample=bits,
+            )
+        if chunk_id == b"fmt ":
+            if size < 16 or body + size > len(view):
+                raise WavFormatError("Truncated 'fmt ' chunk")
+            fmt = bytes(view[body:body + size])
+        # Chunks are word-aligned
+        pos = body + size + (size & 1)
+
+    raise WavFormatError("'data' chunk not found")
+
+
+class WavAssembler:
+    """
+    Turns a sequence of WAV buffers into one WAV byte stream.
+
+    feed() returns the pieces to write for each buffer (the header first, then
+    zero-copy slices of the PCM frames); finish() returns the trailing pad byte
+    and patches() the (offset, bytes) header fixes for a seekable output.
+
+    Args:
+        streaming: Write 0xFFFFFFFF sizes up front (output can't be patched later)
+    """
+
+    def __init__(self, streaming: bool = False):
+        self.streaming = streaming
+        self.info: Optional[WavInfo] = None
+        self.data_size = 0
+        self.chunks = 0
+        self._data_size_offset = 0
+
+    @property
+    def duration(self) -> float:
+        if self.info is None or not self.info.byte_rate:
+            return 0.0
+        return self.data_size / self.info.byte_rate
+
+    def _header(self, info: WavInfo) -> bytes:
+        size = UNKNOWN_SIZE if self.streaming else 0
+        fmt = info.fmt + (b"\x00" if len(info.fmt) & 1 else b"")
+        header = b"".join([
+            b"RIFF", struct.pack("<I", size), b"WAVE",
+            b"fmt ", struct.pack("<I", len(info.fmt)), fmt,
+            b"data", struct.pack("<I", size),
+        ])
+        self._data_size_offset = len(header) - 4
+        return header
+
+    def feed(self, audio: Buffer) -> List[Buffer]:
+        info = parse_wav(audio)
+        pieces: List[Buffer] = []
+        if self.info is None:
+            self.info = info
+            pieces.append(self._header(info))
+        elif (info.channels, info.sample_rate, info.bits_per_sample) != (
+            self.info.channels, self.info.sample_rate, self.info.bits_per_sample
+        ):
+            raise WavFormatError(
+                f"Chunk format {info.channels}ch/{info.sample_rate}Hz/{info.bits_per_sample}bit "
+                f"doesn't match {self.info.channels}ch/{self.info.sample_rate}Hz/{self.info.bits_per_sample}bit"
+            )
+
+        # Whole frames only, so a short chunk can't shift the channels of the next one
+        length = info.data_length - info.data_length % self.info.block_align
+        if length:
+            pieces.append(memoryview(audio)[info.data_offset:info.data_offset + length])
+        self.data_size += length
+        self.chunks += 1
+        return pieces
+
+    def finish(self) -> bytes:
+        return b"\x00" if self.data_size & 1 else b""
+
+    def patches(self) -> List[Tuple[int, bytes]]:
+        if self.info is None:
+            return []
+        header_size = self._data_size_offset + 4
+        riff_size = header_size + self.data_size + (self.data_size & 1) - 8
+        return [
+            (4, struct.pack("<I", riff_size)),
+            (self._data_size_offset, struct.pack("<I", self.data_size)),
+        ]
+
+
+class AudioFileWriter:
+    """
+    Writes chunked TTS audio straight to a file.
+
+    Audio goes to "<path>.part" and is renamed into place by close(), so a
+    failed or cancelled generation never leaves a truncated cache file. If the
+    first WAV chunk can't be parsed, the writer falls back to appending raw
+    bytes.
+
+    Usage:
+        with AudioFileWriter(path, AudioFormat.WAV) as writer:
+            writer.write(response.audio_data)
+        writer.file_size, writer.duration
+    """
+
+    def __init__(self, path: Union[str, Path], format: AudioFormat):
+        self.path = Path(path)
+        self.format = format
+        self.file_size = 0
+        self.chunks = 0
+        self._part = self.path.with_name(self.path.name + ".part")
+        self._file: Optional[BinaryIO] = open(self._part, "wb")
+        self._wav: Optional[WavAssembler] = WavAssembler() if format == AudioFormat.WAV else None
+
+    @property
+    def duration(self) -> float:
+        """Duration of the written PCM (0.0 for non-WAV formats)"""
+        return self._wav.duration if self._wav is not None else 0.0
+
+    def write(self, audio: Buffer) -> None:
+        if self._wav is not None:
+            try:
+                pieces = self._wav.feed(audio)
+            except WavFormatError as e:
+                if self._wav.info is not None:
+                    raise
+                logger.warning(f"[TTS AUDIO] First chunk is not a parseable WAV ({e}), appending raw bytes")
+                self._wav = None
+                pieces = [audio]
+        else:
+            pieces = [audio]
+        for piece in pieces:
+            self._file.write(piece)
+            self.file_size += len(piece)
+        self.chunks += 1
+
+    def close(self) -> None:
+        """Finish the file (patch WAV sizes) and move it into place."""
+        if self._file is None:
+            return
+        if self._wav is not None:
+            trailer = self._wav.finish()
+            self._file.write(trailer)
+            self.file_size += len(trailer)
+            for offset, value in self._wav.patches():
+                self._file.seek(offset)
+                self._file.write(value)
+        self._file.close()
+        self._file = None
+        os.replace(self._part, self.path)
+
+    def abort(self) -> None:
+        """Discard the partial file."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        try:
+            os.remove(self._part)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "AudioFileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+async def stream_wav(responses: AsyncIterator[TTSResponse]) -> AsyncIterator[Buffer]:
+    """
+    Join chunk responses into one WAV stream for an HTTP response.
+
+    The header is sent with the first chunk's PCM using unknown-length sizes;
+    nothing is buffered beyond the chunk being sent.
+    """
+    assembler = WavAssembler(streaming=True)
+    async for response in responses:
+        for piece in assembler.feed(response.audio_data):
+            yield piece
+    trailer = assembler.finish()
+    if trailer:
+        yield trailer
@@ -5,11 +5,16 @@ This module defines the abstract base classes and data structures for TTS provid
 All TTS providers must inherit from TTSProviderBase and implement its abstract methods.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from functools import partial
 from typing import AsyncIterator, List, Dict, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+import httpx
+
 
 class AudioFormat(Enum):
     """Supported audio formats"""
@@ -122,18 +127,95 @@ class TTSResponse:
     metadata: Optional[Dict[str, Any]] = None
 
 
+class _RequestTimeoutClient:
+    """Pooled httpx client view that applies a default per-request timeout."""
+
+    _METHODS = {"get", "post", "put", "patch", "delete", "head", "request", "stream"}
+
+    def __init__(self, client: httpx.AsyncClient, timeout: Any):
+        self._client = client
+        self._timeout = timeout
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if name in self._METHODS:
+            return partial(self._with_timeout, attr)
+        return attr
+
+    def _with_timeout(self, method, *args, **kwargs):
+        kwargs.setdefault("timeout", self._timeout)
+        return method(*args, **kwargs)
+
+
 class TTSProviderBase(ABC):
     """
     Abstract base class for all TTS providers.
     
     Each provider must implement these methods to be compatible
     with the TTS system.
+    
+    Providers are long-lived (see provider_pool.py) and own one keep-alive
+    httpx client; use `async with self._http_client(timeout=...) as client`
+    instead of opening a new httpx.AsyncClient per request.
     """
     
     def __init__(self, config: TTSProviderConfig):
         self.config = config
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
         self._validate_config()
     
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """The provider's pooled client for the running event loop (created on first use)."""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or self._http_loop is not loop:
+            self._close_stale_http_client()
+            from app.config import settings
+            pool_config = settings.tts_provider_pool
+            self._http = httpx.AsyncClient(
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=int(pool_config.get('max_connections', 20)),
+                    max_keepalive_connections=int(pool_config.get('max_keepalive_connections', 10)),
+                    keepalive_expiry=float(pool_config.get('keepalive_expiry_seconds', 60)),
+                ),
+            )
+            self._http_loop = loop
+        return self._http
+    
+    def _close_stale_http_client(self) -> None:
+        """Close a client left on another event loop before it is replaced."""
+        stale, stale_loop = self._http, self._http_loop
+        self._http = None
+        self._http_loop = None
+        # Connections must be closed on the loop that opened them; a closed
+        # loop has already torn down its sockets
+        if stale is not None and not stale.is_closed and stale_loop is not None and stale_loop.is_running():
+            asyncio.run_coroutine_threadsafe(stale.aclose(), stale_loop)
+    
+    @asynccontextmanager
+    async def _http_client(self, timeout: Any = None):
+        """
+        Borrow the provider's pooled HTTP client.
+        
+        Drop-in for `async with httpx.AsyncClient(timeout=...) as client`: the
+        timeout applies to each request and the connection stays open for the
+        next one instead of being closed on exit.
+        """
+        client = self._get_http_client()
+        yield _RequestTimeoutClient(client, timeout if timeout is not None else self.config.timeout)
+    
+    async def close(self):
+        """Close the provider's HTTP client (called when the pool evicts it or on shutdown)."""
+        if self._http is not None and not self._http.is_closed:
+            try:
+                await self._http.aclose()
+            except RuntimeError:
+                # Client belongs to an event loop that is already closed
+                pass
+        self._http = None
+        self._http_loop = None
+    
     @property
     @abstractmethod
     def provider_name(self) -> str:
@@ -172,6 +254,19 @@ class TTSProviderBase(ABC):
         """
         return None
     
+    @property
+    def max_concurrent_requests(self) -> int:
+        """Chunk syntheses this provider may run concurrently for one scene.
+
+        Long scenes are split into chunks; with a value above 1 the chunks
+        are synthesized pipelined (several requests in flight, audio still
+        delivered in order). Default 1 keeps the sequential behavior for
+        single-slot servers. Users can override it per provider with
+        `max_concurrent_requests` in extra_params.
+        """
+        extra = self.config.extra_params or {}
+        return int(extra.get("max_concurrent_requests", 1))
+    
     @property
     @abstractmethod
     def supports_pitch_control(self) -> bool:
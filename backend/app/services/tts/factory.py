@@ -2,11 +2,14 @@
 TTS Provider Factory
 
 Factory for creating TTS provider instances based on configuration.
+Instances are pooled per configuration (see provider_pool.py).
 """
 
 from typing import Optional
 from sqlalchemy.orm import Session
+from app.config import settings
 from .base import TTSProviderBase, TTSProviderConfig, TTSProviderConfigError
+from .provider_pool import get_tts_provider_pool
 from .registry import TTSProviderRegistry
 
 
@@ -28,7 +31,7 @@ class TTSProviderFactory:
         extra_params: Optional[dict] = None
     ) -> TTSProviderBase:
         """
-        Create a TTS provider instance.
+        Get a TTS provider instance (pooled per configuration).
         
         Args:
             provider_type: Provider name (e.g., 'openai-compatible')
@@ -61,13 +64,18 @@ class TTSProviderFactory:
             extra_params=extra_params or {}
         )
         
-        # Instantiate and return provider
-        try:
-            return provider_class(config)
-        except Exception as e:
-            raise TTSProviderConfigError(
-                f"Failed to create {provider_type} provider: {str(e)}"
-            )
+        def build() -> TTSProviderBase:
+            try:
+                return provider_class(config)
+            except Exception as e:
+                raise TTSProviderConfigError(
+                    f"Failed to create {provider_type} provider: {str(e)}"
+                )
+        
+        # Reuse the long-lived instance for this configuration (keeps its HTTP connections warm)
+        if settings.tts_provider_pool.get('enabled', True):
+            return get_tts_provider_pool().get_provider(provider_type, config, build)
+        return build()
     
     @staticmethod
     def get_available_providers() -> list:
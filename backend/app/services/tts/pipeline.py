@@ -0,0 +1,80 @@
+"""
+Pipelined chunk synthesis
+
+Keeps several chunk syntheses in flight against one TTS provider while still
+handing the audio back in chunk order. GPU-backed servers (Kokoro-FastAPI,
+Chatterbox) batch or overlap concurrent requests, so a long scene finishes in
+roughly (chunks / in-flight) x chunk latency instead of the sum of all chunks.
+
+Back-pressure: a new synthesis only starts when the consumer takes a finished
+chunk, so at most max_in_flight chunks of audio are held in memory.
+
+Cancellation: closing the iterator (consumer stopped, task cancelled by
+cancel_session) cancels every synthesis still in flight.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import AsyncIterator, Deque, List
+
+from app.services.tts.base import TTSProviderBase, TTSRequest, TTSResponse
+
+logger = logging.getLogger(__name__)
+
+
+def pipeline_width(provider: TTSProviderBase) -> int:
+    """In-flight chunk syntheses to use for a provider (1 = sequential)."""
+    from app.config import settings
+    config = settings.tts_pipeline
+    if not config.get('enabled', True):
+        return 1
+    return max(1, min(provider.max_concurrent_requests, int(config.get('max_in_flight', 4))))
+
+
+async def synthesize_pipelined(
+    provider: TTSProviderBase,
+    requests: List[TTSRequest],
+    max_in_flight: int = 1,
+    delay_between: float = 0.0,
+) -> AsyncIterator[TTSResponse]:
+    """
+    Synthesize requests with up to max_in_flight running at once, yielding responses in order.
+
+    Args:
+        provider: TTS provider to call
+        requests: One request per text chunk, in playback order
+        max_in_flight: Syntheses allowed to run concurrently
+        delay_between: Pause before starting each synthesis after the first (rate-limit courtesy)
+
+    Raises:
+        The first synthesis error, in chunk order (later in-flight work is cancelled)
+    """
+    max_in_flight = max(1, max_in_flight)
+    in_flight: Deque[asyncio.Task] = deque()
+    next_index = 0
+
+    async def start_next():
+        nonlocal next_index
+        if next_index and delay_between:
+            await asyncio.sleep(delay_between)
+        in_flight.append(asyncio.create_task(provider.synthesize(requests[next_index])))
+        next_index += 1
+
+    try:
+        while next_index < len(requests) or in_flight:
+            while next_index < len(requests) and len(in_flight) < max_in_flight:
+                await start_next()
+
+            yield await in_flight.popleft()
+    finally:
+        pending = [task for task in in_flight if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.info(f"[TTS PIPELINE] Cancelled {len(pending)} in-flight chunk syntheses")
+            await asyncio.gather(*pending, return_exceptions=True)
+        # Retrieve exceptions of finished-but-unconsumed chunks so asyncio doesn't warn
+        for task in in_flight:
+            if task.done() and not task.cancelled():
+                task.exception()
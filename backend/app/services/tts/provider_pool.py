@@ -0,0 +1,203 @@
+"""
+TTS Provider Pool
+
+Process-wide cache of TTS provider instances.
+
+TTSProviderFactory.create_provider() used to build a new provider (and every
+request inside it a new httpx.AsyncClient) for each chunk, preview and
+WebSocket session, so every synthesis paid a TCP/TLS handshake to the TTS
+server. The pool keeps one long-lived provider per configuration instead:
+- key: provider type, API URL, a hash of the API key, timeout, retry attempts
+  and a fingerprint of custom headers + extra_params; saving different
+  settings produces a new key, so a stale provider is never reused
+- each provider owns one keep-alive httpx client (TTSProviderBase._http_client)
+- providers idle for idle_ttl_seconds, or beyond max_entries (least recently
+  used first), are dropped and their HTTP client closed; the close is delayed
+  by the provider's timeout so a request still holding the instance finishes
+- close_all() closes everything on shutdown
+
+Providers are stateless after construction (all per-call state lives in the
+TTSRequest), so sharing an instance between users with identical settings is
+safe.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Tuple
+
+from .base import TTSProviderBase, TTSProviderConfig
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str, int, int, str]
+
+
+def provider_key(provider_type: str, config: TTSProviderConfig) -> PoolKey:
+    """Pool key of a provider configuration (the API key is only kept as a hash)."""
+    from ..llm.client_registry import settings_fingerprint
+    key_hash = hashlib.sha256((config.api_key or "").encode("utf-8")).hexdigest()[:16]
+    options = settings_fingerprint({
+        "headers": config.custom_headers or {},
+        "extra_params": config.extra_params or {},
+    })
+    return (
+        provider_type,
+        (config.api_url or "").rstrip("/"),
+        key_hash,
+        int(config.timeout),
+        int(config.retry_attempts),
+        options,
+    )
+
+
+@dataclass
+class _PoolEntry:
+    provider: TTSProviderBase
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    hits: int = 0
+
+
+class TTSProviderPool:
+    """
+    Cache of long-lived TTS provider instances.
+
+    Args:
+        max_entries: Provider configurations kept before the least recently used is closed
+        idle_ttl: Seconds without use before a provider is closed
+    """
+
+    def __init__(self, max_entries: int = 32, idle_ttl: float = 900.0):
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[PoolKey, _PoolEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_provider(
+        self,
+        provider_type: str,
+        config: TTSProviderConfig,
+        factory: Callable[[], TTSProviderBase],
+    ) -> TTSProviderBase:
+        """Return the pooled provider for this configuration, building it with factory() on a miss."""
+        key = provider_key(provider_type, config)
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_used = now
+                entry.hits += 1
+                self._entries.move_to_end(key)
+                self.hits += 1
+                provider = entry.provider
+            else:
+                provider = None
+                self.misses += 1
+
+        if provider is None:
+            provider = factory()
+            with self._lock:
+                existing = self._entries.get(key)
+                if existing is not None:
+                    # Another thread built the same provider meanwhile - keep theirs
+                    evicted.append(provider)
+                    provider = existing.provider
+                else:
+                    self._entries[key] = _PoolEntry(provider=provider)
+                    while len(self._entries) > self.max_entries:
+                        _, oldest = self._entries.popitem(last=False)
+                        evicted.append(oldest.provider)
+                        self.evictions += 1
+
+        for stale in evicted:
+            self._schedule_close(stale)
+        return provider
+
+    def _evict_idle(self, now: float) -> list:
+        """Remove entries idle for longer than idle_ttl (caller holds the lock)."""
+        evicted = []
+        for key, entry in list(self._entries.items()):
+            if now - entry.last_used > self.idle_ttl:
+                del self._entries[key]
+                evicted.append(entry.provider)
+                self.evictions += 1
+        return evicted
+
+    def _schedule_close(self, provider: TTSProviderBase) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (sync caller) - nothing of the provider's is open on one
+            return
+        loop.create_task(self._close_later(provider, float(provider.config.timeout)))
+
+    @staticmethod
+    async def _close_later(provider: TTSProviderBase, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            await provider.close()
+        except Exception as e:
+            logger.warning(f"[TTS POOL] Failed to close {provider.provider_name} provider: {e}")
+
+    async def close_all(self) -> None:
+        """Close every pooled provider (application shutdown)."""
+        with self._lock:
+            providers = [entry.provider for entry in self._entries.values()]
+            self._entries.clear()
+        for provider in providers:
+            try:
+                await provider.close()
+            except Exception as e:
+                logger.warning(f"[TTS POOL] Failed to close {provider.provider_name} provider: {e}")
+        if providers:
+            logger.info(f"[TTS POOL] Closed {len(providers)} providers")
+
+    def get_stats(self) -> dict:
+        """Get pool statistics for monitoring"""
+        now = time.monotonic()
+        with self._lock:
+            providers = [
+                {
+                    "provider": key[0],
+                    "api_url": key[1],
+                    "hits": entry.hits,
+                    "age_seconds": round(now - entry.created_at, 1),
+                    "idle_seconds": round(now - entry.last_used, 1),
+                }
+                for key, entry in self._entries.items()
+            ]
+            lookups = self.hits + self.misses
+            return {
+                "size": len(providers),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "providers": providers,
+            }
+
+
+# Global singleton
+_pool: Optional[TTSProviderPool] = None
+
+
+def get_tts_provider_pool() -> TTSProviderPool:
+    global _pool
+    if _pool is None:
+        from app.config import settings
+        config = settings.tts_provider_pool
+        _pool = TTSProviderPool(
+            max_entries=int(config.get('max_entries', 32)),
+            idle_ttl=float(config.get('idle_ttl_seconds', 900)),
+        )
+    return _pool
@@ -55,6 +55,12 @@ class ChatterboxProvider(TTSProviderBase):
     def supports_streaming(self) -> bool:
         return True
     
+    @property
+    def max_concurrent_requests(self) -> int:
+        # GPU-backed Chatterbox servers overlap concurrent requests
+        extra = self.config.extra_params or {}
+        return int(extra.get("max_concurrent_requests", 2))
+    
     @property
     def supports_pitch_control(self) -> bool:
         return False
@@ -71,7 +77,7 @@ class ChatterboxProvider(TTSProviderBase):
             return await self._synthesize_long_text(request)
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {"Content-Type": "application/json"}
                 
                 if self.config.api_key:
@@ -156,7 +162,7 @@ class ChatterboxProvider(TTSProviderBase):
         )
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {"Content-Type": "application/json"}
                 
                 if self.config.api_key:
@@ -215,7 +221,7 @@ class ChatterboxProvider(TTSProviderBase):
         logger.info(f"Fetching voices from ChatterboxTTS library, language={language}")
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {}
                 if self.config.api_key:
                     headers["Authorization"] = f"Bearer {self.config.api_key}"
@@ -278,7 +284,7 @@ class ChatterboxProvider(TTSProviderBase):
         logger.info("Fetching supported languages from ChatterboxTTS")
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {}
                 if self.config.api_key:
                     headers["Authorization"] = f"Bearer {self.config.api_key}"
@@ -310,7 +316,7 @@ class ChatterboxProvider(TTSProviderBase):
         logger.info("Fetching default voice from ChatterboxTTS")
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {}
                 if self.config.api_key:
                     headers["Authorization"] = f"Bearer {self.config.api_key}"
@@ -338,7 +344,7 @@ class ChatterboxProvider(TTSProviderBase):
         logger.info(f"Setting default voice to: {voice_name}")
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {}
                 if self.config.api_key:
                     headers["Authorization"] = f"Bearer {self.config.api_key}"
@@ -373,7 +379,7 @@ class ChatterboxProvider(TTSProviderBase):
         logger.info(f"Uploading voice: {voice_name}, language: {language}")
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {}
                 if self.config.api_key:
                     headers["Authorization"] = f"Bearer {self.config.api_key}"
@@ -414,7 +420,7 @@ class ChatterboxProvider(TTSProviderBase):
         logger.info(f"Deleting voice: {voice_name}")
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {}
                 if self.config.api_key:
                     headers["Authorization"] = f"Bearer {self.config.api_key}"
@@ -447,7 +453,7 @@ class ChatterboxProvider(TTSProviderBase):
         logger.info(f"Synthesizing long text: {len(request.text)} characters")
         
         try:
-            async with httpx.AsyncClient(timeout=300.0) as client:  # Longer timeout for long text
+            async with self._http_client(timeout=300.0) as client:  # Longer timeout for long text
                 headers = {"Content-Type": "application/json"}
                 
                 if self.config.api_key:
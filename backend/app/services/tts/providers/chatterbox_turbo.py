@@ -160,7 +160,7 @@ class ChatterboxTurboProvider(TTSProviderBase):
             payload["input"][: payload["input"].find("]") + 1] if "]" in payload["input"] else "",
         )
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 r = await client.post(url, headers=self._headers(), json=payload)
                 if r.status_code != 200:
                     raise TTSProviderAPIError(
@@ -186,7 +186,7 @@ class ChatterboxTurboProvider(TTSProviderBase):
             request.voice_id, len(request.text),
         )
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout * 5) as client:
+            async with self._http_client(timeout=self.config.timeout * 5) as client:
                 async with client.stream(
                     "POST", url, headers=self._headers(), json=payload,
                 ) as resp:
@@ -211,7 +211,7 @@ class ChatterboxTurboProvider(TTSProviderBase):
     async def get_voices(self, language: Optional[str] = None) -> List[Voice]:
         url = self.config.api_url.rstrip("/") + "/v1/audio/voices"
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 r = await client.get(url, headers=self._headers())
                 if r.status_code != 200:
                     logger.warning("ChatterboxTurbo /v1/audio/voices %s", r.status_code)
@@ -250,7 +250,7 @@ class ChatterboxTurboProvider(TTSProviderBase):
 
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with self._http_client(timeout=5.0) as client:
                 r = await client.get(
                     self.config.api_url.rstrip("/") + "/health",
                     headers=self._headers(),
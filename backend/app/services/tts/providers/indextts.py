@@ -157,7 +157,7 @@ class IndexTTSProvider(TTSProviderBase):
         )
 
         async def _make_request():
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 resp = await client.post(
                     f"{self.config.api_url.rstrip('/')}/v1/audio/speech",
                     headers=self._headers(),
@@ -228,7 +228,7 @@ class IndexTTSProvider(TTSProviderBase):
         # idle timeout matters more than the total here.
         timeout = max(self.config.timeout * 5, 240)
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with self._http_client(timeout=timeout) as client:
                 async with client.stream(
                     "POST", url, headers=self._headers(), json=payload,
                 ) as resp:
@@ -257,7 +257,7 @@ class IndexTTSProvider(TTSProviderBase):
         url = f"{self.config.api_url.rstrip('/')}/v1/voices"
 
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 resp = await client.get(url, headers=self._headers())
                 if resp.status_code == 200:
                     data = resp.json()
@@ -298,7 +298,7 @@ class IndexTTSProvider(TTSProviderBase):
 
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with self._http_client(timeout=5.0) as client:
                 resp = await client.get(
                     f"{self.config.api_url.rstrip('/')}/health",
                     headers=self._headers(),
@@ -75,6 +75,12 @@ class KokoroProvider(TTSProviderBase):
     def supports_streaming(self) -> bool:
         return True
     
+    @property
+    def max_concurrent_requests(self) -> int:
+        # Kokoro-FastAPI serves concurrent requests on the GPU
+        extra = self.config.extra_params or {}
+        return int(extra.get("max_concurrent_requests", 2))
+    
     @property
     def supports_pitch_control(self) -> bool:
         return False  # Kokoro doesn't support pitch control
@@ -85,11 +91,15 @@ class KokoroProvider(TTSProviderBase):
     
     def __init__(self, config: TTSProviderConfig):
         super().__init__(config)
-        self.client = httpx.AsyncClient(timeout=config.timeout)
         self._max_text_length = config.extra_params.get("max_text_length", 5000) if config.extra_params else 5000
         
         logger.info(f"Initialized Kokoro provider: {config.api_url}")
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The provider's pooled keep-alive client"""
+        return self._get_http_client()
+    
     async def synthesize(self, request: TTSRequest) -> TTSResponse:
         """
         Synthesize speech using Kokoro API
@@ -500,7 +510,3 @@ class KokoroProvider(TTSProviderBase):
         except Exception as e:
             logger.error(f"Captioned speech error: {str(e)}")
             raise
-    
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
@@ -73,7 +73,7 @@ class OpenAICompatibleProvider(TTSProviderBase):
         
         async def _make_request():
             """Inner function to make the actual HTTP request"""
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {
                     "Content-Type": "application/json",
                 }
@@ -163,7 +163,7 @@ class OpenAICompatibleProvider(TTSProviderBase):
         logger.info(f"Starting streaming synthesis for voice={request.voice_id}")
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {
                     "Content-Type": "application/json",
                 }
@@ -219,7 +219,7 @@ class OpenAICompatibleProvider(TTSProviderBase):
         
         for endpoint in endpoints_to_try:
             try:
-                async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+                async with self._http_client(timeout=self.config.timeout) as client:
                     headers = {}
                     if self.config.api_key:
                         headers["Authorization"] = f"Bearer {self.config.api_key}"
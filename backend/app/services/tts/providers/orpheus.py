@@ -94,7 +94,7 @@ class OrpheusProvider(TTSProviderBase):
         )
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {
                     "Content-Type": "application/json",
                 }
@@ -178,7 +178,7 @@ class OrpheusProvider(TTSProviderBase):
         logger.info(f"Starting streaming synthesis for voice={request.voice_id}")
         
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 headers = {
                     "Content-Type": "application/json",
                 }
@@ -238,7 +238,7 @@ class OrpheusProvider(TTSProviderBase):
         
         for endpoint in endpoints_to_try:
             try:
-                async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+                async with self._http_client(timeout=self.config.timeout) as client:
                     headers = {}
                     if self.config.api_key:
                         headers["Authorization"] = f"Bearer {self.config.api_key}"
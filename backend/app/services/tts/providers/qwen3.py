@@ -147,7 +147,7 @@ class Qwen3TTSProvider(TTSProviderBase):
         )
 
         async def _make_request():
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 resp = await client.post(
                     f"{self.config.api_url.rstrip('/')}/v1/audio/speech",
                     headers=self._headers(),
@@ -201,7 +201,7 @@ class Qwen3TTSProvider(TTSProviderBase):
             payload.get("instruct", ""),
         )
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 async with client.stream(
                     "POST",
                     f"{self.config.api_url.rstrip('/')}/v1/audio/speech",
@@ -243,7 +243,7 @@ class Qwen3TTSProvider(TTSProviderBase):
         url = f"{self.config.api_url.rstrip('/')}/v1/voices"
 
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 resp = await client.get(url, headers=self._headers())
                 if resp.status_code == 200:
                     data = resp.json()
@@ -301,7 +301,7 @@ class Qwen3TTSProvider(TTSProviderBase):
 
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with self._http_client(timeout=5.0) as client:
                 resp = await client.get(
                     f"{self.config.api_url.rstrip('/')}/health",
                     headers=self._headers(),
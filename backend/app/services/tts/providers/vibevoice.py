@@ -180,7 +180,7 @@ class VibeVoiceProvider(TTSProviderBase):
             request.voice_id, len(request.text), payload["response_format"],
         )
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 r = await client.post(url, headers=self._headers(), json=payload)
                 if r.status_code != 200:
                     raise TTSProviderAPIError(
@@ -215,7 +215,7 @@ class VibeVoiceProvider(TTSProviderBase):
             request.voice_id, len(request.text),
         )
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 async with client.stream(
                     "POST", url, headers=self._headers(), json=payload,
                 ) as resp:
@@ -283,7 +283,7 @@ class VibeVoiceProvider(TTSProviderBase):
             n_speakers, len(payload["script"]),
         )
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout * 5) as client:
+            async with self._http_client(timeout=self.config.timeout * 5) as client:
                 r = await client.post(url, headers=self._headers(), json=payload)
                 if r.status_code != 200:
                     raise TTSProviderAPIError(
@@ -320,7 +320,7 @@ class VibeVoiceProvider(TTSProviderBase):
         # default (30s) is too tight for a 2-min scene render.
         timeout = max(self.config.timeout * 5, 300)
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with self._http_client(timeout=timeout) as client:
                 async with client.stream(
                     "POST", url, headers=self._headers(), json=payload,
                 ) as resp:
@@ -348,7 +348,7 @@ class VibeVoiceProvider(TTSProviderBase):
     async def get_voices(self, language: Optional[str] = None) -> List[Voice]:
         url = self.config.api_url.rstrip("/") + "/v1/audio/voices"
         try:
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+            async with self._http_client(timeout=self.config.timeout) as client:
                 # `show_all=true` surfaces custom voices the user dropped
                 # into the wrapper's voices/ directory in addition to the
                 # 9 built-in presets.
@@ -404,7 +404,7 @@ class VibeVoiceProvider(TTSProviderBase):
 
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with self._http_client(timeout=5.0) as client:
                 r = await client.get(
                     self.config.api_url.rstrip("/") + "/v1/vibevoice/health",
                     headers=self._headers(),
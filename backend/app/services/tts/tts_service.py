@@ -12,11 +12,9 @@ Handles:
 import os
 import asyncio
 import logging
-import struct
 from pathlib import Path
-from typing import Optional, AsyncIterator, List, Tuple
+from typing import Optional, AsyncIterator, Callable, Tuple
 from datetime import datetime
-from io import BytesIO
 
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
@@ -33,6 +31,9 @@ from app.services.tts.base import (
     TTSProviderError
 )
 from app.services.tts.text_chunker import TextChunker, TextChunk
+from app.services.tts.pipeline import pipeline_width, synthesize_pipelined
+from app.services.tts.audio_writer import AudioFileWriter, stream_wav
+from app.services.tts.audio_cache import audio_cache_key, get_tts_audio_cache
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -250,22 +251,17 @@ class TTSService:
                 return scene_audio
             
             # Non-progressive: generate complete audio file
-            audio_data, duration, format, chunk_count = await self._generate_scene_audio(
-                variant.content,  # Use variant content instead of scene.content
-                tts_settings
-            )
-            
-            # Save audio file
             user_dir = self._get_user_audio_dir(user_id)
-            filename = self._get_audio_filename(
-                scene.id,
-                tts_settings.default_voice or "default",
-                format
+            file_path, file_size, duration, format, chunk_count = await self._generate_scene_audio(
+                variant.content,  # Use variant content instead of scene.content
+                tts_settings,
+                lambda audio_format: user_dir / self._get_audio_filename(
+                    scene.id,
+                    tts_settings.default_voice or "default",
+                    audio_format
+                ),
+                use_cache=not force_regenerate
             )
-            file_path = user_dir / filename
-            
-            with open(file_path, "wb") as f:
-                f.write(audio_data)
             
             logger.info(f"Saved audio to {file_path}")
             
@@ -289,7 +285,7 @@ class TTSService:
                             logger.warning(f"Could not delete old audio file: {e}")
                     
                     scene_audio.audio_url = str(file_path)
-                    scene_audio.file_size = len(audio_data)
+                    scene_audio.file_size = file_size
                     scene_audio.duration = duration
                     scene_audio.audio_format = format.value
                     scene_audio.chunk_count = chunk_count
@@ -299,7 +295,7 @@ class TTSService:
                         scene.id,
                         user_id,
                         str(file_path),
-                        len(audio_data),
+                        file_size,
                         duration,
                         format,
                         tts_settings,
@@ -311,7 +307,7 @@ class TTSService:
                     scene.id,
                     user_id,
                     str(file_path),
-                    len(audio_data),
+                    file_size,
                     duration,
                     format,
                     tts_settings,
@@ -342,6 +338,9 @@ class TTSService:
         
         Yields each audio chunk immediately after generation,
         allowing frontend to start playback before all chunks are complete.
+        Chunks are synthesized pipelined (see pipeline.py) when the provider
+        allows more than one request in flight. Closing the iterator (the
+        client disconnected) cancels the syntheses still in flight.
         
         Args:
             scene: The scene to narrate
@@ -437,27 +436,29 @@ class TTSService:
                 chunker = TextChunker(max_chunk_size=max_length)
                 chunks = chunker.chunk_text(text)
                 
-                logger.info(f"Split into {len(chunks)} chunks")
+                width = pipeline_width(provider)
+                logger.info(f"Split into {len(chunks)} chunks ({width} in flight)")
                 
-                for i, chunk in enumerate(chunks, 1):
-                    logger.info(f"Generating chunk {i}/{len(chunks)}: {len(chunk.text)} chars")
-                    
-                    tts_request = TTSRequest(
+                requests = [
+                    TTSRequest(
                         text=chunk.text,
                         voice_id=tts_settings.default_voice or "default",
                         speed=tts_settings.speech_speed,
                         format=AudioFormat.WAV,
                         sample_rate=22050
                     )
+                    for chunk in chunks
+                ]
+                
+                i = 0
+                async for response in synthesize_pipelined(provider, requests, width):
+                    i += 1
+                    logger.info(f"Chunk {i}/{len(chunks)} generated: {len(response.audio_data)} bytes")
                     
-                    response = await provider.synthesize(tts_request)
-                    
-                    logger.info(f"Chunk {i} generated: {len(response.audio_data)} bytes")
-                    
-                    # Yield chunk immediately
+                    # Yield chunk immediately (in order, later chunks may already be synthesizing)
                     yield response.audio_data
                 
-                logger.info(f"All {len(chunks)} chunks streamed")
+                logger.info(f"{i}/{len(chunks)} chunks streamed")
                 
         except Exception as e:
             logger.error(f"Failed to stream audio chunks for scene {scene.id}: {e}")
@@ -488,87 +489,29 @@ class TTSService:
             chunk_count=chunk_count
         )
     
-    def _concatenate_wav_chunks(self, chunks: List[bytes]) -> bytes:
-        """
-        Concatenate WAV file chunks properly by combining audio data and updating headers.
-        
-        WAV file structure:
-        - RIFF header (12 bytes): 'RIFF', file_size, 'WAVE'
-        - fmt chunk (24+ bytes): 'fmt ', size, audio format info
-        - data chunk (8+ bytes): 'data', data_size, audio_data
-        
-        Args:
-            chunks: List of WAV file byte data
-            
-        Returns:
-            Combined WAV file as bytes
-        """
-        if not chunks:
-            return b""
-        
-        if len(chunks) == 1:
-            return chunks[0]
-        
-        # Parse first chunk to get format info
-        first_chunk = chunks[0]
-        
-        # Find 'data' chunk in first file
-        data_pos = first_chunk.find(b'data')
-        if data_pos == -1:
-            raise ValueError("Invalid WAV file: 'data' chunk not found")
-        
-        # Extract header (everything up to and including 'data' chunk header)
-        # data chunk header is: b'data' + 4 bytes for data size
-        header = first_chunk[:data_pos + 8]
-        
-        # Collect all audio data (skip headers from each chunk)
-        all_audio_data = []
-        
-        for i, chunk in enumerate(chunks):
-            chunk_data_pos = chunk.find(b'data')
-            if chunk_data_pos == -1:
-                logger.warning(f"Chunk {i} missing 'data' marker, skipping")
-                continue
-            
-            # Skip 'data' + 4-byte size header
-            audio_start = chunk_data_pos + 8
-            audio_data = chunk[audio_start:]
-            all_audio_data.append(audio_data)
-        
-        # Combine all audio data
-        combined_audio = b"".join(all_audio_data)
-        total_audio_size = len(combined_audio)
-        
-        # Update the data chunk size in header (bytes 4-7 after 'data')
-        header_list = bytearray(header)
-        struct.pack_into('<I', header_list, data_pos + 4, total_audio_size)
-        
-        # Update the RIFF chunk size (bytes 4-7 from start)
-        # RIFF size = total file size - 8 (for 'RIFF' and size field itself)
-        total_file_size = len(header_list) + total_audio_size
-        struct.pack_into('<I', header_list, 4, total_file_size - 8)
-        
-        # Combine header and audio
-        result = bytes(header_list) + combined_audio
-        
-        logger.debug(f"Concatenated {len(chunks)} WAV chunks: {len(result)} bytes total")
-        
-        return result
-    
     async def _generate_scene_audio(
         self,
         text: str,
-        tts_settings: TTSSettings
-    ) -> Tuple[bytes, float, AudioFormat]:
+        tts_settings: TTSSettings,
+        output_path: Callable[[AudioFormat], Path],
+        use_cache: bool = True
+    ) -> Tuple[Path, int, float, AudioFormat, int]:
         """
-        Generate audio for text using TTS provider.
+        Generate audio for text using TTS provider and write it to disk.
+        
+        Chunks are written to the file as they arrive (see audio_writer.py),
+        so memory stays at the in-flight chunks instead of the whole scene.
+        Results are shared through the content-addressed audio cache
+        (audio_cache.py), so identical text and settings are synthesized once.
         
         Args:
             text: Text to synthesize
             tts_settings: TTS configuration
+            output_path: Returns the file path for the final audio format
+            use_cache: Serve cached audio if present (False still refreshes the cache)
             
         Returns:
-            Tuple of (audio_data, duration, format)
+            Tuple of (file_path, file_size, duration, format, chunk_count)
         """
         # Create provider
         provider = TTSProviderFactory.create_provider(
@@ -596,6 +539,46 @@ class TTSService:
             except ValueError:
                 logger.warning(f"Invalid format '{format_str}', using MP3")
         
+        # Identical text with identical settings was synthesized before (any user)
+        cache = get_tts_audio_cache()
+        cache_key = audio_cache_key(
+            text,
+            tts_settings.tts_provider_type,
+            tts_settings.tts_api_url,
+            tts_settings.default_voice or "default",
+            tts_settings.speech_speed or 1.0,
+            format,
+            tts_settings.tts_extra_params,
+        )
+        if cache is not None and use_cache:
+            cached = cache.lookup(cache_key)
+            if cached is not None:
+                file_path = output_path(cached.format)
+                try:
+                    file_size = cache.materialize(cached, file_path)
+                    logger.info(f"Using cached audio {cache_key[:12]} ({file_size} bytes)")
+                    return file_path, file_size, cached.duration, cached.format, cached.chunk_count
+                except OSError as e:
+                    # Evicted between lookup and link - synthesize again
+                    logger.warning(f"Cached audio {cache_key[:12]} unavailable: {e}")
+        
+        file_path, file_size, duration, format, chunk_count = await self._synthesize_to_file(
+            text, provider, tts_settings, format, max_length, output_path
+        )
+        if cache is not None:
+            cache.store(cache_key, file_path, format, duration, chunk_count)
+        return file_path, file_size, duration, format, chunk_count
+    
+    async def _synthesize_to_file(
+        self,
+        text: str,
+        provider,
+        tts_settings: TTSSettings,
+        format: AudioFormat,
+        max_length: int,
+        output_path: Callable[[AudioFormat], Path]
+    ) -> Tuple[Path, int, float, AudioFormat, int]:
+        """Synthesize text (chunked if longer than max_length) into output_path(format)."""
         # Check if text needs chunking
         logger.info(f"Text length: {len(text)}, max_length: {max_length}, progressive_narration: {tts_settings.progressive_narration}, needs chunking: {len(text) > max_length}")
         
@@ -610,36 +593,26 @@ class TTSService:
             )
             
             response = await provider.synthesize(request)
-            return response.audio_data, response.duration, response.format, 1  # Single chunk
-        else:
-            # Need to chunk - generate all chunks and concatenate properly
-            logger.info(f"Text needs chunking ({len(text)} > {max_length})")
-            audio_chunks, duration, format = await self._generate_chunked_audio(
+            file_path = output_path(response.format)
+            with AudioFileWriter(file_path, response.format) as writer:
+                writer.write(response.audio_data)
+            return file_path, writer.file_size, response.duration or writer.duration, response.format, 1  # Single chunk
+        
+        # Need to chunk - stream every chunk into the file as it arrives
+        logger.info(f"Text needs chunking ({len(text)} > {max_length})")
+        file_path = output_path(format)
+        with AudioFileWriter(file_path, format) as writer:
+            duration = await self._generate_chunked_audio(
                 text,
                 provider,
                 tts_settings,
                 format,
-                max_length
+                max_length,
+                writer
             )
-            
-            chunk_count = len(audio_chunks)
-            
-            # Properly concatenate audio chunks
-            logger.info(f"Concatenating {chunk_count} chunks, format: {format.value}")
-            if format == AudioFormat.WAV and chunk_count > 1:
-                logger.info(f"Concatenating {chunk_count} WAV chunks")
-                try:
-                    concatenated_audio = self._concatenate_wav_chunks(audio_chunks)
-                    logger.info(f"Concatenated audio: {len(concatenated_audio)} bytes")
-                except Exception as e:
-                    logger.error(f"Failed to concatenate WAV files: {e}")
-                    # Fallback to simple concatenation
-                    concatenated_audio = b"".join(audio_chunks)
-            else:
-                # For non-WAV or single chunk, simple concatenation is fine
-                concatenated_audio = b"".join(audio_chunks)
-            
-            return concatenated_audio, duration, format, chunk_count
+        
+        logger.info(f"Wrote {writer.chunks} chunks to {file_path}: {writer.file_size} bytes")
+        return file_path, writer.file_size, duration or writer.duration, format, writer.chunks
     
     async def _generate_chunked_audio(
         self,
@@ -647,11 +620,12 @@ class TTSService:
         provider,
         tts_settings: TTSSettings,
         format: AudioFormat,
-        max_length: int
-    ) -> Tuple[List[bytes], float, AudioFormat]:
+        max_length: int,
+        writer: AudioFileWriter
+    ) -> float:
         """
         Generate audio for long text by chunking.
-        Returns list of audio chunks instead of concatenating them.
+        Each chunk is handed to the writer as soon as it is next in order.
         
         Args:
             text: Text to synthesize
@@ -659,9 +633,10 @@ class TTSService:
             tts_settings: TTS configuration
             format: Audio format
             max_length: Maximum text length per chunk
+            writer: Destination of the joined audio
             
         Returns:
-            Tuple of (list of audio_chunks, total_duration, format)
+            Total duration reported by the provider
         """
         # Create text chunker
         chunker = TextChunker(
@@ -677,36 +652,39 @@ class TTSService:
         logger.info(f"Chunked text into {chunk_summary['total_chunks']} chunks")
         logger.debug(f"Chunk summary: {chunk_summary}")
         
-        # Generate audio for each chunk
-        audio_chunks = []
+        # Generate audio for each chunk (pipelined when the provider allows it)
+        completed = 0
         total_duration = 0.0
-        
-        for chunk in chunks:
-            request = TTSRequest(
+        requests = [
+            TTSRequest(
                 text=chunk.text,
                 voice_id=tts_settings.default_voice or "default",
                 speed=tts_settings.speech_speed or 1.0,
                 format=format
             )
-            
-            try:
-                response = await provider.synthesize(request)
-                audio_chunks.append(response.audio_data)
+            for chunk in chunks
+        ]
+        
+        try:
+            # Small delay between request starts to avoid rate limiting
+            async for response in synthesize_pipelined(
+                provider, requests, pipeline_width(provider), delay_between=0.1
+            ):
+                chunk = chunks[completed]
+                writer.write(response.audio_data)
+                completed += 1
                 total_duration += response.duration
                 
                 logger.debug(f"Generated chunk {chunk.index}: {len(response.audio_data)} bytes, {response.duration:.2f}s")
                 
-                # Small delay between requests to avoid rate limiting
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                logger.error(f"Failed to generate audio for chunk {chunk.index}: {e}")
-                raise TTSProviderError(f"Failed to generate chunk {chunk.index}: {e}")
+        except Exception as e:
+            chunk = chunks[min(completed, len(chunks) - 1)]
+            logger.error(f"Failed to generate audio for chunk {chunk.index}: {e}")
+            raise TTSProviderError(f"Failed to generate chunk {chunk.index}: {e}")
         
-        # Return list of chunks instead of concatenating
-        logger.info(f"Generated {len(audio_chunks)} audio chunks, total duration: {total_duration:.2f}s")
+        logger.info(f"Generated {completed} audio chunks, total duration: {total_duration:.2f}s")
         
-        return audio_chunks, total_duration, format
+        return total_duration
     
     async def stream_scene_audio(
         self,
@@ -774,6 +752,29 @@ class TTSService:
                 except ValueError:
                     pass
             
+            if format == AudioFormat.WAV and len(scene.content) > provider.max_text_length:
+                # Too long for one request: synthesize chunks and send one WAV as they arrive
+                chunker = TextChunker(
+                    max_chunk_size=provider.max_text_length,
+                    min_chunk_size=50,
+                    respect_sentences=True,
+                    respect_paragraphs=True
+                )
+                requests = [
+                    TTSRequest(
+                        text=chunk.text,
+                        voice_id=tts_settings.default_voice or "default",
+                        speed=tts_settings.speech_speed or 1.0,
+                        format=format
+                    )
+                    for chunk in chunker.chunk_text(scene.content)
+                ]
+                async for piece in stream_wav(
+                    synthesize_pipelined(provider, requests, pipeline_width(provider))
+                ):
+                    yield piece
+                return
+            
             request = TTSRequest(
                 text=scene.content,
                 voice_id=tts_settings.default_voice or "default",
@@ -966,19 +967,20 @@ class TTSService:
         try:
             logger.info(f"Background generation started for scene {scene_id}: {len(chunks)} chunks remaining")
             
-            from app.services.tts.base import TTSRequest
-            
-            for i, chunk in enumerate(chunks, start=1):  # Start from chunk 1
-                logger.info(f"Generating background chunk {i}/{len(chunks)+1}: {len(chunk.text)} chars")
-                
-                request = TTSRequest(
+            requests = [
+                TTSRequest(
                     text=chunk.text,
                     voice_id=tts_settings.default_voice or "default",
                     speed=tts_settings.speech_speed or 1.0,
                     format=actual_format
                 )
-                
-                response = await provider.synthesize(request)
+                for chunk in chunks
+            ]
+            
+            i = 0  # Chunk 0 was generated by the caller
+            async for response in synthesize_pipelined(provider, requests, pipeline_width(provider)):
+                i += 1
+                logger.info(f"Generated background chunk {i}/{len(chunks)+1}")
                 
                 # Save chunk
                 chunk_filename = f"scene_{scene_id}_chunk_{i}_{tts_settings.default_voice or 'default'}.{actual_format.value}"
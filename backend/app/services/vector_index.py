@@ -0,0 +1,172 @@
+"""
+pgvector Index Settings
+
+Shared helpers for the ANN (approximate nearest neighbour) index mode used by
+SemanticMemoryService searches, the re-embed index rebuild and the admin
+index rebuild endpoint.
+
+Search modes (semantic_memory.vector_index.search_mode in config.yaml):
+- auto:  leave planner settings untouched (previous behaviour)
+- exact: disable plain index scans for the vector query, so results are always
+         an exact distance sort (B-tree filters still apply via bitmap scans)
+- ann:   tune the configured ANN index per query (hnsw.ef_search /
+         ivfflat.probes, optional hnsw.iterative_scan)
+
+Index type (hnsw | ivfflat) decides which index is built on the vector
+columns. Use benchmarks/vector_ann to pick parameters for a given corpus.
+"""
+
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tables with a vector(N) "embedding" column searched by cosine distance
+VECTOR_TABLES = [
+    "scene_embeddings",
+    "character_memories",
+    "plot_events",
+    "character_chronicles",
+    "location_lorebooks",
+    "scene_events",
+]
+
+INDEX_TYPES = ("hnsw", "ivfflat")
+SEARCH_MODES = ("auto", "exact", "ann")
+ITERATIVE_SCAN_MODES = ("strict_order", "relaxed_order")
+
+
+def get_vector_index_config() -> dict:
+    """Current vector index configuration (defaults merged with config.yaml)."""
+    from ..config import settings
+    return settings.vector_index
+
+
+def index_name(table_name: str, index_type: str) -> str:
+    """Name of the vector index of a table, e.g. ix_scene_events_embedding_hnsw."""
+    return f"ix_{table_name}_embedding_{index_type}"
+
+
+def create_index_sql(table_name: str, config: Optional[dict] = None, column: str = "embedding", name: Optional[str] = None) -> str:
+    """
+    CREATE INDEX statement for the configured index type of a table.
+
+    column / name override the indexed column and index name, e.g. to index
+    the shadow column of a re-embed before it is swapped in.
+    """
+    config = config or get_vector_index_config()
+    index_type = config.get("index_type", "hnsw")
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unsupported vector index type: {index_type}")
+
+    if index_type == "ivfflat":
+        params = f"lists = {int(config.get('ivfflat_lists', 100))}"
+    else:
+        params = (
+            f"m = {int(config.get('hnsw_m', 16))}, "
+            f"ef_construction = {int(config.get('hnsw_ef_construction', 64))}"
+        )
+    return (
+        f"CREATE INDEX IF NOT EXISTS {name or index_name(table_name, index_type)} ON {table_name} "
+        f"USING {index_type} ({column} vector_cosine_ops) WITH ({params})"
+    )
+
+
+def drop_index_sql(table_name: str) -> List[str]:
+    """DROP statements for every vector index type of a table."""
+    return [f"DROP INDEX IF EXISTS {index_name(table_name, t)}" for t in INDEX_TYPES]
+
+
+def search_settings_sql(
+    config: Optional[dict] = None,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[str]:
+    """
+    SET LOCAL statements to run before a vector query.
+
+    Args:
+        config: Vector index config (defaults to config.yaml)
+        ef_search: Per-query hnsw.ef_search override
+        probes: Per-query ivfflat.probes override
+        limit: Query LIMIT; ef_search is raised to at least this so HNSW can
+            return a full page of results
+
+    Returns:
+        List of SQL statements (empty in auto mode)
+    """
+    config = config or get_vector_index_config()
+    mode = config.get("search_mode", "auto")
+
+    if mode == "exact":
+        return ["SET LOCAL enable_indexscan = off"]
+    if mode != "ann":
+        return []
+
+    if config.get("index_type", "hnsw") == "ivfflat":
+        probes = int(probes or config.get("ivfflat_probes", 10))
+        return [f"SET LOCAL ivfflat.probes = {max(1, probes)}"]
+
+    ef = int(ef_search or config.get("ef_search", 40))
+    if limit:
+        ef = max(ef, int(limit))
+    statements = [f"SET LOCAL hnsw.ef_search = {max(1, min(ef, 1000))}"]
+    iterative_scan = config.get("iterative_scan")
+    if iterative_scan in ITERATIVE_SCAN_MODES:
+        # pgvector >= 0.8: keep scanning when filters (story/branch) discard candidates
+        statements.append(f"SET LOCAL hnsw.iterative_scan = {iterative_scan}")
+    return statements
+
+
+def apply_vector_search_settings(
+    session,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> None:
+    """Apply search_settings_sql() to the current transaction of a session."""
+    from sqlalchemy import text
+
+    try:
+        for statement in search_settings_sql(ef_search=ef_search, probes=probes, limit=limit):
+            session.execute(text(statement))
+    except Exception as e:
+        # Never fail a search because of tuning settings; fall back to planner defaults
+        logger.warning(f"[VECTOR INDEX] Failed to apply search settings: {e}")
+        session.rollback()
+
+
+def rebuild_vector_indexes(conn, tables: Optional[List[str]] = None, config: Optional[dict] = None, force: bool = False) -> List[str]:
+    """
+    Make the vector indexes match the configured index type.
+
+    Indexes of the other type are dropped; the configured one is created if
+    missing. With force=True an existing index of the configured type is
+    rebuilt too, to pick up changed m / ef_construction / lists.
+
+    Args:
+        conn: SQLAlchemy connection (caller commits)
+        tables: Tables to process (default VECTOR_TABLES)
+        config: Vector index config (defaults to config.yaml)
+        force: Rebuild indexes that already exist
+
+    Returns:
+        Names of the indexes now in place
+    """
+    from sqlalchemy import text
+
+    config = config or get_vector_index_config()
+    index_type = config.get("index_type", "hnsw")
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unsupported vector index type: {index_type}")
+
+    built = []
+    for table_name in tables or VECTOR_TABLES:
+        for other_type in INDEX_TYPES:
+            if other_type != index_type or force:
+                conn.execute(text(f"DROP INDEX IF EXISTS {index_name(table_name, other_type)}"))
+        conn.execute(text(create_index_sql(table_name, config)))
+        built.append(index_name(table_name, index_type))
+        logger.info(f"[VECTOR INDEX] {table_name}: {index_type} index in place")
+    return built
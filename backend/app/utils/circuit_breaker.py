@@ -8,13 +8,22 @@ Circuit States:
 - CLOSED: Normal operation, requests pass through
 - OPEN: Service is failing, requests fail immediately
 - HALF_OPEN: Testing if service has recovered
+
+Also provides the LLM request scheduler: a per-endpoint (api_base, model)
+adaptive concurrency limit (AIMD) with priority lanes, backed by a circuit
+breaker per endpoint.
 """
 
+import heapq
+import itertools
 import logging
+import threading
 import time
 import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
 from enum import Enum
-from typing import Callable, Any, Optional
+from typing import AsyncIterator, Callable, Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -124,6 +133,32 @@ class CircuitBreaker:
             self.last_state_change = datetime.utcnow()
             logger.info(f"[CIRCUIT-BREAKER] {self.name}: Circuit HALF_OPEN - testing recovery")
     
+    def record_failure(self, error: Exception):
+        """Count a failure seen outside call() (e.g. a health probe); the circuit opens at failure_threshold"""
+        self._record_failure(error)
+
+    def allow_recovery(self):
+        """Let traffic probe an OPEN circuit now instead of after recovery_timeout (HALF_OPEN)"""
+        if self.state == CircuitState.OPEN:
+            self._half_open_circuit()
+
+    def check_available(self):
+        """
+        Fail fast if the circuit is open; move to HALF_OPEN once the recovery timeout has passed.
+        
+        Raises:
+            CircuitBreakerOpenError: If circuit is open
+        """
+        if self.state == CircuitState.OPEN:
+            if self._should_attempt_reset():
+                self._half_open_circuit()
+            else:
+                time_remaining = self.recovery_timeout - (datetime.utcnow() - self.last_failure_time).total_seconds()
+                raise CircuitBreakerOpenError(
+                    f"Circuit breaker '{self.name}' is OPEN. "
+                    f"Service unavailable. Retry in {time_remaining:.0f}s"
+                )
+    
     async def call(self, func: Callable, *args, **kwargs) -> Any:
         """
         Execute a function through the circuit breaker.
@@ -140,16 +175,7 @@ class CircuitBreaker:
             TimeoutError: If call exceeds timeout
             Exception: Original exception from the function
         """
-        # Check if we should attempt recovery
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self._half_open_circuit()
-            else:
-                time_remaining = self.recovery_timeout - (datetime.utcnow() - self.last_failure_time).total_seconds()
-                raise CircuitBreakerOpenError(
-                    f"Circuit breaker '{self.name}' is OPEN. "
-                    f"Service unavailable. Retry in {time_remaining:.0f}s"
-                )
+        self.check_available()
         
         # Execute the call with timeout
         try:
@@ -225,3 +251,451 @@ def get_circuit_breaker(
 def get_all_circuit_breakers() -> dict[str, dict]:
     """Get state of all circuit breakers for monitoring"""
     return {name: cb.get_state() for name, cb in _circuit_breakers.items()}
+
+
+# ---------------------------------------------------------------------------
+# LLM request scheduler
+# ---------------------------------------------------------------------------
+
+# Priority lanes - lower value is served first when an endpoint is saturated
+LANE_INTERACTIVE = 0   # Streaming user-facing generation
+LANE_GENERATION = 1    # Non-streaming generation (summaries, choices, ...)
+LANE_BACKGROUND = 2    # Extraction and other background work
+
+LANE_NAMES = {
+    LANE_INTERACTIVE: "interactive",
+    LANE_GENERATION: "generation",
+    LANE_BACKGROUND: "background",
+}
+
+# Latency samples fed to a limiter; baselines are kept per lane and metric
+METRIC_FIRST_TOKEN = "first_token"  # Time to first streamed token
+METRIC_PER_TOKEN = "per_token"      # Request time / completion tokens
+METRIC_TOTAL = "total"              # Request time, no usage reported
+
+# Exception class names (litellm / httpx / asyncio) that mean the endpoint is overloaded or down
+_OVERLOAD_ERROR_NAMES = {
+    "Timeout", "TimeoutError", "TimeoutException", "ReadTimeout", "ConnectTimeout",
+    "APIConnectionError", "ConnectError", "RemoteProtocolError",
+    "RateLimitError", "ServiceUnavailableError", "InternalServerError",
+}
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """True for errors that indicate endpoint overload (timeouts, connection errors, 429, 5xx)."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int) and (status == 429 or status >= 500):
+        return True
+    return any(cls.__name__ in _OVERLOAD_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def normalize_api_base(api_base: Optional[str]) -> str:
+    """Endpoint key for an API base URL - "http://host:5001" and "http://host:5001/v1/" are the same server."""
+    base = (api_base or "").rstrip("/")
+    if base.endswith("/v1"):
+        base = base[:-3]
+    return base
+
+
+class _Waiter:
+    __slots__ = ("lane", "seq", "loop", "future", "granted", "cancelled", "queued_at")
+
+    def __init__(self, lane: int, seq: int, loop: asyncio.AbstractEventLoop, future: asyncio.Future):
+        self.lane = lane
+        self.seq = seq
+        self.loop = loop
+        self.future = future
+        self.granted = False
+        self.cancelled = False
+        self.queued_at = time.monotonic()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.lane, self.seq) < (other.lane, other.seq)
+
+
+def _resolve_waiter(waiter: _Waiter):
+    if not waiter.future.done():
+        waiter.future.set_result(None)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for one LLM endpoint.
+    
+    The limit grows by 1/limit for every request that finishes within
+    latency_tolerance x the baseline latency of its lane and metric while the
+    endpoint was saturated, and is multiplied by decrease_factor on a slow response or an
+    overload error (timeout, connection error, 429, 5xx). Requests beyond the
+    limit wait in priority order (lane, then arrival). Repeated overload errors
+    open the endpoint's circuit breaker so callers fail fast.
+    
+    Thread-safe: waiters may come from different event loops.
+    
+    Args:
+        name: Endpoint label used in logs and metrics
+        initial_limit: Concurrency limit before any feedback
+        min_limit: Lower bound of the limit
+        max_limit: Upper bound of the limit
+        latency_tolerance: Latency over baseline (ratio) that counts as congestion
+        decrease_factor: Multiplier applied to the limit on congestion
+        breaker: Circuit breaker consulted before a request and fed overload errors
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_tolerance: float = 2.0,
+        decrease_factor: float = 0.7,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.breaker = breaker
+        
+        self._lock = threading.Lock()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._last_decrease = 0.0
+        self.in_flight = 0
+        self.baseline: Dict[Tuple[int, str], float] = {}
+        self.requests = 0
+        self.overload_errors = 0
+        self.slow_responses = 0
+        self.decreases = 0
+        self.max_queue_depth = 0
+        self._wait_seconds: Dict[int, float] = {}
+        self._wait_count: Dict[int, int] = {}
+    
+    def _queue_depth(self) -> Dict[str, int]:
+        depth = {name: 0 for name in LANE_NAMES.values()}
+        for waiter in self._waiters:
+            if not waiter.cancelled:
+                lane = LANE_NAMES.get(waiter.lane, str(waiter.lane))
+                depth[lane] = depth.get(lane, 0) + 1
+        return depth
+    
+    def _grant_waiters(self) -> List[_Waiter]:
+        """Pop waiters that fit under the current limit. Caller holds the lock."""
+        granted = []
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = heapq.heappop(self._waiters)
+            if waiter.cancelled:
+                continue
+            waiter.granted = True
+            self.in_flight += 1
+            granted.append(waiter)
+        return granted
+    
+    def _wake(self, granted: List[_Waiter]):
+        for waiter in granted:
+            waiter.loop.call_soon_threadsafe(_resolve_waiter, waiter)
+    
+    async def acquire(self, lane: int = LANE_GENERATION) -> float:
+        """
+        Wait for a slot on this endpoint.
+        
+        Returns:
+            Monotonic time the slot was granted (pass to release())
+            
+        Raises:
+            CircuitBreakerOpenError: If the endpoint's circuit is open
+        """
+        if self.breaker is not None:
+            self.breaker.check_available()
+        
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(lane, next(self._seq), loop, loop.create_future())
+        with self._lock:
+            heapq.heappush(self._waiters, waiter)
+            granted = self._grant_waiters()
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        self._wake([other for other in granted if other is not waiter])
+        if waiter.granted:
+            with self._lock:
+                self._record_wait(lane, 0.0)
+            return time.monotonic()
+        
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self.in_flight -= 1
+                    granted = self._grant_waiters()
+                else:
+                    waiter.cancelled = True
+                    granted = []
+            self._wake(granted)
+            raise
+        
+        granted_at = time.monotonic()
+        with self._lock:
+            self._record_wait(lane, granted_at - waiter.queued_at)
+        return granted_at
+    
+    def _record_wait(self, lane: int, seconds: float):
+        self._wait_seconds[lane] = self._wait_seconds.get(lane, 0.0) + seconds
+        self._wait_count[lane] = self._wait_count.get(lane, 0) + 1
+    
+    def release(
+        self,
+        started_at: float,
+        lane: int = LANE_GENERATION,
+        error: Optional[BaseException] = None,
+        record: bool = True,
+        latency: Optional[float] = None,
+        metric: str = METRIC_TOTAL
+    ):
+        """
+        Return a slot and feed the outcome into the limit.
+        
+        Args:
+            started_at: Value returned by acquire()
+            lane: Lane the request ran in
+            error: Exception the request failed with, if any
+            record: False for abandoned requests (cancelled, stream closed early)
+            latency: Latency sample to use instead of the time since started_at
+            metric: What the sample measures (METRIC_*); baselines are tracked
+                per lane and metric, so samples are only compared like for like
+        """
+        if latency is None:
+            latency = time.monotonic() - started_at
+        key = (lane, metric)
+        overload = record and error is not None and is_overload_error(error)
+        
+        with self._lock:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            self.requests += 1
+            
+            if overload:
+                self.overload_errors += 1
+                self._decrease(started_at, "overload error")
+            elif record and error is None:
+                baseline = self.baseline.get(key)
+                if baseline is None:
+                    self.baseline[key] = latency
+                elif latency > baseline * self.latency_tolerance:
+                    self.slow_responses += 1
+                    # Drift slowly so a model that is simply slower doesn't pin the limit at min
+                    self.baseline[key] = baseline * 0.99 + latency * 0.01
+                    self._decrease(started_at, f"{metric} {latency:.3f}s > {self.latency_tolerance}x baseline {baseline:.3f}s")
+                else:
+                    self.baseline[key] = baseline * 0.9 + latency * 0.1
+                    if saturated and self.limit < self.max_limit:
+                        self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            
+            granted = self._grant_waiters()
+        
+        self._wake(granted)
+        
+        if self.breaker is not None and record:
+            if overload:
+                self.breaker._record_failure(error)
+            elif error is None:
+                self.breaker._record_success()
+    
+    def _decrease(self, started_at: float, reason: str):
+        """Multiplicative decrease, at most once per wave of requests. Caller holds the lock."""
+        # Requests already in flight when the limit was last cut report the same congestion
+        if started_at < self._last_decrease:
+            return
+        old = self.limit
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        self._last_decrease = time.monotonic()
+        self.decreases += 1
+        logger.info(f"[LLM SCHEDULER] {self.name}: limit {old:.1f} -> {self.limit:.1f} ({reason})")
+    
+    def get_stats(self) -> dict:
+        """Get limiter state for monitoring"""
+        with self._lock:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queue_depth": self._queue_depth(),
+                "max_queue_depth": self.max_queue_depth,
+                "requests": self.requests,
+                "overload_errors": self.overload_errors,
+                "slow_responses": self.slow_responses,
+                "decreases": self.decreases,
+                "baseline_seconds": {
+                    f"{LANE_NAMES.get(lane, str(lane))}/{metric}": round(value, 4)
+                    for (lane, metric), value in self.baseline.items()
+                },
+                "avg_wait_seconds": {
+                    LANE_NAMES.get(lane, str(lane)): round(self._wait_seconds[lane] / count, 3)
+                    for lane, count in self._wait_count.items() if count
+                },
+                "circuit": self.breaker.state.value if self.breaker else None,
+            }
+
+
+class LLMSlot:
+    """
+    A granted scheduler slot. release() is idempotent, so a streaming caller can
+    release with the outcome once the stream ends and again unconditionally in
+    a finally block.
+    
+    The limit reacts to a latency sample that doesn't depend on how much the
+    model wrote: streaming callers call mark_first_token() on the first chunk
+    (time to first token), non-streaming callers pass the response to
+    record_usage() (seconds per completion token). Without either the total
+    request time is used.
+    """
+    
+    def __init__(self, limiter: Optional[AdaptiveConcurrencyLimiter], started_at: float, lane: int):
+        self.limiter = limiter
+        self.started_at = started_at
+        self.lane = lane
+        self.first_token_at: Optional[float] = None
+        self.completion_tokens: Optional[int] = None
+        self.released = False
+    
+    def mark_first_token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+    
+    def record_usage(self, response: Any):
+        """Take the completion token count from a (non-streaming) LiteLLM response."""
+        usage = getattr(response, "usage", None)
+        tokens = getattr(usage, "completion_tokens", None) if usage is not None else None
+        if isinstance(tokens, int) and tokens > 0:
+            self.completion_tokens = tokens
+    
+    def release(self, error: Optional[BaseException] = None, record: bool = True):
+        if self.released:
+            return
+        self.released = True
+        if self.limiter is not None:
+            if self.first_token_at is not None:
+                latency, metric = self.first_token_at - self.started_at, METRIC_FIRST_TOKEN
+            elif self.completion_tokens:
+                latency, metric = (time.monotonic() - self.started_at) / self.completion_tokens, METRIC_PER_TOKEN
+            else:
+                latency, metric = None, METRIC_TOTAL
+            self.limiter.release(self.started_at, self.lane, error=error, record=record, latency=latency, metric=metric)
+
+
+# Lowest-priority lane allowed for LLM calls made from the current context
+_context_lane: ContextVar[int] = ContextVar("llm_context_lane", default=LANE_INTERACTIVE)
+
+
+def set_llm_lane(lane: int) -> Token:
+    """Demote LLM calls in the current context to at least this lane (returns a reset token)."""
+    return _context_lane.set(lane)
+
+
+def reset_llm_lane(token: Token):
+    _context_lane.reset(token)
+
+
+class LLMScheduler:
+    """
+    Shared scheduler for LLM calls, one AdaptiveConcurrencyLimiter per (api_base, model).
+    
+    Args:
+        enabled: When False, slot() is a no-op
+        limiter_kwargs: Passed to every AdaptiveConcurrencyLimiter
+        circuit_failure_threshold: Consecutive overload errors that open an endpoint's circuit
+        circuit_recovery_timeout: Seconds an open circuit fails fast before testing recovery
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = True,
+        limiter_kwargs: Optional[Dict[str, Any]] = None,
+        circuit_failure_threshold: int = 5,
+        circuit_recovery_timeout: int = 30
+    ):
+        self.enabled = enabled
+        self.limiter_kwargs = limiter_kwargs or {}
+        self.circuit_failure_threshold = circuit_failure_threshold
+        self.circuit_recovery_timeout = circuit_recovery_timeout
+        self._lock = threading.Lock()
+        self._limiters: Dict[Tuple[str, str], AdaptiveConcurrencyLimiter] = {}
+    
+    def get_limiter(self, api_base: Optional[str], model: str) -> AdaptiveConcurrencyLimiter:
+        key = (normalize_api_base(api_base), model)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                name = f"{model}@{key[0]}" if key[0] else model
+                breaker = get_circuit_breaker(
+                    f"llm-{name}",
+                    failure_threshold=self.circuit_failure_threshold,
+                    recovery_timeout=self.circuit_recovery_timeout,
+                )
+                limiter = AdaptiveConcurrencyLimiter(name, breaker=breaker, **self.limiter_kwargs)
+                self._limiters[key] = limiter
+            return limiter
+    
+    async def acquire(self, api_base: Optional[str], model: str, lane: int = LANE_GENERATION) -> "LLMSlot":
+        """
+        Wait for a concurrency slot on an endpoint.
+        
+        The lane is demoted to the one set by set_llm_lane() for the current
+        context (background jobs never jump ahead of user generation).
+        
+        Raises:
+            CircuitBreakerOpenError: If the endpoint's circuit is open
+        """
+        if not self.enabled:
+            return LLMSlot(None, 0.0, lane)
+        lane = max(lane, _context_lane.get())
+        limiter = self.get_limiter(api_base, model)
+        return LLMSlot(limiter, await limiter.acquire(lane), lane)
+    
+    @asynccontextmanager
+    async def slot(self, api_base: Optional[str], model: str, lane: int = LANE_GENERATION) -> AsyncIterator["LLMSlot"]:
+        """Hold a concurrency slot on an endpoint for the duration of the block."""
+        slot = await self.acquire(api_base, model, lane)
+        try:
+            yield slot
+        except Exception as e:
+            slot.release(error=e)
+            raise
+        except BaseException:
+            # Cancelled or stream closed by the consumer - says nothing about the endpoint
+            slot.release(record=False)
+            raise
+        slot.release()
+    
+    def get_stats(self) -> dict:
+        """Get per-endpoint scheduler state for monitoring"""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {
+            "enabled": self.enabled,
+            "endpoints": {limiter.name: limiter.get_stats() for limiter in limiters},
+        }
+
+
+# Global singleton
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        from ..config import settings
+        config = settings.llm_scheduler
+        _llm_scheduler = LLMScheduler(
+            enabled=bool(config.get('enabled', True)),
+            limiter_kwargs={
+                'initial_limit': int(config.get('initial_limit', 4)),
+                'min_limit': int(config.get('min_limit', 1)),
+                'max_limit': int(config.get('max_limit', 32)),
+                'latency_tolerance': float(config.get('latency_tolerance', 2.0)),
+                'decrease_factor': float(config.get('decrease_factor', 0.7)),
+            },
+            circuit_failure_threshold=int(config.get('circuit_failure_threshold', 5)),
+            circuit_recovery_timeout=int(config.get('circuit_recovery_timeout', 30)),
+        )
+    return _llm_scheduler
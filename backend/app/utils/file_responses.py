@@ -0,0 +1,127 @@
+"""
+Cacheable file responses
+
+FileResponse plus what browsers and proxies need to cache and resume file
+downloads:
+
+- ETag / Last-Modified, and 304 Not Modified for a matching If-None-Match
+- Accept-Ranges and single byte ranges (206 Partial Content, 416 when the
+  range lies outside the file), honouring If-Range
+- a caller-supplied Cache-Control
+
+Multi-range requests are answered with the full file, which RFC 9110 allows.
+"""
+
+import os
+from email.utils import formatdate
+from typing import Iterator, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into inclusive (start, end).
+
+    Returns None when the header should be ignored (other units, several
+    ranges, bad syntax). Raises ValueError when the range can't be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep or not (first or last) or not (first or "0").isdigit() or not (last or "0").isdigit():
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise ValueError("range starts beyond end of file")
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison, as required for If-None-Match."""
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+def _read_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    etag: Optional[str] = None,
+    cache_control: str = "private, no-cache",
+) -> Response:
+    """
+    Serve a file with validators, conditional requests and byte ranges.
+
+    Args:
+        request: The incoming request (conditional and Range headers)
+        path: File on disk
+        media_type: Content-Type of the file
+        etag: Opaque tag of the content (e.g. a content hash); derived from
+            size and mtime when omitted
+        cache_control: Cache-Control header value
+    """
+    stat = os.stat(path)
+    etag = f'"{etag}"' if etag else f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat.st_mtime, usegmt=True),
+        "cache-control": cache_control,
+        "accept-ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "content-range": f"bytes */{stat.st_size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            return StreamingResponse(
+                _read_range(path, start, end),
+                status_code=206,
+                media_type=media_type,
+                headers={
+                    **headers,
+                    "content-range": f"bytes {start}-{end}/{stat.st_size}",
+                    "content-length": str(end - start + 1),
+                },
+            )
+
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat)
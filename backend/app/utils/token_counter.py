@@ -0,0 +1,57 @@
+"""
+Shared token counting.
+
+Single tiktoken encoder used wherever token counts are persisted (e.g.
+SceneVariant.token_counts). Counts are keyed by TOKENIZER_NAME so a change of
+tokenizer (or a deployment without tiktoken) never reuses incompatible counts.
+"""
+
+import logging
+from typing import Optional
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Encoding used by ContextManager for budget calculations
+TIKTOKEN_ENCODING = "cl100k_base"
+# Key used when tiktoken is unavailable (chars / 3.5 estimation)
+ESTIMATE_TOKENIZER = "estimate"
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    """Lazily load the shared tiktoken encoding (None if unavailable)."""
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed and TIKTOKEN_AVAILABLE:
+        try:
+            _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+        except Exception as e:
+            logger.warning(f"Failed to initialize tiktoken for token counting: {e}, using estimation")
+            _encoding_failed = True
+    return _encoding
+
+
+def get_tokenizer_name() -> str:
+    """Name under which counts produced by count_tokens() are stored."""
+    return TIKTOKEN_ENCODING if _get_encoding() is not None else ESTIMATE_TOKENIZER
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Count tokens with tiktoken, falling back to the 3.5 chars/token estimate."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        try:
+            return len(encoding.encode(text))
+        except Exception as e:
+            logger.warning(f"Tiktoken encoding failed: {e}, falling back to estimation")
+    return int(len(text) / 3.5)
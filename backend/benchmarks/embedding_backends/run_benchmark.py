@@ -0,0 +1,151 @@
+"""Throughput benchmark for the local embedding / reranker inference backends.
+
+Loads the bi-encoder and cross-encoder with each backend from
+app/services/inference_backends.py (torch fp32, int8, onnx) and reports:
+
+  - load time (includes the one-time ONNX export on first run)
+  - texts/sec (bi-encoder) and pairs/sec (cross-encoder) per batch size
+  - parity against fp32: min / mean cosine for embeddings, max abs score
+    difference and top-5 agreement for the reranker
+
+Usage:
+    cd backend/benchmarks/embedding_backends
+    python run_benchmark.py                              # production models
+    python run_benchmark.py --backends torch,int8 --texts 512
+    python run_benchmark.py --skip-reranker --batch-sizes 1,8,32
+
+Results are printed and written to reports/ as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+BACKEND_ROOT = HERE.parent.parent
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services.inference_backends import load_embedding_model, load_reranker_model  # noqa: E402
+
+WORDS = (
+    "the captain drew her sword as the storm broke over the harbour while "
+    "old Marcus whispered about the missing map and the lantern flickered in "
+    "the tavern where strangers traded rumours of dragons smugglers and a "
+    "betrayal that nobody in the village would ever forget"
+).split()
+
+
+def synthetic_texts(n: int, min_words: int, max_words: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(min_words, max_words))) for _ in range(n)]
+
+
+def _throughput(fn, items, batch_size: int, repeats: int) -> float:
+    fn(items[:batch_size])  # warm-up
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for i in range(0, len(items), batch_size):
+            fn(items[i:i + batch_size])
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def bench_embeddings(args, texts, cache_dir) -> list[dict]:
+    results, reference = [], None
+    for backend in args.backends:
+        start = time.perf_counter()
+        model = load_embedding_model(args.embedding_model, backend, onnx_cache_dir=cache_dir)
+        load_s = time.perf_counter() - start
+
+        row = {"model": "embedding", "backend": backend, "actual": type(model).__name__, "load_s": round(load_s, 2)}
+        for bs in args.batch_sizes:
+            row[f"per_sec_bs{bs}"] = round(_throughput(
+                lambda batch: model.encode(batch, batch_size=bs, convert_to_numpy=True, show_progress_bar=False),
+                texts, bs, args.repeats), 1)
+
+        embeddings = np.asarray(model.encode(texts, convert_to_numpy=True, show_progress_bar=False))
+        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        if reference is None:
+            reference = embeddings
+        cos = (reference * embeddings).sum(axis=1)
+        row["cos_min"], row["cos_mean"] = round(float(cos.min()), 5), round(float(cos.mean()), 5)
+        results.append(row)
+        del model
+    return results
+
+
+def bench_reranker(args, texts, cache_dir) -> list[dict]:
+    queries = synthetic_texts(max(1, len(texts) // 30), 4, 10, args.seed + 1)
+    pairs = [[queries[i % len(queries)], t] for i, t in enumerate(texts)]
+    results, reference = [], None
+    for backend in args.backends:
+        start = time.perf_counter()
+        model = load_reranker_model(args.reranker_model, backend, onnx_cache_dir=cache_dir)
+        load_s = time.perf_counter() - start
+
+        row = {"model": "reranker", "backend": backend, "actual": type(model).__name__, "load_s": round(load_s, 2)}
+        for bs in args.batch_sizes:
+            row[f"per_sec_bs{bs}"] = round(_throughput(
+                lambda batch: model.predict(batch, batch_size=bs), pairs, bs, args.repeats), 1)
+
+        scores = np.asarray(model.predict(pairs), dtype=np.float32)
+        if reference is None:
+            reference = scores
+        row["max_abs_diff"] = round(float(np.abs(reference - scores).max()), 5)
+        # Top-5 agreement per block of 30 candidates (top_k=5 * 3 * 2 in searches)
+        agree = []
+        for i in range(0, len(scores) - 29, 30):
+            ref_top = set(np.argsort(reference[i:i + 30])[-5:])
+            got_top = set(np.argsort(scores[i:i + 30])[-5:])
+            agree.append(len(ref_top & got_top) / 5)
+        row["top5_agreement"] = round(float(np.mean(agree)), 4) if agree else None
+        results.append(row)
+        del model
+    return results
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--embedding-model", default="sentence-transformers/all-mpnet-base-v2")
+    p.add_argument("--reranker-model", default="BAAI/bge-reranker-v2-m3")
+    p.add_argument("--backends", default="torch,int8,onnx", help="First backend is the parity reference")
+    p.add_argument("--batch-sizes", default="1,8,32")
+    p.add_argument("--texts", type=int, default=256)
+    p.add_argument("--repeats", type=int, default=3)
+    p.add_argument("--onnx-cache-dir", default=None, help="Default: a temporary directory (export timed in load_s)")
+    p.add_argument("--skip-reranker", action="store_true")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args()
+    args.backends = [b for b in args.backends.split(",") if b]
+    args.batch_sizes = [int(b) for b in args.batch_sizes.split(",") if b]
+
+    texts = synthetic_texts(args.texts, 20, 120, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.onnx_cache_dir or tmp
+        results = bench_embeddings(args, texts, cache_dir)
+        if not args.skip_reranker:
+            results += bench_reranker(args, texts, cache_dir)
+
+    columns = list(dict.fromkeys(k for row in results for k in row))
+    print("\n" + "  ".join(f"{c:>14}" for c in columns))
+    for row in results:
+        print("  ".join(f"{str(row.get(c, '')):>14}" for c in columns))
+
+    reports = HERE / "reports"
+    reports.mkdir(exist_ok=True)
+    out = reports / f"embedding_backends_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.write_text(json.dumps({"args": vars(args), "results": results}, indent=2))
+    print(f"\nWrote {out}")
+
+
+if __name__ == "__main__":
+    main()
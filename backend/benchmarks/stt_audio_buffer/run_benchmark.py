@@ -0,0 +1,152 @@
+"""Per-frame cost of STT audio accumulation: np.concatenate vs AudioRingBuffer.
+
+Feeds one utterance as 20 ms int16 frames (the WebSocket packet size of the
+dictation client) the way STTStream.feed_audio_data does, and measures per
+frame:
+
+  concat  - the previous path: frombuffer + astype(float32) / 32768 and
+            np.concatenate onto the growing buffer
+  ring    - app.services.stt_audio_buffer.AudioRingBuffer.write (in-place
+            conversion into preallocated storage) plus the zero-copy view
+            of the pending audio
+
+Reported: CPU time per frame (mean / p99 / last frame, in microseconds),
+bytes allocated per frame (tracemalloc peak above the steady state) and the
+total bytes allocated over the utterance. The buffer is consumed once at the
+end, as when Whisper is called at a sentence boundary.
+
+Usage:
+    cd backend/benchmarks/stt_audio_buffer
+    python run_benchmark.py [--seconds 30] [--frame-ms 20] [--repeat 5]
+
+No models or services needed (the backend's .env / config.yaml must load, as
+for the other benchmarks). Results are printed and written to reports/ as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+BACKEND_ROOT = HERE.parent.parent
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services.stt_audio_buffer import AudioRingBuffer  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class RunResult:
+    method: str
+    frames: int
+    cpu_us_mean: float
+    cpu_us_p99: float
+    cpu_us_last: float
+    alloc_bytes_per_frame: float
+    alloc_bytes_total: int
+
+
+class ConcatBuffer:
+    """The previous accumulation path of feed_audio_data."""
+
+    def __init__(self, capacity: int):
+        self.audio_buffer = np.array([], dtype=np.float32)
+
+    def write(self, pcm: bytes) -> np.ndarray:
+        audio_array = np.frombuffer(pcm, dtype=np.int16)
+        audio_float = audio_array.astype(np.float32) / 32768.0
+        self.audio_buffer = np.concatenate([self.audio_buffer, audio_float])
+        return audio_float
+
+    def view(self) -> np.ndarray:
+        return self.audio_buffer
+
+    def consume(self) -> np.ndarray:
+        audio = self.audio_buffer.copy()
+        self.audio_buffer = np.array([], dtype=np.float32)
+        return audio
+
+
+def make_frames(seconds: float, frame_ms: int, seed: int) -> list[bytes]:
+    rng = np.random.default_rng(seed)
+    samples = int(seconds * SAMPLE_RATE)
+    audio = (rng.normal(scale=3000, size=samples)).clip(-32768, 32767).astype(np.int16)
+    step = SAMPLE_RATE * frame_ms // 1000
+    return [audio[i:i + step].tobytes() for i in range(0, samples, step)]
+
+
+def run(method: str, frames: list[bytes], capacity: int) -> RunResult:
+    buffer = AudioRingBuffer(capacity) if method == "ring" else ConcatBuffer(capacity)
+    cpu = []
+    allocated = []
+
+    tracemalloc.start()
+    try:
+        for frame in frames:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            started = time.process_time_ns()
+            new_samples = buffer.write(frame)
+            pending = buffer.view()
+            # What feed_audio_data reads per frame: the new samples for VAD, the length for triggers
+            _ = new_samples[:1], len(pending)
+            cpu.append((time.process_time_ns() - started) / 1000)
+            _, peak = tracemalloc.get_traced_memory()
+            allocated.append(max(0, peak - baseline))
+        buffer.consume()
+    finally:
+        tracemalloc.stop()
+
+    cpu_sorted = sorted(cpu)
+    return RunResult(
+        method=method,
+        frames=len(frames),
+        cpu_us_mean=round(statistics.fmean(cpu), 2),
+        cpu_us_p99=round(cpu_sorted[int(len(cpu_sorted) * 0.99) - 1], 2),
+        cpu_us_last=round(statistics.fmean(cpu[-10:]), 2),
+        alloc_bytes_per_frame=round(statistics.fmean(allocated), 1),
+        alloc_bytes_total=int(sum(allocated)),
+    )
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--seconds", type=float, default=30.0, help="Utterance length")
+    p.add_argument("--frame-ms", type=int, default=20, help="Frame size of one WebSocket packet")
+    p.add_argument("--repeat", type=int, default=5, help="Runs per method (best mean CPU is reported)")
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args()
+
+    frames = make_frames(args.seconds, args.frame_ms, args.seed)
+    capacity = int((args.seconds + 10) * SAMPLE_RATE)
+    print(f"{len(frames)} frames of {args.frame_ms} ms ({args.seconds:.0f} s utterance), {args.repeat} runs per method\n")
+
+    results = []
+    for method in ("concat", "ring"):
+        runs = [run(method, frames, capacity) for _ in range(args.repeat)]
+        results.append(min(runs, key=lambda r: r.cpu_us_mean))
+
+    print(f"{'method':<8} {'cpu us/frame':>13} {'p99 us':>9} {'last us':>9} {'alloc B/frame':>14} {'alloc total':>13}")
+    for r in results:
+        print(f"{r.method:<8} {r.cpu_us_mean:>13} {r.cpu_us_p99:>9} {r.cpu_us_last:>9} "
+              f"{r.alloc_bytes_per_frame:>14} {r.alloc_bytes_total:>13}")
+
+    reports = HERE / "reports"
+    reports.mkdir(exist_ok=True)
+    out = reports / f"stt_audio_buffer_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.write_text(json.dumps({"args": vars(args), "results": [asdict(r) for r in results]}, indent=2))
+    print(f"\nWrote {out}")
+
+
+if __name__ == "__main__":
+    main()
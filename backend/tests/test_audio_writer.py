@@ -0,0 +1,102 @@
+"""
+Tests for streaming WAV/PCM assembly.
+
+Tests:
+1. RIFF chunks are walked properly (a 'data' pattern in a LIST chunk is skipped)
+2. Chunks are joined into one file with patched header sizes
+3. Streamed WAV output uses unknown-length sizes and the same PCM
+4. Mismatched chunk formats are rejected; non-WAV first chunks fall back to raw bytes
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import io
+import struct
+import wave
+
+import pytest
+
+from app.services.tts.audio_writer import (
+    AudioFileWriter,
+    UNKNOWN_SIZE,
+    WavFormatError,
+    parse_wav,
+    stream_wav,
+)
+from app.services.tts.base import AudioFormat, TTSResponse
+
+
+def make_wav(pcm, sample_rate=24000, extra_chunk=b""):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    data = buffer.getvalue()
+    if extra_chunk:
+        # Insert a LIST chunk between fmt and data, as some servers do
+        data = data[:36] + b"LIST" + struct.pack("<I", len(extra_chunk)) + extra_chunk + data[36:]
+        data = data[:4] + struct.pack("<I", len(data) - 8) + data[8:]
+    return data
+
+
+class TestParse:
+    def test_skips_data_pattern_in_other_chunks(self):
+        wav = make_wav(b"\x01\x02" * 10, extra_chunk=b"INFOdata")
+        info = parse_wav(wav)
+        assert wav[info.data_offset:info.data_offset + info.data_length] == b"\x01\x02" * 10
+        assert info.sample_rate == 24000
+
+    def test_streaming_size_runs_to_end(self):
+        wav = bytearray(make_wav(b"\x05\x06" * 4))
+        struct.pack_into("<I", wav, 40, UNKNOWN_SIZE)
+        assert parse_wav(bytes(wav)).data_length == 8
+
+
+class TestFileWriter:
+    def test_joins_chunks_with_patched_sizes(self, tmp_path):
+        path = tmp_path / "scene.wav"
+        with AudioFileWriter(path, AudioFormat.WAV) as writer:
+            writer.write(make_wav(b"\x01\x00" * 100, extra_chunk=b"INFO"))
+            writer.write(make_wav(b"\x02\x00" * 50))
+
+        with wave.open(str(path), "rb") as wav:
+            assert wav.getnframes() == 150
+            assert wav.readframes(150) == b"\x01\x00" * 100 + b"\x02\x00" * 50
+        assert writer.file_size == path.stat().st_size
+        assert struct.unpack_from("<I", path.read_bytes(), 4)[0] == writer.file_size - 8
+        assert abs(writer.duration - 150 / 24000) < 1e-9
+
+    def test_format_mismatch_discards_partial_file(self, tmp_path):
+        path = tmp_path / "scene.wav"
+        with pytest.raises(WavFormatError):
+            with AudioFileWriter(path, AudioFormat.WAV) as writer:
+                writer.write(make_wav(b"\x01\x00" * 10))
+                writer.write(make_wav(b"\x01\x00" * 10, sample_rate=16000))
+        assert list(tmp_path.iterdir()) == []
+
+    def test_non_wav_falls_back_to_raw(self, tmp_path):
+        path = tmp_path / "scene.wav"
+        with AudioFileWriter(path, AudioFormat.WAV) as writer:
+            writer.write(b"ID3mp3")
+            writer.write(b"more")
+        assert path.read_bytes() == b"ID3mp3more"
+
+
+class TestStream:
+    def test_stream_uses_unknown_sizes(self):
+        async def responses():
+            for pcm in (b"\x01\x00" * 3, b"\x02\x00" * 2):
+                yield TTSResponse(audio_data=make_wav(pcm), format=AudioFormat.WAV, duration=0.0, sample_rate=24000, file_size=0)
+
+        async def run():
+            return b"".join([bytes(piece) async for piece in stream_wav(responses())])
+
+        output = asyncio.run(run())
+        assert struct.unpack_from("<I", output, 4)[0] == UNKNOWN_SIZE
+        info = parse_wav(output)
+        assert output[info.data_offset:] == b"\x01\x00" * 3 + b"\x02\x00" * 2
@@ -0,0 +1,122 @@
+"""
+Tests for event-driven ComfyUI job tracking.
+
+Tests:
+1. Progress events update the job table and reach the owner's subscribers only
+2. Completion downloads the image once and wakes wait_for_result without polling
+3. A job that finishes before /prompt returns is downloaded once it is tracked
+4. Execution errors fail the job; queue broadcasts without prompt_id are ignored
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+
+from app.services.image_generation import ComfyUIProvider, GenerationStatus
+from app.services.image_generation.comfyui_events import ComfyUIEventListener
+
+
+def event(kind, **data):
+    return {"type": kind, "data": data}
+
+
+def fake_downloads(listener):
+    downloads = []
+
+    async def fetch_image(image):
+        downloads.append(image["filename"])
+        return b"PNG:" + image["filename"].encode()
+
+    listener._fetch_image = fetch_image
+    return downloads
+
+
+class TestProgressEvents:
+    def test_progress_reaches_owner_subscribers(self):
+        async def run():
+            listener = ComfyUIEventListener("http://comfy:8188")
+            mine = listener.subscribe(owner_id=1)
+            theirs = listener.subscribe(owner_id=2)
+            listener.track("p1", owner_id=1)
+            listener.handle_message(event("execution_start", prompt_id="p1"))
+            listener.handle_message(event("progress", prompt_id="p1", value=2, max=8, node="3"))
+            return listener, [mine.get_nowait() for _ in range(mine.qsize())], theirs.qsize()
+
+        listener, snapshots, other = asyncio.run(run())
+        job = listener.jobs["p1"]
+        assert job.status == GenerationStatus.PROCESSING
+        assert (job.current_step, job.total_steps) == (2, 8)
+        assert snapshots[-1]["progress"] == 0.25
+        assert [s["status"] for s in snapshots] == ["queued", "processing", "processing"]
+        assert other == 0
+
+
+class TestCompletion:
+    def test_wait_for_result_returns_downloaded_image(self):
+        async def run():
+            provider = ComfyUIProvider("http://comfy-wait:8188", polling_interval=0.05, owner_id=1)
+            listener = provider.event_listener
+            downloads = fake_downloads(listener)
+            listener.track("p1", owner_id=1)
+
+            async def comfyui():
+                await asyncio.sleep(0.01)
+                listener.handle_message(event("executed", prompt_id="p1", node="9", output={
+                    "images": [{"filename": "kahani_0001.png", "subfolder": "", "type": "output"}],
+                }))
+                listener.handle_message(event("execution_success", prompt_id="p1"))
+                # Older servers also send the executing/None end marker
+                listener.handle_message(event("executing", prompt_id="p1", node=None))
+
+            asyncio.get_running_loop().create_task(comfyui())
+            result = await provider.wait_for_result("p1", max_wait=5)
+            return result, downloads, listener.jobs["p1"]
+
+        result, downloads, job = asyncio.run(run())
+        assert result.success and result.status == GenerationStatus.COMPLETED
+        assert result.image_data == b"PNG:kahani_0001.png"
+        assert downloads == ["kahani_0001.png"]
+        # Handed over, not kept in the job table
+        assert job.image_data is None
+
+    def test_completion_before_track_waits_for_registration(self):
+        async def run():
+            listener = ComfyUIEventListener("http://comfy:8188")
+            downloads = fake_downloads(listener)
+            listener.handle_message(event("executed", prompt_id="p1", node="9", output={
+                "images": [{"filename": "a.png", "type": "temp"}, {"filename": "b.png", "type": "output"}],
+            }))
+            listener.handle_message(event("execution_success", prompt_id="p1"))
+            await asyncio.sleep(0)
+            before = list(downloads)
+            job = listener.track("p1", owner_id=1)
+            await asyncio.wait_for(job.done.wait(), 1)
+            return before, downloads, job
+
+        before, downloads, job = asyncio.run(run())
+        assert before == []
+        assert downloads == ["b.png"]
+        assert job.status == GenerationStatus.COMPLETED
+        assert job.filename == "b.png"
+
+
+class TestFailures:
+    def test_execution_error_fails_job(self):
+        async def run():
+            listener = ComfyUIEventListener("http://comfy:8188")
+            listener.handle_message(event("status", status={"exec_info": {"queue_remaining": 1}}))
+            job = listener.track("p1", owner_id=1)
+            listener.handle_message(event(
+                "execution_error", prompt_id="p1", node_type="KSampler", exception_message="CUDA out of memory",
+            ))
+            return listener, job
+
+        listener, job = asyncio.run(run())
+        assert listener.events == 1
+        assert job.done.is_set()
+        result = job.to_result()
+        assert not result.success
+        assert result.status == GenerationStatus.FAILED
+        assert result.error_message == "CUDA out of memory"
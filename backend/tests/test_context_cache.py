@@ -0,0 +1,141 @@
+"""
+Tests for the story context cache used by ContextManager.
+
+Tests:
+1. Entries are reused only while the active variant state is unchanged
+2. Explicit invalidation hooks (scene / story / branch)
+3. LRU eviction across stories
+4. Persisted SceneVariant token counts
+"""
+
+from datetime import datetime, timezone
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.context_cache import StoryContextCache, CachedSceneContent
+
+
+def _entry(variant_id=10, updated_at=None, seq=1, tokenizer="cl100k_base"):
+    return CachedSceneContent(
+        variant_id=variant_id,
+        variant_updated_at=updated_at,
+        sequence_number=seq,
+        content=f"Scene {seq}: text",
+        tokens=5,
+        tokenizer=tokenizer,
+    )
+
+
+class TestStoryContextCacheValidation:
+    """Cached content must match the variant it was built from."""
+
+    def test_hit_when_variant_unchanged(self):
+        cache = StoryContextCache()
+        cache.put(1, 1, 100, _entry())
+
+        entry = cache.get(1, 1, 100, 10, None, 1, "cl100k_base")
+
+        assert entry is not None
+        assert entry.tokens == 5
+        assert cache.hits == 1
+
+    def test_miss_when_variant_switched(self):
+        cache = StoryContextCache()
+        cache.put(1, 1, 100, _entry(variant_id=10))
+
+        assert cache.get(1, 1, 100, 11, None, 1, "cl100k_base") is None
+        assert cache.misses == 1
+
+    def test_miss_when_variant_edited(self):
+        cache = StoryContextCache()
+        cache.put(1, 1, 100, _entry(updated_at=None))
+
+        edited_at = datetime.now(timezone.utc)
+        assert cache.get(1, 1, 100, 10, edited_at, 1, "cl100k_base") is None
+
+    def test_miss_when_tokenizer_differs(self):
+        cache = StoryContextCache()
+        cache.put(1, 1, 100, _entry(tokenizer="cl100k_base"))
+
+        assert cache.get(1, 1, 100, 10, None, 1, "estimate") is None
+
+    def test_branches_are_separate(self):
+        cache = StoryContextCache()
+        cache.put(1, 1, 100, _entry())
+
+        assert cache.get(1, 2, 100, 10, None, 1, "cl100k_base") is None
+
+
+class TestStoryContextCacheInvalidation:
+    """Invalidation hooks used by edit/delete/variant-switch paths."""
+
+    def test_invalidate_scene_drops_only_that_scene(self):
+        cache = StoryContextCache()
+        cache.put(1, 1, 100, _entry(seq=1))
+        cache.put(1, 1, 101, _entry(seq=2))
+
+        cache.invalidate_scene(1, 100)
+
+        assert cache.get(1, 1, 100, 10, None, 1, "cl100k_base") is None
+        assert cache.get(1, 1, 101, 10, None, 2, "cl100k_base") is not None
+
+    def test_invalidate_story_branch(self):
+        cache = StoryContextCache()
+        cache.put(1, 1, 100, _entry())
+        cache.put(1, 2, 200, _entry())
+
+        cache.invalidate_story(1, branch_id=2)
+
+        assert cache.get(1, 1, 100, 10, None, 1, "cl100k_base") is not None
+        assert cache.get(1, 2, 200, 10, None, 1, "cl100k_base") is None
+
+    def test_invalidate_whole_story(self):
+        cache = StoryContextCache()
+        cache.put(1, 1, 100, _entry())
+        cache.put(1, 2, 200, _entry())
+        cache.put(2, 3, 300, _entry())
+
+        cache.invalidate_story(1)
+
+        assert cache.get_stats()["stories"] == 1
+
+
+class TestStoryContextCacheEviction:
+    """Least recently used stories are evicted first."""
+
+    def test_lru_eviction(self):
+        cache = StoryContextCache(max_stories=2)
+        cache.put(1, 1, 100, _entry())
+        cache.put(2, 1, 200, _entry())
+        # Touch story 1 so story 2 becomes least recently used
+        cache.get(1, 1, 100, 10, None, 1, "cl100k_base")
+        cache.put(3, 1, 300, _entry())
+
+        assert cache.get(1, 1, 100, 10, None, 1, "cl100k_base") is not None
+        assert cache.get(2, 1, 200, 10, None, 1, "cl100k_base") is None
+
+
+class TestSceneVariantTokenCounts:
+    """SceneVariant persists token counts whenever its content is assigned."""
+
+    def test_counts_set_on_construction(self):
+        from app.models import SceneVariant
+        from app.utils.token_counter import count_tokens, get_tokenizer_name
+
+        variant = SceneVariant(scene_id=1, content="The door creaked open.")
+
+        assert variant.token_counts == {get_tokenizer_name(): count_tokens("The door creaked open.")}
+
+    def test_counts_replaced_on_edit(self):
+        from app.models import SceneVariant
+        from app.utils.token_counter import count_tokens, get_tokenizer_name
+
+        variant = SceneVariant(scene_id=1, content="Short.")
+        variant.token_counts = {"other_tokenizer": 99, get_tokenizer_name(): 1}
+        variant.content = "A much longer replacement sentence for the scene."
+
+        assert variant.token_counts == {
+            get_tokenizer_name(): count_tokens("A much longer replacement sentence for the scene.")
+        }
@@ -0,0 +1,80 @@
+"""
+Tests for the embedding micro-batching dispatcher.
+
+Tests:
+1. Concurrent requests are coalesced into one encoder call
+2. Each caller receives only its own rows
+3. max_batch_size splits large queues; encoder errors reach every caller
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+class _FakeEncoder:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return np.array([[float(len(t)), 0.0] for t in texts])
+
+
+class TestEmbeddingBatcher:
+    """Coalescing behaviour of EmbeddingBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_call(self):
+        encoder = _FakeEncoder()
+        batcher = EmbeddingBatcher(encoder, max_batch_size=32, max_wait_ms=20)
+
+        results = await asyncio.gather(
+            batcher.submit(["a"]),
+            batcher.submit(["bb", "ccc"]),
+            batcher.submit(["dddd"]),
+        )
+
+        assert len(encoder.calls) == 1
+        assert [r[:, 0].tolist() for r in results] == [[1.0], [2.0, 3.0], [4.0]]
+        assert batcher.get_stats()["avg_batch_size"] == 4
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_splits(self):
+        encoder = _FakeEncoder()
+        batcher = EmbeddingBatcher(encoder, max_batch_size=2, max_wait_ms=20)
+
+        results = await asyncio.gather(*(batcher.submit([str(i)]) for i in range(5)))
+
+        assert [len(c) for c in encoder.calls] == [2, 2, 1]
+        assert all(r.shape == (1, 2) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_callers(self):
+        batcher = EmbeddingBatcher(_FakeEncoder(fail=True), max_wait_ms=5)
+
+        results = await asyncio.gather(
+            batcher.submit(["a"]), batcher.submit(["b"]), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_disabled_calls_encoder_directly(self):
+        encoder = _FakeEncoder()
+        batcher = EmbeddingBatcher(encoder, enabled=False)
+
+        await asyncio.gather(batcher.submit(["a"]), batcher.submit(["b"]))
+
+        assert encoder.calls == [["a"], ["b"]]
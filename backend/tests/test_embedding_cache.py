@@ -0,0 +1,95 @@
+"""
+Tests for the query embedding cache used by SemanticMemoryService.
+
+Tests:
+1. Keys separate providers / models, inference backends and API dimensions
+2. Size-aware LRU eviction and counters
+3. Round trip through on-disk persistence
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCache, make_key
+
+
+class TestEmbeddingCacheKeys:
+    """Vectors are only reused for the same provider, model and text."""
+
+    def test_same_text_same_key(self):
+        assert make_key("local", "mpnet", "the tavern") == make_key("local", "mpnet", "the tavern")
+
+    def test_model_and_provider_are_part_of_key(self):
+        cache = EmbeddingCache()
+        cache.put(make_key("local", "mpnet", "q"), np.ones(4))
+
+        assert cache.get(make_key("local", "other-model", "q")) is None
+        assert cache.get(make_key("openai", "mpnet", "q")) is None
+        assert cache.get(make_key("local", "mpnet", "q")) is not None
+
+    def test_backend_and_dimensions_in_model_key(self):
+        from types import SimpleNamespace
+        from app.services.semantic_memory import SemanticMemoryService
+
+        service = SemanticMemoryService(enable_reranking=False)
+        service.embedding_model = SimpleNamespace(inference_backend="int8")
+        int8_key = service.embedding_model_key()
+        service.embedding_model = SimpleNamespace(inference_backend="onnx")
+        assert service.embedding_model_key() != int8_key
+
+        service.configure_provider("openai", model_name="text-embedding-3-small", dimensions=512)
+        short_key = service.embedding_model_key()
+        service.configure_provider("openai", model_name="text-embedding-3-small", dimensions=1536)
+        assert service.embedding_model_key() != short_key
+
+
+class TestEmbeddingCacheEviction:
+    """Memory bound is enforced on vector bytes, oldest entries first."""
+
+    def test_evicts_least_recently_used(self):
+        # Room for two 4-d float32 vectors (16 bytes each)
+        cache = EmbeddingCache(max_bytes=32)
+        cache.put(("p", "m", "a"), np.ones(4))
+        cache.put(("p", "m", "b"), np.ones(4))
+        cache.get(("p", "m", "a"))
+        cache.put(("p", "m", "c"), np.ones(4))
+
+        assert cache.get(("p", "m", "a")) is not None
+        assert cache.get(("p", "m", "b")) is None
+        assert cache.evictions == 1
+        assert cache.get_stats()["bytes"] == 32
+
+    def test_hit_miss_counters(self):
+        cache = EmbeddingCache()
+        cache.put(("p", "m", "a"), np.ones(4))
+        cache.get(("p", "m", "a"))
+        cache.get(("p", "m", "missing"))
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+
+class TestEmbeddingCachePersistence:
+    """save()/load() restore vectors of mixed dimensions."""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "cache" / "query_embeddings.npz")
+        cache = EmbeddingCache(persist_path=path)
+        cache.put(make_key("local", "mpnet", "a"), np.arange(3, dtype=np.float32))
+        cache.put(make_key("openai", "small", "b"), np.arange(5, dtype=np.float32))
+
+        assert cache.save() == 2
+
+        restored = EmbeddingCache(persist_path=path)
+        assert restored.load() == 2
+        np.testing.assert_array_equal(restored.get(make_key("openai", "small", "b")), np.arange(5))
+        np.testing.assert_array_equal(restored.get(make_key("local", "mpnet", "a")), np.arange(3))
+
+    def test_missing_file_is_ignored(self, tmp_path):
+        cache = EmbeddingCache(persist_path=str(tmp_path / "nope.npz"))
+
+        assert cache.load() == 0
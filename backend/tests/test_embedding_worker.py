@@ -0,0 +1,110 @@
+"""
+Tests for the shared embedding / rerank worker.
+
+Tests:
+1. Vectors survive the base64 float32 wire format
+2. /embed and /rerank serve the worker's models
+3. The "worker" provider routes SemanticMemoryService encoding to the worker
+4. Switching to another provider stops routing through the worker
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import embedding_worker, inference_backends
+from app.services.embedding_worker import create_worker_app, decode_array, encode_array
+
+
+class _FakeEmbedder:
+    def encode(self, texts, **kwargs):
+        return np.array([[float(len(t)), 1.0, 0.5] for t in texts], dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+
+class _FakeReranker:
+    def predict(self, pairs, **kwargs):
+        return np.array([float(len(doc)) for _, doc in pairs])
+
+
+@pytest.fixture
+def worker_client(monkeypatch):
+    monkeypatch.setattr(inference_backends, "load_embedding_model", lambda *a, **k: _FakeEmbedder())
+    monkeypatch.setattr(inference_backends, "load_reranker_model", lambda *a, **k: _FakeReranker())
+    app = create_worker_app("fake-embedder", "fake-reranker", {})
+    with TestClient(app) as client:
+        yield client
+
+
+class TestWireFormat:
+    def test_round_trip(self):
+        array = np.random.rand(4, 7).astype(np.float32)
+        decoded = decode_array(encode_array(array))
+        assert decoded.shape == (4, 7)
+        assert np.array_equal(decoded, array)
+
+    def test_empty_batch(self):
+        decoded = decode_array(encode_array(np.zeros((0, 3), dtype=np.float32)))
+        assert decoded.shape == (0, 3)
+
+
+class TestWorkerApp:
+    def test_embed(self, worker_client):
+        response = worker_client.post("/embed", json={"texts": ["ab", "abcd"]})
+        assert response.status_code == 200
+        body = response.json()
+        embeddings = decode_array(body["embeddings"])
+        assert body["dimension"] == 3
+        assert embeddings[:, 0].tolist() == [2.0, 4.0]
+
+    def test_rerank(self, worker_client):
+        response = worker_client.post("/rerank", json={"pairs": [["q", "abc"], ["q", "a"]]})
+        assert response.status_code == 200
+        assert response.json()["scores"] == [3.0, 1.0]
+
+    def test_health_reports_dimension_after_load(self, worker_client):
+        assert worker_client.get("/health").json()["dimension"] is None
+        worker_client.post("/embed", json={"texts": ["x"]})
+        assert worker_client.get("/health").json()["dimension"] == 3
+
+
+class TestWorkerProvider:
+    @pytest.mark.asyncio
+    async def test_encode_texts_uses_worker(self, monkeypatch):
+        from app.services.semantic_memory import SemanticMemoryService
+
+        calls = []
+
+        async def fake_embed(self, texts):
+            calls.append((self.url, list(texts)))
+            return np.ones((len(texts), 5), dtype=np.float32)
+
+        monkeypatch.setattr(embedding_worker.EmbeddingWorkerClient, "embed", fake_embed)
+        service = SemanticMemoryService(enable_reranking=False)
+        service.configure_provider("worker", api_url="http://127.0.0.1:9999/")
+
+        embeddings = await service.encode_texts(["a", "b"])
+        assert embeddings.shape == (2, 5)
+        assert calls == [("http://127.0.0.1:9999", ["a", "b"])]
+        assert service._embedding_dimension == 5
+        assert service.embedding_model is None
+        assert service.embedding_model_key().startswith("worker:")
+
+    def test_switching_away_from_worker_drops_it(self):
+        from app.services.semantic_memory import SemanticMemoryService
+
+        service = SemanticMemoryService(enable_reranking=False)
+        service.configure_provider("worker", api_url="http://127.0.0.1:9999/")
+        service.reranker = embedding_worker.WorkerReranker("http://127.0.0.1:9999/")
+        # Startup order: worker from config first, then the provider stored in the DB
+        service.configure_provider("openai", model_name="text-embedding-3-small", api_key="k")
+
+        assert service._worker_client is None
+        assert service.reranker is None  # The local reranker is loaded on next use
+        assert not service.embedding_model_key().startswith("worker:")
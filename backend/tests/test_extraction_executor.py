@@ -0,0 +1,103 @@
+"""
+Tests for the concurrent extraction executor.
+
+Tests:
+1. Independent steps overlap; dependent steps wait for their dependencies
+2. Concurrency per endpoint is capped
+3. Conditions skip steps, failures are returned as outputs and rolled back
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+
+from app.services.extraction_executor import ExtractionExecutor, ExtractionStep
+
+
+class FakeSession:
+    def __init__(self):
+        self.committed = False
+        self.rolled_back = False
+        self.closed = False
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+def make_executor(limit=2, sessions=None):
+    sessions = sessions if sessions is not None else []
+
+    def factory():
+        session = FakeSession()
+        sessions.append(session)
+        return session
+
+    return ExtractionExecutor(max_concurrency_per_endpoint=limit, session_factory=factory)
+
+
+class TestExecutor:
+    def test_runs_independent_steps_concurrently(self):
+        log = []
+
+        def step(name, delay):
+            async def run(db, outputs):
+                log.append(f"start:{name}")
+                await asyncio.sleep(delay)
+                log.append(f"end:{name}")
+                return name
+            return run
+
+        steps = [
+            ExtractionStep("a", step("a", 0.05)),
+            ExtractionStep("b", step("b", 0.05)),
+            ExtractionStep("c", step("c", 0.0), depends_on=["a", "b"]),
+        ]
+        outputs = asyncio.run(make_executor().run(steps))
+        assert outputs == {"a": "a", "b": "b", "c": "c"}
+        assert log[:2] == ["start:a", "start:b"]
+        assert log.index("start:c") > max(log.index("end:a"), log.index("end:b"))
+
+    def test_caps_concurrency_per_endpoint(self):
+        in_flight = {"now": 0, "max": 0}
+
+        async def run(db, outputs):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+
+        steps = [ExtractionStep(f"s{i}", run, endpoint="llm:main") for i in range(5)]
+        asyncio.run(make_executor(limit=2).run(steps))
+        assert in_flight["max"] == 2
+
+    def test_condition_and_failure(self):
+        sessions = []
+
+        async def fails(db, outputs):
+            raise RuntimeError("boom")
+
+        async def fallback(db, outputs):
+            return "fallback"
+
+        steps = [
+            ExtractionStep("combined", fails),
+            ExtractionStep("fallback", fallback, depends_on=["combined"],
+                           condition=lambda outputs: isinstance(outputs["combined"], Exception)),
+            ExtractionStep("never", fallback, depends_on=["combined"], condition=lambda outputs: False),
+        ]
+        executor = make_executor(sessions=sessions)
+        outputs = asyncio.run(executor.run(steps))
+        assert isinstance(outputs["combined"], RuntimeError)
+        assert outputs["fallback"] == "fallback"
+        assert outputs["never"] is None
+        assert [s.rolled_back for s in sessions] == [True, False]
+        assert all(s.closed for s in sessions)
+        assert executor.metrics.get_stats()["steps"]["combined"]["failures"] == 1
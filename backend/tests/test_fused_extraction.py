@@ -0,0 +1,87 @@
+"""
+Tests for fused per-scene extraction.
+
+Tests:
+1. The fused message shows the scene once and lists every task key
+2. Fused responses are split per task; invalid outputs are reported
+3. The planner respects routing, the output budget and measured quality
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+
+import pytest
+
+from app.services.llm.fused_extraction import (
+    SCENE_REFERENCE,
+    FusedExtractionPlanner,
+    FusedTask,
+    build_fused_message,
+    has_list_key,
+    parse_fused_response,
+)
+
+
+def make_task(name, key, max_tokens=1000, force_main_llm=False):
+    return FusedTask(
+        name=name,
+        render=lambda scene: f"=== SCENE JUST GENERATED ===\n{scene}\n\nExtract {key}.",
+        system_prompt="Return only valid JSON.",
+        max_tokens=max_tokens,
+        validate=has_list_key(key),
+        force_main_llm=force_main_llm,
+    )
+
+
+EVENTS = make_task("scene_events", "events")
+STATES = make_task("entity_states", "characters")
+
+
+class TestFusedMessage:
+    def test_scene_appears_once(self):
+        message = build_fused_message("Mara opened the vault.", [EVENTS, STATES])
+        assert message.count("Mara opened the vault.") == 1
+        assert message.count(SCENE_REFERENCE) == 2
+        assert '"scene_events", "entity_states"' in message
+
+
+class TestParseFusedResponse:
+    def test_splits_outputs(self):
+        raw = json.dumps({"scene_events": {"events": [{"text": "Mara opened vault"}]}, "entity_states": {"characters": []}})
+        outputs, failed = parse_fused_response(raw, [EVENTS, STATES])
+        assert outputs["scene_events"]["events"][0]["text"] == "Mara opened vault"
+        assert outputs["entity_states"] == {"characters": []}
+        assert failed == []
+
+    def test_reports_missing_and_invalid(self):
+        raw = json.dumps({"scene_events": {"events": "none"}})
+        outputs, failed = parse_fused_response(raw, [EVENTS, STATES])
+        assert outputs == {}
+        assert [task.name for task in failed] == ["scene_events", "entity_states"]
+
+    def test_rejects_non_object(self):
+        with pytest.raises(ValueError):
+            parse_fused_response("[1, 2]", [EVENTS, STATES])
+
+
+class TestPlanner:
+    def test_fuses_tasks_on_same_route(self):
+        groups = FusedExtractionPlanner().plan([EVENTS, STATES])
+        assert [[task.name for task in group] for group in groups] == [["scene_events", "entity_states"]]
+
+    def test_separates_routes_and_respects_budget(self):
+        main_events = make_task("scene_events", "events", force_main_llm=True)
+        npcs = make_task("npcs", "npcs", max_tokens=1500)
+        groups = FusedExtractionPlanner(max_output_tokens=2000).plan([main_events, STATES, npcs])
+        assert sorted(len(group) for group in groups) == [1, 1, 1]
+
+    def test_low_quality_task_runs_standalone_until_reprobe(self):
+        planner = FusedExtractionPlanner(min_samples=3, min_quality=0.8, reprobe_every=3)
+        for _ in range(3):
+            planner.record("entity_states", False)
+            planner.record("scene_events", True)
+        sizes = [sorted(len(group) for group in planner.plan([EVENTS, STATES])) for _ in range(3)]
+        assert sizes == [[1, 1], [1, 1], [2]]
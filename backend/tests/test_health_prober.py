@@ -0,0 +1,88 @@
+"""
+Tests for the background LLM endpoint health prober.
+
+Tests:
+1. check() probes a new endpoint once, then answers from the cache
+2. A failed probe marks the endpoint down; only failure_threshold failures open its circuit
+3. A successful probe half-opens the circuit again
+4. Endpoints nobody asks about are forgotten
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+
+from app.services.llm.health_prober import HealthProber, STATE_DOWN, STATE_HEALTHY
+from app.utils.circuit_breaker import CircuitState, get_llm_scheduler
+
+
+class FakeEndpoint:
+    def __init__(self, api_url, healthy=True):
+        self.api_url = api_url
+        self.model_string = "openai/test"
+        self.healthy = healthy
+        self.calls = 0
+
+    async def check_health(self, timeout=5.0):
+        self.calls += 1
+        return (True, "reachable") if self.healthy else (False, "Cannot connect")
+
+
+def breaker_for(endpoint):
+    return get_llm_scheduler().get_limiter(endpoint.api_url, endpoint.model_string).breaker
+
+
+class TestCachedCheck:
+    def test_probes_once_then_cached(self):
+        prober = HealthProber(interval=60)
+        endpoint = FakeEndpoint("http://prober-cache:5001")
+
+        async def run():
+            prober._task = asyncio.get_running_loop().create_future()  # pretend the loop is running
+            first = await prober.check(endpoint)
+            second = await prober.check(endpoint)
+            return first, second
+
+        assert asyncio.run(run()) == ((True, "reachable"), (True, "reachable"))
+        assert endpoint.calls == 1
+        assert prober.get_status(endpoint)["state"] == STATE_HEALTHY
+
+
+class TestCircuitSharing:
+    def test_failed_probe_opens_and_success_half_opens(self):
+        prober = HealthProber()
+        endpoint = FakeEndpoint("http://prober-circuit:5001", healthy=False)
+
+        async def run():
+            available, _ = await prober.check(endpoint)
+            assert not available
+            assert prober.get_status(endpoint)["state"] == STATE_DOWN
+            # One failed probe must not make every request fail fast
+            breaker = breaker_for(endpoint)
+            assert breaker.state == CircuitState.CLOSED
+
+            for _ in range(breaker.failure_threshold - 1):
+                await prober.probe_all()
+            assert breaker.state == CircuitState.OPEN
+
+            endpoint.healthy = True
+            await prober.probe_all()
+
+        prober.down_interval = 0
+        asyncio.run(run())
+        assert breaker_for(endpoint).state == CircuitState.HALF_OPEN
+
+
+class TestIdleEndpoints:
+    def test_forgotten_after_ttl(self):
+        prober = HealthProber(idle_ttl=0)
+        endpoint = FakeEndpoint("http://prober-idle:5001")
+
+        async def run():
+            await prober.check(endpoint)
+            await prober.probe_all()
+
+        asyncio.run(run())
+        assert prober.get_status(endpoint) is None
@@ -0,0 +1,122 @@
+"""
+Tests for generated image thumbnails and cacheable image delivery.
+
+Tests:
+1. WebP thumbnails are written for sizes below the original; requests pick the smallest fitting one
+2. Matching If-None-Match returns 304; the ETag and Cache-Control are sent with the file
+3. Single byte ranges return 206, unsatisfiable ones 416, a stale If-Range the full file
+4. Signed URLs verify the nginx secure_link way and stay stable within a TTL window
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import base64
+import hashlib
+import io
+from urllib.parse import parse_qs, urlparse
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.services.image_generation.derivatives import create_derivatives, pick_derivative, sign_url
+from app.utils.file_responses import file_response
+
+
+def png_bytes(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 80, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def file_client(path, etag="abc123"):
+    app = FastAPI()
+
+    @app.get("/file")
+    async def get_file(request: Request):
+        return file_response(request, path, "image/png", etag=etag, cache_control="private, max-age=60")
+
+    return TestClient(app)
+
+
+class TestDerivatives:
+    def test_thumbnails_below_original_size(self, tmp_path):
+        data = png_bytes(800, 400)
+        original = tmp_path / "scene_1.png"
+        original.write_bytes(data)
+
+        written = create_derivatives(data, str(original), [1024, 256, 512])
+
+        assert sorted(written) == [256, 512]
+        with Image.open(written[256]) as thumb:
+            assert thumb.format == "WEBP"
+            assert thumb.size == (256, 128)
+        assert os.path.basename(written[512]) == "scene_1.w512.webp"
+
+        derivatives = {str(size): path for size, path in written.items()}
+        assert pick_derivative(derivatives, 300) == (512, written[512])
+        assert pick_derivative(derivatives, 100) == (256, written[256])
+        assert pick_derivative(derivatives, 700) is None  # The original is the best fit
+        assert pick_derivative(derivatives, None) is None
+
+
+class TestConditionalRequests:
+    def test_if_none_match_returns_not_modified(self, tmp_path):
+        path = tmp_path / "image.png"
+        path.write_bytes(b"0123456789")
+        client = file_client(str(path))
+
+        response = client.get("/file")
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+        assert response.headers["etag"] == '"abc123"'
+        assert response.headers["cache-control"] == "private, max-age=60"
+        assert response.headers["accept-ranges"] == "bytes"
+
+        response = client.get("/file", headers={"If-None-Match": 'W/"other", "abc123"'})
+        assert response.status_code == 304
+        assert response.content == b""
+
+
+class TestRanges:
+    def test_byte_ranges(self, tmp_path):
+        path = tmp_path / "image.png"
+        path.write_bytes(b"0123456789")
+        client = file_client(str(path))
+
+        response = client.get("/file", headers={"Range": "bytes=2-5"})
+        assert response.status_code == 206
+        assert response.content == b"2345"
+        assert response.headers["content-range"] == "bytes 2-5/10"
+
+        response = client.get("/file", headers={"Range": "bytes=-3"})
+        assert response.status_code == 206
+        assert response.content == b"789"
+
+        response = client.get("/file", headers={"Range": "bytes=20-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */10"
+
+        # The client's partial copy is of other content: send everything
+        response = client.get("/file", headers={"Range": "bytes=2-5", "If-Range": '"old"'})
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+
+
+class TestSignedUrls:
+    def test_signature_matches_nginx_secure_link(self):
+        url = sign_url("story_3/scene_1.w256.webp", "s3cret", "/media/images/", ttl=3600, now=10_000)
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+        expires = int(query["expires"][0])
+
+        expected = base64.urlsafe_b64encode(
+            hashlib.md5(f"{expires}{parsed.path} s3cret".encode()).digest()
+        ).decode().rstrip("=")
+        assert parsed.path == "/media/images/story_3/scene_1.w256.webp"
+        assert query["md5"][0] == expected
+        assert expires - 10_000 >= 3600
+        # Same URL for every request in the window, so browsers can cache it
+        assert sign_url("story_3/scene_1.w256.webp", "s3cret", "/media/images", ttl=3600, now=10_500) == url
@@ -0,0 +1,134 @@
+"""
+Tests for the image job scheduler.
+
+Tests:
+1. No more than max_concurrent_per_server jobs reach one server; servers are independent
+2. Interactive requests get a free slot before waiting batch requests
+3. Identical prompt/seed generations in flight are submitted once; seedless ones never shared
+4. map_prompts bounds concurrency and keeps input order
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+
+from app.services.image_generation import GenerationRequest, GenerationResult, GenerationStatus
+from app.services.image_generation.scheduler import (
+    ImageJobScheduler,
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+)
+
+
+class FakeProvider:
+    def __init__(self, server_url, delay=0.02):
+        self.server_url = server_url
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompts = []
+
+    async def generate_and_wait(self, request, max_wait=300.0):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.prompts.append(request.prompt)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return GenerationResult(
+            success=True,
+            status=GenerationStatus.COMPLETED,
+            image_data=request.prompt.encode(),
+        )
+
+
+class TestServerSlots:
+    def test_in_flight_capped_per_server(self):
+        scheduler = ImageJobScheduler(max_concurrent_per_server=2)
+        first = FakeProvider("http://gpu-1:8188")
+        second = FakeProvider("http://gpu-2:8188")
+
+        async def run():
+            await asyncio.gather(*(
+                scheduler.generate(provider, GenerationRequest(prompt=f"scene {i}"), priority=PRIORITY_BATCH)
+                for i in range(6)
+                for provider in (first, second)
+            ))
+
+        asyncio.run(run())
+        assert first.max_in_flight == 2
+        assert second.max_in_flight == 2
+        assert len(first.prompts) == 6 and len(second.prompts) == 6
+
+    def test_interactive_jumps_waiting_batch(self):
+        scheduler = ImageJobScheduler(max_concurrent_per_server=1)
+        provider = FakeProvider("http://gpu:8188")
+
+        async def run():
+            batch = [
+                asyncio.ensure_future(scheduler.generate(
+                    provider, GenerationRequest(prompt=f"batch {i}"), priority=PRIORITY_BATCH,
+                ))
+                for i in range(3)
+            ]
+            await asyncio.sleep(0.005)
+            interactive = scheduler.generate(provider, GenerationRequest(prompt="user"), priority=PRIORITY_INTERACTIVE)
+            await asyncio.gather(interactive, *batch)
+
+        asyncio.run(run())
+        # batch 0 already held the slot; the user's request is next
+        assert provider.prompts[:2] == ["batch 0", "user"]
+
+
+class TestDeduplication:
+    def test_identical_generations_submitted_once(self):
+        scheduler = ImageJobScheduler(max_concurrent_per_server=4)
+        provider = FakeProvider("http://gpu:8188")
+
+        async def run():
+            return await asyncio.gather(
+                scheduler.generate(provider, GenerationRequest(prompt="castle at dusk", seed=7)),
+                scheduler.generate(provider, GenerationRequest(prompt="castle at dusk", seed=7)),
+                scheduler.generate(provider, GenerationRequest(prompt="castle at dusk", seed=8)),
+            )
+
+        results = asyncio.run(run())
+        assert provider.prompts == ["castle at dusk", "castle at dusk"]
+        assert scheduler.deduplicated == 1
+        assert results[0] is results[1]
+        assert all(r.success for r in results)
+
+    def test_seedless_generations_not_shared(self):
+        scheduler = ImageJobScheduler(max_concurrent_per_server=4)
+        provider = FakeProvider("http://gpu:8188")
+
+        async def run():
+            return await asyncio.gather(
+                scheduler.generate(provider, GenerationRequest(prompt="castle at dusk")),
+                scheduler.generate(provider, GenerationRequest(prompt="castle at dusk")),
+            )
+
+        results = asyncio.run(run())
+        assert provider.prompts == ["castle at dusk", "castle at dusk"]
+        assert scheduler.deduplicated == 0
+        assert results[0] is not results[1]
+
+
+class TestPromptConcurrency:
+    def test_map_prompts_bounded_and_ordered(self):
+        scheduler = ImageJobScheduler(prompt_concurrency=2)
+        state = {"running": 0, "max": 0}
+
+        def factory(i):
+            async def make():
+                state["running"] += 1
+                state["max"] = max(state["max"], state["running"])
+                await asyncio.sleep(0.01 * (5 - i))
+                state["running"] -= 1
+                return f"prompt {i}"
+            return make
+
+        results = asyncio.run(scheduler.map_prompts([factory(i) for i in range(5)]))
+        assert results == [f"prompt {i}" for i in range(5)]
+        assert state["max"] == 2
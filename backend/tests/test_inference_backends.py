@@ -0,0 +1,125 @@
+"""
+Parity tests for the int8 / ONNX inference backends.
+
+Builds a tiny randomly initialised BERT bi-encoder and cross-encoder on disk
+(no model download) and checks that each backend agrees with the fp32 torch
+model:
+1. Bi-encoder: cosine similarity of embeddings
+2. Cross-encoder: scores and ranking
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from app.services.inference_backends import load_embedding_model, load_reranker_model, OnnxSentenceEncoder, OnnxCrossEncoder
+
+SENTENCES = [
+    "the door opens",
+    "a cat sat on the mat",
+    "the old door opened slowly",
+    "quick brown fox",
+]
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "the", "door", "open", "##s", "##ed", "old", "slowly"] + \
+    [chr(c) for c in range(97, 123)] + [f"##{chr(c)}" for c in range(97, 123)]
+
+
+def _tiny_models(root):
+    import torch
+    from transformers import BertConfig, BertModel, BertForSequenceClassification, BertTokenizer
+    from sentence_transformers import SentenceTransformer, models
+
+    torch.manual_seed(0)
+    config = dict(vocab_size=len(VOCAB), hidden_size=64, num_hidden_layers=2, num_attention_heads=2,
+                  intermediate_size=128, max_position_embeddings=512)
+
+    encoder_dir = os.path.join(root, "tiny-encoder")
+    os.makedirs(encoder_dir)
+    with open(os.path.join(encoder_dir, "vocab.txt"), "w") as f:
+        f.write("\n".join(VOCAB))
+    BertTokenizer(os.path.join(encoder_dir, "vocab.txt"), model_max_length=512).save_pretrained(encoder_dir)
+    BertModel(BertConfig(**config)).save_pretrained(encoder_dir)
+    transformer = models.Transformer(encoder_dir, max_seq_length=64)
+    st_dir = os.path.join(root, "tiny-st")
+    SentenceTransformer(modules=[
+        transformer, models.Pooling(64, "mean"), models.Normalize()
+    ]).save(st_dir)
+
+    reranker_dir = os.path.join(root, "tiny-reranker")
+    os.makedirs(reranker_dir)
+    BertTokenizer(os.path.join(encoder_dir, "vocab.txt"), model_max_length=512).save_pretrained(reranker_dir)
+    BertForSequenceClassification(BertConfig(num_labels=1, **config)).save_pretrained(reranker_dir)
+    return st_dir, reranker_dir
+
+
+@pytest.fixture(scope="module")
+def tiny_models(tmp_path_factory):
+    return _tiny_models(str(tmp_path_factory.mktemp("models")))
+
+
+def _is_quantized(module):
+    return any("quantized" in type(m).__module__ for m in module.modules())
+
+
+def _cosines(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+class TestEmbeddingBackendParity:
+    """Quantized / ONNX embeddings point the same way as fp32."""
+
+    def test_int8(self, tiny_models, tmp_path):
+        st_dir, _ = tiny_models
+        reference = load_embedding_model(st_dir, "torch").encode(SENTENCES)
+        model = load_embedding_model(st_dir, "int8")
+        quantized = model.encode(SENTENCES)
+
+        assert _is_quantized(model)
+        assert _cosines(reference, quantized).min() > 0.98
+
+    def test_onnx(self, tiny_models, tmp_path):
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("onnx")
+        st_dir, _ = tiny_models
+        reference = load_embedding_model(st_dir, "torch").encode(SENTENCES)
+        model = load_embedding_model(st_dir, "onnx", onnx_cache_dir=str(tmp_path))
+
+        assert isinstance(model, OnnxSentenceEncoder)
+        assert model.get_sentence_embedding_dimension() == reference.shape[1]
+        assert _cosines(reference, model.encode(SENTENCES)).min() > 0.999
+        # Single string returns a 1-D vector like SentenceTransformer
+        assert model.encode(SENTENCES[0]).shape == (reference.shape[1],)
+
+
+class TestRerankerBackendParity:
+    """Quantized / ONNX cross-encoder scores match fp32."""
+
+    PAIRS = [["who opened the door", s] for s in SENTENCES]
+
+    def test_int8(self, tiny_models):
+        _, reranker_dir = tiny_models
+        reference = load_reranker_model(reranker_dir, "torch").predict(self.PAIRS)
+        model = load_reranker_model(reranker_dir, "int8")
+        quantized = model.predict(self.PAIRS)
+
+        assert _is_quantized(model.model)
+        assert np.abs(reference - quantized).max() < 0.05
+
+    def test_onnx(self, tiny_models, tmp_path):
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("onnx")
+        _, reranker_dir = tiny_models
+        reference = load_reranker_model(reranker_dir, "torch").predict(self.PAIRS)
+        model = load_reranker_model(reranker_dir, "onnx", onnx_cache_dir=str(tmp_path))
+
+        assert isinstance(model, OnnxCrossEncoder)
+        scores = model.predict(self.PAIRS)
+        assert np.abs(reference - scores).max() < 1e-4
+        assert list(np.argsort(reference)) == list(np.argsort(scores))
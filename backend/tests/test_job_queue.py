@@ -0,0 +1,154 @@
+"""
+Tests for the background job queue helpers.
+
+Tests:
+1. Coalesced payloads widen sequence ranges and keep the newest values
+2. Retry backoff doubles per attempt
+3. submit_job runs the handler directly when the queue isn't running, keeping the task referenced
+4. Scene generation holds back non-interactive jobs
+5. Recovering a stale running job folds it into a pending job with the same key
+6. A queued extraction whose LLM is unavailable is re-queued for a later retry
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.database
+from app.models import BackgroundJob
+from app.services import job_queue
+from app.services.job_queue import (
+    JobQueue,
+    merge_payload,
+    register_job_handler,
+    retry_delay,
+    submit_job,
+)
+
+
+def use_sqlite_queue_db(monkeypatch):
+    """Point the queue at an in-memory SQLite background_jobs table."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    BackgroundJob.__table__.create(engine)
+    session_factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(app.database, "SessionLocal", session_factory)
+    return session_factory
+
+
+class TestMergePayload:
+    def test_widens_sequence_range(self):
+        old = {"chapter_id": 3, "from_sequence": 10, "to_sequence": 14, "defer_variant_id": 1}
+        new = {"chapter_id": 3, "from_sequence": 12, "to_sequence": 15, "defer_variant_id": 2}
+        merged = merge_payload(old, new)
+        assert merged["from_sequence"] == 10
+        assert merged["to_sequence"] == 15
+        assert merged["defer_variant_id"] == 2
+
+    def test_payload_without_ranges(self):
+        assert merge_payload({"scene_id": 5}, {"scene_id": 5, "branch_id": 1}) == {"scene_id": 5, "branch_id": 1}
+
+
+class TestRetryDelay:
+    def test_exponential(self):
+        assert [retry_delay(n, 5.0) for n in (1, 2, 3)] == [5.0, 10.0, 20.0]
+
+
+class TestSubmitFallback:
+    def test_runs_handler_when_queue_not_running(self):
+        calls = []
+
+        async def handler(**kwargs):
+            calls.append(kwargs)
+
+        register_job_handler("test_fallback", handler)
+
+        async def run():
+            job_id = await submit_job("test_fallback", {"story_id": 1}, extras={"user_settings": {}})
+            assert len(job_queue._direct_tasks) == 1  # Not left to the loop's weak references
+            await asyncio.sleep(0)
+            return job_id
+
+        assert asyncio.run(run()) is None
+        assert calls == [{"story_id": 1, "user_settings": {}}]
+        assert not job_queue._direct_tasks
+
+
+class TestInteractiveActivity:
+    def test_generation_marks_interactive_until_grace(self):
+        queue = JobQueue(interactive_grace=30.0)
+        queue.mark_interactive_start(("scene_generation", 1))
+        assert queue._interactive_active()
+        queue.mark_interactive_end(("scene_generation", 1))
+        assert not queue._interactive_active()
+
+        expired = JobQueue(interactive_grace=0.0)
+        expired.mark_interactive_start(("scene_generation", 1))
+        assert not expired._interactive_active()
+
+
+class TestRecoverRunning:
+    def test_stale_running_job_folds_into_pending_duplicate(self, monkeypatch):
+        session_factory = use_sqlite_queue_db(monkeypatch)
+        with session_factory() as db:
+            db.add(BackgroundJob(
+                job_type="scene_extractions", status="running", priority=10, attempts=1,
+                coalesce_key="extract:1", payload={"from_sequence": 3, "to_sequence": 5},
+                locked_by="dead:1", locked_at=datetime.utcnow() - timedelta(hours=1),
+            ))
+            db.add(BackgroundJob(
+                job_type="scene_extractions", status="pending", priority=10,
+                coalesce_key="extract:1", payload={"from_sequence": 5, "to_sequence": 8},
+            ))
+            db.commit()
+
+        JobQueue(stale_after=60.0)._recover_and_prune()
+
+        with session_factory() as db:
+            old, pending = db.query(BackgroundJob).order_by(BackgroundJob.id).all()
+            assert old.status == "failed"
+            assert old.locked_by is None
+            assert pending.status == "pending"
+            assert pending.payload == {"from_sequence": 3, "to_sequence": 8}
+
+
+class TestQueuedFailure:
+    def test_unhealthy_llm_requeues_with_backoff(self, monkeypatch):
+        from app.api.story_tasks import background_tasks
+        from app.services.llm import service as llm_service_module
+
+        class DownProber:
+            async def check(self, client):
+                return False, "connection refused"
+
+        class StubLLMService:
+            def get_user_client(self, user_id, user_settings):
+                return object()
+
+        monkeypatch.setattr(background_tasks, "get_health_prober", lambda: DownProber())
+        monkeypatch.setattr(llm_service_module, "UnifiedLLMService", StubLLMService)
+        session_factory = use_sqlite_queue_db(monkeypatch)
+
+        queue = JobQueue(retry_base_delay=60.0)
+        job_id = queue.enqueue(
+            "chronicle_extraction",
+            {"story_id": 1, "user_id": 1, "chapter_id": 2, "from_sequence": 0, "to_sequence": 3},
+            extras={"user_settings": {}},
+        )
+        job = queue._claim(None)
+        assert job["id"] == job_id
+        asyncio.run(queue._run(job))
+
+        with session_factory() as db:
+            stored = db.query(BackgroundJob).filter(BackgroundJob.id == job_id).one()
+            assert stored.status == "pending"
+            assert stored.attempts == 1
+            assert "connection refused" in stored.last_error
+            assert stored.run_after.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert queue.retried == 1
@@ -0,0 +1,103 @@
+"""
+Tests for the process-wide LLM client registry.
+
+Tests:
+1. Settings fingerprints ignore dict key order
+2. A user's client is reused until their settings change or are invalidated
+3. LiteLLM is reconfigured only when another client configured it last
+4. Extraction services are shared per resolved settings, with LRU eviction
+5. LiteLLM gets a pooled client of the calling event loop, only for OpenAI-compatible endpoints
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+
+from app.services.llm.client_registry import LLMClientRegistry, litellm_pool_kwargs, settings_fingerprint
+from app.services.llm.extraction_service import ExtractionLLMService
+
+
+class FakeClient:
+    api_type = "openai-compatible"
+
+    def __init__(self):
+        self.configured = 0
+
+    def _configure_litellm(self):
+        self.configured += 1
+
+
+class TestFingerprint:
+    def test_key_order_independent(self):
+        assert settings_fingerprint({"a": 1, "b": {"c": 2, "d": 3}}) == settings_fingerprint({"b": {"d": 3, "c": 2}, "a": 1})
+        assert settings_fingerprint({"a": 1}) != settings_fingerprint({"a": 2})
+
+
+class TestLLMClients:
+    def test_reuse_until_settings_change(self):
+        registry = LLMClientRegistry()
+        settings = {"llm_settings": {"api_type": "openai-compatible", "model_name": "m"}}
+        first = registry.get_llm_client(1, settings, FakeClient)
+        assert registry.get_llm_client(1, dict(settings), FakeClient) is first
+
+        changed = {"llm_settings": {"api_type": "openai-compatible", "model_name": "other"}}
+        assert registry.get_llm_client(1, changed, FakeClient) is not first
+
+    def test_invalidate_user(self):
+        registry = LLMClientRegistry()
+        first = registry.get_llm_client(1, {"model": "m"}, FakeClient)
+        registry.invalidate_user(1)
+        assert registry.get_llm_client(1, {"model": "m"}, FakeClient) is not first
+
+    def test_reconfigures_litellm_only_on_switch(self):
+        registry = LLMClientRegistry()
+        alice = registry.get_llm_client(1, {"model": "a"}, FakeClient)
+        registry.get_llm_client(1, {"model": "a"}, FakeClient)
+        assert alice.configured == 0
+
+        registry.get_llm_client(2, {"model": "b"}, FakeClient)
+        registry.get_llm_client(1, {"model": "a"}, FakeClient)
+        assert alice.configured == 1
+
+
+class TestExtractionServices:
+    def test_lru_eviction(self):
+        registry = LLMClientRegistry(max_entries=2)
+        a = registry.get_extraction_service({"model": "a"}, object)
+        registry.get_extraction_service({"model": "b"}, object)
+        assert registry.get_extraction_service({"model": "a"}, object) is a
+        registry.get_extraction_service({"model": "c"}, object)
+        assert registry.get_stats()["extraction_services"] == 2
+        # "b" was least recently used
+        assert registry.get_extraction_service({"model": "a"}, object) is a
+
+    def test_from_settings_shares_instances(self):
+        user_settings = {
+            "extraction_model_settings": {"url": "http://localhost:5001", "model_name": "qwen3", "api_type": "openai-compatible"},
+            "llm_settings": {"timeout_total": 120},
+        }
+        first = ExtractionLLMService.from_settings(user_settings)
+        assert ExtractionLLMService.from_settings(user_settings) is first
+        assert ExtractionLLMService.from_settings(user_settings, max_tokens_override=1500) is not first
+
+
+class TestLiteLLMPool:
+    def test_client_per_event_loop(self):
+        async def pool_client():
+            first = litellm_pool_kwargs("openai/local-model", "http://127.0.0.1:5001/v1", "k")["client"]
+            second = litellm_pool_kwargs("openai/local-model", "http://127.0.0.1:5001/v1", "k")["client"]
+            assert first is second
+            return first
+
+        # e.g. the main loop and an admin re-embed running under asyncio.run()
+        assert asyncio.run(pool_client()) is not asyncio.run(pool_client())
+
+    def test_only_openai_compatible_endpoints(self):
+        async def kwargs(model, api_base):
+            return litellm_pool_kwargs(model, api_base, None)
+
+        assert asyncio.run(kwargs("anthropic/claude", None)) == {}
+        assert asyncio.run(kwargs("openai/local-model", None)) == {}
+        assert litellm_pool_kwargs("openai/local-model", "http://127.0.0.1:5001/v1", None) == {}  # No running loop
@@ -0,0 +1,153 @@
+"""
+Tests for the per-endpoint LLM scheduler in utils/circuit_breaker.py.
+
+Tests:
+1. Fast responses on a saturated endpoint raise the limit additively
+2. Overload errors and slow responses cut the limit multiplicatively, once per wave;
+   non-streaming samples are per completion token, so long outputs aren't slow
+3. Waiters are served by lane, then arrival order
+4. Repeated overload errors open the endpoint's circuit
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import time
+
+import pytest
+
+from app.utils.circuit_breaker import (
+    LANE_BACKGROUND,
+    LANE_GENERATION,
+    LANE_INTERACTIVE,
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    LLMScheduler,
+    LLMSlot,
+    is_overload_error,
+)
+
+
+class ServiceUnavailableError(Exception):
+    status_code = 503
+
+
+class TestAIMD:
+    def test_additive_increase_when_saturated(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, max_limit=4)
+
+        async def run():
+            for _ in range(3):
+                started = await limiter.acquire()
+                limiter.release(started, latency=0.1)
+
+        asyncio.run(run())
+        # First sample sets the baseline, second grows 1 -> 2, third no longer saturates
+        assert limiter.limit == 2
+        assert limiter.in_flight == 0
+
+    def test_no_increase_when_idle(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=4)
+
+        async def run():
+            started = await limiter.acquire()
+            limiter.release(started, latency=0.1)
+            started = await limiter.acquire()
+            limiter.release(started, latency=0.1)
+
+        asyncio.run(run())
+        assert limiter.limit == 4
+
+    def test_decrease_on_overload_once_per_wave(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=8, decrease_factor=0.5)
+
+        async def run():
+            first = await limiter.acquire()
+            second = await limiter.acquire()
+            limiter.release(first, error=ServiceUnavailableError())
+            # Started before the cut - same congestion, no second decrease
+            limiter.release(second, error=ServiceUnavailableError())
+
+        asyncio.run(run())
+        assert limiter.limit == 4
+        assert limiter.decreases == 1
+
+    def test_decrease_on_slow_response(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=4, latency_tolerance=2.0, decrease_factor=0.5)
+        now = time.monotonic()
+        limiter.in_flight = 2
+        limiter.release(now, latency=1.0)
+        limiter.release(now, latency=5.0)
+        assert limiter.limit == 2
+        assert limiter.slow_responses == 1
+
+    def test_long_completion_is_not_slow(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=4, latency_tolerance=2.0)
+
+        def finish(seconds, tokens):
+            limiter.in_flight += 1
+            slot = LLMSlot(limiter, time.monotonic() - seconds, LANE_GENERATION)
+            slot.record_usage(type("Response", (), {"usage": type("Usage", (), {"completion_tokens": tokens})()})())
+            slot.release()
+
+        finish(1.0, 100)
+        finish(20.0, 2000)  # Same speed, twenty times the output
+        assert limiter.slow_responses == 0
+        finish(5.0, 100)
+        assert limiter.slow_responses == 1
+        assert set(limiter.baseline) == {(LANE_GENERATION, "per_token")}
+
+    def test_client_errors_are_not_overload(self):
+        assert is_overload_error(ServiceUnavailableError())
+        assert is_overload_error(asyncio.TimeoutError())
+        assert not is_overload_error(ValueError("bad request"))
+
+
+class TestPriority:
+    def test_waiters_served_by_lane(self):
+        limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, max_limit=1)
+        order = []
+
+        async def request(lane, name):
+            started = await limiter.acquire(lane)
+            order.append(name)
+            limiter.release(started, lane)
+
+        async def run():
+            held = await limiter.acquire(LANE_GENERATION)
+            tasks = [
+                asyncio.ensure_future(request(LANE_BACKGROUND, "extraction")),
+                asyncio.ensure_future(request(LANE_GENERATION, "summary")),
+                asyncio.ensure_future(request(LANE_INTERACTIVE, "stream")),
+            ]
+            await asyncio.sleep(0)
+            assert limiter.get_stats()["queue_depth"] == {"interactive": 1, "generation": 1, "background": 1}
+            limiter.release(held)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        assert order == ["stream", "summary", "extraction"]
+
+
+class TestCircuit:
+    def test_overload_opens_circuit(self):
+        scheduler = LLMScheduler(limiter_kwargs={"initial_limit": 2})
+        limiter = scheduler.get_limiter("http://localhost:5001/v1", "openai/test")
+        limiter.breaker = CircuitBreaker("llm-test", failure_threshold=2, recovery_timeout=60)
+
+        async def fail():
+            async with scheduler.slot("http://localhost:5001/v1/", "openai/test"):
+                raise ServiceUnavailableError()
+
+        async def run():
+            for _ in range(2):
+                with pytest.raises(ServiceUnavailableError):
+                    await fail()
+            with pytest.raises(CircuitBreakerOpenError):
+                await scheduler.acquire("http://localhost:5001/v1", "openai/test")
+
+        asyncio.run(run())
+        assert limiter.in_flight == 0
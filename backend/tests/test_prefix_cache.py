@@ -0,0 +1,95 @@
+"""
+Tests for the prompt prefix memoization and byte-identity tracking.
+
+Tests:
+1. Keys change with the context and with prefix-shaping settings
+2. Cached prefixes are copies, expire after the TTL and are dropped when the user saves settings
+3. Byte-identity counts identical leading messages and bytes
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from types import SimpleNamespace
+
+from app.services.llm.prefix_cache import (
+    PrefixIdentityTracker,
+    PromptPrefixCache,
+    make_prefix_key,
+    shared_prefix_bytes,
+)
+
+
+CONTEXT = {"story_id": 1, "branch_id": 2, "scene_number": 14, "genre": "noir", "_context_manager_ref": object()}
+SETTINGS = {"generation_preferences": {"scene_length": "medium"}, "allow_nsfw": False}
+
+
+class TestPrefixKey:
+    def test_internal_refs_do_not_change_key(self):
+        other = dict(CONTEXT, _context_manager_ref=object())
+        assert make_prefix_key(CONTEXT, 1, SETTINGS, 10) == make_prefix_key(other, 1, SETTINGS, 10)
+
+    def test_context_and_settings_change_key(self):
+        key = make_prefix_key(CONTEXT, 1, SETTINGS, 10)
+        assert key != make_prefix_key(dict(CONTEXT, genre="horror"), 1, SETTINGS, 10)
+        assert key != make_prefix_key(CONTEXT, 1, dict(SETTINGS, allow_nsfw=True), 10)
+        assert key != make_prefix_key(dict(CONTEXT, _semantic_improved=True), 1, SETTINGS, 10)
+
+
+class TestPromptPrefixCache:
+    def test_returns_copies(self):
+        cache = PromptPrefixCache()
+        cache.put(("k",), [{"role": "system", "content": "s"}])
+        first = cache.get(("k",))
+        first.append({"role": "user", "content": "task"})
+        first[0]["content"] = "changed"
+        assert cache.get(("k",)) == [{"role": "system", "content": "s"}]
+        assert cache.get_stats()["hits"] == 2
+
+    def test_ttl_expiry(self):
+        cache = PromptPrefixCache(ttl_seconds=0)
+        cache.put(("k",), [{"role": "system", "content": "s"}])
+        assert cache.get(("k",)) is None
+
+    def test_settings_save_drops_user_prefixes(self):
+        from app.services.llm.prefix_cache import prefix_cache
+        from app.services.llm.service import UnifiedLLMService
+
+        mine = make_prefix_key(CONTEXT, 41, SETTINGS, 10)
+        theirs = make_prefix_key(CONTEXT, 42, SETTINGS, 10)
+        prefix_cache.put(mine, [{"role": "system", "content": "old preset"}])
+        prefix_cache.put(theirs, [{"role": "system", "content": "other user"}])
+
+        # What the writing preset / settings endpoints call after saving
+        object.__new__(UnifiedLLMService).invalidate_user_client(41)
+
+        assert prefix_cache.get(mine) is None
+        assert prefix_cache.get(theirs) is not None
+        prefix_cache.invalidate_user(42)
+
+
+class TestPrefixIdentity:
+    def test_shared_prefix_bytes(self):
+        previous = [b"a" * 10, b"hello world", b"tail"]
+        current = [b"a" * 10, b"hello there", b"tail"]
+        assert shared_prefix_bytes(previous, current) == (1, 16)
+
+    def test_tracker_counts_identical_calls(self):
+        tracker = PrefixIdentityTracker()
+        messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "story"}]
+        assert tracker.observe((1, 1, 1), messages)["first"]
+        result = tracker.observe((1, 1, 1), messages)
+        assert result["identical"] and result["shared_bytes"] == result["total_bytes"]
+        assert tracker.get_stats()["identical_rate"] == 1.0
+
+    def test_llama_cpp_timings_estimate_saved_time(self):
+        tracker = PrefixIdentityTracker()
+        response = SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=1100, prompt_tokens_details=None),
+            timings={"cache_n": 1000, "prompt_n": 100, "prompt_ms": 200.0},
+        )
+        tracker.record_completion(response)
+        stats = tracker.get_stats()
+        assert stats["cached_prompt_tokens"] == 1000
+        assert stats["estimated_prompt_ms_saved"] == 2000.0
@@ -0,0 +1,115 @@
+"""
+Tests for the streaming re-embed pipeline.
+
+Tests:
+1. The checkpoint watermark only advances over contiguous finished chunks, never past a failed one
+2. Shadow-column indexes are built on the shadow column under a temporary name
+3. A failed chunk holds the checkpoint back; a dying worker doesn't leave the reader blocked
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+from unittest.mock import patch
+
+import numpy as np
+
+from app.services.reembed_service import SHADOW_COLUMN, ChunkWatermark, ReembedService
+from app.services.vector_index import create_index_sql
+
+
+class TestChunkWatermark:
+    def test_in_order_completion(self):
+        watermark = ChunkWatermark(10)
+        assert watermark.complete(0, 20) == 20
+        assert watermark.complete(1, 35) == 35
+        assert watermark.last_id == 35
+
+    def test_out_of_order_completion_waits_for_gap(self):
+        watermark = ChunkWatermark()
+        assert watermark.complete(1, 200) is None
+        assert watermark.complete(2, 300) is None
+        assert watermark.last_id == 0
+        assert watermark.complete(0, 100) == 300
+
+    def test_failed_chunk_stops_watermark(self):
+        watermark = ChunkWatermark()
+        assert watermark.complete(0, 100, rows=5) == 100
+        assert watermark.complete(2, 300, rows=5) is None
+        assert watermark.complete(1, 200, rows=5, ok=False) is None
+        assert watermark.complete(3, 400, rows=5) is None
+        assert (watermark.last_id, watermark.rows, watermark.failed) == (100, 5, True)
+
+
+class TestShadowIndex:
+    def test_index_on_shadow_column(self):
+        sql = create_index_sql(
+            "scene_events", {"index_type": "hnsw"},
+            column=SHADOW_COLUMN, name="ix_scene_events_embedding_next",
+        )
+        assert "ix_scene_events_embedding_next ON scene_events" in sql
+        assert f"({SHADOW_COLUMN} vector_cosine_ops)" in sql
+
+
+class FakeEncoder:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+
+    async def encode_texts(self, texts):
+        if self.fail_on in texts:
+            raise RuntimeError("encoder down")
+        return np.zeros((len(texts), 4), dtype=np.float32)
+
+
+def run_stream(service, encoder, chunks, workers=2):
+    service._progress[1] = {}
+    service._cancel_flags[1] = False
+    service._open_row_stream = lambda *args: (type("Conn", (), {"close": lambda self: None})(), iter(chunks))
+    checkpoint = {"mode": "shadow", "last_id": 0, "max_id": 1000, "processed": 0, "errors": 0}
+
+    async def run():
+        try:
+            return await service._stream_table(
+                None, "scene_events", "SceneEvent", "event_text", 1, checkpoint, {"chunk_size": 2, "workers": workers},
+            )
+        finally:
+            # Reader and workers are gone, whatever happened
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    with patch("app.services.semantic_memory.get_semantic_memory_service", return_value=encoder):
+        failed = asyncio.run(run())
+    return failed, checkpoint
+
+
+class TestStreamFailures:
+    def test_failed_chunk_holds_checkpoint(self):
+        service = ReembedService()
+        written = []
+        service._write_chunk = lambda engine, table, column, ids, embeddings: written.extend(ids)
+        service._save_checkpoint = lambda engine, checkpoint: None
+        chunks = [[(1, "a"), (2, "b")], [(3, "bad"), (4, "c")], [(5, "d"), (6, "e")]]
+
+        failed, checkpoint = run_stream(service, FakeEncoder(fail_on="bad"), chunks, workers=1)
+
+        assert failed == 2
+        assert sorted(written) == [1, 2, 5, 6]
+        assert checkpoint["last_id"] == 2
+        assert checkpoint["processed"] == 2
+
+    def test_worker_error_does_not_block_reader(self):
+        service = ReembedService()
+        service._write_chunk = lambda *args: None
+
+        def save_checkpoint(engine, checkpoint):
+            raise RuntimeError("database gone")
+
+        service._save_checkpoint = save_checkpoint
+        chunks = [[(i, "text")] for i in range(1, 50)]
+
+        try:
+            run_stream(service, FakeEncoder(), chunks)
+            raise AssertionError("expected the checkpoint error")
+        except RuntimeError as e:
+            assert str(e) == "database gone"
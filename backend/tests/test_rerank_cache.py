@@ -0,0 +1,91 @@
+"""
+Tests for cross-encoder rerank cost controls in SemanticMemoryService.
+
+Tests:
+1. Pair scores are reused only for the same query, document id and text
+2. Margin-based early exit
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from app.services.rerank_cache import RerankScoreCache
+from app.services.semantic_memory import SemanticMemoryService
+
+
+class _FakeReranker:
+    def __init__(self):
+        self.pairs = []
+
+    def predict(self, pairs):
+        self.pairs.extend(pairs)
+        return [float(len(doc)) for _, doc in pairs]
+
+
+def _service(margin=0.0):
+    service = SemanticMemoryService()
+    service.reranker = _FakeReranker()
+    service._rerank_cache = RerankScoreCache()
+    service._rerank_stats = service._rerank_cache
+    service.rerank_early_exit_margin = margin
+    return service
+
+
+class TestRerankPairCache:
+    """Only unseen pairs reach the cross-encoder."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_uses_cache(self):
+        service = _service()
+        docs = [("emb_1", "short"), ("emb_2", "much longer text")]
+
+        first = await service._rerank_pairs("who opened the door?", docs)
+        second = await service._rerank_pairs("who opened the door?", docs)
+
+        assert first == second
+        assert len(service.reranker.pairs) == 2
+        assert service.get_rerank_stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_edited_document_is_rescored(self):
+        service = _service()
+        await service._rerank_pairs("q", [("emb_1", "old text")])
+
+        scores = await service._rerank_pairs("q", [("emb_1", "new, edited text")])
+
+        assert scores == [float(len("new, edited text"))]
+        assert len(service.reranker.pairs) == 2
+
+    @pytest.mark.asyncio
+    async def test_different_query_is_rescored(self):
+        service = _service()
+        await service._rerank_pairs("q1", [("emb_1", "text")])
+        await service._rerank_pairs("q2", [("emb_1", "text")])
+
+        assert len(service.reranker.pairs) == 2
+
+
+class TestRerankEarlyExit:
+    """Reranking is skipped when the bi-encoder cut at top_k is clear."""
+
+    def _candidates(self, scores):
+        return [{'bi_encoder_score': s} for s in scores]
+
+    def test_disabled_by_default(self):
+        service = _service(margin=0.0)
+
+        assert not service._can_skip_rerank(self._candidates([0.9, 0.8, 0.1]), top_k=2)
+
+    def test_large_margin_skips(self):
+        service = _service(margin=0.1)
+
+        assert service._can_skip_rerank(self._candidates([0.9, 0.8, 0.5, 0.4]), top_k=2)
+        assert service.get_rerank_stats()["early_exits"] == 1
+
+    def test_small_margin_reranks(self):
+        service = _service(margin=0.1)
+
+        assert not service._can_skip_rerank(self._candidates([0.9, 0.8, 0.78, 0.4]), top_k=2)
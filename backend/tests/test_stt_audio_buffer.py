@@ -0,0 +1,51 @@
+"""
+Tests for the preallocated STT audio ring buffer.
+
+Tests:
+1. int16 PCM is converted exactly like the old astype / 32768 path
+2. Pending audio and tails are zero-copy views, also after wrapping around
+3. Oldest samples are dropped on overflow
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from app.services.stt_audio_buffer import AudioRingBuffer
+
+
+def pcm(values):
+    return np.asarray(values, dtype=np.int16).tobytes()
+
+
+class TestConversion:
+    def test_matches_float_conversion(self):
+        values = np.array([-32768, -1, 0, 1, 12345, 32767], dtype=np.int16)
+        buffer = AudioRingBuffer(16)
+        written = buffer.write(values.tobytes())
+        assert np.array_equal(written, values.astype(np.float32) / 32768.0)
+
+
+class TestViews:
+    def test_wrapped_window_is_contiguous_view(self):
+        buffer = AudioRingBuffer(8)
+        buffer.write(pcm(range(6)))
+        assert list(buffer.consume() * 32768) == [0, 1, 2, 3, 4, 5]
+
+        buffer.write(pcm(range(10, 15)))  # wraps past the end of the storage
+        pending = buffer.view()
+        assert list(pending * 32768) == [10, 11, 12, 13, 14]
+        assert np.shares_memory(pending, buffer._storage)
+        assert list(buffer.tail(2) * 32768) == [13, 14]
+        assert len(buffer) == 5
+
+
+class TestOverflow:
+    def test_drops_oldest(self):
+        buffer = AudioRingBuffer(4)
+        buffer.write(pcm([1, 2, 3]))
+        buffer.write(pcm([4, 5, 6]))
+        assert list(buffer.view() * 32768) == [3, 4, 5, 6]
+        assert buffer.overflowed_samples == 2
@@ -0,0 +1,140 @@
+"""
+Tests for multi-session STT with batched inference.
+
+Tests:
+1. Segments submitted concurrently are decoded in one batch, grouped by language
+2. VAD frames from several sessions share one batch; each session's state and
+   partial frame carry over to its next packet
+3. Each session keeps its own buffer and transcript
+4. Batched Whisper output is mapped back to the segment it came from
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.stt_scheduler import STTInferenceScheduler, VADState, VAD_FRAME_SAMPLES
+from app.services.stt_service import STTStream, stt_service
+
+
+class FakeService:
+    sample_rate = 16000
+
+    def __init__(self):
+        self.silero_vad_model = object()
+        self.whisper_batches = []
+        self.vad_batches = []
+
+    def transcribe_batch(self, audios, language):
+        self.whisper_batches.append((len(audios), language))
+        return [f"{language}:{len(audio)}" for audio in audios]
+
+    def vad_probabilities(self, frames, states):
+        self.vad_batches.append([len(f) for f in frames])
+        for f, state in zip(frames, states):
+            state.model_state = (state.model_state or 0) + len(f)
+        return [f[:, 0] for f in frames]
+
+    @staticmethod
+    def resolve_language(language):
+        return language
+
+    @staticmethod
+    def _post_process_text(text):
+        return text
+
+
+class TestWhisperBatching:
+    def test_concurrent_segments_share_a_batch(self):
+        service = FakeService()
+        scheduler = STTInferenceScheduler(service, max_batch_size=8, batch_window_ms=20)
+
+        async def run():
+            return await asyncio.gather(
+                scheduler.transcribe(np.zeros(100, dtype=np.float32), "en"),
+                scheduler.transcribe(np.zeros(200, dtype=np.float32), "en"),
+                scheduler.transcribe(np.zeros(300, dtype=np.float32), "de"),
+            )
+
+        assert asyncio.run(run()) == ["en:100", "en:200", "de:300"]
+        assert sorted(service.whisper_batches) == [(1, "de"), (2, "en")]
+        assert scheduler.get_stats()["whisper"]["batches"] == 1
+
+
+class TestVADBatching:
+    def test_frames_from_sessions_stacked(self):
+        service = FakeService()
+        scheduler = STTInferenceScheduler(service, vad_batch_window_ms=20)
+        speech = np.full(VAD_FRAME_SAMPLES * 2, 0.9, dtype=np.float32)
+        silence = np.zeros(VAD_FRAME_SAMPLES * 3 + 100, dtype=np.float32)
+
+        state = VADState()
+
+        async def run():
+            first = await asyncio.gather(
+                scheduler.detect_speech(speech, 0.5),
+                scheduler.detect_speech(silence, 0.5, state),
+            )
+            # 100 leftover samples + 412 new ones make a full frame
+            second = await scheduler.detect_speech(np.zeros(VAD_FRAME_SAMPLES - 100, dtype=np.float32), 0.5, state)
+            return first, second
+
+        assert asyncio.run(run()) == ([True, False], False)
+        assert service.vad_batches == [[2, 3], [1]]
+        assert state.model_state == 4
+        assert len(state.remainder) == 0
+
+
+class TestSessionIsolation:
+    def test_streams_keep_separate_state(self):
+        service = FakeService()
+        scheduler = STTInferenceScheduler(service, batch_window_ms=0, vad_batch_window_ms=0)
+        finals = {}
+
+        def make_stream(name):
+            async def on_final(text):
+                finals[name] = text
+            stream = STTStream(service, on_final=on_final, language=name)
+            stream.scheduler = scheduler
+            return stream
+
+        async def run():
+            alice, bob = make_stream("en"), make_stream("fr")
+            await alice.feed_audio_data(np.zeros(1600, dtype=np.int16).tobytes())
+            await bob.feed_audio_data(np.zeros(3200, dtype=np.int16).tobytes())
+            assert len(alice.audio_buffer) == 1600 and len(bob.audio_buffer) == 3200
+            await alice.stop_transcription()
+            await bob.stop_transcription()
+
+        asyncio.run(run())
+        assert finals == {"en": "en:1600", "fr": "fr:3200"}
+
+
+class FakePipeline:
+    """Returns one segment per clip, tagged with the clip's first sample value."""
+
+    def transcribe(self, audio, clip_timestamps, **kwargs):
+        segments = []
+        for clip in clip_timestamps:
+            start = int(round(clip["start"] * 16000))
+            segments.append(SimpleNamespace(seek=int(clip["start"] * 100), text=f"clip{int(audio[start])}"))
+        return segments, None
+
+
+class TestBatchMapping:
+    def test_segments_mapped_to_owners(self):
+        saved = (stt_service._batched_pipeline, stt_service.whisper_model)
+        stt_service._batched_pipeline = FakePipeline()
+        stt_service.whisper_model = SimpleNamespace(frames_per_second=100)
+        try:
+            first = np.full(16000, 1, dtype=np.float32)
+            second = np.full(31 * 16000, 2, dtype=np.float32)  # split into two clips
+            second[30 * 16000:] = 3
+            assert stt_service.transcribe_batch([first, second]) == ["clip1", "clip2 clip3"]
+        finally:
+            stt_service._batched_pipeline, stt_service.whisper_model = saved
@@ -0,0 +1,70 @@
+"""
+Tests for the content-addressed TTS audio cache.
+
+Tests:
+1. Keys depend on text and audio settings, not on dict order or pool tuning params
+2. Stored audio is found again, also after a restart (index rebuilt from disk)
+3. Least recently used entries are evicted beyond the disk quota
+4. Materialized user files survive eviction of the cache entry
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.tts.audio_cache import TTSAudioCache, audio_cache_key
+from app.services.tts.base import AudioFormat
+
+
+def key(text, **extra_params):
+    return audio_cache_key(text, "kokoro", "http://localhost:8880/", "af_bella", 1.0, AudioFormat.MP3, extra_params)
+
+
+class TestKey:
+    def test_settings_change_key(self):
+        assert key("Hello") == key("Hello")
+        assert key("Hello") != key("Hello!")
+        assert key("Hello", model="a", lang="en") == key("Hello", lang="en", model="a")
+        assert key("Hello", model="a") != key("Hello", model="b")
+        assert key("Hello") == key("Hello", max_concurrent_requests=4)
+        assert key("Hello") != audio_cache_key("Hello", "kokoro", "http://localhost:8880", "af_bella", 1.2, AudioFormat.MP3)
+
+
+class TestStore:
+    def test_round_trip_and_restart(self, tmp_path):
+        cache = TTSAudioCache(tmp_path / "cache", max_bytes=1024)
+        assert cache.lookup(key("a")) is None
+        cache.store_bytes(key("a"), b"mp3-a", AudioFormat.MP3, 1.5)
+
+        entry = cache.lookup(key("a"))
+        assert entry.path.read_bytes() == b"mp3-a"
+        assert cache.get_stats()["hits"] == 1
+
+        restarted = TTSAudioCache(tmp_path / "cache", max_bytes=1024)
+        entry = restarted.lookup(key("a"))
+        assert entry is not None and entry.duration == 1.5
+        assert list(tmp_path.rglob("*.part")) == []
+
+
+class TestEviction:
+    def test_lru_beyond_quota(self, tmp_path):
+        cache = TTSAudioCache(tmp_path / "cache", max_bytes=25)
+        for name in ("a", "b"):
+            cache.store_bytes(key(name), b"x" * 10, AudioFormat.MP3, 1.0)
+        cache.lookup(key("a"))
+        cache.store_bytes(key("c"), b"x" * 10, AudioFormat.MP3, 1.0)
+
+        assert cache.lookup(key("b")) is None
+        assert cache.lookup(key("a")) is not None
+        assert cache.get_stats()["evictions"] == 1
+        assert not list(tmp_path.rglob(f"{key('b')}.*"))
+
+    def test_user_file_survives_eviction(self, tmp_path):
+        cache = TTSAudioCache(tmp_path / "cache", max_bytes=15)
+        entry = cache.store_bytes(key("a"), b"x" * 10, AudioFormat.MP3, 1.0)
+        user_file = tmp_path / "scene_1.mp3"
+        assert cache.materialize(entry, user_file) == 10
+
+        cache.store_bytes(key("b"), b"y" * 10, AudioFormat.MP3, 1.0)
+        assert cache.lookup(key("a")) is None
+        assert user_file.read_bytes() == b"x" * 10
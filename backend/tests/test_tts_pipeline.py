@@ -0,0 +1,86 @@
+"""
+Tests for pipelined TTS chunk synthesis.
+
+Tests:
+1. Chunks come back in order even when later ones finish first
+2. No more than max_in_flight syntheses run at once
+3. Closing the stream cancels in-flight syntheses
+4. Providers default to one request in flight unless extra_params raise it
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+
+from app.services.tts.base import AudioFormat, TTSProviderConfig, TTSRequest, TTSResponse
+from app.services.tts.pipeline import synthesize_pipelined
+from app.services.tts.providers.kokoro import KokoroProvider
+
+
+class FakeProvider:
+    def __init__(self, delays):
+        self.delays = delays
+        self.running = 0
+        self.max_running = 0
+        self.cancelled = 0
+
+    async def synthesize(self, request):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays[int(request.text)])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+        return TTSResponse(
+            audio_data=request.text.encode(), format=AudioFormat.WAV,
+            duration=1.0, sample_rate=22050, file_size=1,
+        )
+
+
+def make_requests(count):
+    return [TTSRequest(text=str(i), voice_id="default") for i in range(count)]
+
+
+async def collect(provider, requests, width, **kwargs):
+    return [r.audio_data async for r in synthesize_pipelined(provider, requests, width, **kwargs)]
+
+
+class TestOrdering:
+    def test_in_order_with_bounded_concurrency(self):
+        provider = FakeProvider([0.05, 0.01, 0.0, 0.02, 0.0])
+        result = asyncio.run(collect(provider, make_requests(5), 3))
+        assert result == [b"0", b"1", b"2", b"3", b"4"]
+        assert provider.max_running == 3
+
+    def test_sequential_when_width_one(self):
+        provider = FakeProvider([0.0, 0.0, 0.0])
+        assert asyncio.run(collect(provider, make_requests(3), 1)) == [b"0", b"1", b"2"]
+        assert provider.max_running == 1
+
+
+class TestCancellation:
+    def test_closing_stream_cancels_in_flight(self):
+        provider = FakeProvider([0.0, 1.0, 1.0, 1.0])
+
+        async def run():
+            stream = synthesize_pipelined(provider, make_requests(4), 3)
+            first = await stream.__anext__()
+            await stream.aclose()
+            return first.audio_data
+
+        assert asyncio.run(run()) == b"0"
+        assert provider.cancelled == 2
+        assert provider.running == 0
+
+
+class TestProviderWidth:
+    def test_extra_params_override(self):
+        config = TTSProviderConfig(api_url="http://localhost:8880", api_key="", extra_params={})
+        assert KokoroProvider(config).max_concurrent_requests == 2
+        config.extra_params = {"max_concurrent_requests": 1}
+        assert KokoroProvider(config).max_concurrent_requests == 1
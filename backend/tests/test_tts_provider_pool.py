@@ -0,0 +1,109 @@
+"""
+Tests for the long-lived TTS provider pool.
+
+Tests:
+1. The same configuration returns the same provider; a different key or extra_params a new one
+2. The least recently used provider is evicted beyond max_entries
+3. Idle providers are dropped and closed
+4. The pooled HTTP client stays open across requests and applies the per-request timeout
+5. A client left on another, still running event loop is closed when replaced
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import threading
+import time
+
+from app.services.tts.base import TTSProviderConfig
+from app.services.tts.provider_pool import TTSProviderPool
+from app.services.tts.providers.kokoro import KokoroProvider
+
+
+def make_config(api_key="", **extra_params):
+    return TTSProviderConfig(api_url="http://localhost:8880", api_key=api_key, extra_params=extra_params)
+
+
+def get(pool, config):
+    return pool.get_provider("kokoro", config, lambda: KokoroProvider(config))
+
+
+class TestReuse:
+    def test_same_configuration_shares_instance(self):
+        pool = TTSProviderPool()
+        first = get(pool, make_config())
+        assert get(pool, make_config()) is first
+        assert get(pool, make_config(api_key="secret")) is not first
+        assert get(pool, make_config(max_concurrent_requests=1)) is not first
+        assert pool.get_stats()["hits"] == 1
+
+    def test_stats_hide_api_key(self):
+        pool = TTSProviderPool()
+        get(pool, make_config(api_key="secret"))
+        assert "secret" not in str(pool.get_stats())
+
+
+class TestEviction:
+    def test_lru_beyond_max_entries(self):
+        pool = TTSProviderPool(max_entries=2)
+        a = get(pool, make_config(voice="a"))
+        get(pool, make_config(voice="b"))
+        assert get(pool, make_config(voice="a")) is a
+        get(pool, make_config(voice="c"))
+        assert pool.get_stats()["evictions"] == 1
+        # "b" was least recently used
+        assert get(pool, make_config(voice="a")) is a
+
+    def test_idle_provider_closed(self):
+        pool = TTSProviderPool(idle_ttl=0)
+        config = TTSProviderConfig(api_url="http://localhost:8880", api_key="", timeout=0)
+
+        async def run():
+            idle = get(pool, config)
+            client = idle._get_http_client()
+            await asyncio.sleep(0.01)
+            assert get(pool, config) is not idle
+            await asyncio.sleep(0.01)  # delayed close (timeout=0)
+            return client
+
+        assert asyncio.run(run()).is_closed
+
+
+class TestPooledClient:
+    def test_client_reused_with_request_timeout(self):
+        provider = KokoroProvider(make_config())
+
+        async def run():
+            async with provider._http_client(timeout=5) as first:
+                pass
+            async with provider._http_client(timeout=5) as second:
+                pass
+            assert first._client is second._client
+            assert not first._client.is_closed
+            await provider.close()
+            return first._client
+
+        assert asyncio.run(run()).is_closed
+
+    def test_client_of_other_loop_closed_on_replace(self):
+        provider = KokoroProvider(make_config())
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            async def client_on_loop():
+                return provider._get_http_client()
+
+            stale = asyncio.run_coroutine_threadsafe(client_on_loop(), other_loop).result(timeout=5)
+            fresh = asyncio.run(client_on_loop())
+            assert fresh is not stale
+            deadline = time.monotonic() + 5
+            while not stale.is_closed and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert stale.is_closed
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join(timeout=5)
+            other_loop.close()
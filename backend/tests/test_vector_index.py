@@ -0,0 +1,55 @@
+"""
+Tests for pgvector index mode helpers.
+
+Tests:
+1. SET LOCAL statements per search mode / index type
+2. Index DDL for HNSW and IVFFlat
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.vector_index import create_index_sql, search_settings_sql
+
+
+class TestSearchSettings:
+    """Per-query settings applied before vector searches."""
+
+    def test_auto_mode_changes_nothing(self):
+        assert search_settings_sql({'search_mode': 'auto'}) == []
+
+    def test_exact_mode_disables_index_scans(self):
+        assert search_settings_sql({'search_mode': 'exact'}) == ["SET LOCAL enable_indexscan = off"]
+
+    def test_hnsw_ef_search_override_and_limit_floor(self):
+        config = {'search_mode': 'ann', 'index_type': 'hnsw', 'ef_search': 40}
+
+        assert search_settings_sql(config, ef_search=100) == ["SET LOCAL hnsw.ef_search = 100"]
+        assert search_settings_sql(config, limit=60) == ["SET LOCAL hnsw.ef_search = 60"]
+
+    def test_hnsw_iterative_scan(self):
+        config = {'search_mode': 'ann', 'index_type': 'hnsw', 'ef_search': 40, 'iterative_scan': 'relaxed_order'}
+
+        assert "SET LOCAL hnsw.iterative_scan = relaxed_order" in search_settings_sql(config)
+
+    def test_ivfflat_probes(self):
+        config = {'search_mode': 'ann', 'index_type': 'ivfflat', 'ivfflat_probes': 10}
+
+        assert search_settings_sql(config) == ["SET LOCAL ivfflat.probes = 10"]
+
+
+class TestIndexSql:
+    """Index DDL follows the configured index type."""
+
+    def test_hnsw(self):
+        sql = create_index_sql('scene_events', {'index_type': 'hnsw', 'hnsw_m': 24, 'hnsw_ef_construction': 100})
+
+        assert "ix_scene_events_embedding_hnsw" in sql
+        assert "USING hnsw (embedding vector_cosine_ops) WITH (m = 24, ef_construction = 100)" in sql
+
+    def test_ivfflat(self):
+        sql = create_index_sql('plot_events', {'index_type': 'ivfflat', 'ivfflat_lists': 50})
+
+        assert "ix_plot_events_embedding_ivfflat" in sql
+        assert "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 50)" in sql
@@ -4,6 +4,9 @@ import { useState, useEffect, useCallback } from 'react';
 import { X, ChevronDown, ChevronUp, Download, Trash2, User, BookOpen } from 'lucide-react';
 import { imageGenerationApi } from '@/lib/api/index';
 
+// Longest edge of the thumbnails shown in the grid (full images only on download)
+const GALLERY_THUMBNAIL_SIZE = 512;
+
 interface GeneratedImage {
   id: number;
   story_id: number;
@@ -12,6 +15,26 @@ interface GeneratedImage {
   image_type: string;
   prompt?: string;
   created_at: string;
+  url?: string;
+  thumbnail_url?: string;
+  thumbnails?: Record<string, string>;
+}
+
+// Smallest thumbnail covering the grid cell; the full image if none is large enough
+function gridImageUrl(img: GeneratedImage): string | undefined {
+  const fitting = Object.keys(img.thumbnails || {})
+    .map(Number)
+    .filter(size => size >= GALLERY_THUMBNAIL_SIZE)
+    .sort((a, b) => a - b);
+  return fitting.length ? img.thumbnails![String(fitting[0])] : img.url;
+}
+
+// Listing URLs are cacheable (content-versioned or nginx-signed); older backends only serve by id
+function loadImageSrc(img: GeneratedImage, thumbnail: boolean): Promise<string> {
+  const url = thumbnail ? gridImageUrl(img) : img.url;
+  return url
+    ? imageGenerationApi.getImageSrc(url)
+    : imageGenerationApi.getImageFileAsBlob(img.id, thumbnail ? GALLERY_THUMBNAIL_SIZE : undefined);
 }
 
 interface SceneInfo {
@@ -107,19 +130,18 @@ export default function ImageGallery({
       setSceneGroups(groups);
 
       // Load image URLs for visible images (latest per scene + all portraits)
-      const imagesToLoad: number[] = [
-        ...portraits.map(p => p.id),
-        ...groups.map(g => g.images[0]?.id).filter(Boolean),
+      const imagesToLoad: GeneratedImage[] = [
+        ...portraits,
+        ...groups.map(g => g.images[0]).filter(Boolean),
       ];
 
       const urls: Record<number, string> = {};
       await Promise.all(
-        imagesToLoad.map(async (id) => {
+        imagesToLoad.map(async (img) => {
           try {
-            const url = await imageGenerationApi.getImageFileAsBlob(id);
-            urls[id] = url;
+            urls[img.id] = await loadImageSrc(img, true);
           } catch (err) {
-            console.error(`Failed to load image ${id}:`, err);
+            console.error(`Failed to load image ${img.id}:`, err);
           }
         })
       );
@@ -140,15 +162,14 @@ export default function ImageGallery({
   // Load additional image URLs when expanding a scene group
   const loadGroupImages = async (group: SceneImageGroup) => {
     const newUrls: Record<number, string> = { ...imageUrls };
-    const idsToLoad = group.images.slice(1).map(img => img.id).filter(id => !imageUrls[id]);
+    const imagesToLoad = group.images.slice(1).filter(img => !imageUrls[img.id]);
 
     await Promise.all(
-      idsToLoad.map(async (id) => {
+      imagesToLoad.map(async (img) => {
         try {
-          const url = await imageGenerationApi.getImageFileAsBlob(id);
-          newUrls[id] = url;
+          newUrls[img.id] = await loadImageSrc(img, true);
         } catch (err) {
-          console.error(`Failed to load image ${id}:`, err);
+          console.error(`Failed to load image ${img.id}:`, err);
         }
       })
     );
@@ -170,14 +191,10 @@ export default function ImageGallery({
     );
   };
 
-  const handleDownload = async (imageId: number, filename: string) => {
-    const url = imageUrls[imageId];
-    if (!url) return;
-
+  const handleDownload = async (img: GeneratedImage, filename: string) => {
     try {
-      const response = await fetch(url);
-      const blob = await response.blob();
-      const downloadUrl = window.URL.createObjectURL(blob);
+      // The gallery shows thumbnails; download the full image
+      const downloadUrl = await loadImageSrc(img, false);
       const a = document.createElement('a');
       a.href = downloadUrl;
       a.download = filename;
@@ -267,7 +284,7 @@ export default function ImageGallery({
                           </div>
                           <div className="absolute inset-0 bg-black/60 opacity-0 group-hover:opacity-100 transition-opacity rounded-lg flex items-center justify-center gap-2">
                             <button
-                              onClick={() => handleDownload(img.id, `portrait_${img.character_id}.png`)}
+                              onClick={() => handleDownload(img, `portrait_${img.character_id}.png`)}
                               className="p-2 bg-white/20 hover:bg-white/30 rounded-lg"
                               title="Download"
                             >
@@ -349,7 +366,7 @@ export default function ImageGallery({
                               </div>
                               <div className="absolute inset-0 bg-black/60 opacity-0 group-hover:opacity-100 transition-opacity rounded-lg flex items-center justify-center gap-2">
                                 <button
-                                  onClick={() => handleDownload(img.id, `scene_${group.sceneInfo?.sequence_number || group.sceneId}_${idx + 1}.png`)}
+                                  onClick={() => handleDownload(img, `scene_${group.sceneInfo?.sequence_number || group.sceneId}_${idx + 1}.png`)}
                                   className="p-2 bg-white/20 hover:bg-white/30 rounded-lg"
                                   title="Download"
                                 >
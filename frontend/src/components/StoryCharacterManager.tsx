@@ -79,7 +79,7 @@ export default function StoryCharacterManager({
           .filter((c: StoryCharacter) => c.portrait_image_id)
           .map(async (c: StoryCharacter) => {
             try {
-              urls[c.portrait_image_id!] = await imageGenerationApi.getImageFileAsBlob(c.portrait_image_id!);
+              urls[c.portrait_image_id!] = await imageGenerationApi.getImageFileAsBlob(c.portrait_image_id!, 256);
             } catch (err) {
               console.warn(`Failed to load portrait for ${c.name}:`, err);
             }
@@ -94,6 +94,9 @@ export interface GeneratedImage {
   width?: number;
   height?: number;
   created_at: string;
+  url?: string;
+  thumbnail_url?: string;
+  thumbnails?: Record<string, string>;
 }
 
 export interface ImageGenerationSettings {
@@ -272,19 +275,33 @@ export class ImageGenerationApi extends BaseApiClient {
    * Fetch an image file as a blob URL (authenticated).
    * Returns an object URL that can be used in <img src>.
    * Caller should revoke the URL when done via URL.revokeObjectURL().
+   * Pass size (longest edge in pixels) to get a WebP thumbnail instead of the full image.
+   * Prefer getImageSrc() with the URLs of an image listing - those are cacheable.
    */
-  async getImageFileAsBlob(imageId: number): Promise<string> {
+  async getImageFileAsBlob(imageId: number, size?: number): Promise<string> {
+    const query = size ? `?size=${size}` : '';
+    return this.getImageSrc(`/api/image-generation/images/${imageId}/file${query}`);
+  }
+
+  /**
+   * Turn an image URL from a listing (url, thumbnail_url, thumbnails) into an <img src>.
+   * API URLs need the Bearer token, so they are fetched into a blob URL; their
+   * content-versioned form is cached by the browser as immutable, so this is a cache
+   * hit after the first load. Signed media URLs are served by nginx and used directly.
+   * Revoke returned blob: URLs when done via URL.revokeObjectURL().
+   */
+  async getImageSrc(url: string): Promise<string> {
     if (!this.baseURL) {
       await this.initialize();
     }
-    const response = await fetch(
-      `${this.baseURL}/api/image-generation/images/${imageId}/file`,
-      {
-        headers: {
-          'Authorization': `Bearer ${this.token}`,
-        },
-      }
-    );
+    if (!url.startsWith('/api/')) {
+      return `${this.baseURL}${url}`;
+    }
+    const response = await fetch(`${this.baseURL}${url}`, {
+      headers: {
+        'Authorization': `Bearer ${this.token}`,
+      },
+    });
     if (!response.ok) {
       throw new Error(`Failed to fetch image: ${response.status}`);
     }